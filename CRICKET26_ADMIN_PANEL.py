@@ -18,11 +18,23 @@ import hashlib
 import requests
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Set
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, Set, Tuple
 import os
+import mmap
+import tempfile
+import time
+import zlib
 import sv_ttk
 import threading
 import queue
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from stat import S_ISREG
+
+from cricket26.manifest_store import ManifestStore
+from manifests.build_patch import build_patch, version_entry
+from manifests.generate_manifest import (BINARY_MANIFEST_SUFFIX, DIFF_SUFFIX, PACKING_LIST_SUFFIX, STAT_SIDECAR_SUFFIX,
+                                         PreviousManifest, build_packing_list, compare_manifests, format_diff_summary, scan_game_files,
+                                         write_binary_manifest, write_stat_sidecar)
 
 # ==============================================================================
 # --- CONSTANTS & CONFIGURATION ---
@@ -50,6 +62,13 @@ class AdminConstants:
     # Supported hash algorithms
     HASH_ALGORITHMS = ['MD5', 'SHA1', 'SHA256']
     
+    # Digests the multi-digest hasher can compute in one pass (CRC32 is what SFV files carry)
+    DIGEST_ALGORITHMS = HASH_ALGORITHMS + ['CRC32']
+    CHECKSUM_EXTENSIONS = {'MD5': '.md5', 'SHA1': '.sha1', 'SHA256': '.sha256', 'CRC32': '.sfv'}
+    
+    # Every digest the hash tools compute, keyed by path/size/mtime (next to the utility's caches)
+    DIGEST_CACHE_FILE = Path(tempfile.gettempdir()) / "cricket26_updater_cache" / "admin_digests.json"
+    
     # Default host configuration
     DEFAULT_HOST = {
         "id": "gdrive_primary",
@@ -87,14 +106,452 @@ def format_bytes(byte_count: int) -> str:
 def calculate_file_hash(file_path: Path, algorithm: str = 'SHA256') -> Optional[str]:
     """Calculate hash of a file."""
     try:
-        hash_obj = hashlib.new(algorithm.lower())
-        with open(file_path, 'rb') as f:
-            while chunk := f.read(8192):
-                hash_obj.update(chunk)
-        return hash_obj.hexdigest()
+        return HashEngine(workers=1, algorithm=algorithm).hash_file(file_path)
     except Exception as e:
         return None
 
+# ==============================================================================
+# --- HASHING ENGINE ---
+# ==============================================================================
+
+class HashCancelled(Exception):
+    """Raised inside a hashing worker once its engine is cancelled."""
+
+
+class MultiDigest:
+    """Several digests fed from one read pass; CRC32 is kept as SFV-style uppercase hex."""
+    
+    def __init__(self, algorithms: Iterable[str]):
+        self.algorithms = list(algorithms)
+        self._hashes = [hashlib.new(name.lower()) for name in self.algorithms if name != 'CRC32']
+        self._crc = 0 if 'CRC32' in self.algorithms else None
+    
+    def update(self, data):
+        for hash_obj in self._hashes:
+            hash_obj.update(data)
+        if self._crc is not None:
+            self._crc = zlib.crc32(data, self._crc)
+    
+    def hexdigests(self) -> Dict[str, str]:
+        hashes = iter(self._hashes)
+        return {name: f"{self._crc:08X}" if name == 'CRC32' else next(hashes).hexdigest() for name in self.algorithms}
+
+
+def format_checksum_line(algorithm: str, digest: str, name: str) -> str:
+    """One line of a .md5/.sha1/.sha256 file ("digest  name") or of an .sfv ("name CRC")."""
+    return f"{name} {digest}" if algorithm == 'CRC32' else f"{digest}  {name}"
+
+
+class DigestCache:
+    """Persistent cache of every digest the hash tools have computed.
+    
+    "files" maps a path to [size, mtime_ns, sha256]; a stat that still matches leads to the
+    content entry "content"[sha256], which holds the file's size and whatever of MD5, SHA1
+    and CRC32 were ever computed for it. Exports hold the files under one game root as
+    relative paths plus a content probe (SHA256 of the size, first and last PROBE_BYTES), so
+    another maintainer can import them onto their own copy of the build. Their mtimes differ,
+    so an imported entry is stored without one and confirmed the first time it is looked up:
+    the size and probe must match, after which the local mtime is recorded.
+    """
+    FORMAT = "cricket26-digest-cache"
+    PROBE_BYTES = 64 * 1024
+    
+    def __init__(self, cache_file: Path = AdminConstants.DIGEST_CACHE_FILE):
+        self.cache_file = Path(cache_file)
+        self.files: Dict[str, list] = {}
+        self.content: Dict[str, Dict[str, Any]] = {}
+        self._loaded = False
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+    
+    @staticmethod
+    def _key(file_path) -> str:
+        return os.path.normcase(os.path.abspath(file_path))
+    
+    @staticmethod
+    def _valid_entry(entry) -> bool:
+        """[size, mtime_ns or None, sha256] as written by store() or import_file()."""
+        return (isinstance(entry, list) and len(entry) == 3 and isinstance(entry[0], int)
+                and (entry[1] is None or isinstance(entry[1], int))
+                and isinstance(entry[2], str) and len(entry[2]) == 64)
+    
+    @staticmethod
+    def _valid_content(files: Dict[str, list], content) -> Dict[str, Dict[str, Any]]:
+        """The content entries of a cache or export that some file entry refers to."""
+        if not isinstance(content, dict):
+            return {}
+        wanted = {entry[2] for entry in files.values()}
+        return {sha256: digests for sha256, digests in content.items() if sha256 in wanted and isinstance(digests, dict)}
+    
+    @classmethod
+    def probe(cls, file_path, size: int) -> str:
+        """Cheap content check: SHA256 of the size and the first and last PROBE_BYTES."""
+        probe = hashlib.sha256(str(size).encode())
+        with open(file_path, 'rb') as f:
+            probe.update(f.read(cls.PROBE_BYTES))
+            if size > cls.PROBE_BYTES:
+                f.seek(max(cls.PROBE_BYTES, size - cls.PROBE_BYTES))
+                probe.update(f.read(cls.PROBE_BYTES))
+        return probe.hexdigest()
+    
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            files = data.get('files', {}) if isinstance(data, dict) else {}
+            self.files = {key: entry for key, entry in files.items() if self._valid_entry(entry)} if isinstance(files, dict) else {}
+            self.content = self._valid_content(self.files, data.get('content'))
+        except (OSError, ValueError):
+            pass  # Missing or unreadable: start empty
+    
+    def __len__(self) -> int:
+        with self._lock:
+            self._load()
+            return len(self.files)
+    
+    def lookup(self, file_path, size: int, mtime_ns: int, algorithms: Iterable[str]) -> Optional[Dict[str, str]]:
+        """Cached {algorithm: hex} for the requested algorithms, or None unless all are known."""
+        key = self._key(file_path)
+        with self._lock:
+            self._load()
+            entry = self.files.get(key)
+            if not entry or entry[0] != size:
+                return None
+            digests = {**self.content.get(entry[2], {}), 'SHA256': entry[2]}
+        if entry[1] != mtime_ns:
+            # Only an imported entry (no local mtime yet) may match on content instead
+            if entry[1] is not None or not digests.get('probe'):
+                return None
+            try:
+                if self.probe(file_path, size) != digests['probe']:
+                    return None
+            except OSError:
+                return None
+            with self._lock:
+                if self.files.get(key) is entry:
+                    self.files[key] = [size, mtime_ns, entry[2]]
+                    self._dirty = True
+        if all(name in digests for name in algorithms):
+            return {name: digests[name] for name in algorithms}
+        return None
+    
+    def store(self, file_path, size: int, mtime_ns: int, digests: Dict[str, str]):
+        """Remember digests (which must include SHA256) for a file at this size and mtime."""
+        sha256 = digests['SHA256']
+        with self._lock:
+            self._load()
+            self.files[self._key(file_path)] = [size, mtime_ns, sha256]
+            content = self.content.setdefault(sha256, {'size': size})
+            content.update((name, digest) for name, digest in digests.items() if name != 'SHA256')
+            self._dirty = True
+    
+    def save(self):
+        """Write the cache if anything changed (atomically, so a crash keeps the old one)."""
+        with self._save_lock:  # Serialized, so an older snapshot never replaces a newer one
+            with self._lock:
+                if not self._dirty:
+                    return
+                data = json.dumps({'format': self.FORMAT, 'version': 1, 'files': self.files, 'content': self.content})
+                self._dirty = False
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(prefix=self.cache_file.name + '.', suffix='.tmp', dir=self.cache_file.parent)
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(data)
+                os.replace(tmp_name, self.cache_file)
+            except OSError:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+                raise
+    
+    def clear(self):
+        """Forget every entry."""
+        with self._lock:
+            self._loaded = True
+            self.files, self.content = {}, {}
+            self._dirty = True
+        self.save()
+    
+    def export(self, output_path: Path, game_root: Path) -> int:
+        """Write the entries under game_root with relative paths; returns how many files.
+        
+        Only entries that still match the file on disk are exported, each with its content probe.
+        """
+        root_key = self._key(game_root).rstrip(os.sep) + os.sep
+        with self._lock:
+            self._load()
+            candidates = [(key, list(entry), self.content.get(entry[2], {}).get('probe'))
+                          for key, entry in self.files.items() if key.startswith(root_key) and entry[1] is not None]
+        files, probes = {}, {}
+        for key, entry, known_probe in candidates:
+            try:
+                file_stat = os.stat(key)
+                if (file_stat.st_size, file_stat.st_mtime_ns) != (entry[0], entry[1]):
+                    continue
+                probes[entry[2]] = known_probe or probes.get(entry[2]) or self.probe(key, entry[0])
+            except OSError:
+                continue
+            files[key[len(root_key):].replace(os.sep, '/')] = entry
+        with self._lock:
+            for sha256, probe in probes.items():
+                content = self.content.setdefault(sha256, {})
+                if content.get('probe') != probe:
+                    content['probe'] = probe
+                    self._dirty = True
+            content = {sha256: self.content[sha256] for sha256 in probes}
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump({'format': self.FORMAT, 'version': 1, 'files': files, 'content': content}, f, indent=1)
+        self.save()
+        return len(files)
+    
+    def import_file(self, input_path: Path, game_root: Path) -> int:
+        """Merge an export onto game_root; returns how many file entries it added or replaced.
+        
+        Malformed rows and entries without a content probe are dropped; the rest are stored
+        without an mtime until lookup() confirms them against the local file.
+        """
+        with open(input_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or data.get('format') != self.FORMAT:
+            raise ValueError("Not a digest cache export")
+        files = data.get('files')
+        files = {rel: [entry[0], None, entry[2].lower()] for rel, entry in files.items()
+                 if isinstance(rel, str) and self._valid_entry(entry)} if isinstance(files, dict) else {}
+        content = self._valid_content(files, {sha256.lower(): digests for sha256, digests in data.get('content', {}).items()}
+                                      if isinstance(data.get('content'), dict) else {})
+        files = {rel: entry for rel, entry in files.items() if isinstance(content.get(entry[2], {}).get('probe'), str)}
+        with self._lock:
+            self._load()
+            for sha256, digests in content.items():
+                self.content.setdefault(sha256, {}).update((name, value) for name, value in digests.items() if isinstance(value, (str, int)))
+            for relative_path, entry in files.items():
+                self.files[self._key(Path(game_root) / relative_path)] = entry
+            self._dirty = True
+        self.save()
+        return len(files)
+
+
+class HashEngine:
+    """Parallel file hasher shared by the admin hash tools.
+    
+    Discovery (a directory walk or a file list) runs on its own thread and feeds a bounded
+    worker pool, so hashing starts with the first file while the totals keep growing. Files
+    of MMAP_THRESHOLD and up are hashed through mmap, smaller ones in READ_SIZE reads.
+    cancel() stops discovery and makes workers drop their file at the next chunk. With
+    `algorithms`, every file is read once for all of them and results are {algorithm: hex}.
+    With a DigestCache, files whose size and mtime are cached are not read at all.
+    """
+    READ_SIZE = 4 * 1024 * 1024
+    MMAP_THRESHOLD = 64 * 1024 * 1024
+    MMAP_SLICE = 16 * 1024 * 1024
+    DEFAULT_WORKERS = min(8, os.cpu_count() or 2)
+    
+    def __init__(self, workers: Optional[int] = None, algorithm: str = 'SHA256',
+                 on_progress: Optional[Callable[['HashEngine'], None]] = None, interval: float = 0.25,
+                 algorithms: Optional[List[str]] = None, cache: Optional[DigestCache] = None):
+        self.workers = max(1, workers or self.DEFAULT_WORKERS)
+        self.algorithm = algorithm
+        self.algorithms = list(algorithms) if algorithms else None
+        self.cache = cache
+        self.cache_hits = 0
+        self.on_progress = on_progress
+        self.interval = interval
+        self.files_found = 0
+        self.bytes_found = 0
+        self.files_done = 0
+        self.bytes_done = 0
+        self.discovery_done = False
+        self.started = time.monotonic()
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+    
+    def cancel(self):
+        """Stop discovery and abandon in-flight files."""
+        self._cancel.set()
+    
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+    
+    def rate(self) -> float:
+        """Bytes hashed per second since the engine was created."""
+        return self.bytes_done / max(time.monotonic() - self.started, 1e-6)
+    
+    def progress(self) -> int:
+        """Percent done by bytes (by files when everything found is empty)."""
+        if self.bytes_found:
+            return int(self.bytes_done * 100 / self.bytes_found)
+        return int(self.files_done * 100 / self.files_found) if self.files_found else 0
+    
+    def describe(self) -> str:
+        """Throughput line for a status bar."""
+        more = "" if self.discovery_done else "+"
+        cached = f" | {self.cache_hits} cached" if self.cache_hits else ""
+        return (f"⚡ {self.files_done}/{self.files_found}{more} files | "
+                f"{format_bytes(self.bytes_done)} / {format_bytes(self.bytes_found)}{more} | {format_bytes(self.rate())}/s{cached}")
+    
+    @staticmethod
+    def walk(base_paths: Iterable[Path], root: Path, stats: Optional[List] = None) -> Iterator[Tuple[str, Path, int]]:
+        """(relative path, path, size) for every file under base_paths, in a single scandir pass.
+        
+        With `stats`, also appends (relative path, size, mtime_ns) per file for a stat sidecar.
+        """
+        for base_path in base_paths:
+            if base_path.is_file():
+                file_stat = base_path.stat()
+                relative_path = base_path.relative_to(root).as_posix()
+                if stats is not None:
+                    stats.append((relative_path, file_stat.st_size, file_stat.st_mtime_ns))
+                yield relative_path, base_path, file_stat.st_size
+                continue
+            stack = [str(base_path)]
+            while stack:
+                try:
+                    with os.scandir(stack.pop()) as entries:
+                        entries = list(entries)
+                except OSError:
+                    continue
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        file_path = Path(entry.path)
+                        file_stat = entry.stat()
+                        relative_path = file_path.relative_to(root).as_posix()
+                        if stats is not None:
+                            stats.append((relative_path, file_stat.st_size, file_stat.st_mtime_ns))
+                        yield relative_path, file_path, file_stat.st_size
+    
+    def hash_file(self, file_path: Path, on_chunk: Optional[Callable[[int], None]] = None) -> str:
+        """Hash one file with `algorithm`; raises OSError, or HashCancelled once cancelled."""
+        return self._read(file_path, hashlib.new(self.algorithm.lower()), on_chunk).hexdigest()
+    
+    def digest_file(self, file_path: Path, on_chunk: Optional[Callable[[int], None]] = None) -> Dict[str, str]:
+        """Every one of `algorithms` for one file, in a single read pass."""
+        return self._read(file_path, MultiDigest(self.algorithms or [self.algorithm]), on_chunk).hexdigests()
+    
+    def cached_digests(self, file_path: Path, on_chunk: Optional[Callable[[int], None]] = None) -> Dict[str, str]:
+        """digest_file() through the cache: a hit costs one stat; a miss also computes SHA256 and is stored."""
+        wanted = self.algorithms or [self.algorithm]
+        if self.cache is None:
+            return self.digest_file(file_path, on_chunk)
+        file_stat = os.stat(file_path)
+        known = self.cache.lookup(file_path, file_stat.st_size, file_stat.st_mtime_ns, wanted)
+        if known:
+            with self._lock:
+                self.bytes_done += file_stat.st_size
+                self.cache_hits += 1
+            return known
+        digests = self._read(file_path, MultiDigest(list(dict.fromkeys(wanted + ['SHA256']))), on_chunk).hexdigests()
+        self.cache.store(file_path, file_stat.st_size, file_stat.st_mtime_ns, digests)
+        return {name: digests[name] for name in wanted}
+    
+    def _read(self, file_path: Path, hash_obj, on_chunk):
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size >= self.MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                    for start in range(0, size, self.MMAP_SLICE):
+                        with view[start:start + self.MMAP_SLICE] as chunk:
+                            self._consume(hash_obj, chunk, on_chunk)
+            else:
+                while chunk := f.read(self.READ_SIZE):
+                    self._consume(hash_obj, chunk, on_chunk)
+        return hash_obj
+    
+    def _consume(self, hash_obj, chunk, on_chunk):
+        if self._cancel.is_set():
+            raise HashCancelled()
+        hash_obj.update(chunk)
+        with self._lock:
+            self.bytes_done += len(chunk)
+        if on_chunk:
+            on_chunk(len(chunk))
+    
+    def hash_paths(self, items: Iterable[Tuple]) -> Iterator[Tuple[str, Path, Any, Optional[str]]]:
+        """Hash (key, path[, size]) items; yields (key, path, digest or None, error or None) as files finish.
+        
+        `items` is consumed on the discovery thread, so it can be a lazy walk. on_progress(engine)
+        runs on the caller's thread at most every `interval` seconds, and once at the end.
+        """
+        work: queue.Queue = queue.Queue()
+        threading.Thread(target=self._discover, args=(items, work), daemon=True, name='HashDiscovery').start()
+        pending = set()
+        discovering = True
+        last_report = 0.0
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='AdminHasher') as pool:
+            while True:
+                while discovering and len(pending) < self.workers * 4 and not self.cancelled:
+                    try:
+                        item = work.get(timeout=0.1) if not pending else work.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        discovering = False
+                        break
+                    key, file_path, error = item
+                    if error:
+                        yield key, file_path, None, error
+                    else:
+                        pending.add(pool.submit(self._hash_item, key, file_path))
+                
+                if pending:
+                    done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+                elif not discovering or self.cancelled:
+                    break
+                
+                if self.on_progress and time.monotonic() - last_report >= self.interval:
+                    last_report = time.monotonic()
+                    self.on_progress(self)
+        if self.cache:
+            self.cache.save()
+        if self.on_progress:
+            self.on_progress(self)
+    
+    def _discover(self, items: Iterable[Tuple], work: queue.Queue):
+        try:
+            for key, file_path, *size in items:
+                if self._cancel.is_set():
+                    break
+                if not size:
+                    try:
+                        file_stat = os.stat(file_path)
+                    except OSError:
+                        file_stat = None
+                    if file_stat is None or not S_ISREG(file_stat.st_mode):
+                        work.put((key, file_path, f"File not found: {key}"))
+                        continue
+                    size = [file_stat.st_size]
+                with self._lock:
+                    self.files_found += 1
+                    self.bytes_found += size[0]
+                work.put((key, file_path, None))
+        except Exception as e:
+            work.put(("", None, f"File discovery failed: {e}"))
+        finally:
+            self.discovery_done = True
+            work.put(None)
+    
+    def _hash_item(self, key: str, file_path: Path) -> Tuple[str, Path, Any, Optional[str]]:
+        try:
+            digests = self.cached_digests(file_path)
+            return key, file_path, digests if self.algorithms else digests[self.algorithm], None
+        except HashCancelled:
+            return key, file_path, None, "Cancelled"
+        except OSError as e:
+            return key, file_path, None, f"Failed to hash: {key} ({e})"
+        finally:
+            with self._lock:
+                self.files_done += 1
+
 # ==============================================================================
 # --- VERSION MANAGER ---
 # ==============================================================================
@@ -163,6 +620,8 @@ class VersionManager:
             "manifest_links": data.get("manifest_links", {}),
             "fallback_links": data.get("fallback_links", {})
         }
+        # Keep sections this editor does not manage (checksums, update_archives, ...)
+        corrected.update({key: value for key, value in data.items() if key not in corrected})
         return corrected
     
     def save_to_file(self, file_path: Optional[Path] = None) -> bool:
@@ -189,8 +648,13 @@ class VersionManager:
     
     def add_update(self, from_version: str, to_version: str, gdrive_link: str, 
                    update_size: str, manifest_link: str = "", 
-                   fallback_url: str = "", fallback_message: str = "") -> bool:
-        """Add a new update path (from_version -> to_version)."""
+                   fallback_url: str = "", fallback_message: str = "",
+                   archive_info: Optional[Dict[str, Any]] = None) -> bool:
+        """Add a new update path (from_version -> to_version).
+        
+        archive_info is a built patch's version_entry(): exact size, SHA256, block hashes and
+        central directory, stored under update_archives with the SHA256 as the path's checksum.
+        """
         try:
             # Create update key (format: "1.0_1.1")
             update_key = f"{from_version}_{to_version}"
@@ -221,6 +685,9 @@ class VersionManager:
                     "message": fallback_message if fallback_message else "Primary download unavailable. Using fallback server."
                 }
             
+            if archive_info:
+                self.set_update_archive(update_key, archive_info)
+            
             # Rebuild versions array
             self.rebuild_versions_array()
             
@@ -230,13 +697,18 @@ class VersionManager:
     
     def update_existing(self, from_version: str, to_version: str, old_to_version: str,
                        gdrive_link: str, update_size: str, manifest_link: str = "",
-                       fallback_url: str = "", fallback_message: str = "") -> bool:
+                       fallback_url: str = "", fallback_message: str = "",
+                       archive_info: Optional[Dict[str, Any]] = None) -> bool:
         """Update an existing update path."""
         try:
             # Remove old entry
             old_key = f"{from_version}_{old_to_version}"
             new_key = f"{from_version}_{to_version}"
             
+            # An archive built earlier stays attached unless a new one replaces it
+            archive_info = archive_info or self.data.get('update_archives', {}).get(old_key)
+            self.remove_update_archive(old_key)
+            
             # Remove old links
             if self.data['hosts'] and old_key in self.data['hosts'][0]['links']:
                 del self.data['hosts'][0]['links'][old_key]
@@ -249,7 +721,7 @@ class VersionManager:
             
             # Add new entry
             return self.add_update(from_version, to_version, gdrive_link, update_size, 
-                                 manifest_link, fallback_url, fallback_message)
+                                 manifest_link, fallback_url, fallback_message, archive_info)
         except Exception as e:
             return False
     
@@ -274,6 +746,8 @@ class VersionManager:
             if 'fallback_links' in self.data and update_key in self.data['fallback_links']:
                 del self.data['fallback_links'][update_key]
             
+            self.remove_update_archive(update_key)
+            
             # Rebuild versions array
             self.rebuild_versions_array()
             
@@ -281,6 +755,22 @@ class VersionManager:
         except Exception as e:
             return False
     
+    def set_update_archive(self, update_key: str, archive_info: Dict[str, Any]):
+        """Record a built patch archive: details, exact checksum and its size string."""
+        self.data.setdefault('update_archives', {})[update_key] = archive_info
+        self.data.setdefault('checksums', {})[update_key] = archive_info['sha256']
+        self.data['update_sizes'][update_key] = format_bytes(archive_info['size_bytes'])
+        for host in self.data['hosts']:
+            if update_key in host.get('links', {}):
+                host.setdefault('checksums', {})[update_key] = archive_info['sha256']
+    
+    def remove_update_archive(self, update_key: str):
+        """Drop a path's archive details and checksums."""
+        self.data.get('update_archives', {}).pop(update_key, None)
+        self.data.get('checksums', {}).pop(update_key, None)
+        for host in self.data['hosts']:
+            host.get('checksums', {}).pop(update_key, None)
+    
     def get_update(self, from_version: str, to_version: str) -> Optional[Dict[str, Any]]:
         """Get a specific update path."""
         update_key = f"{from_version}_{to_version}"
@@ -293,7 +783,8 @@ class VersionManager:
                 'update_size': self.data['update_sizes'].get(update_key, '0 MB'),
                 'manifest_link': self.data['manifest_links'].get(to_version, ''),
                 'fallback_url': '',
-                'fallback_message': ''
+                'fallback_message': '',
+                'archive': self.data.get('update_archives', {}).get(update_key)
             }
             
             # Get fallback info if exists
@@ -382,29 +873,51 @@ class ManifestGenerator:
     """Generate game file manifest for verification."""
     
     @staticmethod
-    def generate_manifest(game_dir: Path, progress_callback=None) -> Dict[str, str]:
-        """Generate manifest of all game files with SHA256 hashes."""
+    def generate_manifest(game_dir: Path, progress_callback=None, previous: Optional[PreviousManifest] = None,
+                          stats: Optional[List] = None, engine: Optional[HashEngine] = None) -> Dict[str, str]:
+        """Generate manifest of all game files with SHA256 hashes.
+        
+        With `previous`, files whose size and mtime match its stat sidecar (and that its patch
+        file list does not name) keep their previous hash instead of being re-read. The scanned
+        (path, size, mtime_ns) entries are appended to `stats` for the new sidecar. The rest are
+        hashed on `engine` (a default HashEngine if not given).
+        """
         manifest = {}
-        total_files = sum(1 for _ in game_dir.rglob('*') if _.is_file())
+        files, _ = scan_game_files(game_dir, is_excluded=lambda rel_path: False)
+        total_files = len(files)
         processed = 0
+        to_hash = []
         
-        for file_path in game_dir.rglob('*'):
-            if file_path.is_file():
-                try:
-                    relative_path = file_path.relative_to(game_dir)
-                    file_hash = calculate_file_hash(file_path, 'SHA256')
-                    
-                    if file_hash:
-                        manifest[str(relative_path).replace('\\', '/')] = file_hash
-                    
-                    processed += 1
-                    if progress_callback:
-                        progress_callback(processed, total_files, str(relative_path))
-                
-                except Exception as e:
-                    continue
+        for relative_path, size, mtime_ns in files:
+            known = previous.lookup(relative_path, size, mtime_ns, False) if previous else None
+            if known:
+                manifest[relative_path] = known[0]
+                processed += 1
+            else:
+                to_hash.append((relative_path, game_dir / relative_path, size))
         
-        return manifest
+        for relative_path, _, file_hash, _ in (engine or HashEngine()).hash_paths(to_hash):
+            if file_hash:
+                manifest[relative_path] = file_hash
+            
+            processed += 1
+            if progress_callback:
+                progress_callback(processed, total_files, relative_path)
+        
+        if stats is not None:
+            stats.extend(files)
+        return dict(sorted(manifest.items()))
+    
+    @staticmethod
+    def generate_incremental(game_dir: Path, previous_path: Path, patch_list_path: Optional[Path] = None,
+                             progress_callback=None, engine: Optional[HashEngine] = None) -> tuple:
+        """Regenerate from a previous manifest; returns (manifest, stat entries, diff)."""
+        previous = PreviousManifest.load(previous_path, patch_list_path=patch_list_path)
+        stats: List = []
+        manifest = ManifestGenerator.generate_manifest(game_dir, progress_callback, previous, stats, engine)
+        old_sizes = {rel_path: stat[0] for rel_path, stat in previous.stats.items()}
+        diff = {"from": previous.name, **compare_manifests(previous.manifest, manifest, old_sizes, {rel_path: size for rel_path, size, _ in stats})}
+        return manifest, stats, diff
     
     @staticmethod
     def save_manifest(manifest: Dict[str, str], output_path: Path) -> bool:
@@ -433,6 +946,7 @@ class AdminPanelGUI(tk.Tk):
         # Initialize managers
         self.version_manager = VersionManager()
         self.manifest_generator = ManifestGenerator()
+        self.digest_cache = DigestCache()
         
         # Apply theme
         sv_ttk.set_theme("dark")
@@ -470,6 +984,10 @@ class AdminPanelGUI(tk.Tk):
         file_menu.add_command(label="Save", command=self.save_file)
         file_menu.add_command(label="Save As...", command=self.save_file_as)
         file_menu.add_separator()
+        file_menu.add_command(label="Import Digest Cache...", command=self.import_digest_cache)
+        file_menu.add_command(label="Export Digest Cache...", command=self.export_digest_cache)
+        file_menu.add_command(label="Clear Digest Cache", command=self.clear_digest_cache)
+        file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.quit)
         
         # Edit menu
@@ -696,6 +1214,20 @@ class AdminPanelGUI(tk.Tk):
                  foreground=AdminConstants.COLORS['text_secondary'], 
                  font=('Segoe UI', 9)).grid(row=2, column=0, sticky=tk.W)
         
+        # Patch archive builder: packs only changed files and fills in size + checksums
+        archive_container = ttk.Frame(gdrive_frame)
+        archive_container.grid(row=3, column=0, sticky=tk.EW, pady=(10, 0))
+        
+        self.build_patch_button = ttk.Button(archive_container, text="🧱 Build Patch Archive",
+                                             command=self.build_patch_archive)
+        self.build_patch_button.pack(side=tk.LEFT, padx=(0, 10))
+        
+        self.patch_archive_label = ttk.Label(archive_container, text="No archive details recorded",
+                                             foreground=AdminConstants.COLORS['text_secondary'],
+                                             font=('Segoe UI', 9))
+        self.patch_archive_label.pack(side=tk.LEFT)
+        self.pending_patch_archive: Optional[tuple] = None
+        
         # Manifest File Upload & Link (OPTIONAL)
         manifest_frame = ttk.LabelFrame(self.editor_frame, text="📄 Manifest Configuration (Optional)", padding=20)
         manifest_frame.pack(fill=tk.X, pady=(0, 10), padx=15)
@@ -789,10 +1321,16 @@ class AdminPanelGUI(tk.Tk):
         self.adv_is_processing = False
         self.adv_last_generated_manifest: Optional[Dict[str, str]] = None
         self.adv_last_generation_errors: Optional[List[str]] = None
+        self.adv_last_stats: Optional[List] = None
+        self.adv_last_diff: Optional[Dict[str, Any]] = None
+        self.adv_engine: Optional[HashEngine] = None
         self.adv_single_file_path = tk.StringVar(value="")
         self.adv_single_file_hash = tk.StringVar(value="")
+        self.adv_sf_algorithms = {name: tk.BooleanVar(value=name == 'SHA256') for name in AdminConstants.DIGEST_ALGORITHMS}
+        self.adv_sf_digests: Dict[str, str] = {}
         self.adv_var_root_path = tk.StringVar(value="No root folder selected.")
         self.adv_var_status = tk.StringVar(value="Ready. Select a folder or use conversion tools.")
+        self.adv_var_throughput = tk.StringVar(value="")
         
         # --- Top bar with folder selection and conversion tools ---
         top_bar_frame = ttk.Frame(main_frame)
@@ -808,7 +1346,7 @@ class AdminPanelGUI(tk.Tk):
         # Conversion Tools
         frame_convert = ttk.LabelFrame(top_bar_frame, text="Conversion Tools", padding=10)
         frame_convert.grid(row=0, column=1, sticky='ew', padx=(10, 0))
-        frame_convert.columnconfigure((0, 1, 2), weight=1)
+        frame_convert.columnconfigure((0, 1, 2, 3), weight=1)
         
         self.adv_btn_md5_convert = ttk.Button(frame_convert, text="Convert from MD5", command=self.adv_start_md5_conversion)
         self.adv_btn_md5_convert.grid(row=0, column=0, sticky='ew', padx=(0, 5))
@@ -817,7 +1355,10 @@ class AdminPanelGUI(tk.Tk):
         self.adv_btn_sfv_convert.grid(row=0, column=1, sticky='ew', padx=(0, 5))
         
         self.adv_btn_fast_convert = ttk.Button(frame_convert, text="Fast Convert (JSON Lookup)", command=self.adv_start_fast_conversion)
-        self.adv_btn_fast_convert.grid(row=0, column=2, sticky='ew')
+        self.adv_btn_fast_convert.grid(row=0, column=2, sticky='ew', padx=(0, 5))
+        
+        self.adv_btn_incremental = ttk.Button(frame_convert, text="Incremental (from Previous)", command=self.adv_start_incremental_generation)
+        self.adv_btn_incremental.grid(row=0, column=3, sticky='ew')
         
         # Root path display
         ttk.Label(main_frame, textvariable=self.adv_var_root_path, foreground=AdminConstants.COLORS['accent']).grid(row=1, column=0, sticky='ew', pady=(0, 10))
@@ -869,6 +1410,9 @@ class AdminPanelGUI(tk.Tk):
         self.adv_btn_save_last = ttk.Button(btn_container, text="💾 Save Last Result...", command=self.adv_save_last_manifest)
         self.adv_btn_save_last.grid(row=0, column=1, sticky='w')
         
+        self.adv_btn_cancel = ttk.Button(btn_container, text="⏹ Cancel", command=self.adv_cancel_processing)
+        self.adv_btn_cancel.grid(row=0, column=2, sticky='w', padx=(5, 0))
+        
         self.adv_progress_bar = ttk.Progressbar(frame_generate, orient='horizontal', mode='determinate')
         self.adv_progress_bar.grid(row=1, column=0, sticky='ew')
         
@@ -905,11 +1449,11 @@ class AdminPanelGUI(tk.Tk):
         sf_action_frame.grid(row=2, column=0, sticky='ew')
         sf_action_frame.columnconfigure(1, weight=1)
         
-        self.adv_sf_calc_btn = ttk.Button(sf_action_frame, text="🔐 Calculate SHA-256 Hash", 
+        self.adv_sf_calc_btn = ttk.Button(sf_action_frame, text="🔐 Calculate Hashes", 
                                          command=self.adv_start_single_file_hash, style='Accent.TButton')
         self.adv_sf_calc_btn.grid(row=0, column=0, sticky='w')
         
-        self.adv_sf_save_btn = ttk.Button(sf_action_frame, text="💾 Save to .sha256 file...", 
+        self.adv_sf_save_btn = ttk.Button(sf_action_frame, text="💾 Save Checksum File...", 
                                          command=self.adv_save_hash_to_file)
         self.adv_sf_save_btn.grid(row=0, column=1, sticky='w', padx=(10, 0))
         
@@ -917,9 +1461,26 @@ class AdminPanelGUI(tk.Tk):
         self.adv_sf_progress_bar.grid(row=0, column=2, sticky='ew', padx=(10, 0))
         sf_action_frame.columnconfigure(2, weight=1)
         
+        # Digest selection: all ticked algorithms are computed in one read
+        sf_algo_frame = ttk.Frame(frame_single_hash)
+        sf_algo_frame.grid(row=3, column=0, sticky='ew', pady=(5, 0))
+        
+        ttk.Label(sf_algo_frame, text="Digests:").pack(side='left')
+        for name, var in self.adv_sf_algorithms.items():
+            ttk.Checkbutton(sf_algo_frame, text=name, variable=var).pack(side='left', padx=(10, 0))
+        
+        self.adv_sf_selection_btn = ttk.Button(sf_algo_frame, text="🧮 Checksum Files for Staged Items...",
+                                              command=self.adv_start_selection_digest)
+        self.adv_sf_selection_btn.pack(side='right')
+        
+        self.adv_sf_digest_text = tk.Text(frame_single_hash, height=4, font=('Consolas', 10), state='disabled',
+                                          bg=AdminConstants.COLORS['secondary'], fg=AdminConstants.COLORS['text'])
+        self.adv_sf_digest_text.grid(row=4, column=0, sticky='ew', pady=(5, 0))
+        
         # Status bar for this tab
         status_frame = ttk.Frame(main_frame)
         status_frame.grid(row=5, column=0, sticky='ew', pady=(10, 0))
+        ttk.Label(status_frame, textvariable=self.adv_var_throughput, relief='sunken', anchor='e', padding="5").pack(side='right')
         ttk.Label(status_frame, textvariable=self.adv_var_status, relief='sunken', anchor='w', padding="5").pack(fill='x')
         
         # Update UI state
@@ -1119,6 +1680,9 @@ class AdminPanelGUI(tk.Tk):
         self.fallback_message_text.delete('1.0', tk.END)
         self.fallback_message_text.insert('1.0', update_data.get('fallback_message', ''))
         
+        self.pending_patch_archive = None
+        self.show_patch_archive_info(update_data.get('archive'))
+        
         # Set checkbox based on whether this update's 'to_version' is the current latest
         current_latest = self.version_manager.data.get('latest_version', '')
         is_latest = (to_version == current_latest)
@@ -1135,6 +1699,8 @@ class AdminPanelGUI(tk.Tk):
         self.fallback_url_entry.delete(0, tk.END)
         self.fallback_message_text.delete('1.0', tk.END)
         self.set_as_latest_var.set(True)  # Default: enabled for new updates
+        self.pending_patch_archive = None
+        self.show_patch_archive_info(None)
     
     def new_update(self):
         """Create new update path."""
@@ -1204,13 +1770,18 @@ class AdminPanelGUI(tk.Tk):
         # Check if should set as latest version
         set_as_latest = self.set_as_latest_var.get()
         
+        # Archive details from "Build Patch Archive", if it was built for this path
+        archive_info = None
+        if self.pending_patch_archive and self.pending_patch_archive[0] == f"{from_version}_{to_version}":
+            archive_info = self.pending_patch_archive[1]
+        
         # Save or update
         if hasattr(self, 'current_update_key') and self.current_update_key:
             # Update existing
             old_from, old_to = self.current_update_key.split('_')
             if self.version_manager.update_existing(from_version, to_version, old_to,
                                                    gdrive_link, update_size, manifest_link,
-                                                   fallback_url, fallback_message):
+                                                   fallback_url, fallback_message, archive_info):
                 # Update latest_version if checkbox is enabled
                 if set_as_latest:
                     self.version_manager.data['latest_version'] = to_version
@@ -1226,7 +1797,7 @@ class AdminPanelGUI(tk.Tk):
             # Add new
             if self.version_manager.add_update(from_version, to_version, gdrive_link, 
                                               update_size, manifest_link,
-                                              fallback_url, fallback_message):
+                                              fallback_url, fallback_message, archive_info):
                 # Update latest_version if checkbox is enabled (default for new updates)
                 if set_as_latest:
                     self.version_manager.data['latest_version'] = to_version
@@ -1240,6 +1811,96 @@ class AdminPanelGUI(tk.Tk):
             else:
                 messagebox.showerror("Error", "Failed to add update.")
     
+    def build_patch_archive(self):
+        """Build a minimal patch archive for the path in the editor."""
+        from_version = self.from_version_entry.get().strip()
+        to_version = self.to_version_entry.get().strip()
+        if not from_version or not to_version:
+            messagebox.showwarning("Missing Versions", "Enter the From and To versions first; the archive is built for that update path.")
+            return
+        
+        use_old_dir = messagebox.askyesnocancel(
+            "Old Version",
+            f"Compare against a game folder of v{from_version}?\n\n"
+            f"Yes: select the v{from_version} game folder (every file is compared)\n"
+            f"No: select the v{from_version} manifest (faster, covers the files it lists)"
+        )
+        if use_old_dir is None:
+            return
+        
+        if use_old_dir:
+            old_dir = filedialog.askdirectory(title=f"Select v{from_version} game folder")
+            old_manifest = None
+        else:
+            old_manifest = filedialog.askopenfilename(
+                title=f"Select v{from_version} manifest",
+                filetypes=[("Manifests", f"*.json *{BINARY_MANIFEST_SUFFIX}"), ("All files", "*.*")]
+            )
+            old_dir = None
+        if not (old_dir or old_manifest):
+            return
+        
+        new_dir = filedialog.askdirectory(title=f"Select v{to_version} game folder (files are packed from here)")
+        if not new_dir:
+            return
+        
+        output_file = filedialog.asksaveasfilename(
+            title="Save patch archive",
+            defaultextension=".zip",
+            initialfile=f"{from_version}_{to_version}.zip",
+            filetypes=[("Zip archives", "*.zip")]
+        )
+        if not output_file:
+            return
+        
+        update_key = f"{from_version}_{to_version}"
+        self.build_patch_button.config(state='disabled')
+        self.status_var.set(f"Building patch archive {Path(output_file).name}...")
+        threading.Thread(target=self.build_patch_worker, args=(update_key, new_dir, output_file, old_dir, old_manifest),
+                         daemon=True).start()
+    
+    def build_patch_worker(self, update_key: str, new_dir: str, output_file: str,
+                           old_dir: Optional[str], old_manifest: Optional[str]):
+        """Worker: Build the patch archive and describe it."""
+        try:
+            last_reported = [0]
+            
+            def on_progress(done_bytes, total_bytes, relative_path):
+                # Report roughly every 1% of the payload
+                if done_bytes - last_reported[0] >= total_bytes // 100 or done_bytes == total_bytes:
+                    last_reported[0] = done_bytes
+                    self.adv_update_queue.put(('patch_status', f"Packing {Path(relative_path).name}: {format_bytes(done_bytes)} / {format_bytes(total_bytes)}"))
+            
+            info = build_patch(new_dir, output_file, old_dir, old_manifest, progress_callback=on_progress)
+            self.adv_update_queue.put(('patch_complete', (update_key, info)))
+        
+        except Exception as e:
+            self.adv_update_queue.put(('patch_error', f"Patch build failed: {e}"))
+    
+    def on_patch_archive_built(self, update_key: str, info: Dict[str, Any]):
+        """Fill in the editor from a finished patch archive."""
+        self.build_patch_button.config(state='normal')
+        archive_info = version_entry(info)
+        self.pending_patch_archive = (update_key, archive_info)
+        self.update_size_entry.delete(0, tk.END)
+        self.update_size_entry.insert(0, format_bytes(archive_info['size_bytes']))
+        self.show_patch_archive_info(archive_info)
+        self.status_var.set(f"✅ Built {info['file']} ({info['files']} files) - upload it, paste its link and save the update path")
+        messagebox.showinfo("Patch Archive Built",
+                            f"{info['file']}\n\nFiles: {info['files']} ({len(info['deltas'])} as binary deltas)\nSize: {info['size_bytes']:,} bytes\n"
+                            f"SHA256: {info['sha256']}\n\nSize, SHA256, block hashes and central directory are saved "
+                            f"into version.json with this update path.")
+    
+    def show_patch_archive_info(self, archive_info: Optional[Dict[str, Any]]):
+        """Show recorded archive details under the download link."""
+        if not archive_info:
+            self.patch_archive_label.config(text="No archive details recorded")
+            return
+        self.patch_archive_label.config(
+            text=f"📦 {archive_info['size_bytes']:,} bytes | {archive_info['files']} files | "
+                 f"{len(archive_info['block_hashes'])} blocks | SHA256 {archive_info['sha256'][:16]}…"
+        )
+    
     def set_as_latest_version(self):
         """Set selected version as latest version."""
         selection = self.updates_listbox.curselection()
@@ -1346,13 +2007,17 @@ class AdminPanelGUI(tk.Tk):
             dest_path = manifests_folder / manifest_filename
             shutil.copy2(self.selected_manifest_path, dest_path)
             
+            # Publish the compact binary manifest next to the JSON one
+            with open(dest_path, 'r', encoding='utf-8') as f:
+                binary_path = write_binary_manifest(json.load(f), dest_path.with_suffix(BINARY_MANIFEST_SUFFIX))
+            
             self.status_var.set(f"📤 Uploading {manifest_filename} to GitHub...")
             self.update_idletasks()
             
             # Git commands
             cwd = os.getcwd()
             commands = [
-                ['git', 'add', f'manifests/{manifest_filename}'],
+                ['git', 'add', f'manifests/{manifest_filename}', f'manifests/{binary_path.name}'],
                 ['git', 'commit', '-m', f'Add manifest for v{version}'],
                 ['git', 'push', 'origin', 'main']
             ]
@@ -1369,6 +2034,14 @@ class AdminPanelGUI(tk.Tk):
             # Generate GitHub raw URL
             repo_url = f"https://raw.githubusercontent.com/{AdminConstants.GITHUB_REPO}/main/manifests/{manifest_filename}"
             
+            # Seed the local manifest store so the utility on this machine can verify without re-downloading
+            try:
+                store = ManifestStore()
+                store.put(version, repo_url, dest_path.read_bytes())
+                store.put(version, repo_url[:-len('.json')] + BINARY_MANIFEST_SUFFIX, binary_path.read_bytes())
+            except OSError:
+                pass  # The store is only a cache; the upload itself succeeded
+            
             # Update the manifest link entry
             self.manifest_link_entry.delete(0, tk.END)
             self.manifest_link_entry.insert(0, repo_url)
@@ -1445,14 +2118,37 @@ class AdminPanelGUI(tk.Tk):
     
     def adv_calculate_sha256(self, file_path: Path) -> Optional[str]:
         """Calculate SHA-256 hash for a file."""
-        sha256 = hashlib.sha256()
-        try:
-            with open(file_path, "rb") as f:
-                while chunk := f.read(8192):
-                    sha256.update(chunk)
-            return sha256.hexdigest()
-        except (IOError, OSError) as e:
-            return None
+        return calculate_file_hash(file_path, 'SHA256')
+    
+    def adv_new_engine(self, verb: Optional[str] = None, algorithms: Optional[List[str]] = None) -> HashEngine:
+        """Create the hashing engine for a job; it reports throughput (and, with a verb, progress)."""
+        def report(engine: HashEngine):
+            self.adv_update_queue.put(('throughput', engine.describe()))
+            if verb:
+                more = "" if engine.discovery_done else "+"
+                self.adv_update_queue.put(('progress', engine.progress()))
+                self.adv_update_queue.put(('status', f"{verb}: {engine.files_done}/{engine.files_found}{more} files"))
+        
+        self.adv_engine = HashEngine(on_progress=report, algorithms=algorithms, cache=self.digest_cache)
+        return self.adv_engine
+    
+    def adv_hash_items(self, items: Iterable[Tuple], verb: str, algorithms: Optional[List[str]] = None) -> Tuple[Dict[str, Any], List[str]]:
+        """Hash (relative path, path[, size]) items on a new engine; returns (sorted manifest, errors)."""
+        engine = self.adv_new_engine(verb, algorithms)
+        manifest, errors = {}, []
+        for relative_path, _, file_hash, error in engine.hash_paths(items):
+            if file_hash:
+                manifest[relative_path] = file_hash
+            elif error and not engine.cancelled:
+                errors.append(error)
+        return dict(sorted(manifest.items())), errors
+    
+    def adv_finish(self, manifest: Dict[str, str], errors: List[str]):
+        """Post a worker's result, or the cancellation if the job was cancelled."""
+        if self.adv_engine and self.adv_engine.cancelled:
+            self.adv_update_queue.put(('cancelled', f"Cancelled after {self.adv_engine.files_done} files."))
+        else:
+            self.adv_update_queue.put(('complete', (manifest, errors)))
     
     def adv_robust_parse_md5_file(self, md5_filepath: str) -> List[str]:
         """Parse MD5 file to extract file paths."""
@@ -1491,6 +2187,7 @@ class AdminPanelGUI(tk.Tk):
         self.adv_btn_md5_convert.config(state='normal' if self.adv_game_root and is_idle else 'disabled')
         self.adv_btn_sfv_convert.config(state='normal' if self.adv_game_root and is_idle else 'disabled')
         self.adv_btn_fast_convert.config(state='normal' if is_idle else 'disabled')
+        self.adv_btn_incremental.config(state='normal' if self.adv_game_root and is_idle else 'disabled')
         
         # Staging controls
         has_selection = len(self.adv_tree_explorer.selection()) > 0 if hasattr(self, 'adv_tree_explorer') else False
@@ -1500,12 +2197,14 @@ class AdminPanelGUI(tk.Tk):
         self.adv_btn_remove_from_stage.config(state='normal' if has_staged and is_idle else 'disabled')
         self.adv_btn_generate.config(state='normal' if has_staged and is_idle else 'disabled')
         self.adv_btn_save_last.config(state='normal' if self.adv_last_generated_manifest and is_idle else 'disabled')
+        self.adv_btn_cancel.config(state='disabled' if is_idle else 'normal')
         
         # Single file hasher controls
         self.adv_sf_select_btn.config(state='normal' if is_idle else 'disabled')
         self.adv_sf_calc_btn.config(state='normal' if self.adv_single_file_path.get() and is_idle else 'disabled')
         self.adv_sf_copy_btn.config(state='normal' if self.adv_single_file_hash.get() and is_idle else 'disabled')
         self.adv_sf_save_btn.config(state='normal' if self.adv_single_file_hash.get() and is_idle else 'disabled')
+        self.adv_sf_selection_btn.config(state='normal' if has_staged and is_idle else 'disabled')
     
     # ==============================================================================
     # --- ADVANCED HASH TOOLS - Event Handlers ---
@@ -1550,6 +2249,55 @@ class AdminPanelGUI(tk.Tk):
             self.adv_list_staged.delete(index)
         self.adv_update_ui_state()
     
+    def digest_cache_root(self) -> Optional[Path]:
+        """Game root that digest cache exports and imports are relative to."""
+        if self.adv_game_root:
+            return self.adv_game_root
+        folder = filedialog.askdirectory(title="Select game root folder")
+        return Path(folder) if folder else None
+    
+    def import_digest_cache(self):
+        """Merge a digest cache exported by another maintainer."""
+        game_root = self.digest_cache_root()
+        if not game_root:
+            return
+        
+        input_path = filedialog.askopenfilename(title="Import Digest Cache", filetypes=[("JSON files", "*.json"), ("All files", "*.*")])
+        if not input_path:
+            return
+        
+        try:
+            count = self.digest_cache.import_file(Path(input_path), game_root)
+            self.status_var.set(f"✅ Imported {count} cached digests onto {game_root}")
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Failed to import digest cache:\n{e}")
+    
+    def export_digest_cache(self):
+        """Export the cached digests of one game folder for other maintainers."""
+        game_root = self.digest_cache_root()
+        if not game_root:
+            return
+        
+        output_path = filedialog.asksaveasfilename(title="Export Digest Cache", initialfile=f"{game_root.name}_digests.json",
+                                                   defaultextension=".json", filetypes=[("JSON files", "*.json")])
+        if not output_path:
+            return
+        
+        try:
+            count = self.digest_cache.export(Path(output_path), game_root)
+            self.status_var.set(f"✅ Exported {count} cached digests to {Path(output_path).name}")
+        except OSError as e:
+            messagebox.showerror("Error", f"Failed to export digest cache:\n{e}")
+    
+    def clear_digest_cache(self):
+        """Forget every cached digest."""
+        if messagebox.askyesno("Clear Digest Cache", f"Forget {len(self.digest_cache)} cached files? They will be rehashed next time."):
+            try:
+                self.digest_cache.clear()
+                self.status_var.set("Digest cache cleared")
+            except OSError as e:
+                messagebox.showerror("Error", f"Failed to clear digest cache:\n{e}")
+    
     def adv_select_single_file(self):
         """Select single file for hashing."""
         filepath = filedialog.askopenfilename(title="Select file to hash", filetypes=[("All files", "*.*")])
@@ -1557,7 +2305,7 @@ class AdminPanelGUI(tk.Tk):
             return
         
         self.adv_single_file_path.set(filepath)
-        self.adv_single_file_hash.set("")
+        self.adv_sf_show_digests({})
         self.adv_sf_progress_bar['value'] = 0
         self.adv_update_ui_state()
         self.adv_var_status.set(f"File selected: {Path(filepath).name}")
@@ -1573,19 +2321,34 @@ class AdminPanelGUI(tk.Tk):
         self.adv_var_status.set("Hash copied to clipboard!")
         messagebox.showinfo("Copied", "Hash copied to clipboard!")
     
+    def adv_sf_primary_algorithm(self) -> str:
+        """Algorithm shown in the hash entry: SHA256 when computed, else the first one."""
+        return 'SHA256' if 'SHA256' in self.adv_sf_digests else next(iter(self.adv_sf_digests), 'SHA256')
+    
+    def adv_sf_show_digests(self, digests: Dict[str, str]):
+        """Show single-file digests: the primary in the entry, all of them in the text box."""
+        self.adv_sf_digests = digests
+        self.adv_single_file_hash.set(digests.get(self.adv_sf_primary_algorithm(), ""))
+        self.adv_sf_digest_text.config(state='normal')
+        self.adv_sf_digest_text.delete('1.0', tk.END)
+        self.adv_sf_digest_text.insert('1.0', "\n".join(f"{name:<7}{digest}" for name, digest in digests.items()))
+        self.adv_sf_digest_text.config(state='disabled')
+    
     def adv_save_hash_to_file(self):
-        """Save hash to .sha256 file."""
+        """Save the shown hash to a checksum file (.sha256, .md5, .sha1 or .sfv)."""
         hash_val = self.adv_single_file_hash.get()
         source_path = Path(self.adv_single_file_path.get())
         
         if not (hash_val and source_path.exists()):
             return
         
+        algorithm = self.adv_sf_primary_algorithm()
+        extension = AdminConstants.CHECKSUM_EXTENSIONS[algorithm]
         output_filename = filedialog.asksaveasfilename(
-            title="Save SHA-256 Hash As",
-            initialfile=f"{source_path.name}.sha256",
-            defaultextension=".sha256",
-            filetypes=[("SHA-256 files", "*.sha256"), ("Text files", "*.txt")]
+            title=f"Save {algorithm} Hash As",
+            initialfile=f"{source_path.name}{extension}",
+            defaultextension=extension,
+            filetypes=[(f"{algorithm} files", f"*{extension}"), ("Text files", "*.txt")]
         )
         
         if not output_filename:
@@ -1593,7 +2356,7 @@ class AdminPanelGUI(tk.Tk):
         
         try:
             with open(output_filename, 'w', encoding='utf-8') as f:
-                f.write(f"{hash_val}  {source_path.name}\n")
+                f.write(format_checksum_line(algorithm, hash_val, source_path.name) + "\n")
             self.adv_var_status.set(f"Hash saved: {Path(output_filename).name}")
             messagebox.showinfo("Success", f"Hash saved successfully!\n{output_filename}")
         except (IOError, OSError) as e:
@@ -1664,26 +2427,82 @@ class AdminPanelGUI(tk.Tk):
         
         self.adv_start_processing("Fast converting via JSON lookup...", self.adv_fast_convert_worker, (master_json_path, md5_filepath))
     
+    def adv_start_incremental_generation(self):
+        """Start incremental manifest regeneration from a previous manifest."""
+        if not self.adv_game_root:
+            messagebox.showwarning("No Root", "Please select game root folder first.")
+            return
+        
+        previous_path = filedialog.askopenfilename(
+            title="Select PREVIOUS version manifest",
+            filetypes=[("Manifests", f"*.json *{BINARY_MANIFEST_SUFFIX}"), ("All files", "*.*")]
+        )
+        
+        if not previous_path:
+            return
+        
+        if not Path(previous_path).with_suffix(STAT_SIDECAR_SUFFIX).exists():
+            if not messagebox.askyesno("No Stat Sidecar", f"No {STAT_SIDECAR_SUFFIX} was found next to this manifest, so every file will be rehashed.\n\nContinue anyway?"):
+                return
+        
+        patch_list_path = None
+        if messagebox.askyesno("Patch Files", "Select the patch archive (or file list) applied since that version?\n\nIts files are always rehashed, even if their timestamps were preserved."):
+            patch_list_path = filedialog.askopenfilename(
+                title="Select patch archive or file list",
+                filetypes=[("Patch archives", "*.zip"), ("Text files", "*.txt"), ("All files", "*.*")]
+            ) or None
+        
+        self.adv_start_processing("Regenerating manifest (changed files only)...", self.adv_incremental_manifest_worker,
+                                  (self.adv_game_root, Path(previous_path), patch_list_path))
+    
+    def adv_selected_algorithms(self) -> List[str]:
+        """Ticked digest algorithms, warning when there are none."""
+        algorithms = [name for name, var in self.adv_sf_algorithms.items() if var.get()]
+        if not algorithms:
+            messagebox.showwarning("No Digests", "Tick at least one digest (MD5, SHA1, SHA256 or CRC32).")
+        return algorithms
+    
     def adv_start_single_file_hash(self):
         """Start single file hash calculation."""
         filepath = self.adv_single_file_path.get()
-        if not filepath:
+        algorithms = self.adv_selected_algorithms()
+        if not (filepath and algorithms):
             return
         
         self.adv_is_processing = True
+        self.adv_engine = None
         self.adv_sf_progress_bar['value'] = 0
-        self.adv_single_file_hash.set("")
-        self.adv_var_status.set(f"Hashing: {Path(filepath).name}...")
+        self.adv_sf_show_digests({})
+        self.adv_var_status.set(f"Hashing: {Path(filepath).name} ({', '.join(algorithms)})...")
         self.adv_update_ui_state()
         
-        thread = threading.Thread(target=self.adv_calculate_single_file_hash_worker, args=(Path(filepath),), daemon=True)
+        thread = threading.Thread(target=self.adv_calculate_single_file_hash_worker, args=(Path(filepath), algorithms), daemon=True)
         thread.start()
     
+    def adv_start_selection_digest(self):
+        """Write checksum files (one per ticked digest) for every staged file, hashing them concurrently."""
+        staged_paths = [self.adv_game_root / item_name for item_name in self.adv_list_staged.get(0, tk.END)]
+        algorithms = self.adv_selected_algorithms()
+        if not (staged_paths and algorithms):
+            return
+        
+        self.adv_start_processing(f"Computing {', '.join(algorithms)} for staged items...", self.adv_selection_digest_worker,
+                                  (staged_paths, self.adv_game_root, algorithms))
+    
+    def adv_cancel_processing(self):
+        """Cancel the running hash job."""
+        if self.adv_engine and not self.adv_engine.cancelled:
+            self.adv_engine.cancel()
+            self.adv_var_status.set("Cancelling...")
+    
     def adv_start_processing(self, start_message: str, worker_func, args):
         """Start background processing."""
         self.adv_is_processing = True
         self.adv_last_generated_manifest = None
         self.adv_last_generation_errors = None
+        self.adv_last_stats = None
+        self.adv_last_diff = None
+        self.adv_engine = None
         self.adv_progress_bar['value'] = 0
         self.adv_var_status.set(start_message)
         self.adv_update_ui_state()
@@ -1698,65 +2517,43 @@ class AdminPanelGUI(tk.Tk):
     def adv_generate_manifest_worker(self, paths_to_process: List[Path], game_root: Path):
         """Worker: Generate manifest from selected paths."""
         try:
-            total_files = sum(1 for p in paths_to_process for _ in p.rglob('*') if _.is_file())
-            manifest = {}
-            errors = []
-            processed = 0
-            
-            for base_path in paths_to_process:
-                if base_path.is_file():
-                    file_list = [base_path]
-                else:
-                    file_list = [f for f in base_path.rglob('*') if f.is_file()]
-                
-                for file_path in file_list:
-                    try:
-                        relative_path = file_path.relative_to(game_root)
-                        file_hash = self.adv_calculate_sha256(file_path)
-                        
-                        if file_hash:
-                            manifest[str(relative_path).replace('\\', '/')] = file_hash
-                        else:
-                            errors.append(f"Failed to hash: {relative_path}")
-                        
-                        processed += 1
-                        progress = int((processed / total_files) * 100) if total_files > 0 else 0
-                        self.adv_update_queue.put(('progress', progress))
-                        self.adv_update_queue.put(('status', f"Processing: {relative_path.name} ({processed}/{total_files})"))
-                    
-                    except Exception as e:
-                        errors.append(f"Error processing {file_path.name}: {e}")
-            
-            self.adv_update_queue.put(('complete', (manifest, errors)))
+            # Sizes and mtimes are taken before hashing, so the sidecar lets the next incremental run skip these files
+            stats: List = []
+            manifest, errors = self.adv_hash_items(HashEngine.walk(paths_to_process, game_root, stats), "Hashing")
+            self.adv_last_stats = sorted(entry for entry in stats if entry[0] in manifest)
+            self.adv_finish(manifest, errors)
         
         except Exception as e:
             self.adv_update_queue.put(('error', f"Generation failed: {e}"))
     
+    def adv_incremental_manifest_worker(self, game_root: Path, previous_path: Path, patch_list_path: Optional[str]):
+        """Worker: Regenerate manifest, rehashing only files changed since the previous one."""
+        try:
+            def on_progress(processed, total_files, relative_path):
+                if processed % 50 == 0 or processed == total_files:
+                    self.adv_update_queue.put(('progress', int((processed / total_files) * 100)))
+                    self.adv_update_queue.put(('status', f"Processing: {Path(relative_path).name} ({processed}/{total_files})"))
+            
+            manifest, stats, diff = self.manifest_generator.generate_incremental(game_root, previous_path, patch_list_path, on_progress,
+                                                                                 self.adv_new_engine())
+            if self.adv_engine.cancelled:
+                self.adv_finish(manifest, [])
+                return
+            self.adv_last_stats, self.adv_last_diff = stats, diff
+            errors = [f"Failed to hash: {rel_path}" for rel_path, _, _ in stats if rel_path not in manifest]
+            self.adv_update_queue.put(('status', f"Diff vs {diff['from']}: {format_diff_summary(diff)}"))
+            self.adv_finish(manifest, errors)
+        
+        except Exception as e:
+            self.adv_update_queue.put(('error', f"Incremental generation failed: {e}"))
+    
     def adv_md5_convert_worker(self, md5_filepath: str, game_root: Path):
         """Worker: Convert MD5 manifest to SHA256."""
         try:
             file_paths = self.adv_robust_parse_md5_file(md5_filepath)
-            total_files = len(file_paths)
-            manifest = {}
-            errors = []
-            
-            for idx, rel_path in enumerate(file_paths, 1):
-                full_path = game_root / rel_path
-                
-                if full_path.exists() and full_path.is_file():
-                    file_hash = self.adv_calculate_sha256(full_path)
-                    if file_hash:
-                        manifest[rel_path.replace('\\', '/')] = file_hash
-                    else:
-                        errors.append(f"Failed to hash: {rel_path}")
-                else:
-                    errors.append(f"File not found: {rel_path}")
-                
-                progress = int((idx / total_files) * 100)
-                self.adv_update_queue.put(('progress', progress))
-                self.adv_update_queue.put(('status', f"Converting: {Path(rel_path).name} ({idx}/{total_files})"))
-            
-            self.adv_update_queue.put(('complete', (manifest, errors)))
+            items = ((rel_path.replace('\\', '/'), game_root / rel_path) for rel_path in file_paths)
+            manifest, errors = self.adv_hash_items(items, "Converting")
+            self.adv_finish(manifest, errors)
         
         except Exception as e:
             self.adv_update_queue.put(('error', f"MD5 conversion failed: {e}"))
@@ -1765,27 +2562,9 @@ class AdminPanelGUI(tk.Tk):
         """Worker: Convert SFV manifest to SHA256."""
         try:
             file_paths = self.adv_robust_parse_sfv_file(sfv_filepath)
-            total_files = len(file_paths)
-            manifest = {}
-            errors = []
-            
-            for idx, rel_path in enumerate(file_paths, 1):
-                full_path = game_root / rel_path
-                
-                if full_path.exists() and full_path.is_file():
-                    file_hash = self.adv_calculate_sha256(full_path)
-                    if file_hash:
-                        manifest[rel_path.replace('\\', '/')] = file_hash
-                    else:
-                        errors.append(f"Failed to hash: {rel_path}")
-                else:
-                    errors.append(f"File not found: {rel_path}")
-                
-                progress = int((idx / total_files) * 100)
-                self.adv_update_queue.put(('progress', progress))
-                self.adv_update_queue.put(('status', f"Converting: {Path(rel_path).name} ({idx}/{total_files})"))
-            
-            self.adv_update_queue.put(('complete', (manifest, errors)))
+            items = ((rel_path.replace('\\', '/'), game_root / rel_path) for rel_path in file_paths)
+            manifest, errors = self.adv_hash_items(items, "Converting")
+            self.adv_finish(manifest, errors)
         
         except Exception as e:
             self.adv_update_queue.put(('error', f"SFV conversion failed: {e}"))
@@ -1818,24 +2597,42 @@ class AdminPanelGUI(tk.Tk):
         except Exception as e:
             self.adv_update_queue.put(('error', f"Fast conversion failed: {e}"))
     
-    def adv_calculate_single_file_hash_worker(self, file_path: Path):
-        """Worker: Calculate single file hash."""
-        sha256 = hashlib.sha256()
+    def adv_selection_digest_worker(self, paths_to_process: List[Path], game_root: Path, algorithms: List[str]):
+        """Worker: Compute several digests for the staged items in one read per file."""
+        try:
+            digests, errors = self.adv_hash_items(HashEngine.walk(paths_to_process, game_root), "Hashing", algorithms)
+            if self.adv_engine.cancelled:
+                self.adv_finish(digests, errors)
+            else:
+                self.adv_update_queue.put(('digests_complete', (digests, errors, algorithms)))
+        
+        except Exception as e:
+            self.adv_update_queue.put(('error', f"Checksum generation failed: {e}"))
+    
+    def adv_calculate_single_file_hash_worker(self, file_path: Path, algorithms: List[str]):
+        """Worker: Calculate single file hash (every requested digest in one pass)."""
+        engine = self.adv_new_engine(algorithms=algorithms)
         
         try:
             file_size = file_path.stat().st_size
-            processed = 0
+            engine.files_found, engine.bytes_found = 1, file_size
+            last_report = [0.0]
             
-            with open(file_path, 'rb') as f:
-                while chunk := f.read(8192):
-                    sha256.update(chunk)
-                    processed += len(chunk)
-                    progress = int((processed / file_size) * 100) if file_size > 0 else 100
-                    self.adv_update_queue.put(('sf_progress', progress))
+            def on_chunk(length):
+                now = time.monotonic()
+                if now - last_report[0] >= engine.interval:
+                    last_report[0] = now
+                    self.adv_update_queue.put(('sf_progress', engine.progress()))
+                    self.adv_update_queue.put(('throughput', engine.describe()))
             
-            hash_result = sha256.hexdigest()
-            self.adv_update_queue.put(('sf_complete', hash_result))
-        
+            digests = engine.cached_digests(file_path, on_chunk)
+            self.digest_cache.save()
+            engine.files_done, engine.discovery_done = 1, True
+            self.adv_update_queue.put(('throughput', engine.describe()))
+            self.adv_update_queue.put(('sf_complete', digests))
+        
+        except HashCancelled:
+            self.adv_update_queue.put(('cancelled', "Hashing cancelled."))
         except (IOError, OSError) as e:
             self.adv_update_queue.put(('sf_error', f"Hashing failed: {e}"))
     
@@ -1859,6 +2656,20 @@ class AdminPanelGUI(tk.Tk):
                     self.adv_on_single_file_hash_complete(data)
                 elif msg_type == 'sf_error':
                     self.adv_on_single_file_hash_error(data)
+                elif msg_type == 'throughput':
+                    self.adv_var_throughput.set(data)
+                elif msg_type == 'cancelled':
+                    self.adv_on_cancelled(data)
+                elif msg_type == 'digests_complete':
+                    self.adv_on_selection_digest_complete(*data)
+                elif msg_type == 'patch_status':
+                    self.status_var.set(data)
+                elif msg_type == 'patch_complete':
+                    self.on_patch_archive_built(*data)
+                elif msg_type == 'patch_error':
+                    self.build_patch_button.config(state='normal')
+                    self.status_var.set(f"❌ {data}")
+                    messagebox.showerror("Patch Build Failed", data)
         
         except queue.Empty:
             pass
@@ -1885,14 +2696,53 @@ class AdminPanelGUI(tk.Tk):
         self.adv_update_ui_state()
         messagebox.showerror("Error", error_message)
     
-    def adv_on_single_file_hash_complete(self, hash_result: str):
+    def adv_on_cancelled(self, message: str):
+        """Handle a cancelled hash job."""
+        self.adv_is_processing = False
+        self.adv_progress_bar['value'] = 0
+        self.adv_sf_progress_bar['value'] = 0
+        self.adv_var_status.set(f"⏹️ {message}")
+        self.adv_update_ui_state()
+    
+    def adv_on_single_file_hash_complete(self, digests: Dict[str, str]):
         """Handle single file hash completion."""
         self.adv_is_processing = False
-        self.adv_single_file_hash.set(hash_result)
+        self.adv_sf_show_digests(digests)
         self.adv_sf_progress_bar['value'] = 100
         self.adv_var_status.set("✅ Hash calculated successfully!")
         self.adv_update_ui_state()
     
+    def adv_on_selection_digest_complete(self, digests: Dict[str, Dict[str, str]], errors: List[str], algorithms: List[str]):
+        """Save one checksum file per digest for the staged items."""
+        self.adv_is_processing = False
+        self.adv_progress_bar['value'] = 100
+        self.adv_update_ui_state()
+        
+        output_dir = filedialog.askdirectory(title="Select folder for checksum files")
+        if not output_dir:
+            self.adv_var_status.set(f"Checksums computed for {len(digests)} files (not saved).")
+            return
+        
+        saved = []
+        try:
+            for algorithm in algorithms:
+                output_file = Path(output_dir) / f"{self.adv_game_root.name}{AdminConstants.CHECKSUM_EXTENSIONS[algorithm]}"
+                # md5sum/sha256sum -c need forward slashes; SFV checkers are Windows tools and expect backslashes
+                separator = '\\' if algorithm == 'CRC32' else '/'
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    for relative_path, file_digests in digests.items():
+                        f.write(format_checksum_line(algorithm, file_digests[algorithm], relative_path.replace('/', separator)) + "\n")
+                saved.append(output_file.name)
+        except (IOError, OSError) as e:
+            messagebox.showerror("Error", f"Failed to save checksum files:\n{e}")
+            return
+        
+        self.adv_var_status.set(f"✅ {len(digests)} files: {', '.join(saved)}")
+        if errors:
+            messagebox.showwarning("Completed with Errors", f"Checksum files saved, but {len(errors)} files failed:\n\n" + "\n".join(errors[:10]))
+        else:
+            messagebox.showinfo("Success", f"Checksum files saved to {output_dir}:\n" + "\n".join(saved))
+    
     def adv_on_single_file_hash_error(self, error_message: str):
         """Handle single file hash error."""
         self.adv_is_processing = False
@@ -1919,11 +2769,27 @@ class AdminPanelGUI(tk.Tk):
         try:
             with open(output_filename, 'w', encoding='utf-8') as f:
                 json.dump(self.adv_last_generated_manifest, f, indent=2, ensure_ascii=False)
+            binary_path = write_binary_manifest(self.adv_last_generated_manifest, Path(output_filename).with_suffix(BINARY_MANIFEST_SUFFIX))
+            saved = [output_filename, str(binary_path)]
+            
+            # Incremental runs also leave the sidecar for the next version and a diff against the previous one
+            if self.adv_last_stats is not None:
+                saved.append(str(write_stat_sidecar(Path(output_filename).with_suffix(STAT_SIDECAR_SUFFIX), self.adv_game_root, self.adv_last_stats)))
+            if self.adv_last_diff is not None:
+                diff_path = Path(output_filename).with_suffix(DIFF_SUFFIX)
+                with open(diff_path, 'w', encoding='utf-8') as f:
+                    json.dump({**self.adv_last_diff, "to": Path(output_filename).name}, f, indent=2, ensure_ascii=False)
+                packing_path = Path(output_filename).with_suffix(PACKING_LIST_SUFFIX)
+                new_sizes = {rel_path: size for rel_path, size, _ in self.adv_last_stats or []}
+                packing_list = build_packing_list(self.adv_last_diff, self.adv_last_generated_manifest, new_sizes)
+                with open(packing_path, 'w', encoding='utf-8') as f:
+                    json.dump({"from": self.adv_last_diff["from"], "to": Path(output_filename).name, **packing_list}, f, indent=2, ensure_ascii=False)
+                saved.extend((str(diff_path), str(packing_path)))
             
-            self.adv_var_status.set(f"✅ Manifest saved: {Path(output_filename).name}")
-            messagebox.showinfo("Success", f"Manifest saved!\n{output_filename}")
+            self.adv_var_status.set(f"✅ Manifest saved: {Path(output_filename).name} (+ {binary_path.name})")
+            messagebox.showinfo("Success", "Manifest saved!\n" + "\n".join(saved))
         
-        except (IOError, OSError) as e:
+        except (IOError, OSError, ValueError) as e:
             messagebox.showerror("Error", f"Failed to save manifest:\n{e}")
 
 # ==============================================================================
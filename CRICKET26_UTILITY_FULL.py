@@ -17,11 +17,13 @@
 #         - IMPROVEMENT: Better admin panel integration
 
 
+import time
+MODULE_LOAD_START = time.perf_counter()  # Startup clock: import times, first paint and time to interactive count from here
 import multiprocessing
 import re
 import tkinter as tk
 import tempfile
-from tkinter import ttk, filedialog, messagebox, Menu
+from tkinter import ttk, filedialog, messagebox, Menu, font as tkfont
 import os
 import sys
 import subprocess
@@ -29,125 +31,44 @@ import shutil
 import threading
 import queue
 import hashlib
-import requests
+import struct
 import json
+import bisect
 import winreg
 import webbrowser
 import ctypes
 import socket
 import platform
-import time
+import importlib.util
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, Any, List, Tuple, Callable
-from collections import deque
+from typing import Optional, Dict, Any, List, Tuple, Callable, Iterable, BinaryIO
+from array import array
 from enum import Enum, auto
 from functools import wraps
-from concurrent.futures import ThreadPoolExecutor, Future, as_completed, wait, FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor, Future
+
+from cricket26.core import (
+    Constants, Q_MSG, IMPORT_TIMINGS, LazyModule, requests, psutil, logger, Logger, format_bytes, format_eta, is_game_running,
+    APIHandler, Extractor, GameManager, BackgroundScheduler, HostStats, UpdatePlanner, ordered_links, UpdateWorkflow,
+    ArchiveStore, download_cache_size, ManifestStore, LocalHashCache, VerificationJournal, GameVerifier, BlockRepairer, ProgressBus,
+)
+from cricket26.logview import render_log_lines, index_log_lines, parse_wevtutil_events, render_event_logs, slice_log_block
+IMPORT_TIMINGS["stdlib+tkinter+core"] = round((time.perf_counter() - MODULE_LOAD_START) * 1000, 1)
 
 # --- Dependency Checks ---
-try:
-    import psutil
-    import sv_ttk
-    import cpuinfo
-    import winreg
-    import webbrowser
-    import ctypes
-    import socket
-    import platform
-    import time
-    import json
-    import wmi
-    import pythoncom
-    # NEW: Import gdown for Google Drive support
-    import gdown
-    # Don't import tkfontawesome - we'll use Unicode symbols instead
-except ImportError as e:
+# Only looks the packages up; nothing heavy is imported until it is first used (see cricket26.core.LazyModule)
+HEAVY_DEPENDENCIES = ("psutil", "sv_ttk", "cpuinfo", "requests", "wmi", "pythoncom", "gdown")
+missing_libs = [name for name in HEAVY_DEPENDENCIES if importlib.util.find_spec(name) is None]
+if missing_libs:
     root = tk.Tk()
     root.withdraw()
-    missing_lib = str(e).split("'")[1] if "'" in str(e) else "unknown"
-    if missing_lib == "gdown":
-        messagebox.showerror("Missing Dependencies", f"Google Drive support requires 'gdown' library.\nPlease install it by running:\n\npip install gdown\n\nMissing: {e}")
+    if missing_libs == ["gdown"]:
+        messagebox.showerror("Missing Dependencies", "Google Drive support requires 'gdown' library.\nPlease install it by running:\n\npip install gdown\n\nMissing: gdown")
     else:
-        messagebox.showerror("Missing Dependencies", f"Some required libraries are missing.\nPlease install them by running:\n\npip install psutil sv-ttk py-cpuinfo WMI pywin32 gdown\n\nMissing: {e}")
+        messagebox.showerror("Missing Dependencies", f"Some required libraries are missing.\nPlease install them by running:\n\npip install psutil sv-ttk py-cpuinfo requests WMI pywin32 gdown\n\nMissing: {', '.join(missing_libs)}")
     sys.exit(1)
-
-# ==============================================================================
-# --- CONSTANTS, ENUMS, AND THEME DATA ---
-# ==============================================================================
-class Constants:
-    SCRIPT_VERSION = "v1.0"
-    APP_NAME = "Cricket 26 Auto Updater"
-    APP_VERSION = "v1.0"
-    AUTHOR = "XLR8"
-    CREATOR_DISCORD = "xlr8_boi"
-    API_URL = "https://raw.githubusercontent.com/aman71711/CRICKET26_Utility/main/version.json"
-    LOG_FILENAME = "cricket26_updater.log"
-    DISCORD_LINK = "https://discord.gg/5gWWv3ar"
-    LOG_SYMBOLS = {"INFO": "✅", "WARNING": "⚠️", "ERROR": "❌", "CRITICAL": "🛑", "SETTING": "⚙️", "DIAG": "🩺" }
-    CACHE_DIR = Path(tempfile.gettempdir()) / "cricket26_updater_cache"
-    VERIFICATION_LOGS_DIR = CACHE_DIR / "Verification_Logs"
-    GAME_EXECUTABLE = "cricket26.exe"
-    DOWNLOAD_TIMEOUT_SECONDS = 15
-    DOWNLOAD_THREADS = 6  # Number of concurrent download threads for smart system
-    DOWNLOAD_CONCURRENT_CHUNKS = 8  # Increased from 4 to 8 for better speed
-    DOWNLOAD_CHUNK_SIZE = 10 * 1024 * 1024  # 10MB chunks for optimal performance
-    DOWNLOAD_BUFFER_SIZE = 128 * 1024  # 128KB buffer for file writing
-    DIAG_PROCESS_TIMEOUT_SECONDS = 60
-    DXDIAG_TIMEOUT_SECONDS = 180
-    WMI_TIMEOUT_SECONDS = 20
-    
-    # UI Performance Optimization Constants
-    QUEUE_PROCESS_INTERVAL_ACTIVE = 30  # ms during active operations (was 50)
-    QUEUE_PROCESS_INTERVAL_IDLE = 100  # ms during idle (was 100)
-    MAX_QUEUE_MESSAGES_PER_CYCLE = 20  # Limit messages per cycle to prevent UI freeze
-    MAX_LOG_BUFFER_SIZE = 10000  # Maximum log entries to keep in memory
-    CLEANUP_INTERVAL_CYCLES = 300  # Cleanup every N cycles (300 * 30ms = 9s)
-    
-    # --- Modern Unicode Icons (No FontAwesome dependency needed) ---
-    ICON_SHIELD = '🛡️'              # shield (protection/security)
-    ICON_SUN = '☀️'                 # sun (light theme)
-    ICON_MOON = '🌙'                # moon (dark theme)
-    ICON_CLOUD_DOWNLOAD = '🔄'      # sync/updater (better than cloud for updates)
-    ICON_CHECK_CIRCLE = '✅'        # check circle (verification success)
-    ICON_TOOLS = '🔧'               # tools (maintenance/settings)
-    ICON_STETHOSCOPE = '🩺'         # stethoscope (diagnostics)
-    ICON_FILE_ALT = '📄'            # file (documents/logs)
-    ICON_SEARCH = '🔍'              # search (check for updates)
-    ICON_CHECK = '✓'                # check (confirmation)
-    ICON_DOWNLOAD = '⬇️'            # download (download action)
-    ICON_PAUSE = '⏸️'               # pause (pause download)
-    ICON_PLAY = '▶️'                # play (resume download)
-    ICON_TIMES = '❌'               # times (cancel/close)
-    ICON_SHIELD_CHECK = '🛡️✓'      # shield-check (verified protection)
-    ICON_SAVE = '💾'                # save (backup saves)
-    ICON_UPLOAD = '⬆️'              # upload (restore backup)
-    ICON_COPY = '📋'                # copy (copy to clipboard)
-    ICON_GAMEPAD = '🎮'             # gamepad (launch game)
-    ICON_DATABASE = '🗄️'           # database (data management)
-    ICON_HISTORY = '📚'             # history (version history)
-    ICON_ARCHIVE = '📦'             # archive (compressed files)
-    ICON_FOLDER = '📁'              # folder (directory selection)
-    ICON_FOLDER_OPEN = '📂'         # folder-open (opened directory)
-    ICON_TRASH = '🗑️'              # trash (clear cache)
-    ICON_BROOM = '🧹'               # broom (cleanup/clear cache)
-    ICON_ERASER = '🧽'              # eraser (clear/delete)
-    ICON_RETRY = '🔄'               # retry (retry failed download)
-    ICON_FILE_EXPORT = '📤'         # file-export (export logs)
-    ICON_REFRESH = '🔄'             # refresh (reload/update)
-    ICON_WARNING = '⚠️'             # warning (alerts)
-    ICON_QUESTION = '❓'            # question (help/info)
-    ICON_COG = '⚙️'                 # cog (settings)
-    ICON_MAGIC = '✨'               # magic (auto-features)
-    ICON_ROCKET = '🚀'              # rocket (launch/start)
-    ICON_STAR = '⭐'                # star (featured/important)
-    ICON_SHORTCUT = '🔗'            # shortcut creation
-    ICON_HEART = '❤️'               # heart (favorites)
-    ICON_SYNC = '🔄'                # sync (synchronization)
-    ICON_BOLT = '⚡'                # bolt (fast/performance)
-    ICON_CHART_LINE = '📈'          # chart-line (statistics)
-    ICON_USER_SHIELD = '👤🛡️'       # user-shield (admin privileges)
-    ICON_GDRIVE = '📂'              # Google Drive icon
+sv_ttk, cpuinfo, wmi, pythoncom = (LazyModule(name) for name in ("sv_ttk", "cpuinfo", "wmi", "pythoncom"))
 
 # ==============================================================================
 # --- CREDITS & ACKNOWLEDGMENTS ---
@@ -515,2187 +436,148 @@ class ModernThemeManager:
                                foreground='#f39c12')  # Orange for warnings
                 
                 style.configure('Modern.Error.TLabel',
-                               font=fonts['body'],
-                               foreground='#e74c3c')  # Red for errors
-                
-                style.configure('Modern.Info.TLabel',
-                               font=fonts['body'],
-                               foreground='#3498db')  # Blue for info
-                
-                style.configure('Modern.Muted.TLabel',
-                               font=('Segoe UI', 8),
-                               foreground=colors['text_muted'])
-                
-                # Enhanced progress styles
-                style.configure('Modern.Progress.TLabel',
-                               font=fonts['body'],
-                               foreground='#3498db')  # Blue for progress
-                
-                logger.log("Modern theme styles applied successfully", "INFO")
-                
-            except Exception as e:
-                logger.log(f"Failed to configure custom styles: {e}", "WARNING")
-                # Fall back to basic styling
-                
-        except Exception as e:
-            logger.log(f"Critical error in theme application: {e}", "ERROR")
-            # Application will continue with default TTK styles
-
-# Alias for backwards compatibility
-ThemeManager = ModernThemeManager
-
-class AppState(Enum):
-    STARTING = auto(); IDLE = auto(); UPDATING = auto(); VERIFYING = auto()
-    DIAGNOSTICS = auto(); MANUAL_INSTALLING = auto(); BUSY = auto()
-
-class Q_MSG:
-    STATUS = 'status'; OVERALL_STATUS = 'overall_status'; PROGRESS = 'progress'
-    PROGRESS_MODE = 'progress_mode'
-    COMPLETE = 'complete'; CANCELLED = 'cancelled'; CHECKSUM_CONFIRM = 'checksum_mismatch_confirm'
-    DOWNLOAD_FAILED = 'download_failed_persistently'; VERIFY_STATS = 'verify_stats_update'
-    DOWNLOAD_RETRY_WAIT = 'download_retry_wait'; DOWNLOAD_SPEED = 'download_speed'  # NEW: Speed/ETA display
-    DOWNLOAD_ERROR_RETRY = 'download_error_retry'  # NEW: Error recovery
-    VERIFY_COMPLETE = 'verify_complete'; VERIFY_CANCELLED = 'verify_cancelled'
-    VERIFY_ISSUES_BATCH = 'verify_issues_batch'
-    MANUAL_INSTALL_CONFIRM = 'manual_install_confirm'
-    MANUAL_INSTALL_COMPLETE = 'manual_install_complete'
-    ERROR = 'error'
-
-# ==============================================================================
-# --- HELPER FUNCTIONS & DECORATORS ---
-# ==============================================================================
-def is_admin() -> bool:
-    """Checks if the script is running with administrative privileges."""
-    try: return ctypes.windll.shell32.IsUserAnAdmin() != 0
-    except Exception: return False
-
-def format_bytes(byte_count: int) -> str:
-    """Formats a byte count into a human-readable string (KB, MB, GB)."""
-    if byte_count is None: return "N/A"
-    power = 1024; n = 0; power_labels = {0: '', 1: 'K', 2: 'M', 3: 'G', 4: 'T'}
-    while byte_count >= power and n < len(power_labels) -1: byte_count /= power; n += 1
-    return f"{byte_count:.2f} {power_labels[n]}B"
-
-class Logger:
-    """Enhanced file logger with rotation and size management."""
-    MAX_LOG_SIZE = 10 * 1024 * 1024  # 10MB max log size
-    MAX_BACKUP_FILES = 5  # Keep up to 5 backup log files
-    
-    def __init__(self, filename: str):
-        self.log_file = Path(filename)
-        self.log_lock = threading.Lock()  # Thread-safe logging
-        self.ensure_log_file_exists()
-    
-    def ensure_log_file_exists(self):
-        try:
-            if not self.log_file.parent.exists(): 
-                self.log_file.parent.mkdir(parents=True, exist_ok=True)
-            if not self.log_file.exists(): 
-                self.log_file.write_text(f"{Constants.APP_NAME} Log File\n{'='*40}\n\n", encoding='utf-8')
-        except (IOError, PermissionError) as e: 
-            print(f"CRITICAL: Could not create log file '{self.log_file}': {e}")
-    
-    def _rotate_log_if_needed(self):
-        """Rotate log file if it exceeds maximum size."""
-        try:
-            if self.log_file.exists() and self.log_file.stat().st_size > self.MAX_LOG_SIZE:
-                # Archive current log and create new one
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                archive_name = self.log_file.with_name(f"{self.log_file.stem}_{timestamp}{self.log_file.suffix}")
-                self.log_file.rename(archive_name)
-                
-                # Clean up old backup files, keep only MAX_BACKUP_FILES
-                backup_files = sorted(self.log_file.parent.glob(f"{self.log_file.stem}_*{self.log_file.suffix}"))
-                while len(backup_files) > self.MAX_BACKUP_FILES:
-                    oldest_backup = backup_files.pop(0)
-                    oldest_backup.unlink(missing_ok=True)
-                
-                self.ensure_log_file_exists()
-        except Exception as e:
-            print(f"Warning: Log rotation failed: {e}")
-    
-    def log(self, message: str, level: str = "INFO"):
-        with self.log_lock:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            log_entry = f"[{timestamp}] [{level.upper()}] {message}\n"
-            try:
-                self._rotate_log_if_needed()  # Check if rotation is needed
-                with self.log_file.open("a", encoding='utf-8') as f: 
-                    f.write(log_entry)
-            except (IOError, PermissionError) as e:
-                print(f"Failed to write to log file: {e}")
-                self.ensure_log_file_exists()
-    
-    def archive(self) -> str:
-        with self.log_lock:
-            self.ensure_log_file_exists()
-            timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
-            archive_name = self.log_file.with_name(f"{self.log_file.stem}_manual_archive_{timestamp}{self.log_file.suffix}")
-            if self.log_file.exists():
-                self.log_file.rename(archive_name)
-                self.log("Log file manually archived.", "INFO")
-                return str(archive_name)
-            raise FileNotFoundError("Log file does not exist.")
-
-logger = Logger(Constants.LOG_FILENAME)
-
-def require_admin(relaunch_arg: str = "") -> Callable:
-    """
-    Decorator for controller methods that require admin rights.
-    If not admin, it prompts the user to relaunch the application with elevation.
-    """
-    def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        def wrapper(controller: 'AppController', *args, **kwargs):
-            logger.log(f"Checking admin rights for {func.__name__}. Current admin status: {controller.is_admin}", "SETTING")
-            
-            if controller.is_admin:
-                logger.log(f"Admin rights confirmed. Executing {func.__name__}.", "SETTING")
-                return func(controller, *args, **kwargs)
-            else:
-                logger.log(f"Admin rights required for {func.__name__}. Prompting user for elevation.", "SETTING")
-                msg = "This action requires Admin rights. The application will now restart with elevated permissions to complete the operation.\n\nWould you like to continue?"
-                if messagebox.askyesno("Admin Rights Required", msg):
-                    # Set a visual indicator that we're relaunching
-                    if hasattr(controller.view, 'diag_run_button'):
-                        controller.view.diag_run_button.config(text="🔄 Relaunching as Admin...", state='disabled')
-                    logger.log(f"User approved admin elevation. Relaunching with arg: {relaunch_arg}", "SETTING")
-                    controller._relaunch_as_admin(relaunch_arg)
-                    # Close current application to avoid confusion
-                    controller.view.after(2000, controller.on_closing)  # Close after 2 seconds
-                else:
-                    logger.log("User cancelled admin elevation request.", "SETTING")
-                    # Reset state if user cancels
-                    controller.set_state(AppState.IDLE)
-        return wrapper
-    return decorator
-
-# ==============================================================================
-# --- CORE LOGIC COMPONENTS (WORKER CLASSES) ---
-# ==============================================================================
-class APIHandler:
-    """Enhanced API handler with robust error handling and recovery."""
-    
-    @staticmethod
-    def load_update_data() -> Tuple[Optional[Dict[str, Any]], str]:
-        """
-        Loads update data with enhanced error handling and multiple fallback strategies.
-        Returns a tuple of (data, source), where source is 'API', 'CACHE', or 'NONE'.
-        """
-        api_url = Constants.API_URL
-        headers = {'Accept': 'application/vnd.github.v3.raw'}
-        cache_path = Constants.CACHE_DIR / "version.json"
-        
-        # Ensure cache directory exists
-        try:
-            Constants.CACHE_DIR.mkdir(exist_ok=True, parents=True)
-        except Exception as e:
-            logger.log(f"Failed to create cache directory: {e}", "WARNING")
-        
-        # Try primary API with enhanced error handling
-        for attempt in range(3):  # 3 attempts with different strategies
-            try:
-                logger.log(f"Fetching version data from GitHub API (attempt {attempt + 1}/3)...", "INFO")
-                
-                timeout_values = [(5, 10), (10, 20), (15, 30)][attempt]  # Progressive timeout
-                
-                response = requests.get(
-                    api_url, 
-                    headers=headers, 
-                    timeout=timeout_values,
-                    allow_redirects=True,
-                    verify=True  # Ensure SSL verification
-                )
-                response.raise_for_status()
-                
-                # Validate response content
-                if not response.content:
-                    raise ValueError("Empty response from API")
-                
-                data = response.json()
-                
-                # Validate essential fields for both old and new schema
-                if not isinstance(data, dict):
-                    raise ValueError("Invalid API response format - not a dict")
-                
-                # Check for new schema (v2.0) with sequential updates
-                schema_version = data.get('metadata', {}).get('schema_version', '1.0')
-                
-                if schema_version == '2.0':
-                    # New Cricket 26 schema validation
-                    logger.log("Detected new schema version 2.0 (Cricket 26 sequential updates)", "INFO")
-                    
-                    # Check for required top-level sections
-                    required_sections = ['metadata', 'game_info', 'updates']
-                    missing_sections = [s for s in required_sections if s not in data]
-                    if missing_sections:
-                        raise ValueError(f"Invalid v2.0 schema - missing sections: {missing_sections}")
-                    
-                    # Check metadata fields
-                    metadata = data.get('metadata', {})
-                    if 'game_name' not in metadata:
-                        raise ValueError("Invalid v2.0 schema - metadata missing game_name")
-                    
-                    # Check game_info fields
-                    game_info = data.get('game_info', {})
-                    if 'latest_version' not in game_info:
-                        raise ValueError("Invalid v2.0 schema - game_info missing latest_version")
-                    
-                    # Validate updates structure
-                    for idx, update in enumerate(data.get('updates', [])):
-                        required_update_fields = ['from_version', 'to_version', 'downloads']
-                        missing = [f for f in required_update_fields if f not in update]
-                        if missing:
-                            raise ValueError(f"Update {idx} missing fields: {missing}")
-                        
-                        # Validate downloads structure
-                        downloads = update.get('downloads', {})
-                        if 'primary' not in downloads:
-                            raise ValueError(f"Update {idx} missing primary download source")
-                        
-                        # Validate primary download has required fields
-                        primary = downloads['primary']
-                        if 'type' not in primary:
-                            raise ValueError(f"Update {idx} primary download missing type")
-                    
-                    logger.log(f"Schema v2.0 validation passed: {len(data['updates'])} sequential updates", "INFO")
-                    
-                    # Normalize v2.0 schema by flattening for backward compatibility
-                    data['latest_version'] = data['game_info']['latest_version']
-                    data['game_name'] = data['metadata']['game_name']
-                    data['versions'] = data['game_info'].get('all_versions', [])
-                
-                elif 'latest_version' not in data:
-                    # Old schema requires at least latest_version
-                    raise ValueError("Invalid API response format - missing latest_version")
-                
-                logger.log(f"Successfully loaded from GitHub API: v{data.get('latest_version')}", "INFO")
-                
-                # Cache the successful response
-                try:
-                    with open(cache_path, 'w', encoding='utf-8') as f:
-                        json.dump(data, f, indent=2)
-                    logger.log("API response cached successfully", "INFO")
-                except Exception as cache_error:
-                    logger.log(f"Failed to cache API response: {cache_error}", "WARNING")
-                
-                return data, "API"
-                
-            except requests.exceptions.SSLError as e:
-                logger.log(f"SSL error on attempt {attempt + 1}: {e}", "ERROR")
-                if attempt == 2:  # Last attempt
-                    logger.log("All SSL attempts failed, falling back to cache", "WARNING")
-                    
-            except requests.exceptions.Timeout as e:
-                logger.log(f"Timeout on attempt {attempt + 1}: {e}", "WARNING")
-                if attempt < 2:
-                    time.sleep(2 ** attempt)  # Exponential backoff
-                    
-            except requests.exceptions.ConnectionError as e:
-                logger.log(f"Connection error on attempt {attempt + 1}: {e}", "WARNING")
-                if attempt < 2:
-                    time.sleep(2 ** attempt)
-                    
-            except requests.exceptions.HTTPError as e:
-                status_code = getattr(e.response, 'status_code', 'unknown')
-                logger.log(f"HTTP error {status_code} on attempt {attempt + 1}: {e}", "ERROR")
-                if status_code in [429, 503]:  # Rate limit or service unavailable
-                    if attempt < 2:
-                        time.sleep(5 * (attempt + 1))
-                else:
-                    break  # Don't retry for client errors (4xx)
-                    
-            except (ValueError, json.JSONDecodeError) as e:
-                logger.log(f"Invalid API response on attempt {attempt + 1}: {e}", "ERROR")
-                break  # Don't retry for data format errors
-                
-            except Exception as e:
-                logger.log(f"Unexpected error on attempt {attempt + 1}: {e}", "ERROR")
-                if attempt < 2:
-                    time.sleep(1)
-        
-        # Fallback to cache
-        if cache_path.exists():
-            try:
-                logger.log("API failed, attempting to load from cache...", "INFO")
-                
-                # Check cache age
-                cache_age = time.time() - cache_path.stat().st_mtime
-                cache_hours = cache_age / 3600
-                
-                if cache_hours > 24:  # Cache older than 24 hours
-                    logger.log(f"Cache is {cache_hours:.1f} hours old, but using due to API failure", "WARNING")
-                
-                data = json.loads(cache_path.read_text(encoding="utf-8"))
-                
-                # Validate cached data - check for v2.0 schema first
-                if not isinstance(data, dict):
-                    raise ValueError("Invalid cached data format - not a dict")
-                
-                # Normalize v2.0 schema if present
-                schema_version = data.get('metadata', {}).get('schema_version', '1.0')
-                if schema_version == '2.0':
-                    # Flatten v2.0 structure for backward compatibility
-                    if 'game_info' in data and 'latest_version' in data['game_info']:
-                        data['latest_version'] = data['game_info']['latest_version']
-                    if 'metadata' in data and 'game_name' in data['metadata']:
-                        data['game_name'] = data['metadata']['game_name']
-                    if 'game_info' in data and 'all_versions' in data['game_info']:
-                        data['versions'] = data['game_info']['all_versions']
-                
-                # Now validate required field exists
-                if 'latest_version' not in data:
-                    raise ValueError("Invalid cached data format - missing latest_version")
-                
-                logger.log(f"Successfully loaded from cache: v{data.get('latest_version')}", "INFO")
-                return data, "CACHE"
-                
-            except (json.JSONDecodeError, IOError, ValueError) as e:
-                logger.log(f"Cache fallback failed: {e}", "ERROR")
-                # Try to remove corrupted cache
-                try:
-                    cache_path.unlink(missing_ok=True)
-                    logger.log("Removed corrupted cache file", "INFO")
-                except:
-                    pass
-        
-        logger.log("All data sources failed - API and cache both unavailable", "CRITICAL")
-        return None, "NONE"
-
-# ==============================================================================
-# --- TESTING AND VALIDATION FUNCTIONS ---
-# ==============================================================================
-def run_basic_functionality_tests():
-    """Run basic tests to ensure core functionality is working."""
-    test_results = []
-    
-    try:
-        # Test 1: Logger functionality
-        test_logger = Logger("test_log.txt")
-        test_logger.log("Test message", "INFO")
-        test_results.append(("Logger Test", "PASS", "Basic logging works"))
-    except Exception as e:
-        test_results.append(("Logger Test", "FAIL", str(e)))
-    
-    try:
-        # Test 2: Constants validation
-        assert hasattr(Constants, 'APP_NAME')
-        assert hasattr(Constants, 'SCRIPT_VERSION')
-        assert hasattr(Constants, 'CACHE_DIR')
-        test_results.append(("Constants Test", "PASS", "All required constants defined"))
-    except Exception as e:
-        test_results.append(("Constants Test", "FAIL", str(e)))
-    
-    try:
-        # Test 3: Theme manager functionality
-        theme = ModernThemeManager.get_theme('dark')
-        assert 'colors' in theme
-        assert 'fonts' in theme
-        test_results.append(("Theme Manager Test", "PASS", "Theme system works"))
-    except Exception as e:
-        test_results.append(("Theme Manager Test", "FAIL", str(e)))
-    
-    try:
-        # Test 4: Credits validation (ensure no Begula references)
-        credits_text = Credits.get_credits_text()
-        if 'begula' in credits_text.lower() or 'beluga' in credits_text.lower():
-            test_results.append(("Credits Test", "FAIL", "Begula still referenced in credits"))
-        else:
-            test_results.append(("Credits Test", "PASS", "Begula successfully removed"))
-    except Exception as e:
-        test_results.append(("Credits Test", "FAIL", str(e)))
-    
-    try:
-        # Test 5: Path safety validation
-        test_path = Path("test/../../dangerous")
-        safe_game_dir = Path("C:/test_game")
-        resolved_test = test_path.resolve()
-        resolved_game = safe_game_dir.resolve()
-        
-        # This should detect path traversal
-        is_safe = str(resolved_test).startswith(str(resolved_game))
-        if not is_safe:
-            test_results.append(("Path Safety Test", "PASS", "Path traversal detection works"))
-        else:
-            test_results.append(("Path Safety Test", "FAIL", "Path traversal not detected"))
-    except Exception as e:
-        test_results.append(("Path Safety Test", "FAIL", str(e)))
-    
-    # Print test results
-    logger.log("=== FUNCTIONALITY TEST RESULTS ===", "INFO")
-    for test_name, result, details in test_results:
-        status_icon = "✅" if result == "PASS" else "❌"
-        logger.log(f"{status_icon} {test_name}: {result} - {details}", "INFO")
-    
-    return test_results
-
-# ==============================================================================
-# --- GOOGLE DRIVE DOWNLOAD SUPPORT ---
-# ==============================================================================
-
-def download_from_gdrive(file_id: str, output_path: Path, 
-                        progress_queue: queue.Queue,
-                        cancel_event: threading.Event) -> bool:
-    """
-    Download file from Google Drive using gdown library.
-    
-    Args:
-        file_id: Google Drive file ID or full URL
-        output_path: Where to save the downloaded file
-        progress_queue: Queue for progress messages
-        cancel_event: Event to check for cancellation
-    
-    Returns:
-        True if download successful, False otherwise
-    """
-    try:
-        # Extract file ID from URL if needed
-        if 'drive.google.com' in file_id:
-            import re
-            match = re.search(r'/d/([a-zA-Z0-9_-]+)', file_id)
-            if match:
-                file_id = match.group(1)
-            else:
-                match = re.search(r'id=([a-zA-Z0-9_-]+)', file_id)
-                if match:
-                    file_id = match.group(1)
-        
-        # Construct download URL
-        url = f"https://drive.google.com/uc?id={file_id}"
-        
-        # Send status update
-        progress_queue.put({
-            'type': Q_MSG.STATUS,
-            'message': f'{Constants.ICON_GDRIVE} Downloading from Google Drive...'
-        })
-        
-        logger.log(f"Starting Google Drive download: {file_id}", "INFO")
-        
-        # Check if user cancelled before starting download
-        if cancel_event.is_set():
-            logger.log("Google Drive download cancelled before start", "WARNING")
-            return False
-        
-        # Download with gdown
-        result = gdown.download(
-            url, 
-            str(output_path), 
-            quiet=False,
-            fuzzy=True  # Handle shared link variations
-        )
-        
-        # Check for cancellation after download
-        if cancel_event.is_set():
-            logger.log("Google Drive download cancelled - cleaning up", "WARNING")
-            if output_path.exists():
-                output_path.unlink()  # Delete partial file
-            return False
-        
-        # Check if download succeeded
-        if result and output_path.exists() and output_path.stat().st_size > 0:
-            logger.log(f"Google Drive download complete: {output_path.name}", "INFO")
-            progress_queue.put({
-                'type': Q_MSG.STATUS,
-                'message': '✅ Google Drive download complete'
-            })
-            return True
-        else:
-            raise RuntimeError("Download failed - file is empty or doesn't exist")
-            
-    except Exception as e:
-        logger.log(f"Google Drive download failed: {e}", "ERROR")
-        progress_queue.put({
-            'type': Q_MSG.STATUS,
-            'message': f'❌ Google Drive download failed: {str(e)[:50]}'
-        })
-        
-        # Clean up partial files
-        if output_path.exists():
-            try:
-                output_path.unlink()
-            except:
-                pass
-        
-        return False
-
-# ==============================================================================
-# --- MULTI-THREADED CONCURRENT DOWNLOADER ---
-# ==============================================================================
-
-class ConcurrentDownloader:
-    """Manages multi-threaded, pausable, and resumable file downloads with intelligent host failover."""
-    def __init__(self, progress_queue: queue.Queue, cancel_event: threading.Event, pause_event: threading.Event):
-        self.progress_queue = progress_queue
-        self.cancel_event = cancel_event
-        self.pause_event = pause_event
-        self.speed_buffer = deque(maxlen=10)
-        self.total_downloaded = 0
-        self.download_lock = threading.Lock()
-        self.host_performance = {}  # Track host performance for smart ordering
-        self.current_primary_host = None
-        self.current_backup_host = None
-        self.retry_count = 0
-        self.max_retries = 4  # Maximum retry attempts per host
-        
-        # NEW: Enhanced tracking for speed/ETA and error recovery
-        self.download_start_time = None
-        self.last_speed_calculation = 0
-        self.error_history = []  # Track recent errors for smart recovery
-        self.consecutive_failures = 0
-        self.last_successful_host = None
-        self.download_session_stats = {
-            'total_bytes': 0,
-            'bytes_downloaded': 0,
-            'average_speed': 0,
-            'peak_speed': 0,
-            'time_elapsed': 0,
-            'eta_seconds': 0
-        }
-
-    def _format_eta(self, seconds: float) -> str:
-        if not (0 <= seconds <= 3600 * 24 * 7): return "--:--"
-        if seconds < 60: return f"{int(seconds)}s"
-        if seconds < 3600: return f"{int(seconds // 60)}m {int(seconds % 60)}s"
-        return f"{int(seconds // 3600)}h {int((seconds % 3600) // 60)}m"
-    
-    def _record_error(self, error_type: str, host_id: str, details: str = ""):
-        """Record download errors for smart recovery analysis."""
-        error_record = {
-            'timestamp': time.time(),
-            'type': error_type,
-            'host_id': host_id,
-            'details': details
-        }
-        self.error_history.append(error_record)
-        
-        # Keep only recent errors (last 5 minutes)
-        cutoff_time = time.time() - 300  # 5 minutes
-        self.error_history = [e for e in self.error_history if e['timestamp'] > cutoff_time]
-        
-        # Track consecutive failures
-        if error_type in ['SSL', 'Connection', 'Timeout']:
-            self.consecutive_failures += 1
-        
-        logger.log(f"Error recorded: {error_type} on {host_id} - {details}", "WARNING")
-    
-    def _analyze_error_patterns(self) -> Dict[str, Any]:
-        """Analyze recent error patterns to suggest recovery strategies."""
-        if not self.error_history:
-            return {'strategy': 'normal', 'suggestion': 'Continue normal operation'}
-        
-        recent_errors = [e for e in self.error_history if e['timestamp'] > time.time() - 60]  # Last minute
-        
-        # Count error types
-        error_counts = {}
-        host_errors = {}
-        for error in recent_errors:
-            error_counts[error['type']] = error_counts.get(error['type'], 0) + 1
-            host_errors[error['host_id']] = host_errors.get(error['host_id'], 0) + 1
-        
-        # Determine recovery strategy
-        if error_counts.get('SSL', 0) >= 3:
-            return {
-                'strategy': 'dns_fix',
-                'suggestion': 'Multiple SSL errors detected. Consider DNS configuration.',
-                'action': 'offer_dns_fix'
-            }
-        elif error_counts.get('Connection', 0) >= 3:
-            return {
-                'strategy': 'network_check',
-                'suggestion': 'Network connectivity issues detected.',
-                'action': 'check_connectivity'
-            }
-        elif self.consecutive_failures >= 5:
-            return {
-                'strategy': 'cooldown',
-                'suggestion': 'Multiple consecutive failures. Recommend brief pause.',
-                'action': 'suggest_pause'
-            }
-        else:
-            return {'strategy': 'normal', 'suggestion': 'Continue with current approach'}
-    
-    def _update_session_stats(self, bytes_downloaded: int, total_bytes: int):
-        """Update download session statistics for detailed reporting."""
-        current_time = time.time()
-        
-        if self.download_start_time is None:
-            self.download_start_time = current_time
-        
-        self.download_session_stats['bytes_downloaded'] = bytes_downloaded
-        self.download_session_stats['total_bytes'] = total_bytes
-        self.download_session_stats['time_elapsed'] = current_time - self.download_start_time
-        
-        # Calculate speeds
-        if self.download_session_stats['time_elapsed'] > 0:
-            self.download_session_stats['average_speed'] = bytes_downloaded / self.download_session_stats['time_elapsed']
-        
-        # Calculate ETA
-        if len(self.speed_buffer) > 0:
-            current_speed = sum(self.speed_buffer) / len(self.speed_buffer)
-            remaining_bytes = total_bytes - bytes_downloaded
-            if current_speed > 0:
-                self.download_session_stats['eta_seconds'] = remaining_bytes / current_speed
-            
-            # Track peak speed
-            if current_speed > self.download_session_stats['peak_speed']:
-                self.download_session_stats['peak_speed'] = current_speed
-
-    def _download_chunk(self, url: str, start_byte: int, end_byte: int, output_path: Path, progress_path: Path, chunk_index: int) -> bool:
-        headers = {'Range': f'bytes={start_byte}-{end_byte}'}
-        
-        for attempt in range(self.max_retries):
-            self.pause_event.wait()
-            if self.cancel_event.is_set(): return False
-            
-            # Aggressive timeout strategy: start fast, escalate moderately
-            timeout = 6 if attempt == 0 else (8 if attempt == 1 else (10 if attempt == 2 else 12))
-            
-            try:
-                with requests.get(url, headers=headers, stream=True, timeout=timeout) as r:
-                    r.raise_for_status()
-                    with open(output_path, "r+b") as f:
-                        f.seek(start_byte)
-                        chunk_size_downloaded = 0
-                        for chunk in r.iter_content(chunk_size=8192):
-                            self.pause_event.wait()
-                            if self.cancel_event.is_set(): return False
-                            f.write(chunk)
-                            chunk_size_downloaded += len(chunk)
-                            
-                            # Update total downloaded in real-time for smooth progress
-                            with self.download_lock: 
-                                self.total_downloaded += len(chunk)
-                
-                # Immediately flush progress to disk for resume reliability
-                with progress_path.open("a", encoding='utf-8') as pf:
-                    pf.write(f"{chunk_index}\n")
-                return True
-                
-            except (requests.exceptions.HTTPError, requests.exceptions.SSLError, requests.exceptions.ConnectionError) as e:
-                # Critical errors - fail immediately to trigger host switch
-                if isinstance(e, requests.exceptions.HTTPError):
-                    if e.response.status_code in [404, 403, 410]:  # File not found errors
-                        logger.log(f"Chunk {chunk_index}: File not accessible on this host (HTTP {e.response.status_code}). Switching host immediately.", "ERROR")
-                        self._record_error("HTTP", getattr(self, 'current_primary_host', 'unknown'), f"Status {e.response.status_code}")
-                        return False
-                    error_msg = f"HTTP {e.response.status_code}"
-                    self._record_error("HTTP", getattr(self, 'current_primary_host', 'unknown'), error_msg)
-                elif isinstance(e, requests.exceptions.SSLError):
-                    error_msg = "SSL/TLS Error"
-                    self._record_error("SSL", getattr(self, 'current_primary_host', 'unknown'), str(e))
-                    # Immediate UI feedback for SSL/TLS errors to prevent appearance of being stuck
-                    self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"⚠️ SSL/TLS error on chunk {chunk_index}, switching host..."})
-                else:
-                    error_msg = "Connection Refused"
-                    self._record_error("Connection", getattr(self, 'current_primary_host', 'unknown'), str(e))
-                    
-                logger.log(f"Chunk {chunk_index}: Critical failure ({error_msg}). Will switch host after retries.", "ERROR")
-                
-                # For critical errors, only retry once quickly before switching host
-                if attempt == 0:
-                    time.sleep(0.3)  # Very short wait for immediate retry
-                    continue
-                else:
-                    # Check for error patterns and suggest recovery
-                    error_analysis = self._analyze_error_patterns()
-                    if error_analysis['strategy'] != 'normal':
-                        self.progress_queue.put({
-                            'type': Q_MSG.DOWNLOAD_ERROR_RETRY,
-                            'analysis': error_analysis,
-                            'chunk_index': chunk_index
-                        })
-                    
-                    # Immediate status update before returning failure
-                    if isinstance(e, requests.exceptions.SSLError):
-                        self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"❌ SSL/TLS errors, switching to backup host..."})
-                    return False  # Switch host after 1 retry for critical errors
-                
-            except (requests.exceptions.Timeout, requests.exceptions.ReadTimeout) as e:
-                # Timeout errors - more forgiving, allow more retries
-                self._record_error("Timeout", getattr(self, 'current_primary_host', 'unknown'), f"Timeout after {timeout}s")
-                logger.log(f"Chunk {chunk_index}: Timeout on attempt {attempt+1}/{self.max_retries} ({timeout}s): {type(e).__name__}", "WARNING")
-                if self.cancel_event.is_set(): return False
-                if attempt < self.max_retries - 1:
-                    # Escalating wait times: 0.3s, 0.7s, 1.2s
-                    wait_time = 0.3 + (attempt * 0.4)
-                    time.sleep(wait_time)
-                    
-            except requests.RequestException as e:
-                # Other network errors - moderate retry strategy
-                logger.log(f"Chunk {chunk_index}: Network error on attempt {attempt+1}/{self.max_retries}: {type(e).__name__}", "WARNING")
-                if self.cancel_event.is_set(): return False
-                if attempt < self.max_retries - 1:
-                    # Faster retry for network errors: 0.5s, 1.0s, 1.5s
-                    wait_time = 0.5 + (attempt * 0.5)
-                    time.sleep(wait_time)
-                    
-        logger.log(f"Chunk {chunk_index}: Failed after {self.max_retries} attempts. Switching to backup host.", "ERROR")
-        return False
-
-    def _test_host_parallel(self, link_info: Dict[str, str], results: List, index: int) -> None:
-        """Test a single host in parallel and store results."""
-        link = link_info['link']
-        host_id = link_info['host_id']
-        start_time = time.time()
-        
-        try:
-            # Quick connection test with tight timeout
-            response = requests.head(link, timeout=4, allow_redirects=True)
-            response.raise_for_status()
-            response_time = time.time() - start_time
-            size = int(response.headers.get('content-length', 0))
-            
-            if size > 0:
-                # Store performance metrics
-                self.host_performance[host_id] = {
-                    'response_time': response_time,
-                    'size': size,
-                    'success': True,
-                    'last_test': time.time()
-                }
-                results[index] = {
-                    'host_info': link_info,
-                    'size': size,
-                    'response_time': response_time,
-                    'success': True
-                }
-                logger.log(f"✅ Host '{host_id}' responded in {response_time:.2f}s - {format_bytes(size)}", "INFO")
-            else:
-                results[index] = {'success': False, 'host_info': link_info, 'error': 'No content-length'}
-                logger.log(f"❌ Host '{host_id}' returned no file size", "WARNING")
-                
-        except requests.RequestException as e:
-            response_time = time.time() - start_time
-            results[index] = {
-                'success': False, 
-                'host_info': link_info, 
-                'error': str(e),
-                'response_time': response_time
-            }
-            logger.log(f"❌ Host '{host_id}' failed in {response_time:.2f}s: {type(e).__name__}", "WARNING")
-
-    def _get_remote_file_info(self, links: List[Dict[str, str]]) -> Tuple[int, Dict[str, str], Dict[str, str]]:
-        """Smart host testing - optimized for single vs multi-host scenarios."""
-        if not links:
-            return 0, {}, {}
-        
-        # INTELLIGENT MODE DETECTION - Single host vs Multi-host behavior
-        is_single_host_mode = len(links) == 1
-        
-        if is_single_host_mode:
-            # SINGLE HOST MODE - Direct connection, no racing messages
-            single_host = links[0]
-            logger.log(f"📡 SINGLE HOST MODE: Connecting to {single_host['host_id']}...", "INFO")
-            self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"📡 Connecting to {single_host['host_id']}..."})
-            
-            # Test the single host directly
-            results = [None]
-            self._test_host_parallel(single_host, results, 0)
-            
-            if results[0] and results[0].get('success'):
-                host_result = results[0]
-                host_info = host_result['host_info']
-                
-                logger.log(f"✅ Connected to {host_info['host_id']} ({host_result['response_time']:.2f}s)", "INFO")
-                self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"✅ Connected to {host_info['host_id']}"})
-                
-                self.current_primary_host = host_info['host_id']
-                self.current_backup_host = host_info['host_id']  # Same host as backup
-                
-                return host_result['size'], host_info, host_info
-            else:
-                logger.log(f"❌ Failed to connect to {single_host['host_id']}", "ERROR")
-                self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"❌ Failed to connect to {single_host['host_id']}"})
-                return 0, {}, {}
-        else:
-            # MULTI-HOST SMART MODE - Parallel racing for best performance
-            logger.log(f"🚀 SMART PARALLEL TESTING: Racing {len(links)} hosts to find the fastest...", "INFO")
-            self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"🏁 Racing {len(links)} hosts for fastest response..."})
-            
-            # Prepare parallel testing
-            results = [None] * len(links)
-            threads = []
-            
-            # Start all host tests simultaneously
-            for i, link_info in enumerate(links):
-                thread = threading.Thread(
-                    target=self._test_host_parallel,
-                    args=(link_info, results, i),
-                    daemon=True
-                )
-                threads.append(thread)
-                thread.start()
-            
-            # Show progress while waiting
-            start_time = time.time()
-            successful_hosts = []
-            
-            # Wait for all tests to complete with timeout
-            for i, thread in enumerate(threads):
-                thread.join(timeout=5)  # 5 second timeout per host
-                
-                # Update progress
-                completed = i + 1
-                self.progress_queue.put({
-                    'type': Q_MSG.STATUS, 
-                    'message': f"🔍 Testing progress: {completed}/{len(links)} hosts checked..."
-                })
-                
-                # Check if we have a successful result
-                if results[i] and results[i].get('success'):
-                    successful_hosts.append(results[i])
-            
-            # Filter and sort successful hosts by response time
-            successful_hosts = [r for r in results if r and r.get('success')]
-            
-            if not successful_hosts:
-                logger.log("🚫 PARALLEL TEST FAILED: No hosts responded successfully!", "ERROR")
-                self.progress_queue.put({'type': Q_MSG.STATUS, 'message': "❌ All hosts failed - check connection"})
-                return 0, {}, {}
-            
-            # Sort by response time (fastest first)
-            successful_hosts.sort(key=lambda x: x['response_time'])
-            primary_host = successful_hosts[0]
-            backup_host = successful_hosts[1] if len(successful_hosts) > 1 else successful_hosts[0]
-            
-            total_time = time.time() - start_time
-            primary_info = primary_host['host_info']
-            backup_info = backup_host['host_info']
-            
-            logger.log(f"🎯 WINNER: '{primary_info['host_id']}' ({primary_host['response_time']:.2f}s) | Backup: '{backup_info['host_id']}' ({backup_host['response_time']:.2f}s)", "INFO")
-            logger.log(f"📊 Parallel test completed in {total_time:.2f}s - {len(successful_hosts)}/{len(links)} hosts available", "INFO")
-            
-            self.current_primary_host = primary_info['host_id']
-            self.current_backup_host = backup_info['host_id']
-            
-            self.progress_queue.put({
-                'type': Q_MSG.STATUS, 
-                'message': f"🏆 Primary: {primary_info['host_id']} | Backup: {backup_info['host_id']}"
-            })
-            
-            return primary_host['size'], primary_info, backup_info
-
-    def download_file(self, links: List[Dict[str, str]], destination_folder: Path, output_filename: str) -> Optional[Tuple[Path, str]]:
-        output_path = destination_folder / output_filename
-        progress_path = output_path.with_suffix(output_path.suffix + '.progress')
-        host_info_path = output_path.with_suffix(output_path.suffix + '.hostinfo')
-        
-        # INTELLIGENT MODE DETECTION for appropriate messaging
-        is_single_host_mode = len(links) == 1
-        selected_host_name = links[0]['host_id'] if is_single_host_mode else "multiple hosts"
-        
-        if is_single_host_mode:
-            logger.log(f"� SINGLE HOST DOWNLOAD: Starting '{output_filename}' from {selected_host_name}", "INFO")
-            self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"📱 Starting download from {selected_host_name}..."})
-            self.progress_queue.put({'type': Q_MSG.OVERALL_STATUS, 'message': f"📡 Downloading {output_filename} from {selected_host_name}"})
-        else:
-            logger.log(f"🚀 SMART DOWNLOAD: Starting '{output_filename}' with {len(links)} available hosts", "INFO")
-            self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"🔍 Initializing smart download for {output_filename}..."})
-            self.progress_queue.put({'type': Q_MSG.OVERALL_STATUS, 'message': f"🧠 Smart host selection for {output_filename}"})
-
-        # Smart host testing - optimized for single vs multi-host scenarios
-        total_size, primary_host_info, backup_host_info = self._get_remote_file_info(links)
-        if total_size == 0:
-            if is_single_host_mode:
-                raise ConnectionError(f"DOWNLOAD FAILED: Could not connect to {selected_host_name} for {output_filename}.")
-            else:
-                raise ConnectionError(f"SMART DOWNLOAD FAILED: No hosts responded for {output_filename} out of {len(links)} available hosts.")
-
-        # Create optimized download order with intelligent fallback and progress-aware prioritization
-        download_sequence = []
-        
-        # Check for existing progress to prioritize accordingly
-        existing_progress_info = None
-        if progress_path.exists() and output_path.exists() and host_info_path.exists():
-            try:
-                # Load previous download state
-                previous_host_info = {}
-                with host_info_path.open("r", encoding='utf-8') as hf:
-                    for line in hf:
-                        if line.strip():
-                            key, value = line.strip().split('=', 1)
-                            previous_host_info[key] = value
-                
-                previous_host_id = previous_host_info.get('host_id', 'unknown')
-                previous_file_size = int(previous_host_info.get('file_size', '0'))
-                current_size = output_path.stat().st_size if output_path.exists() else 0
-                completion_percentage = (current_size / total_size * 100) if total_size > 0 and previous_file_size == total_size else 0
-                
-                if completion_percentage > 60:  # 60% threshold for smart resume
-                    existing_progress_info = {
-                        'host_id': previous_host_id,
-                        'completion': completion_percentage,
-                        'file_size_match': previous_file_size == total_size
-                    }
-                    logger.log(f"🔍 FOUND EXISTING PROGRESS: {completion_percentage:.1f}% from host '{previous_host_id}'", "INFO")
-                    
-            except Exception as e:
-                logger.log(f"⚠️ Could not read existing progress: {e}", "WARNING")
-        
-        # Build download sequence with intelligent progress-aware prioritization
-        if existing_progress_info and existing_progress_info['file_size_match']:
-            # Smart host prioritization based on progress
-            previous_host_id = existing_progress_info['host_id']
-            completion = existing_progress_info['completion']
-            
-            # Find the host with existing progress
-            existing_host = next((h for h in links if h['host_id'] == previous_host_id), None)
-            
-            if existing_host and completion > 60:
-                # >60% downloaded - LOCK to this host as primary priority
-                logger.log(f"🔒 HOST LOCK: '{previous_host_id}' has {completion:.1f}% progress - using as primary host", "INFO")
-                download_sequence = [existing_host]
-                
-                # Add other hosts as backups only (will only be used if primary fails)
-                for link_info in links:
-                    if link_info['host_id'] != previous_host_id:
-                        download_sequence.append(link_info)
-                        
-            elif existing_host and completion > 0:
-                # Some progress but <60% - prefer this host but don't lock to it
-                logger.log(f"🚀 PROGRESS PRIORITY: Using '{previous_host_id}' first ({completion:.1f}% already downloaded)", "INFO")
-                download_sequence = [existing_host]
-                
-                # Add fastest host as second priority if different
-                if primary_host_info['host_id'] != previous_host_id:
-                    download_sequence.append(primary_host_info)
-                if backup_host_info and backup_host_info['host_id'] != previous_host_id and backup_host_info != primary_host_info:
-                    download_sequence.append(backup_host_info)
-                    
-                # Add remaining hosts
-                for link_info in links:
-                    if link_info not in download_sequence:
-                        download_sequence.append(link_info)
-            else:
-                logger.log(f"⚠️ Host '{previous_host_id}' with progress not available, using speed priority", "WARNING")
-                # Fall back to speed-based priority
-                download_sequence = [primary_host_info]
-                if backup_host_info and backup_host_info != primary_host_info:
-                    download_sequence.append(backup_host_info)
-                
-                # Add remaining hosts as tertiary backups
-                for link_info in links:
-                    if link_info not in download_sequence:
-                        download_sequence.append(link_info)
-        else:
-            # No significant progress or file size mismatch - use speed-based priority
-            download_sequence = [primary_host_info]
-            if backup_host_info and backup_host_info != primary_host_info:
-                download_sequence.append(backup_host_info)
-            
-            # Add remaining hosts as tertiary backups
-            for link_info in links:
-                if link_info not in download_sequence:
-                    download_sequence.append(link_info)
-
-        logger.log(f"📋 OPTIMIZED DOWNLOAD SEQUENCE: {[h['host_id'] for h in download_sequence[:3]]}{'...' if len(download_sequence) > 3 else ''}", "INFO")
-
-        # Smart resume logic with ENHANCED same-host resume and intelligent host switching
-        completed_chunks = set()
-        current_host_id = primary_host_info['host_id']
-        
-        if progress_path.exists() and output_path.exists() and host_info_path.exists():
-            logger.log("🔍 Checking resume compatibility...", "INFO")
-            try:
-                # Load previous download state
-                previous_host_info = {}
-                try:
-                    with host_info_path.open("r", encoding='utf-8') as hf:
-                        for line in hf:
-                            if line.strip():
-                                key, value = line.strip().split('=', 1)
-                                previous_host_info[key] = value
-                except Exception:
-                    previous_host_info = {}
-                
-                previous_host_id = previous_host_info.get('host_id', 'unknown')
-                previous_file_size = int(previous_host_info.get('file_size', '0'))
-                current_size = output_path.stat().st_size if output_path.exists() else 0
-                completion_percentage = (current_size / total_size * 100) if total_size > 0 else 0
-                
-                # ENHANCED RESUME LOGIC - Your requirements implemented:
-                # 1. Resume from any size if same host
-                # 2. Only switch hosts if >60% progress and current host fails  
-                # 3. Always use fastest host but delete partial files when switching
-                
-                if previous_host_id == current_host_id and previous_file_size == total_size:
-                    # SAME HOST RESUME - Resume from any size (no minimum threshold)
-                    if current_size > 0 and current_size <= total_size:
-                        try:
-                            with progress_path.open("r", encoding='utf-8') as pf:
-                                completed_chunks = {int(line) for line in pf if line.strip()}
-                            logger.log(f"✅ SAME HOST RESUME: Continuing from {previous_host_id} with {completion_percentage:.1f}% progress", "INFO")
-                            self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"⚡ Resuming from {current_host_id} ({completion_percentage:.1f}% done)..."})
-                        except (ValueError, IOError):
-                            logger.log("⚠️ Progress file corrupted, restarting from beginning", "WARNING")
-                            self._cleanup_partial_files(output_path, progress_path, host_info_path)
-                    else:
-                        logger.log(f"⚠️ Invalid file size {current_size}, restarting", "WARNING")
-                        self._cleanup_partial_files(output_path, progress_path, host_info_path)
-                        
-                elif previous_host_id != current_host_id:
-                    # DIFFERENT HOST - Smart decision based on progress and host availability
-                    
-                    if completion_percentage > 60:
-                        # >60% downloaded - Try to continue with original host if available (HOST LOCK)
-                        original_host = next((h for h in download_sequence if h['host_id'] == previous_host_id), None)
-                        
-                        if original_host:
-                            logger.log(f"� HOST LOCK ACTIVATED: {completion_percentage:.1f}% from '{previous_host_id}' - prioritizing original host", "INFO")
-                            # Move original host to front to prioritize it
-                            if download_sequence[0]['host_id'] != previous_host_id:
-                                download_sequence.remove(original_host)
-                                download_sequence.insert(0, original_host)
-                            current_host_id = previous_host_id
-                            
-                            try:
-                                with progress_path.open("r", encoding='utf-8') as pf:
-                                    completed_chunks = {int(line) for line in pf if line.strip()}
-                                self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"� Host locked: Resuming from {previous_host_id} ({completion_percentage:.1f}%)..."})
-                            except (ValueError, IOError):
-                                logger.log("⚠️ Progress file corrupted but preserving host priority", "WARNING")
-                                self._cleanup_partial_files(output_path, progress_path, host_info_path)
-                        else:
-                            # Original host not available - delete partial file and use fastest host
-                            logger.log(f"⚠️ HOST SWITCH REQUIRED: Original host '{previous_host_id}' unavailable, deleting partial file", "WARNING")
-                            self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"🔄 Host switched: Deleting partial file and using fastest host..."})
-                            self._cleanup_partial_files(output_path, progress_path, host_info_path)
-                    else:
-                        # <60% downloaded - Always use fastest host, delete partial file
-                        logger.log(f"🚀 OPTIMAL HOST SWITCH: {completion_percentage:.1f}% from '{previous_host_id}' → '{current_host_id}' (faster)", "INFO")
-                        self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"🚀 Switching to faster host {current_host_id}, deleting partial file..."})
-                        self._cleanup_partial_files(output_path, progress_path, host_info_path)
-                        
-                elif previous_file_size != total_size:
-                    # File size changed - Always restart
-                    logger.log(f"🔄 SIZE CHANGE: File size changed from {previous_file_size} to {total_size}, restarting", "WARNING")
-                    self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"🔄 File size changed, restarting download..."})
-                    self._cleanup_partial_files(output_path, progress_path, host_info_path)
-                    
-            except (ValueError, IOError, OSError) as e:
-                logger.log(f"⚠️ Resume state corrupted, restarting fresh: {e}", "WARNING")
-                self._cleanup_partial_files(output_path, progress_path, host_info_path)
-
-        # Initialize fresh download if needed
-        if not output_path.exists():
-            logger.log(f"🆕 FRESH DOWNLOAD: Preparing {output_filename} ({format_bytes(total_size)})", "INFO")
-            with open(output_path, "wb") as f: 
-                f.truncate(total_size)
-            completed_chunks.clear()
-            
-            # Create host tracking file
-            self._create_host_info_file(host_info_path, current_host_id, total_size)
-
-        # Prepare chunk structure
-        chunk_size = Constants.DOWNLOAD_CHUNK_SIZE
-        num_chunks = max(1, (total_size + chunk_size - 1) // chunk_size)
-        all_chunks = [{'index': i, 'start': i * chunk_size, 'end': min((i + 1) * chunk_size - 1, total_size - 1)} for i in range(num_chunks)]
-
-        # INTELLIGENT MULTI-HOST DOWNLOAD with smart failover
-        for attempt, host_info in enumerate(download_sequence):
-            if self.cancel_event.is_set(): 
-                break
-                
-            host_id = host_info['host_id']
-            link = host_info['link']
-            
-            logger.log(f"📡 DOWNLOAD ATTEMPT {attempt + 1}/{len(download_sequence)}: Using host '{host_id}'", "INFO")
-            
-            if attempt > 0:
-                # Switching hosts due to failure - implement smart host preservation logic
-                self.progress_queue.put({
-                    'type': Q_MSG.STATUS, 
-                    'message': f"🔄 Switching to host {host_id} (attempt {attempt + 1})..."
-                })
-                
-                # SMART HOST SWITCHING LOGIC:
-                # 1. Resume from any size if continuing with same host
-                # 2. If >60% downloaded from previous host, try to stick with that host unless it fails
-                # 3. Only delete partial files when actually switching to different host
-                should_clean = False
-                
-                if existing_progress_info:
-                    previous_host_id = existing_progress_info['host_id']
-                    completion_percentage = existing_progress_info['completion']
-                    current_host_id = host_id
-                    
-                    if previous_host_id == current_host_id:
-                        # Same host - ALWAYS try to resume from any size
-                        logger.log(f"🔄 SAME HOST RESUME: Continuing with '{host_id}' from {completion_percentage:.1f}%", "INFO")
-                        should_clean = False
-                        
-                        # Verify we can still resume
-                        try:
-                            with progress_path.open("r", encoding='utf-8') as pf:
-                                completed_chunks = {int(line) for line in pf if line.strip()}
-                            if len(completed_chunks) > 0:
-                                logger.log(f"✅ SAME HOST RESUME: {len(completed_chunks)} chunks already downloaded", "INFO")
-                            else:
-                                logger.log("⚠️ No valid chunks found, will restart with same host", "WARNING")
-                                should_clean = True
-                        except Exception as e:
-                            logger.log(f"⚠️ Could not verify resume state: {e}", "WARNING")
-                            should_clean = True
-                    else:
-                        # Different host - check if we should preserve >60% progress
-                        if completion_percentage > 60:
-                            # >60% downloaded - try to stick with previous host first
-                            previous_host_available = next((h for h in download_sequence if h['host_id'] == previous_host_id), None)
-                            if previous_host_available and previous_host_id != current_host_id:
-                                logger.log(f"🔒 HOST LOCK: {completion_percentage:.1f}% done with '{previous_host_id}', trying to continue with it instead of switching to '{current_host_id}'", "INFO")
-                                # Skip this host and try to continue with the previous one
-                                continue
-                            else:
-                                # Previous host not available anymore, switch and delete
-                                logger.log(f"🗑️ FORCED SWITCH: Previous host '{previous_host_id}' unavailable, deleting {completion_percentage:.1f}% progress and switching to '{current_host_id}'", "WARNING")
-                                should_clean = True
-                        else:
-                            # <60% downloaded - normal switch, delete partial file
-                            logger.log(f"🧹 CLEAN SWITCH: Only {completion_percentage:.1f}% done, switching from '{previous_host_id}' to '{current_host_id}'", "INFO")
-                            should_clean = True
-                else:
-                    # No existing progress info - start fresh
-                    should_clean = True
-                
-                if should_clean:
-                    # Delete partial files when switching hosts
-                    logger.log(f"🧹 CLEANING: Removing partial files before switching to host '{host_id}'", "INFO")
-                    self._cleanup_partial_files(output_path, progress_path, host_info_path)
-                    completed_chunks.clear()
-                    
-                    # Verify new host has correct file size
-                    if not self._verify_host_file_size(link, total_size, host_id):
-                        continue
-                    
-                    # Recreate files for new host
-                    with open(output_path, "wb") as f: 
-                        f.truncate(total_size)
-                    self._create_host_info_file(host_info_path, host_id, total_size)
-                else:
-                    # Just update the host info file for resume (same host)
-                    self._create_host_info_file(host_info_path, host_id, total_size)
-                
-                # Brief pause before retry (escalating)
-                retry_delay = min(0.5 + (attempt * 0.3), 2.0)  # 0.5s, 0.8s, 1.1s, max 2s
-                time.sleep(retry_delay)
-
-            try:
-                # Execute download with current host
-                success = self._execute_download_with_host(
-                    link, host_id, output_path, progress_path, 
-                    all_chunks, completed_chunks, total_size, output_filename
-                )
-                
-                if success:
-                    logger.log(f"✅ DOWNLOAD SUCCESS: '{output_filename}' completed via host '{host_id}'", "INFO")
-                    return output_path, host_id
-                else:
-                    # Download failed, try next host
-                    logger.log(f"❌ HOST FAILED: '{host_id}' failed download, trying next host...", "WARNING")
-                    continue
-                    
-            except Exception as e:
-                logger.log(f"💥 HOST EXCEPTION: '{host_id}' encountered error: {e}", "ERROR")
-                continue
-
-        # All hosts failed - ensure UI can recover
-        logger.log(f"🚫 COMPLETE FAILURE: All {len(download_sequence)} hosts failed for '{output_filename}'", "ERROR")
-        
-        # Send immediate status update to prevent UI lock
-        self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"❌ All {len(download_sequence)} hosts failed for {output_filename}"})
-        
-        # Force progress update to show failure state
-        self.progress_queue.put({'type': Q_MSG.PROGRESS, 'value': 0})
-        
-        return None
-
-    def _cleanup_partial_files(self, output_path: Path, progress_path: Path, host_info_path: Path):
-        """Clean up partial download files."""
-        for path in [output_path, progress_path, host_info_path]:
-            if path.exists():
-                path.unlink(missing_ok=True)
-
-    def _create_host_info_file(self, host_info_path: Path, host_id: str, total_size: int):
-        """Create host tracking file."""
-        with host_info_path.open("w", encoding='utf-8') as hf:
-            hf.write(f"host_id={host_id}\n")
-            hf.write(f"file_size={total_size}\n")
-            hf.write(f"start_time={time.time()}\n")
-
-    def _verify_host_file_size(self, link: str, expected_size: int, host_id: str) -> bool:
-        """Verify host has correct file size when switching."""
-        try:
-            response = requests.head(link, timeout=4, allow_redirects=True)
-            response.raise_for_status()
-            actual_size = int(response.headers.get('content-length', 0))
-            
-            size_tolerance = min(expected_size * 0.01, 1024 * 1024)  # 1% or 1MB tolerance
-            size_diff = abs(actual_size - expected_size)
-            
-            if size_diff > size_tolerance:
-                logger.log(f"❌ Host '{host_id}' has wrong file size: {format_bytes(actual_size)} vs expected {format_bytes(expected_size)}", "ERROR")
-                return False
-            elif size_diff > 0:
-                logger.log(f"⚠️ Host '{host_id}' has slight size difference: {format_bytes(size_diff)}", "WARNING")
-            
-            return True
-            
-        except requests.RequestException as e:
-            logger.log(f"❌ Cannot verify size for host '{host_id}': {e}", "ERROR")
-            return False
-
-    def _execute_download_with_host(self, link: str, host_id: str, output_path: Path, 
-                                  progress_path: Path, all_chunks: List, completed_chunks: set, 
-                                  total_size: int, output_filename: str) -> bool:
-        """Execute the actual download with detailed progress tracking."""
-        chunks_to_download = [c for c in all_chunks if c['index'] not in completed_chunks]
-        if not chunks_to_download:
-            return True  # Already complete
-
-        # Enhanced UI feedback
-        self.progress_queue.put({
-            'type': Q_MSG.STATUS, 
-            'message': f"⬇️ Downloading from {host_id} | {len(chunks_to_download)} chunks remaining"
-        })
-        self.progress_queue.put({
-            'type': Q_MSG.OVERALL_STATUS, 
-            'message': f"📥 Active download: {output_filename} from {host_id}"
-        })
-
-        # Initialize download tracking
-        initial_downloaded_size = sum((c['end'] - c['start'] + 1) for c in all_chunks if c['index'] in completed_chunks)
-        with self.download_lock: 
-            self.total_downloaded = initial_downloaded_size
-        self.speed_buffer.clear()
-        last_update_time, last_update_size = time.time(), self.total_downloaded
-
-        # Show initial progress
-        initial_progress = (self.total_downloaded / total_size) * 100 if total_size > 0 else 0
-        initial_progress = min(initial_progress, 100.0)
-        
-        if initial_progress > 0:
-            self.progress_queue.put({
-                'type': Q_MSG.STATUS, 
-                'message': f"⬇️ Resuming | {initial_progress:.1f}% | {host_id}"
-            })
-            self.progress_queue.put({'type': Q_MSG.PROGRESS, 'value': initial_progress})
-        else:
-            self.progress_queue.put({
-                'type': Q_MSG.STATUS, 
-                'message': f"⬇️ Starting fresh | 0% | {host_id}"
-            })
-            self.progress_queue.put({'type': Q_MSG.PROGRESS, 'value': 0})
-
-        # Multi-threaded download with REAL-TIME progress tracking
-        failed_chunks = []
-        chunk_futures = {}
-        
-        with ThreadPoolExecutor(max_workers=Constants.DOWNLOAD_THREADS) as executor:
-            # Submit all chunks
-            for chunk in chunks_to_download:
-                if self.cancel_event.is_set(): 
-                    break
-                future = executor.submit(
-                    self._download_chunk, link, chunk['start'], chunk['end'], 
-                    output_path, progress_path, chunk['index']
-                )
-                chunk_futures[future] = chunk
-
-            # REAL-TIME progress monitoring with continuous updates
-            completed_count = 0
-            total_chunks = len(chunks_to_download)
-            
-            # Start continuous progress monitoring thread
-            def real_time_progress_monitor():
-                """Monitor progress in real-time with frequent updates."""
-                last_update = time.time()
-                last_size = self.total_downloaded
-                
-                while chunk_futures and not self.cancel_event.is_set():
-                    self.pause_event.wait()  # Respect pause state
-                    
-                    current_time = time.time()
-                    current_size = self.total_downloaded
-                    time_diff = current_time - last_update
-                    
-                    # Update UI every 200ms for smooth progress
-                    if time_diff >= 0.2:
-                        with self.download_lock:
-                            progress = (current_size / total_size) * 100 if total_size > 0 else 0
-                            progress = min(progress, 100.0)
-                            
-                            # Calculate real-time speed
-                            size_diff = current_size - last_size
-                            instant_speed = size_diff / time_diff if time_diff > 0 else 0
-                            
-                            # Update speed buffer for smoothing
-                            if instant_speed > 0:
-                                self.speed_buffer.append(instant_speed)
-                            
-                            avg_speed = sum(self.speed_buffer) / len(self.speed_buffer) if self.speed_buffer else 0
-                            remaining_bytes = total_size - current_size
-                            eta = remaining_bytes / avg_speed if avg_speed > 0 else 0
-                            
-                            # Update session statistics
-                            self._update_session_stats(current_size, total_size)
-                            
-                            # Enhanced status with more details
-                            if not self.pause_event.is_set():
-                                status_msg = f"⏸️ PAUSED | {progress:.1f}% | {format_bytes(avg_speed)}/s | Host: {host_id}"
-                            else:
-                                chunks_remaining = len(chunk_futures)
-                                # Enhanced display with peak speed and session stats
-                                peak_speed_str = f"Peak: {format_bytes(self.download_session_stats['peak_speed'])}/s" if self.download_session_stats['peak_speed'] > 0 else ""
-                                status_msg = f"⬇️ {host_id} | {progress:.1f}% | {format_bytes(avg_speed)}/s | ETA: {self._format_eta(eta)} | {chunks_remaining} chunks"
-                            
-                            # Send enhanced real-time updates
-                            self.progress_queue.put({'type': Q_MSG.STATUS, 'message': status_msg})
-                            self.progress_queue.put({'type': Q_MSG.PROGRESS, 'value': progress})
-                            
-                            # Send detailed speed/ETA information for UI enhancement
-                            self.progress_queue.put({
-                                'type': Q_MSG.DOWNLOAD_SPEED,
-                                'current_speed': avg_speed,
-                                'peak_speed': self.download_session_stats['peak_speed'],
-                                'average_speed': self.download_session_stats['average_speed'],
-                                'eta_seconds': eta,
-                                'eta_formatted': self._format_eta(eta),
-                                'time_elapsed': self.download_session_stats['time_elapsed'],
-                                'bytes_remaining': remaining_bytes,
-                                'progress_percent': progress
-                            })
-                            
-                            last_update = current_time
-                            last_size = current_size
-                    
-                    time.sleep(0.1)  # Check every 100ms for responsiveness
-            
-            # Start real-time monitoring
-            monitor_thread = threading.Thread(target=real_time_progress_monitor, daemon=True)
-            monitor_thread.start()
-            
-            # Process completed chunks as they finish
-            for future in as_completed(chunk_futures):
-                if self.cancel_event.is_set(): 
-                    break
-                    
-                chunk = chunk_futures.pop(future)  # Remove from active futures
-                try:
-                    success = future.result()
-                    if success:
-                        completed_count += 1
-                        completed_chunks.add(chunk['index'])
-                        
-                        # Immediate progress update when chunk completes
-                        with self.download_lock:
-                            progress = (self.total_downloaded / total_size) * 100 if total_size > 0 else 0
-                            progress = min(progress, 100.0)
-                        
-                        # Quick update for chunk completion
-                        chunks_remaining = len(chunk_futures)
-                        if chunks_remaining > 0:
-                            self.progress_queue.put({
-                                'type': Q_MSG.STATUS, 
-                                'message': f"⬇️ {host_id} | {progress:.1f}% | Chunk {completed_count}/{total_chunks} | {chunks_remaining} remaining"
-                            })
-                        
-                    else:
-                        # Chunk failed
-                        failed_chunks.append(chunk)
-                        logger.log(f"⚠️ Chunk {chunk['index']} failed from host '{host_id}'", "WARNING")
-                        
-                except Exception as e:
-                    failed_chunks.append(chunk)
-                    logger.log(f"💥 Chunk {chunk['index']} exception from host '{host_id}': {e}", "ERROR")
-
-        # Check download success
-        if self.cancel_event.is_set():
-            return False
-            
-        if failed_chunks:
-            failure_rate = len(failed_chunks) / total_chunks * 100
-            logger.log(f"⚠️ Host '{host_id}' had {len(failed_chunks)}/{total_chunks} failed chunks ({failure_rate:.1f}%)", "WARNING")
-            
-            # Critical failure detection - if too many SSL/TLS errors, fail immediately
-            ssl_errors = sum(1 for chunk in failed_chunks if any("SSL/TLS Error" in str(e) for e in [chunk.get('error', '')]))
-            critical_failure_rate = ssl_errors / total_chunks * 100 if total_chunks > 0 else 0
-            
-            # If failure rate is too high, abandon this host
-            if failure_rate > 20:  # More than 20% failed
-                if critical_failure_rate > 10:  # SSL/TLS errors are critical
-                    logger.log(f"❌ Host '{host_id}' has critical SSL/TLS failure rate ({critical_failure_rate:.1f}%), abandoning immediately", "ERROR")
-                    self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"❌ Critical SSL/TLS errors from {host_id}, switching..."})
-                    return False
-                else:
-                    logger.log(f"❌ Host '{host_id}' failure rate too high ({failure_rate:.1f}%), switching host", "ERROR")
-                    self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"❌ Host {host_id} failed, switching..."})
-                    return False
-            else:
-                # Retry failed chunks once, but not SSL/TLS errors
-                retryable_chunks = [chunk for chunk in failed_chunks if not any("SSL/TLS Error" in str(e) for e in [chunk.get('error', '')])]
-                if retryable_chunks:
-                    logger.log(f"🔄 Retrying {len(retryable_chunks)} non-critical failed chunks from host '{host_id}'", "INFO")
-                    self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"🔄 Retrying {len(retryable_chunks)} chunks from {host_id}..."})
-                    
-                    for chunk in retryable_chunks[:5]:  # Limit retries to avoid infinite loops
-                        if self.cancel_event.is_set():
-                            break
-                        success = self._download_chunk(link, chunk['start'], chunk['end'], output_path, progress_path, chunk['index'])
-                        if success:
-                            completed_chunks.add(chunk['index'])
-                        else:
-                            logger.log(f"❌ Final retry failed for chunk {chunk['index']} from host '{host_id}'", "ERROR")
-                            self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"❌ Final retry failed for chunk {chunk['index']}"})
-                            return False
-                
-                # If SSL/TLS errors remain, fail
-                if ssl_errors > 0:
-                    logger.log(f"❌ {ssl_errors} SSL/TLS errors cannot be retried, host '{host_id}' failed", "ERROR")
-                    self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"❌ SSL/TLS errors on {host_id}, cannot continue"})
-                    return False
-
-        # Final verification
-        final_chunks_to_download = [c for c in all_chunks if c['index'] not in completed_chunks]
-        if final_chunks_to_download:
-            logger.log(f"❌ Download incomplete: {len(final_chunks_to_download)} chunks still missing from host '{host_id}'", "ERROR")
-            return False
-
-        # Success!
-        self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"✅ Download complete from {host_id}"})
-        self.progress_queue.put({'type': Q_MSG.PROGRESS, 'value': 100})
-        return True
-
-class Extractor:
-    @staticmethod
-    def find_7zip_executable() -> Optional[str]:
-        base_path = getattr(sys, '_MEIPASS', Path(__file__).resolve().parent); bundled_exe_path = Path(base_path) / "7z.exe"
-        if bundled_exe_path.exists(): return str(bundled_exe_path)
-        logger.log("Bundled 7-Zip not found. Searching system...", "WARNING")
-        registry_paths = [ (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\7-Zip"), (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\WOW6432Node\7-Zip") ]
-        for hive, key_path in registry_paths:
-            try:
-                with winreg.OpenKey(hive, key_path) as key:
-                    path, _ = winreg.QueryValueEx(key, "Path"); exe = Path(path) / "7z.exe"
-                    if exe.exists(): logger.log(f"Found 7-Zip in registry: {exe}", "INFO"); return str(exe)
-            except FileNotFoundError: continue
-        exe = shutil.which("7z");
-        if exe: logger.log(f"Found 7-Zip in system PATH: {exe}", "INFO"); return str(exe)
-        logger.log("7-Zip executable could not be found anywhere.", "CRITICAL"); return None
-
-    def extract_archive(self, archive_path: Path, dest_dir: Path, progress_queue: queue.Queue, cancel_event: threading.Event) -> None:
-        seven_zip_exe = self.find_7zip_executable()
-        if not seven_zip_exe:
-            raise FileNotFoundError("7-Zip executable not found. Please place 7z.exe in the application folder.")
-        command = [seven_zip_exe, 'x', str(archive_path), f'-o{dest_dir}', '-y']
-        logger.log(f"Executing asynchronous extraction: {' '.join(command)}", "INFO")
-        progress_queue.put({'type': Q_MSG.PROGRESS_MODE, 'mode': 'indeterminate'})
-        proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, creationflags=subprocess.CREATE_NO_WINDOW)
-        while proc.poll() is None:
-            if cancel_event.is_set():
-                proc.terminate()
-                try:
-                    proc.wait(timeout=3.0)  # Give it 3 seconds to terminate gracefully
-                except subprocess.TimeoutExpired:
-                    proc.kill()  # Force kill if it doesn't terminate
-                    logger.log("Extraction process force killed", "WARNING")
-                logger.log("Extraction cancelled by user.", "INFO")
-                raise InterruptedError("Extraction cancelled.")
-            time.sleep(0.2)
-        progress_queue.put({'type': Q_MSG.PROGRESS_MODE, 'mode': 'determinate'})
-        stdout, stderr = proc.communicate()
-        if proc.returncode != 0:
-            error_details = stderr or stdout or "Unknown 7-Zip error."
-            logger.log(f"Extraction failed for '{archive_path.name}': {error_details}", "ERROR")
-            raise RuntimeError(f"Extraction failed: {error_details}")
-        logger.log(f"Successfully extracted '{archive_path.name}'.", "INFO")
-
-    def install_files(self, source_dir: Path, game_dir: Path, progress_queue: queue.Queue, cancel_event: threading.Event) -> None:
-        logger.log(f"Preparing to install files from '{source_dir}' to '{game_dir}'.", "INFO")
-        progress_queue.put({'type': Q_MSG.STATUS, 'message': "Analyzing patch files..."})
-        files_to_copy = []
-        total_size = 0
-        source_root = next((Path(root) for root, _, files in os.walk(source_dir) if Constants.GAME_EXECUTABLE in files), source_dir)
-        logger.log(f"Determined effective source root for copy: {source_root}", "INFO")
-
-        # Security: Resolve absolute paths to prevent path traversal
-        game_dir_resolved = game_dir.resolve()
-        source_root_resolved = source_root.resolve()
-
-        for root, _, files in os.walk(source_root):
-            if cancel_event.is_set(): 
-                raise InterruptedError("Installation cancelled during analysis.")
-            for file in files:
-                src_path = Path(root) / file
-                try:
-                    rel_path = src_path.relative_to(source_root)
-                    dest_path = game_dir / rel_path
-                    
-                    # Security: Validate destination path to prevent path traversal
-                    dest_path_resolved = dest_path.resolve()
-                    if not str(dest_path_resolved).startswith(str(game_dir_resolved)):
-                        logger.log(f"SECURITY: Skipping file with suspicious path: {rel_path}", "WARNING")
-                        continue
-                    
-                    # Additional security: Check for dangerous file extensions
-                    if dest_path.suffix.lower() in ['.exe', '.bat', '.cmd', '.scr', '.com', '.pif'] and dest_path.name != Constants.GAME_EXECUTABLE:
-                        logger.log(f"SECURITY: Skipping potentially dangerous file: {dest_path.name}", "WARNING")
-                        continue
-                    
-                    file_size = src_path.stat().st_size
-                    files_to_copy.append({'src': src_path, 'dest': dest_path, 'size': file_size})
-                    total_size += file_size
-                    
-                except (ValueError, FileNotFoundError) as e:
-                    logger.log(f"File analysis error for {src_path}: {e}. Skipping.", "WARNING")
-
-        logger.log(f"Analysis complete. Found {len(files_to_copy)} files to install, totaling {format_bytes(total_size)}.", "INFO")
-        copied_size = 0
-        last_update_time = time.time()
-
-        for i, file_info in enumerate(files_to_copy):
-            if cancel_event.is_set(): 
-                raise InterruptedError("Installation cancelled by user.")
-            
-            try:
-                # Ensure parent directory exists
-                file_info['dest'].parent.mkdir(parents=True, exist_ok=True)
-                
-                # Copy with verification
-                shutil.copy2(file_info['src'], file_info['dest'])
-                copied_size += file_info['size']
-                
-                # Update progress
-                current_time = time.time()
-                if current_time - last_update_time > 0.05:
-                    progress = (copied_size / total_size) * 100 if total_size > 0 else 100
-                    progress_queue.put({'type': Q_MSG.PROGRESS, 'value': progress})
-                    progress_queue.put({'type': Q_MSG.STATUS, 'message': f"Copying: {file_info['dest'].name}"})
-                    last_update_time = current_time
-                    
-            except (IOError, OSError) as e:
-                logger.log(f"Failed to copy {file_info['src']} to {file_info['dest']}: {e}", "ERROR")
-                raise RuntimeError(f"Installation failed: Could not copy {file_info['dest'].name}")
-        
-        logger.log("All files installed successfully.", "INFO")
-
-class GameManager:
-    """Manages game-specific operations like version checking, launching, and save backups."""
-    def __init__(self, game_dir: str): self.game_dir = Path(game_dir) if game_dir else None
-    def check_version(self) -> Optional[str]:
-        if not self.game_dir: return None
-        version_file = self.game_dir / "version.txt"
-        if not version_file.exists(): logger.log(f"version.txt not found in {self.game_dir}", "WARNING"); return "NOT_FOUND"
-        try:
-            content = version_file.read_text().strip(); parts = content.split('.')
-            if len(parts) >= 3: version = parts[2].split()[0]; logger.log(f"Detected game version: v{version}", "INFO"); return version
-            else: logger.log(f"Invalid version format in version.txt: {content}", "WARNING"); return "INVALID_FORMAT"
-        except IOError as e: logger.log(f"Error reading version.txt: {e}", "ERROR"); return "READ_ERROR"
-    def launch_game(self) -> Optional[str]:
-        if not self.game_dir: return "Game directory not set."
-        exe_path = self.game_dir / Constants.GAME_EXECUTABLE
-        if not exe_path.exists(): return f"{Constants.GAME_EXECUTABLE} not found in the selected directory."
-        try: subprocess.Popen([str(exe_path)], cwd=str(self.game_dir)); logger.log("Game launched successfully.", "INFO"); return None
-        except OSError as e: logger.log(f"Failed to launch game: {e}", "ERROR"); return f"Failed to launch game: {e}"
-    def backup_saved_games(self) -> str:
-        saved_games_path = Path.home() / "Saved Games" / "Cricket 24"
-        if not saved_games_path.exists(): msg = f"Saved games folder not found at: {saved_games_path}"; logger.log(msg, "WARNING"); raise FileNotFoundError(msg)
-        backup_dir = saved_games_path.parent / "Cricket 26 Backups"; backup_dir.mkdir(exist_ok=True)
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        backup_zip_path = backup_dir / f"Cricket26_Save_{timestamp}.zip"
-        shutil.make_archive(str(backup_zip_path.with_suffix('')), 'zip', str(saved_games_path))
-        logger.log(f"Backup created successfully: {backup_zip_path}", "INFO"); return f"Backup complete: {backup_zip_path}"
-    def restore_backup(self, backup_zip_path_str: str) -> str:
-        backup_zip_path = Path(backup_zip_path_str)
-        saved_games_path = Path.home() / "Saved Games" / "Cricket 26"
-        saved_games_parent = saved_games_path.parent
-        with tempfile.TemporaryDirectory(prefix="c26-restore-", dir=saved_games_parent) as temp_restore_dir:
-            logger.log(f"Unpacking backup '{backup_zip_path.name}' to a temporary location...", "INFO")
-            try:
-                shutil.unpack_archive(backup_zip_path, temp_restore_dir)
-                logger.log("Unpacking successful.", "INFO")
-            except Exception as e:
-                logger.log(f"CRITICAL: Failed to unpack the backup archive '{backup_zip_path.name}'. Details: {e}", "ERROR")
-                raise RuntimeError(f"Could not restore backup. The archive file might be corrupted.\nDetails: {e}")
-            unpacked_source_dir = Path(temp_restore_dir) / "Cricket 26"
-            if not unpacked_source_dir.exists():
-                logger.log("CRITICAL: Backup archive has an unexpected structure. Expected a 'Cricket 26' folder inside.", "ERROR")
-                raise ValueError("Backup archive has an unexpected structure. Cannot proceed with restore.")
-            original_data_temp_name = None
-            if saved_games_path.exists():
-                original_data_temp_name = saved_games_path.with_name(f"Cricket 26_pre-restore_{int(time.time())}")
-                logger.log(f"Temporarily renaming current save data to '{original_data_temp_name.name}'...", "INFO")
-                saved_games_path.rename(original_data_temp_name)
-            try:
-                logger.log("Moving new data into place...", "INFO")
-                unpacked_source_dir.rename(saved_games_path)
-            except Exception as e:
-                logger.log(f"CRITICAL: Failed to move new data into place: {e}. Attempting rollback.", "CRITICAL")
-                if original_data_temp_name and original_data_temp_name.exists():
-                    logger.log("Attempting to roll back by restoring original save data...", "INFO")
-                    original_data_temp_name.rename(saved_games_path)
-                    logger.log("Rollback successful. Your original save data is safe.", "INFO")
-                    raise RuntimeError(f"A critical error occurred while finalizing the restore.\n\nYour original save data has been automatically restored.\nPlease check the log for details about the failure: {e}")
-                else:
-                    logger.log("CRITICAL: Rollback failed. Original data backup could not be found.", "CRITICAL")
-                    raise RuntimeError("A critical error occurred and the automatic rollback FAILED. Please check your 'Saved Games' folder for a '_pre-restore_' backup.")
-
-            if original_data_temp_name and original_data_temp_name.exists():
-                logger.log("Restore complete. Cleaning up old save data...", "INFO")
-                shutil.rmtree(original_data_temp_name)
-        logger.log(f"Successfully restored backup from: {backup_zip_path.name}", "INFO")
-        return f"Successfully restored backup:\n{backup_zip_path.name}"
-
-class UpdateWorkflow:
-    """Encapsulates the entire multi-step update process."""
-    def __init__(self, game_dir: str, cache_dir: Path, updates: List, data: Dict, queue: queue.Queue, cancel: threading.Event, pause: threading.Event, verify: bool, decision_queue: queue.Queue):
-        self.game_dir, self.cache_dir = Path(game_dir), cache_dir; self.updates, self.data = updates, data
-        self.progress_queue, self.cancel_event, self.pause_event, self.verify_checksums = queue, cancel, pause, verify
-        self.decision_queue = decision_queue
-        self.downloader = ConcurrentDownloader(self.progress_queue, self.cancel_event, self.pause_event)
-        self.extractor = Extractor()
-
-    def run(self):
-        logger.log("Update workflow started.", "INFO")
-        # Immediately update UI to show workflow has started
-        self.progress_queue.put({'type': Q_MSG.OVERALL_STATUS, 'message': "Initializing update..."})
-        self.progress_queue.put({'type': Q_MSG.STATUS, 'message': "Starting update process..."})
-        downloaded_files = []
-        
-        # Check if using sequential update system
-        schema_version = self.data.get('metadata', {}).get('schema_version', '1.0')
-        supports_sequential = self.data.get('metadata', {}).get('supports_sequential_updates', False)
-        is_sequential = schema_version == '2.0' or supports_sequential
-        
-        try:
-            if self.cancel_event.is_set(): raise InterruptedError("Cancelled before start")
-            self._check_disk_space()
-            if self.cancel_event.is_set(): raise InterruptedError("Cancelled during disk check")
-            downloaded_files = self._run_download_phase()
-            if self.cancel_event.is_set() or not downloaded_files: raise InterruptedError("Cancelled during download")
-            
-            # Only run install phase if NOT using sequential (sequential installs as it goes)
-            if not is_sequential:
-                self._run_install_phase(downloaded_files)
-                if self.cancel_event.is_set(): raise InterruptedError("Cancelled before completion")
-                self._cleanup_successful_update_files(downloaded_files)
-            
-            self.progress_queue.put({'type': Q_MSG.COMPLETE, 'final_version': self.data.get('latest_version', 'N/A')})
-        except InterruptedError as e:
-            logger.log(f"Update workflow cancelled: {e}", "INFO")
-            if not is_sequential:
-                self._cleanup_failed_update_files(downloaded_files)
-        except Exception as e:
-            if not self.cancel_event.is_set():
-                logger.log(f"Update workflow stopped due to a runtime error: {e}", "CRITICAL")
-                self.progress_queue.put({'type': Q_MSG.DOWNLOAD_FAILED, 'reason': str(e)})
-        finally:
-            if self.cancel_event.is_set(): self.progress_queue.put({'type': Q_MSG.CANCELLED})
-            logger.log("Update workflow finished.", "INFO")
-
-    def _check_disk_space(self):
-        self.progress_queue.put({'type': Q_MSG.OVERALL_STATUS, 'message': "Checking disk space..."})
-        total_download_size = sum(u.get('size_bytes', 0) for u in self.updates)
-        max_install_size = max((u.get('size_bytes', 0) for u in self.updates), default=0) * 2.5
-        cache_drive = Path(self.cache_dir.anchor); game_drive = Path(self.game_dir.anchor)
-        cache_free = shutil.disk_usage(cache_drive).free
-        if cache_free < total_download_size: raise RuntimeError(f"Not enough space on {cache_drive} for downloads. Required: {format_bytes(total_download_size)}, Available: {format_bytes(cache_free)}")
-        if game_drive == cache_drive:
-             if cache_free < (total_download_size + max_install_size): raise RuntimeError(f"Not enough space on {game_drive} for download & install. Required: ~{format_bytes(total_download_size + max_install_size)}, Available: {format_bytes(cache_free)}")
-        else:
-            game_free = shutil.disk_usage(game_drive).free
-            if game_free < max_install_size: raise RuntimeError(f"Not enough space on game drive {game_drive} for installation. Required: ~{format_bytes(max_install_size)}, Available: {format_bytes(game_free)}")
-        logger.log("Disk space check passed.", "INFO")
-
-    def _download_update_with_fallback(self, update_info: Dict) -> Optional[Path]:
-        """
-        Download update with fallback support for Cricket 26 v2.0 schema.
-        Tries primary source first, then fallbacks in order.
-        """
-        downloads = update_info.get('downloads', {})
-        
-        # Try primary first
-        primary = downloads.get('primary')
-        if primary:
-            self.progress_queue.put({
-                'type': Q_MSG.STATUS,
-                'message': f'📥 Trying primary: {primary.get("name", primary.get("type", "Unknown"))}'
-            })
-            
-            result = self._download_from_source(primary, update_info)
-            if result:
-                return result
-        
-        # Primary failed - try fallbacks
-        fallbacks = downloads.get('fallback', [])
-        
-        for i, fallback in enumerate(fallbacks, 1):
-            self.progress_queue.put({
-                'type': Q_MSG.STATUS,
-                'message': f'🔄 Trying fallback {i}/{len(fallbacks)}: {fallback.get("name", fallback.get("type", "Unknown"))}'
-            })
-            
-            result = self._download_from_source(fallback, update_info)
-            if result:
-                return result
-        
-        # All sources failed
-        return None
-
-    def _download_from_source(self, source: Dict, update_info: Dict) -> Optional[Path]:
-        """
-        Download from a single source (gdrive or direct).
-        """
-        source_type = source.get('type', 'unknown')
-        
-        try:
-            archive_name = f"C26_Update_{update_info.get('from_version', '?')}_to_{update_info.get('to_version', '?')}.zip"
-            output_path = self.cache_dir / archive_name
-            
-            if source_type == 'gdrive':
-                # Google Drive download
-                file_id = source.get('file_id')
-                if not file_id:
-                    # Try to extract from URL
-                    url = source.get('url', '')
-                    import re
-                    match = re.search(r'/d/([a-zA-Z0-9_-]+)', url)
-                    if match:
-                        file_id = match.group(1)
-                    else:
-                        logger.log(f"No file_id found in source: {source}", "ERROR")
-                        return None
-                
-                success = download_from_gdrive(
-                    file_id,
-                    output_path,
-                    self.progress_queue,
-                    self.cancel_event
-                )
-                
-                if success and output_path.exists():
-                    return output_path
-                
-            elif source_type == 'direct':
-                # Direct HTTP download (use existing download system)
-                url = source.get('url')
-                if not url:
-                    logger.log(f"No URL found in source: {source}", "ERROR")
-                    return None
-                
-                # Create link format for existing downloader
-                links = [{'link': url, 'host_id': source.get('name', 'direct')}]
-                result = self.downloader.download_file(
-                    links,
-                    self.cache_dir,
-                    archive_name
-                )
-                
-                if result:
-                    return result[0]  # Return the path
-            
-            else:
-                logger.log(f"Unknown source type: {source_type}", "ERROR")
-                
-        except Exception as e:
-            logger.log(f"Download from {source.get('name', 'unknown')} failed: {e}", "ERROR")
-        
-        return None
-
-    def _run_download_phase_sequential(self) -> List[Dict[str, Any]]:
-        """
-        Download and INSTALL updates SEQUENTIALLY for Cricket 26 (install-as-you-go).
-        Each update is installed immediately after download so partial progress is preserved.
-        If update 7/12 fails, updates 1-6 remain installed.
-        """
-        num_updates = len(self.updates)
-        completed_updates = []
-        
-        logger.log(f"Starting sequential download-and-install for {num_updates} updates", "INFO")
-        
-        with tempfile.TemporaryDirectory(prefix="c26-extract-") as temp_extract_dir_str:
-            extract_dir = Path(temp_extract_dir_str)
-            
-            for i, update_info in enumerate(self.updates, 1):
-                if self.cancel_event.is_set():
-                    raise InterruptedError("Sequential update cancelled by user")
-                
-                # Show which update we're on
-                from_ver = update_info.get('from_version', '?')
-                to_ver = update_info.get('to_version', '?')
-                
-                self.progress_queue.put({
-                    'type': Q_MSG.OVERALL_STATUS,
-                    'message': f'📦 Sequential Update {i}/{num_updates}: v{from_ver} → v{to_ver}'
-                })
-                
-                # Download with fallback support
-                try:
-                    self.progress_queue.put({
-                        'type': Q_MSG.STATUS,
-                        'message': f'⬇️ Downloading update {i}/{num_updates}...'
-                    })
-                    
-                    downloaded_file = self._download_update_with_fallback(update_info)
-                    
-                    if not downloaded_file:
-                        # Download failed even with fallbacks
-                        raise RuntimeError(
-                            f"Failed to download update {i}/{num_updates}. "
-                            f"All sources failed for v{from_ver} → v{to_ver}. "
-                            f"Game is at v{self.updates[i-2].get('to_version', 'unknown') if i > 1 else 'base'} "
-                            f"(Installed: {len(completed_updates)}/{num_updates} updates)."
-                        )
-                    
-                    # Download successful - verify if needed
-                    if self.verify_checksums:
-                        expected_checksum = update_info.get('downloads', {}).get('primary', {}).get('checksum')
-                        if expected_checksum:
-                            self.progress_queue.put({
-                                'type': Q_MSG.STATUS,
-                                'message': f'🔐 Verifying update {i}/{num_updates}...'
-                            })
-                            
-                            if not self._verify_checksum(downloaded_file, expected_checksum):
-                                logger.log(f"Checksum mismatch for update {i}", "ERROR")
-                                # Clean up and fail
-                                downloaded_file.unlink(missing_ok=True)
-                                raise RuntimeError(f"Security verification failed for update {i}/{num_updates}")
-                    
-                    self.progress_queue.put({
-                        'type': Q_MSG.STATUS,
-                        'message': f'✅ Update {i}/{num_updates} downloaded successfully!'
-                    })
-                    
-                    # INSTALL IMMEDIATELY (install-as-you-go)
-                    self.progress_queue.put({
-                        'type': Q_MSG.OVERALL_STATUS,
-                        'message': f'📦 Installing Update {i}/{num_updates}...'
-                    })
-                    
-                    # Extract
-                    self.progress_queue.put({
-                        'type': Q_MSG.STATUS,
-                        'message': f'📂 Extracting update {i}/{num_updates}...'
-                    })
-                    self.extractor.extract_archive(downloaded_file, extract_dir, self.progress_queue, self.cancel_event)
-                    
-                    # Install
-                    self.progress_queue.put({
-                        'type': Q_MSG.STATUS,
-                        'message': f'💾 Installing update {i}/{num_updates} to game directory...'
-                    })
-                    self.progress_queue.put({'type': Q_MSG.PROGRESS, 'value': 0})
-                    self.extractor.install_files(extract_dir, self.game_dir, self.progress_queue, self.cancel_event)
-                    
-                    # Clean up extracted files for next update
-                    for item in extract_dir.iterdir():
-                        if item.is_dir():
-                            import shutil
-                            shutil.rmtree(item, ignore_errors=True)
-                        else:
-                            item.unlink(missing_ok=True)
-                    
-                    # Delete downloaded archive to save space
-                    downloaded_file.unlink(missing_ok=True)
-                    
-                    # Mark as completed and installed
-                    completed_updates.append({
-                        'info': update_info,
-                        'installed': True
-                    })
-                    
-                    self.progress_queue.put({
-                        'type': Q_MSG.STATUS,
-                        'message': f'✅ Update {i}/{num_updates} installed successfully! Game now at v{to_ver}'
-                    })
-                    
-                except Exception as e:
-                    # Update failed - but previous updates are already installed!
-                    logger.log(f"Sequential update {i}/{num_updates} failed: {e}", "ERROR")
-                    
-                    current_version = self.updates[i-2].get('to_version', 'unknown') if i > 1 else 'base'
-                    
-                    self.progress_queue.put({
-                        'type': Q_MSG.DOWNLOAD_FAILED,
-                        'reason': f'Update {i}/{num_updates} failed: {str(e)}\n\n'
-                                  f'✅ Good News: Updates 1-{len(completed_updates)} are already installed!\n'
-                                  f'📌 Current Game Version: v{current_version}\n'
-                                  f'❌ Failed at: v{from_ver} → v{to_ver}\n\n'
-                                  f'Your game is playable at v{current_version}. '
-                                  f'You can retry the update later to complete remaining updates.'
-                    })
-                    
-                    raise
-        
-        # All updates downloaded AND installed successfully!
-        self.progress_queue.put({
-            'type': Q_MSG.OVERALL_STATUS,
-            'message': f'🎉 All {num_updates} updates installed successfully!'
-        })
-        
-        return completed_updates
-
-    def _run_download_phase(self) -> List[Dict[str, Any]]:
-        """
-        Main download phase - detects schema version and uses appropriate method.
-        """
-        # Check if using new v2.0 schema with sequential updates
-        schema_version = self.data.get('metadata', {}).get('schema_version', '1.0')
-        supports_sequential = self.data.get('metadata', {}).get('supports_sequential_updates', False)
-        
-        if schema_version == '2.0' or supports_sequential:
-            logger.log("Using sequential update system (v2.0 schema)", "INFO")
-            return self._run_download_phase_sequential()
-        else:
-            logger.log("Using legacy parallel download system", "INFO")
-            return self._run_download_phase_legacy()
-    
-    def _run_download_phase_legacy(self) -> List[Dict[str, Any]]:
-        """Legacy download phase for old schema (original Cricket 24 method)."""
-        downloaded_files_map = []
-        num_updates = len(self.updates)
-        
-        # INTELLIGENT MODE DETECTION for contextual messaging
-        is_single_host_mode = all(len(update.get('links', [])) == 1 for update in self.updates)
-        total_unique_hosts = len(set(link['host_id'] for update in self.updates for link in update.get('links', [])))
-        
-        if is_single_host_mode and total_unique_hosts == 1:
-            # Pure single host mode - simplified messaging
-            single_host_name = self.updates[0].get('links', [{}])[0].get('host_id', 'selected host')
-            self.progress_queue.put({'type': Q_MSG.OVERALL_STATUS, 'message': f"📱 DOWNLOAD: Starting {num_updates} patch(es) from {single_host_name}"})
-            self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"📡 Connecting to {single_host_name} for {num_updates} update file(s)..."})
-        else:
-            # Multi-host smart mode - advanced messaging
-            self.progress_queue.put({'type': Q_MSG.OVERALL_STATUS, 'message': f"🚀 SMART DOWNLOAD: Starting {num_updates} patch(es) with intelligent host selection..."})
-            self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"🧠 Initializing multi-host download system for {num_updates} update file(s)..."})
-        
-        for i, update_info in enumerate(self.updates):
-            if self.cancel_event.is_set(): raise InterruptedError("Download phase cancelled.")
-            
-            # Enhanced patch info with contextual messaging
-            patch_name = f"v{update_info.get('from', '?')} → v{update_info.get('to', '?')}"
-            available_hosts = len(update_info.get('links', []))
-            patch_is_single_host = available_hosts == 1
-            
-            if patch_is_single_host:
-                # Single host for this patch
-                host_name = update_info.get('links', [{}])[0].get('host_id', 'host')
-                self.progress_queue.put({'type': Q_MSG.OVERALL_STATUS, 'message': f"📥 PATCH {i+1}/{num_updates}: {patch_name} from {host_name}"})
-                self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"📡 Downloading patch {patch_name} from {host_name}..."})
-            else:
-                # Multi-host for this patch
-                self.progress_queue.put({'type': Q_MSG.OVERALL_STATUS, 'message': f"📥 SMART PATCH {i+1}/{num_updates}: {patch_name} | {available_hosts} hosts available"})
-                self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"🧠 Smart system: Testing {available_hosts} hosts for patch {patch_name}..."})
-            
-            archive_name = f"C26_Update_{update_info['from']}_to_{update_info['to']}.zip"
-            
-            try:
-                download_result = self.downloader.download_file(update_info.get('links', []), self.cache_dir, archive_name)
-                if not download_result:
-                    if self.cancel_event.is_set(): 
-                        raise InterruptedError("Download cancelled during file transfer.")
-                    else: 
-                        # Create contextual error message based on available hosts
-                        if available_hosts == 1:
-                            # Single host failure
-                            single_host_name = update_info.get('links', [{}])[0].get('host_id', 'selected host')
-                            raise RuntimeError(f"DOWNLOAD FAILED: {single_host_name} was unable to provide the update file for v{update_info.get('to', 'N/A')}. This could be due to network issues or server problems.")
-                        else:
-                            # Multi-host failure  
-                            raise RuntimeError(f"SMART DOWNLOAD FAILED: All {available_hosts} hosts failed for update v{update_info.get('to', 'N/A')}.")
+                               font=fonts['body'],
+                               foreground='#e74c3c')  # Red for errors
                 
-                dl_file_path, host_id = download_result
+                style.configure('Modern.Info.TLabel',
+                               font=fonts['body'],
+                               foreground='#3498db')  # Blue for info
                 
-                # Show success with host info
-                self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"✅ Patch {i+1}/{num_updates} downloaded successfully from {host_id}"})
+                style.configure('Modern.Muted.TLabel',
+                               font=('Segoe UI', 8),
+                               foreground=colors['text_muted'])
                 
-            except Exception as e:
-                # Enhanced error reporting with contextual host information
-                error_msg = str(e)
-                if "SMART DOWNLOAD FAILED" in error_msg or "hosts failed" in error_msg:
-                    raise RuntimeError(f"Smart multi-host download system failed for patch {patch_name}: {error_msg}")
-                elif "DOWNLOAD FAILED" in error_msg:
-                    raise RuntimeError(f"Single host download failed for patch {patch_name}: {error_msg}")
-                else:
-                    raise RuntimeError(f"Download error for patch {patch_name}: {error_msg}")
-            
-            if self.verify_checksums:
-                self.progress_queue.put({'type': Q_MSG.OVERALL_STATUS, 'message': f"🔍 SECURITY CHECK: Verifying Patch {i+1}/{num_updates}..."})
-                self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"🔐 Checking file integrity for {patch_name} from {host_id}..."})
+                # Enhanced progress styles
+                style.configure('Modern.Progress.TLabel',
+                               font=fonts['body'],
+                               foreground='#3498db')  # Blue for progress
                 
-                expected_checksum = self._get_checksum_for_host(host_id, update_info['key'])
+                logger.log("Modern theme styles applied successfully", "INFO")
                 
-                if expected_checksum:
-                    if not self._verify_checksum(dl_file_path, expected_checksum):
-                        self.progress_queue.put({'type': Q_MSG.CHECKSUM_CONFIRM, 'update_info': update_info})
-                        if not self.decision_queue.get():
-                            if dl_file_path.exists(): dl_file_path.unlink(missing_ok=True)
-                            raise RuntimeError(f"Update aborted by user due to checksum mismatch for v{update_info.get('to', 'N/A')}.")
-                        logger.log(f"User continued despite checksum mismatch for v{update_info.get('to', 'N/A')}.", "WARNING")
-                    else:
-                        self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"🔐 Security check passed for {patch_name}"})
-                else:
-                    logger.log(f"No checksum found for host '{host_id}' for patch to v{update_info['to']}. Skipping verification.", "WARNING")
-                    self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"⚠️ No checksum available for {patch_name} from {host_id}"})
-
-            downloaded_files_map.append({'info': update_info, 'path': dl_file_path})
-            
-        # Final success status with contextual messaging
-        if num_updates == 1 and available_hosts == 1:
-            single_host_name = downloaded_files_map[0]['info']['links'][0]['host_id']
-            self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"✅ Update downloaded successfully from {single_host_name}"})
-        else:
-            self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"✅ All {num_updates} patch(es) downloaded successfully with smart system"})
-        return downloaded_files_map
-
-    def _run_install_phase(self, files_to_install: List[Dict[str, Any]]):
-        with tempfile.TemporaryDirectory(prefix="c26-extract-") as temp_extract_dir_str:
-            extract_dir = Path(temp_extract_dir_str)
-            for i, downloaded_file in enumerate(files_to_install):
-                if self.cancel_event.is_set(): raise InterruptedError("Installation phase cancelled.")
+            except Exception as e:
+                logger.log(f"Failed to configure custom styles: {e}", "WARNING")
+                # Fall back to basic styling
                 
-                self.progress_queue.put({'type': Q_MSG.OVERALL_STATUS, 'message': f"Extracting Patch {i+1}/{len(files_to_install)}..."})
-                self.extractor.extract_archive(downloaded_file['path'], extract_dir, self.progress_queue, self.cancel_event)
-
-                self.progress_queue.put({'type': Q_MSG.OVERALL_STATUS, 'message': f"Installing Patch {i+1}/{len(files_to_install)}..."})
-                self.progress_queue.put({'type': Q_MSG.PROGRESS, 'value': 0})
-                self.extractor.install_files(extract_dir, self.game_dir, self.progress_queue, self.cancel_event)
-
-                for item in extract_dir.iterdir():
-                    if item.is_dir(): shutil.rmtree(item)
-                    else: item.unlink()
-
-    def _cleanup_successful_update_files(self, downloaded_files: List[Dict[str, Any]]):
-        logger.log("Update successful. Cleaning up used patch files.", "INFO")
-        self.progress_queue.put({'type': Q_MSG.OVERALL_STATUS, 'message': "Cleaning up temporary files..."})
-        for file_data in downloaded_files:
-            archive_path = file_data['path']
-            try:
-                archive_path.unlink(missing_ok=True)
-            except OSError as e:
-                logger.log(f"Could not delete file {archive_path.name} during cleanup: {e}", "WARNING")
+        except Exception as e:
+            logger.log(f"Critical error in theme application: {e}", "ERROR")
+            # Application will continue with default TTK styles
 
-    def _cleanup_failed_update_files(self, downloaded_files: List[Dict[str, Any]]):
-        logger.log("Cleaning up files from failed/cancelled update.", "INFO")
-        for file_data in downloaded_files:
-            archive_path = file_data['path']
-            try:
-                archive_path.with_suffix(archive_path.suffix + '.progress').unlink(missing_ok=True)
-                archive_path.unlink(missing_ok=True)
-                logger.log(f"Deleted incomplete download: {archive_path.name}", "INFO")
-            except OSError as e:
-                logger.log(f"Could not delete file {archive_path.name} during cleanup: {e}", "WARNING")
-
-    def _get_checksum_for_host(self, host_id: str, update_key: str) -> Optional[str]:
-        for host in self.data.get('hosts', []):
-            if host.get('id') == host_id:
-                host_checksums = host.get('checksums')
-                if isinstance(host_checksums, dict):
-                    checksum = host_checksums.get(update_key)
-                    if checksum:
-                        logger.log(f"Found specific checksum for host '{host_id}' and patch '{update_key}'.", "INFO")
-                        return checksum
-                    else:
-                        logger.log(f"Host '{host_id}' has a checksums object, but no entry for '{update_key}'.", "WARNING")
-                        return None
-        
-        logger.log(f"No checksums object defined for host '{host_id}'. Verification for this file will be skipped.", "WARNING")
-        return None
+# Alias for backwards compatibility
+ThemeManager = ModernThemeManager
 
-    def _verify_checksum(self, file_path: Path, expected_hash: str) -> bool:
-        self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"Verifying integrity of {file_path.name}..."})
-        logger.log(f"Verifying checksum for {file_path.name}", "INFO"); sha256 = hashlib.sha256()
-        try:
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4 * 1024 * 1024), b""):
-                    if self.cancel_event.is_set(): return False
-                    self.pause_event.wait()
-                    sha256.update(chunk)
-            is_valid = sha256.hexdigest().lower() == expected_hash.lower()
-            logger.log(f"Checksum for {file_path.name} {'OK' if is_valid else 'MISMATCH'}.", "INFO" if is_valid else "ERROR")
-            return is_valid
-        except IOError as e:
-            logger.log(f"Could not read file for checksum: {e}", "ERROR")
-            return False
+class AppState(Enum):
+    STARTING = auto(); IDLE = auto(); UPDATING = auto(); VERIFYING = auto()
+    DIAGNOSTICS = auto(); MANUAL_INSTALLING = auto(); BUSY = auto()
 
-class GameVerifier:
-    """Handles the logic for verifying game files against a manifest."""
-    def __init__(self, game_dir: Path, manifest: Dict, queue: queue.Queue, cancel: threading.Event, pause: threading.Event):
-        self.game_dir, self.manifest_data = game_dir, manifest
-        self.progress_queue, self.cancel_event, self.pause_event = queue, cancel, pause
-        self.issue_buffer: List[Tuple[str, str]] = []
-        self.BUFFER_FLUSH_SIZE = 100
-        self.BUFFER_FLUSH_INTERVAL_S = 0.5
-        self.last_flush_time = 0
-
-    def _flush_issue_buffer(self, force: bool = False):
-        if self.issue_buffer and (force or len(self.issue_buffer) >= self.BUFFER_FLUSH_SIZE or time.time() - self.last_flush_time > self.BUFFER_FLUSH_INTERVAL_S):
-            self.progress_queue.put({'type': Q_MSG.VERIFY_ISSUES_BATCH, 'batch': list(self.issue_buffer)})
-            self.issue_buffer.clear()
-            self.last_flush_time = time.time()
-
-    def _calculate_sha256(self, file_path: Path) -> Optional[str]:
-        sha256 = hashlib.sha256()
-        try:
-            with open(file_path, "rb") as f:
-                while chunk := f.read(4 * 1024 * 1024):
-                    if self.cancel_event.is_set(): return None
-                    self.pause_event.wait(); sha256.update(chunk)
-            return sha256.hexdigest()
-        except (IOError, PermissionError):
-            logger.log(f"Permission denied or IO error reading {file_path} for hashing.", "ERROR")
-            return None
+# ==============================================================================
+# --- HELPER FUNCTIONS & DECORATORS ---
+# ==============================================================================
+def is_admin() -> bool:
+    """Checks if the script is running with administrative privileges."""
+    try: return ctypes.windll.shell32.IsUserAnAdmin() != 0
+    except Exception: return False
 
-    def run(self):
-        logger.log("Starting game file verification (in-memory)...", "INFO")
-        self.progress_queue.put({'type': Q_MSG.OVERALL_STATUS, 'message': 'Verifying Game Files'})
-        normalized_manifest = {key.replace('\\', '/'): value for key, value in self.manifest_data.items()}
-        try:
-            local_files = {p.relative_to(self.game_dir).as_posix() for p in self.game_dir.rglob('*') if p.is_file()}
-        except PermissionError:
-            self.progress_queue.put({'type': Q_MSG.ERROR, 'message': "Permission denied when scanning game files. Please check folder permissions."})
-            return
-        manifest_files = set(normalized_manifest.keys())
-        missing_files, corrupted_files, good_files, extra_files, unreadable_files = [], [], [], sorted(list(local_files - manifest_files)), []
-        self.last_flush_time = time.time()
-        for rel_path in sorted(list(manifest_files - local_files)):
-            if self.cancel_event.is_set(): break
-            missing_files.append(rel_path)
-            self.issue_buffer.append(('missing', rel_path))
-            self._flush_issue_buffer()
-        if not self.cancel_event.is_set():
-            files_to_check = sorted(list(manifest_files.intersection(local_files)))
-            last_update_time = time.time()
-            for i, rel_path in enumerate(files_to_check):
-                if self.cancel_event.is_set(): break
-                self.pause_event.wait()
-                current_time = time.time()
-                if current_time - last_update_time > 0.1:
-                    self.progress_queue.put({'type': Q_MSG.VERIFY_STATS, 'data': {'processed': i, 'total': len(files_to_check), 'missing': len(missing_files), 'corrupted': len(corrupted_files), 'current_file': Path(rel_path).name}})
-                    last_update_time = current_time
-                full_path = self.game_dir / rel_path.replace('/', os.sep); expected_hash = normalized_manifest.get(rel_path)
-                if not expected_hash: continue
-                calculated_hash = self._calculate_sha256(full_path)
-                if calculated_hash is None:
-                    if self.cancel_event.is_set(): break
-                    unreadable_files.append(rel_path)
-                    continue
-                if calculated_hash.lower() == expected_hash.lower():
-                    good_files.append(rel_path)
+def require_admin(relaunch_arg: str = "") -> Callable:
+    """
+    Decorator for controller methods that require admin rights.
+    If not admin, it prompts the user to relaunch the application with elevation.
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(controller: 'AppController', *args, **kwargs):
+            logger.log(f"Checking admin rights for {func.__name__}. Current admin status: {controller.is_admin}", "SETTING")
+            
+            if controller.is_admin:
+                logger.log(f"Admin rights confirmed. Executing {func.__name__}.", "SETTING")
+                return func(controller, *args, **kwargs)
+            else:
+                logger.log(f"Admin rights required for {func.__name__}. Prompting user for elevation.", "SETTING")
+                msg = "This action requires Admin rights. The application will now restart with elevated permissions to complete the operation.\n\nWould you like to continue?"
+                if messagebox.askyesno("Admin Rights Required", msg):
+                    # Set a visual indicator that we're relaunching
+                    if hasattr(controller.view, 'diag_run_button'):
+                        controller.view.diag_run_button.config(text="🔄 Relaunching as Admin...", state='disabled')
+                    logger.log(f"User approved admin elevation. Relaunching with arg: {relaunch_arg}", "SETTING")
+                    controller._relaunch_as_admin(relaunch_arg)
+                    # Close current application to avoid confusion
+                    controller.view.after(2000, controller.on_closing)  # Close after 2 seconds
                 else:
-                    corrupted_files.append(rel_path)
-                    self.issue_buffer.append(('corrupted', rel_path))
-                    logger.log(f"Verification failed for {rel_path}. Hash mismatch.", "WARNING")
-                self._flush_issue_buffer()
-        self._flush_issue_buffer(force=True)
-        if self.cancel_event.is_set():
-            self.progress_queue.put({'type': Q_MSG.VERIFY_CANCELLED})
-            return
-        final_data = {'processed': len(files_to_check), 'total': len(files_to_check), 'missing': len(missing_files), 'corrupted': len(corrupted_files), 'current_file': "Finalizing report..."}
-        self.progress_queue.put({'type': Q_MSG.VERIFY_STATS, 'data': final_data})
-        results = {"missing": missing_files, "corrupted": corrupted_files, "extra": extra_files, "good": good_files, "unreadable": unreadable_files}
-        self.progress_queue.put({'type': Q_MSG.VERIFY_COMPLETE, 'results': results}); logger.log("Game file verification finished.", "INFO")
+                    logger.log("User cancelled admin elevation request.", "SETTING")
+                    # Reset state if user cancels
+                    controller.set_state(AppState.IDLE)
+        return wrapper
+    return decorator
+
+# ==============================================================================
+# --- TESTING AND VALIDATION FUNCTIONS ---
+# ==============================================================================
+def run_basic_functionality_tests():
+    """Run basic tests to ensure core functionality is working."""
+    test_results = []
+    
+    try:
+        # Test 1: Logger functionality
+        test_logger = Logger("test_log.txt")
+        test_logger.log("Test message", "INFO")
+        test_results.append(("Logger Test", "PASS", "Basic logging works"))
+    except Exception as e:
+        test_results.append(("Logger Test", "FAIL", str(e)))
+    
+    try:
+        # Test 2: Constants validation
+        assert hasattr(Constants, 'APP_NAME')
+        assert hasattr(Constants, 'SCRIPT_VERSION')
+        assert hasattr(Constants, 'CACHE_DIR')
+        test_results.append(("Constants Test", "PASS", "All required constants defined"))
+    except Exception as e:
+        test_results.append(("Constants Test", "FAIL", str(e)))
+    
+    try:
+        # Test 3: Theme manager functionality
+        theme = ModernThemeManager.get_theme('dark')
+        assert 'colors' in theme
+        assert 'fonts' in theme
+        test_results.append(("Theme Manager Test", "PASS", "Theme system works"))
+    except Exception as e:
+        test_results.append(("Theme Manager Test", "FAIL", str(e)))
+    
+    try:
+        # Test 4: Credits validation (ensure no Begula references)
+        credits_text = Credits.get_credits_text()
+        if 'begula' in credits_text.lower() or 'beluga' in credits_text.lower():
+            test_results.append(("Credits Test", "FAIL", "Begula still referenced in credits"))
+        else:
+            test_results.append(("Credits Test", "PASS", "Begula successfully removed"))
+    except Exception as e:
+        test_results.append(("Credits Test", "FAIL", str(e)))
+    
+    try:
+        # Test 5: Path safety validation
+        test_path = Path("test/../../dangerous")
+        safe_game_dir = Path("C:/test_game")
+        resolved_test = test_path.resolve()
+        resolved_game = safe_game_dir.resolve()
+        
+        # This should detect path traversal
+        is_safe = str(resolved_test).startswith(str(resolved_game))
+        if not is_safe:
+            test_results.append(("Path Safety Test", "PASS", "Path traversal detection works"))
+        else:
+            test_results.append(("Path Safety Test", "FAIL", "Path traversal not detected"))
+    except Exception as e:
+        test_results.append(("Path Safety Test", "FAIL", str(e)))
+    
+    # Print test results
+    logger.log("=== FUNCTIONALITY TEST RESULTS ===", "INFO")
+    for test_name, result, details in test_results:
+        status_icon = "✅" if result == "PASS" else "❌"
+        logger.log(f"{status_icon} {test_name}: {result} - {details}", "INFO")
+    
+    return test_results
 
+# ==============================================================================
+# --- SYSTEM DIAGNOSTICS ---
+# ==============================================================================
 class DiagnosticsManager:
     """Collects and reports system, game, and crash log information."""
     def __init__(self, game_dir: Optional[Path]):
@@ -2731,9 +613,7 @@ class DiagnosticsManager:
     def _get_wmi_data(self) -> Dict[str, str]:
         wmi_report = {}
         try:
-            import pythoncom
             pythoncom.CoInitializeEx(0)
-            import wmi
             wmi_obj = wmi.WMI()
 
             ram_info = psutil.virtual_memory()
@@ -2939,6 +819,267 @@ class DiagnosticsManager:
         logger.log("Diagnostics report generation complete.", "INFO")
         return report
 
+# ==============================================================================
+# --- LOG SERVICE ---
+# ==============================================================================
+LOG_VIEW_FILTERS: Dict[str, Optional[Tuple[int, ...]]] = {
+    "All levels": None, "Warnings & errors": (3, 4, 5), "Errors only": (4, 5), "Settings": (1,), "Diagnostics": (2,)}
+
+class _LogFileIndex:
+    """Line start offsets and level codes for the first `covered` bytes of one log file."""
+    __slots__ = ('path', 'file_id', 'mtime_ns', 'covered', 'saved', 'offsets', 'levels')
+
+    def __init__(self, path: Path, file_id: int = 0, mtime_ns: int = 0):
+        self.path, self.file_id, self.mtime_ns = path, file_id, mtime_ns
+        self.covered = self.saved = 0
+        self.offsets, self.levels = array('Q'), bytearray()
+
+class LogIndex:
+    """Line-offset index over the application log and its rotated/archived copies, oldest first.
+
+    Lines are numbered across all files, so the Logs tab can jump, search and filter the full
+    history while holding only the rows it shows. Each line has a one-byte level code (see
+    cricket26.logview.LOG_LEVELS) for filtering. Archives never change, so their indexes are kept in
+    INDEX_DIR and reused by later sessions; the live log is extended from where the last
+    refresh stopped. When the log is rotated its index carries over to the archive.
+    `refresh()` runs on one thread (the LogService worker); readers may call from any thread.
+    """
+    INDEX_DIR = Constants.CACHE_DIR / "log_index"
+    _MAGIC = b'C26L'
+    _HEADER = struct.Struct('<4sQQqQ')  # magic, file id, covered bytes, mtime_ns, line count
+
+    def __init__(self, log_file: Path):
+        self.log_file = Path(log_file)
+        self._lock = threading.RLock()
+        self._files: List[_LogFileIndex] = []
+        self._starts: List[int] = [0]  # Global number of each file's first line, plus the total
+
+    @property
+    def total(self) -> int:
+        with self._lock: return self._starts[-1]
+
+    def refresh(self) -> bool:
+        """Brings the index up to date with the files on disk; True when line numbers shifted."""
+        archives = []
+        for path in self.log_file.parent.glob(f"{self.log_file.stem}_*{self.log_file.suffix}"):
+            try: st = path.stat()
+            except OSError: continue
+            archives.append((st.st_mtime_ns, path.name, path, st))
+        with self._lock: old = list(self._files)
+        by_name = {entry.path.name: entry for entry in old}
+        current = old[-1] if old and old[-1].path == self.log_file else None
+        files = []
+        for _, _, path, st in sorted(archives):
+            entry = by_name.get(path.name)
+            if entry is None or entry.mtime_ns != st.st_mtime_ns or entry.covered > st.st_size:
+                if current is not None and current.file_id and current.file_id == st.st_ino: entry, current = current, None  # The log was just rotated
+                else: entry = self._load(path, st, archive=True) or _LogFileIndex(path, st.st_ino, st.st_mtime_ns)
+                entry.path, entry.mtime_ns = path, st.st_mtime_ns
+                self._extend(entry)
+            files.append(entry)
+        try:
+            st = self.log_file.stat()
+            if current is None or (current.file_id and st.st_ino and current.file_id != st.st_ino) or current.covered > st.st_size:
+                current = self._load(self.log_file, st) or _LogFileIndex(self.log_file, st.st_ino)
+            files.append(current)
+        except OSError: current = None
+        shifted = [id(entry) for entry in files[:len(old)]] != [id(entry) for entry in old]  # Rotation only appends a file
+        with self._lock:
+            self._files = files
+            self._starts = [0]
+            for entry in files: self._starts.append(self._starts[-1] + len(entry.offsets))
+        if current is not None and self._extend(current):
+            with self._lock: self._starts[-1] = self._starts[-2] + len(current.offsets)
+        return shifted
+
+    def _extend(self, entry: _LogFileIndex) -> bool:
+        try:
+            with entry.path.open('rb') as f: f.seek(entry.covered); data = f.read()
+        except OSError: return False
+        offsets, levels, consumed = index_log_lines(data, entry.covered, entry.levels[-1] if entry.levels else 0)
+        if not consumed: return False
+        with self._lock: entry.offsets.extend(offsets); entry.levels.extend(levels); entry.covered += consumed
+        return True
+
+    def _locate(self, line: int) -> Tuple[int, int]:
+        idx = bisect.bisect_right(self._starts, line) - 1
+        return idx, line - self._starts[idx]
+
+    def read(self, lines: List[int]) -> List[Tuple[str, int]]:
+        """(text, level code) for each global line number, in the order given."""
+        result: List[Tuple[str, int]] = []
+        with self._lock:
+            files, total = list(self._files), self._starts[-1]
+            spans = []  # (file, first local line, end local line) per contiguous run
+            for line in lines:
+                if not 0 <= line < total: spans.append([None, 0, 1]); continue  # The view is a refresh behind
+                idx, local = self._locate(line)
+                if spans and spans[-1][0] == idx and spans[-1][2] == local: spans[-1][2] += 1
+                else: spans.append([idx, local, local + 1])
+            bounds = [(files[idx], files[idx].offsets[a], files[idx].offsets[b] if b < len(files[idx].offsets) else files[idx].covered, a, b) if idx is not None else (None, 0, 0, a, b) for idx, a, b in spans]
+        handles: Dict[int, BinaryIO] = {}
+        try:
+            for entry, start, end, a, b in bounds:
+                if entry is None: result.append(("", 0)); continue
+                try:
+                    f = handles.get(id(entry)) or handles.setdefault(id(entry), entry.path.open('rb'))
+                    f.seek(start); data = f.read(end - start).decode('utf-8', errors='replace').split('\n')
+                except OSError: data = []  # Archive deleted since the last refresh
+                result.extend((data[i].rstrip('\r') if i < len(data) else "", entry.levels[a + i]) for i in range(b - a))
+        finally:
+            for f in handles.values(): f.close()
+        return result
+
+    def matching(self, levels: Iterable[int], start: int = 0) -> array:
+        """Global numbers of the lines at or after `start` whose level code is in `levels`."""
+        pattern = re.compile(b'[' + re.escape(bytes(sorted(levels))) + b']')
+        out = array('I')
+        with self._lock:
+            for entry, base in zip(self._files, self._starts):
+                if base + len(entry.levels) <= start: continue
+                out.extend(base + m.start() for m in pattern.finditer(entry.levels, max(0, start - base)))
+        return out
+
+    def find(self, query: str, start: int, forward: bool = True, levels: Optional[Iterable[int]] = None) -> Optional[int]:
+        """First line containing query (case-insensitive) from `start` onwards (before it when searching back), wrapping around."""
+        needle = query.lower().encode('utf-8', errors='ignore'); wanted = set(levels) if levels else None
+        with self._lock: files, starts = list(self._files), list(self._starts)
+        total = starts[-1]
+        if not needle or not total: return None
+        start = max(0, min(start, total))
+        for lo, hi in ([(start, total), (0, start)] if forward else [(0, start), (start, total)]):
+            order = range(len(files)) if forward else reversed(range(len(files)))
+            for idx in order:
+                a, b = max(lo, starts[idx]) - starts[idx], min(hi, starts[idx + 1]) - starts[idx]
+                if a >= b: continue
+                hit = self._find_in(files[idx], a, b, needle, forward, wanted)
+                if hit is not None: return starts[idx] + hit
+        return None
+
+    def _find_in(self, entry: _LogFileIndex, a: int, b: int, needle: bytes, forward: bool, wanted: Optional[set]) -> Optional[int]:
+        with self._lock: offsets, begin, end = entry.offsets, entry.offsets[a], entry.offsets[b] if b < len(entry.offsets) else entry.covered
+        try:
+            with entry.path.open('rb') as f: f.seek(begin); data = f.read(end - begin).lower()
+        except OSError: return None
+        pos, stop = 0, len(data)
+        while True:
+            found = data.find(needle, pos) if forward else data.rfind(needle, 0, stop)
+            if found < 0: return None
+            line = bisect.bisect_right(offsets, begin + found, a, b) - 1
+            if wanted is None or entry.levels[line] in wanted: return line
+            if forward: pos = offsets[line + 1] - begin if line + 1 < b else len(data)
+            else: stop = offsets[line] - begin
+
+    def _index_path(self, path: Path) -> Path:
+        return self.INDEX_DIR / f"{path.name}.idx"
+
+    def _load(self, path: Path, st: os.stat_result, archive: bool = False) -> Optional[_LogFileIndex]:
+        try: raw = self._index_path(path).read_bytes(); magic, file_id, covered, mtime_ns, count = self._HEADER.unpack_from(raw)
+        except (OSError, struct.error): return None
+        if magic != self._MAGIC or covered > st.st_size or len(raw) != self._HEADER.size + count * 9: return None
+        if (file_id and st.st_ino and file_id != st.st_ino) or (archive and mtime_ns != st.st_mtime_ns): return None
+        entry = _LogFileIndex(path, file_id, mtime_ns); entry.covered = entry.saved = covered
+        entry.offsets.frombytes(raw[self._HEADER.size:self._HEADER.size + count * 8]); entry.levels = bytearray(raw[self._HEADER.size + count * 8:])
+        return entry
+
+    def save(self, include_current: bool = True):
+        """Writes changed per-file indexes to INDEX_DIR and removes those of deleted archives."""
+        with self._lock:
+            files = [entry for entry in self._files if include_current or entry.path != self.log_file]
+            snapshots = [(entry, self._HEADER.pack(self._MAGIC, entry.file_id, entry.covered, entry.mtime_ns, len(entry.offsets)) + entry.offsets.tobytes() + bytes(entry.levels))
+                         for entry in files if entry.covered != entry.saved]
+            keep = {self._index_path(entry.path).name for entry in self._files}
+        try:
+            self.INDEX_DIR.mkdir(parents=True, exist_ok=True)
+            for entry, payload in snapshots:
+                temp = self._index_path(entry.path).with_suffix('.tmp'); temp.write_bytes(payload); os.replace(temp, self._index_path(entry.path))
+                entry.saved = entry.covered
+            for path in self.INDEX_DIR.glob('*.idx'):
+                if path.name not in keep: path.unlink(missing_ok=True)
+        except OSError as e: print(f"Warning: Could not save log index: {e}")
+
+class LogService:
+    """Keeps the Logs tab's LogIndex and the Windows event logs up to date off the Tk thread.
+
+    `request()` schedules a refresh on a single worker thread; requests that arrive while one is
+    running fold into one follow-up refresh. The wevtutil queries are cached for EVENT_REFRESH_S.
+    Each refresh that changes something is passed to `deliver` as a batch for
+    `AppGUI.apply_log_batch`: {'reset', 'total', 'events'}, where reset means line numbers
+    shifted (or the user asked to start over), events is the (text, tag ranges) block from
+    render_event_logs, and total is the line count the view renders through the index (which
+    replaces the pre-rendered 'lines' of earlier batches).
+    Searches run on the same worker and arrive as {'search', 'line'}.
+    """
+    EVENT_REFRESH_S = 60.0
+    EVENT_QUERIES = (("Application", 20, 5), ("System", 10, 3))  # log, events fetched, events shown
+
+    def __init__(self, log_file: Path, deliver: Callable[[dict], None], flush: Optional[Callable[[], None]] = None):
+        self.index, self.deliver, self.flush = LogIndex(log_file), deliver, flush
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='LogService')
+        self._lock = threading.Lock(); self._running = self._again = self._reset = False
+        self._events_at: Optional[float] = None; self._delivered_total = -1
+
+    def request(self, reset: bool = False):
+        """Schedules a refresh (re-sending everything when reset); safe to call from any thread."""
+        with self._lock:
+            self._reset = self._reset or reset
+            if self._running: self._again = True; return
+            self._running = True
+        try: self._executor.submit(self._run)
+        except RuntimeError:  # Shut down
+            with self._lock: self._running = False
+
+    def search(self, query: str, start: int, forward: bool = True, levels: Optional[Iterable[int]] = None):
+        """Looks for the next line containing query on the worker (see LogIndex.find)."""
+        def _search():
+            try: line = self.index.find(query, start, forward, levels)
+            except Exception as e: print(f"Warning: Log search failed: {e}"); line = None
+            self.deliver({'search': query, 'line': line})
+        try: self._executor.submit(_search)
+        except RuntimeError: pass
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self.index.save()
+
+    def _run(self):
+        while True:
+            with self._lock: reset, self._reset, self._again = self._reset, False, False
+            try: batch = self.collect(reset)
+            except Exception as e: print(f"Warning: Log refresh failed: {e}"); batch = {}
+            if batch:
+                try: self.deliver(batch)
+                except Exception as e: print(f"Warning: Log batch could not be delivered: {e}")
+            with self._lock:
+                if not (self._again or self._reset): self._running = False; return
+
+    def collect(self, reset: bool = False) -> dict:
+        """Refreshes the index (and the event logs when due); returns a batch, or {} when nothing changed."""
+        if reset: self._events_at = None
+        batch: Dict[str, Any] = {}
+        now = time.monotonic()
+        if self._events_at is None or now - self._events_at >= self.EVENT_REFRESH_S:
+            self._events_at = now
+            batch['events'] = render_event_logs([(log_name, parse_wevtutil_events(self._query_event_log(log_name, count), shown)) for log_name, count, shown in self.EVENT_QUERIES])
+        if self.flush:
+            try: self.flush()
+            except TimeoutError: pass  # Index what has reached the disk
+        shifted = self.index.refresh()
+        if shifted: self.index.save(include_current=False)
+        total = self.index.total
+        if reset or shifted or total != self._delivered_total or batch:
+            batch.update(reset=reset or shifted, total=total); self._delivered_total = total
+        return batch
+
+    @staticmethod
+    def _query_event_log(log_name: str, count: int) -> str:
+        if sys.platform != 'win32': return ""
+        try:
+            proc = subprocess.run(['wevtutil', 'qe', log_name, f'/c:{count}', '/rd:true', '/f:text'], capture_output=True, text=True,
+                                  creationflags=subprocess.CREATE_NO_WINDOW, encoding='utf-8', errors='ignore', timeout=10)
+            return proc.stdout if proc.returncode == 0 else ""
+        except (OSError, subprocess.SubprocessError): return ""
+
 # ==============================================================================
 # --- APPLICATION CONTROLLER (The Brain) ---
 # ==============================================================================
@@ -3060,13 +1201,15 @@ class AppController:
         self.verify_checksum_enabled = view.verify_checksum_var
         self.download_source_var = view.download_source_var
         self.current_version = ""
-        self.updates_to_install = []
+        self.updates_to_install = []; self.plan_data: Optional[Dict[str, Any]] = None  # update_data the shown plan was computed from
         self.last_verify_results = {}
+        self.last_verify_manifest: Dict[str, Any] = {}
         self.last_diag_report = {}
         self.diag_info_fetched = False
         self._last_diag_scan_time = 0
         self.dir_change_tasks: List[Future] = []
-        self.progress_queue = queue.Queue()
+        self.progress_queue = ProgressBus()
+        self.log_service = LogService(logger.log_file, deliver=lambda batch: self.view.after(0, self.view.apply_log_batch, batch), flush=logger.flush)
         self.decision_queue = queue.Queue()
         self.updater_cancel_event = threading.Event()
         self.downloader_pause_event = threading.Event(); self.downloader_pause_event.set()
@@ -3075,8 +1218,10 @@ class AppController:
         self.verifier_scan_started = False
         self.is_in_retry_wait = False
         self.update_data = None
+        self.startup_timings: Dict[str, float] = {}  # Milliseconds since the module started loading, per startup milestone
         self.is_admin = is_admin()
         self.task_manager = BackgroundTaskManager(self)
+        self.manifest_store = ManifestStore(Constants.MANIFEST_STORE_DIR)
         
         # NEW: Enhanced error recovery and download management
         self._last_download_failure = None  # Track last failure for retry functionality
@@ -3092,10 +1237,13 @@ class AppController:
             Q_MSG.VERIFY_CANCELLED: self._handle_verify_cancelled, Q_MSG.VERIFY_ISSUES_BATCH: self._handle_verify_issues_batch,
             Q_MSG.MANUAL_INSTALL_CONFIRM: self._handle_manual_install_confirm,
             Q_MSG.MANUAL_INSTALL_COMPLETE: self._handle_manual_install_complete,
+            Q_MSG.UPDATE_DATA: self._handle_update_data,
             Q_MSG.ERROR: lambda msg: messagebox.showerror("Error", msg.get('message', 'An unknown error occurred.')),
         }
 
     def start(self, startup_actions: List[Tuple[Callable, Tuple]]):
+        self._mark_startup('window_built')
+        self.view.after_idle(self._on_first_paint)
         self.set_state(AppState.STARTING)
         self.process_queue()
         self.view.refresh_logs()
@@ -3109,34 +1257,49 @@ class AppController:
             self.view.after(100, self.on_closing)
             return
 
+        # Stale-while-revalidate: a cached version.json is applied at once and checked in the background;
+        # only a first run (no cache) waits for the network
         self.task_manager.submit(
-            APIHandler.load_update_data,
+            self._load_initial_data,
             on_done=self._on_initial_data_loaded,
             on_error=self._on_initial_data_load_error
         )
         
         self.startup_actions = startup_actions
 
+    def _mark_startup(self, milestone: str):
+        self.startup_timings[milestone] = round((time.perf_counter() - MODULE_LOAD_START) * 1000, 1)
+
+    def _on_first_paint(self):
+        self.view.update_idletasks()  # Flush pending geometry and redraws so the mark covers the first full frame
+        self._mark_startup('first_paint')
+
+    def _load_initial_data(self) -> Tuple[Optional[Dict[str, Any]], str]:
+        data, source = APIHandler.load_cached_update_data()
+        if data is None: data, source = APIHandler.load_update_data()
+        self._mark_startup('data_loaded')
+        return data, source
+
+    def _revalidate_update_data(self):
+        """Worker: conditional GET for version.json; a changed copy is handed to the UI via progress_queue."""
+        try: data, source = APIHandler.revalidate_update_data()
+        except (requests.RequestException, ValueError) as e:
+            self._mark_startup('revalidate_failed')
+            logger.log(f"Could not revalidate version.json ({e}); keeping the cached copy.", "WARNING")
+            data, source = None, "CACHE"
+        else: self._mark_startup('revalidated')
+        self.progress_queue.put({'type': Q_MSG.UPDATE_DATA, 'data': data, 'source': source})
+
     def process_queue(self):
         try:
-            # Process all pending messages with improved batching for real-time responsiveness
-            messages_processed = 0
-            max_messages_per_cycle = Constants.MAX_QUEUE_MESSAGES_PER_CYCLE  # Use constant (was hardcoded 10)
-            
-            while not self.progress_queue.empty() and messages_processed < max_messages_per_cycle:
-                try:
-                    msg = self.progress_queue.get_nowait()
-                    handler = self.queue_handlers.get(msg.get('type'))
-                    if handler:
-                        try:
-                            handler(msg)
-                        except Exception as e:
-                            logger.log(f"Error in queue handler for {msg.get('type')}: {e}", "CRITICAL")
-                    messages_processed += 1
-                except queue.Empty:
-                    break
-                except Exception as e:
-                    logger.log(f"Critical error in process_queue loop: {e}", "CRITICAL")
+            # Sample the coalesced slots once per frame, plus a bounded number of discrete events
+            for msg in self.progress_queue.drain(Constants.MAX_QUEUE_MESSAGES_PER_CYCLE):
+                handler = self.queue_handlers.get(msg.get('type'))
+                if handler:
+                    try:
+                        handler(msg)
+                    except Exception as e:
+                        logger.log(f"Error in queue handler for {msg.get('type')}: {e}", "CRITICAL")
                     
             # Optimized periodic cleanup
             if not hasattr(self, '_cleanup_counter'):
@@ -3168,9 +1331,17 @@ class AppController:
             old_state = self.state
             self.state = new_state
             logger.log(f"State transition: {old_state.name} -> {new_state.name}", "SETTING")
+            if new_state == AppState.IDLE and old_state in [AppState.UPDATING, AppState.VERIFYING, AppState.MANUAL_INSTALLING]: self._log_progress_bus_stats()
             # Schedule UI update on main thread
             self.view.after_idle(lambda: self.view.update_ui_for_state(new_state))
 
+    def _log_progress_bus_stats(self):
+        stats = self.progress_queue.stats()
+        if not stats['posted']: return
+        logger.log(f"Progress bus: {stats['posted']} posted, {stats['delivered']} delivered, {stats['coalesced']} coalesced, {stats['dropped']} dropped, "
+                   f"peak event depth {stats['peak_event_depth']}, latency avg {stats['avg_latency_ms']:.1f} ms / max {stats['max_latency_ms']:.1f} ms", "INFO")
+        self.progress_queue.reset_stats()
+
     def on_closing(self):
         busy_states = [AppState.UPDATING, AppState.VERIFYING, AppState.MANUAL_INSTALLING, AppState.BUSY, AppState.DIAGNOSTICS]
         if self.state in busy_states:
@@ -3194,6 +1365,7 @@ class AppController:
             self.task_manager.shutdown()
         except Exception as e:
             logger.log(f"Error during task manager shutdown: {e}", "WARNING")
+        self.log_service.close()
         
         # Immediate GUI destruction
         logger.log("Application shutdown complete", "INFO")
@@ -3247,91 +1419,62 @@ class AppController:
             self.view.dashboard_status_label.config(text="Ready to check for updates.", style="Info.TLabel")
             self.view.update_plan_text.insert(tk.END, "Click 'Check for Updates' to see the required patches.")
 
-        self.updates_to_install.clear()
+        self.updates_to_install.clear(); self.plan_data = None
         self.view.update_plan_text.config(state='disabled')
         if self.state != AppState.STARTING: self.set_state(AppState.IDLE)
 
     def _get_ordered_links_for_update(self, update_key: str) -> List[Dict[str, str]]:
-        user_selection = self.download_source_var.get()
-        all_hosts_by_name = {host['name']: host for host in self.update_data.get('hosts', [])}
-
-        if user_selection != "Automatic":
-            if user_selection in all_hosts_by_name:
-                host = all_hosts_by_name[user_selection]
-                link = host['links'].get(update_key)
-                return [{'link': link, 'host_id': host['id']}] if link else []
-            return []
-
-        ordered_links = []
-        preference_order = self.update_data.get('host_preference_order', [])
-        all_hosts_by_id = {host['id']: host for host in self.update_data.get('hosts', [])}
-        for host_id in preference_order:
-            if host_id in all_hosts_by_id:
-                host = all_hosts_by_id[host_id]
-                link = host['links'].get(update_key)
-                if link:
-                    ordered_links.append({'link': link, 'host_id': host_id})
-        return ordered_links
+        return ordered_links(self.update_data, update_key, self.download_source_var.get())
 
     def check_updates(self):
         logger.log("User clicked 'Check for Updates'.", "INFO")
         if not self.update_data: messagebox.showerror("API Error", "Could not load update data."); return
         if not self.game_dir.get(): messagebox.showerror("Error", "Please select the game directory first."); return
         if not self.current_version: messagebox.showerror("Error", "Could not detect game version."); return
-        try:
-            latest = self.update_data.get('latest_version')
-            self.view.dashboard_latest_version_label.config(text=f"v{latest}")
-            if self.current_version == latest:
-                self.view.dashboard_status_label.config(text="You are on the latest version!", style="Success.TLabel")
-                self.view.update_dashboard_action_button.config(text=f"{Constants.ICON_CHECK} All Set!", state='disabled', style='TButton')
-                self.updates_to_install.clear()
-                return
-
-            versions = self.update_data.get('versions', [])
-            current_idx = versions.index(self.current_version)
-            update_keys = [f"{versions[i]}_{versions[i+1]}" for i in range(current_idx, len(versions)-1)]
-
-            update_sizes = self.update_data.get('update_sizes', {});
-            self.updates_to_install = []
-
-            for i, key in enumerate(update_keys, start=current_idx):
-                ordered_links = self._get_ordered_links_for_update(key)
-                if not ordered_links:
-                    logger.log(f"No download links found for update key {key} on any host.", "ERROR")
-                    continue
+        data, current, latest = self.update_data, self.current_version, self.update_data.get('latest_version')
+        self.view.dashboard_latest_version_label.config(text=f"v{latest}")
+        if current == latest:
+            self.view.dashboard_status_label.config(text="You are on the latest version!", style="Success.TLabel")
+            self.view.update_dashboard_action_button.config(text=f"{Constants.ICON_CHECK} All Set!", state='disabled', style='TButton')
+            self.updates_to_install.clear(); self.plan_data = data
+            return
 
-                size_str = update_sizes.get(key, "0 B")
-                size_bytes = 0
-                try:
-                    num_part_str = size_str.split()[0]
-                    num_part = float(num_part_str)
-                    if "MB" in size_str.upper(): size_bytes = int(num_part * 1024 * 1024)
-                    elif "GB" in size_str.upper(): size_bytes = int(num_part * 1024 * 1024 * 1024)
-                    elif "KB" in size_str.upper(): size_bytes = int(num_part * 1024)
-                    else: size_bytes = int(num_part)
-                except (ValueError, IndexError):
-                    size_bytes = 0
-
-                self.updates_to_install.append({
-                    'from': versions[i],
-                    'to': versions[i+1],
-                    'links': ordered_links,
-                    'size': size_str,
-                    'size_bytes': size_bytes,
-                    'key': key
-                })
+        # Route over every available patch (adjacent and cumulative), not just the adjacent-version chain. Planning
+        # may hash cached archives to adopt them into the ArchiveStore, so it runs off the Tk thread.
+        source, by_time = self.download_source_var.get(), self.view.plan_by_time_var.get()
+        def _plan():
+            planner = UpdatePlanner(data, Constants.CACHE_DIR, lambda key: ordered_links(data, key, source), HostStats(Constants.CACHE_DIR), ArchiveStore.for_cache(Constants.CACHE_DIR))
+            return data, current, planner.plan(current, latest, by_time=by_time)
 
+        self.set_state(AppState.BUSY)
+        self.view.dashboard_status_label.config(text="Planning update route...", style="Info.TLabel")
+        self.view.update_dashboard_action_button.config(state='disabled')
+        self.task_manager.submit(_plan, on_done=self._show_update_plan, on_error=self._on_update_plan_error, is_utility_task=True)
+
+    def _show_update_plan(self, result: Tuple[Dict[str, Any], str, Optional[Dict[str, Any]]]):
+        """Renders a plan from check_updates (on the Tk thread); re-plans if the data or version changed meanwhile."""
+        data, current, plan = result
+        if data is not self.update_data or current != self.current_version:
+            logger.log("Update data or game version changed while planning; planning again.", "INFO")
+            self.view.after(20, self.check_updates); return  # After the task's own switch back to IDLE
+        self.plan_data = data
+        try:
+            if plan is None: raise ValueError(f"No patch route from v{current} to v{data.get('latest_version')}")
+            self.updates_to_install = [UpdatePlanner.to_install_entry(edge) for edge in plan['route']]
+            logger.log(f"Update route ({'time' if plan['by_time'] else 'bytes'}): {' → '.join([current] + [e['to'] for e in plan['route']])} | {format_bytes(plan['bytes'])} to download, ~{format_eta(plan['seconds'])}", "INFO")
             self.view.update_plan_text.config(state='normal'); self.view.update_plan_text.delete(1.0, tk.END)
 
             if self.updates_to_install:
                 self.view.update_plan_text.tag_configure("bold", font=("Segoe UI", 10))
                 self.view.update_plan_text.insert(tk.END, "The following patches will be installed:\n\n", "cyan")
-                total_size_bytes = 0
-                for update in self.updates_to_install:
-                    self.view.update_plan_text.insert(tk.END, f"• Patch from v{update['from']} to v{update['to']} (Size: {update['size']})\n", "cyan")
-                    total_size_bytes += update['size_bytes']
+                for edge in plan['route']:
+                    note = " — already downloaded" if edge['cached'] else ("" if edge['size_bytes'] else " — size unknown")
+                    self.view.update_plan_text.insert(tk.END, f"• Patch from v{edge['from']} to v{edge['to']} (Size: {edge['size']}){note}\n", "cyan")
                 self.view.update_plan_text.insert(tk.END, f"\nTotal Download Size: ", "cyan")
-                self.view.update_plan_text.insert(tk.END, f"~{format_bytes(total_size_bytes)}", "cyan")
+                self.view.update_plan_text.insert(tk.END, f"~{format_bytes(plan['bytes'])} (est. {format_eta(plan['seconds'])})", "cyan")
+                for alternative in plan['alternatives']:
+                    hops = ' → '.join(f"v{v}" for v in [current] + [e['to'] for e in alternative['route']])
+                    self.view.update_plan_text.insert(tk.END, f"\nAlternative ({alternative['label']}): {hops} — ~{format_bytes(alternative['bytes'])}, est. {format_eta(alternative['seconds'])}", "normal")
 
                 self.view.dashboard_status_label.config(text=f"{len(self.updates_to_install)} update(s) found. Ready to install.", style="Success.TLabel")
                 logger.log(f"Found {len(self.updates_to_install)} updates.", "INFO")
@@ -3341,7 +1484,8 @@ class AppController:
                 self.view.dashboard_status_label.config(text="You are on the latest version!", style="Success.TLabel")
                 self.view.update_dashboard_action_button.config(text=f"{Constants.ICON_CHECK} All Set!", state='disabled', style='TButton')
 
-        except ValueError:
+        except ValueError as e:
+            logger.log(f"Update planning failed: {e}", "ERROR")
             messagebox.showerror("Version Error", f"Your version (v{self.current_version}) is not in the update path. Consider manual install.")
             logger.log(f"Unrecognized version v{self.current_version} in path.", "ERROR")
             self.view.dashboard_status_label.config(text="Your version is not on the official update path.", style="Error.TLabel")
@@ -3354,11 +1498,20 @@ class AppController:
             logger.log(f"Failed during update check: {e}", "CRITICAL")
 
         self.view.update_plan_text.config(state='disabled')
-        self.set_state(AppState.IDLE)
         self.view.refresh_logs()
 
+    def _on_update_plan_error(self, message: str):
+        messagebox.showerror("Update Check Failed", f"{message}\nCheck logs for details.")
+        self.view.dashboard_status_label.config(text="Update check failed.", style="Error.TLabel")
+        self.view.update_dashboard_action_button.config(text=f"{Constants.ICON_SEARCH} Check for Updates", command=self.check_updates, style="Accent.TButton", state='normal')
+        self.updates_to_install.clear()
+
     def is_game_running(self) -> bool:
-        return any(f'{Constants.GAME_EXECUTABLE}' in p.info['name'].lower() for p in psutil.process_iter(['name']))
+        return is_game_running()
+
+    def _create_scheduler(self) -> BackgroundScheduler:
+        """Background mode throttles hashing only while the game is running."""
+        return BackgroundScheduler(enabled=self.view.background_mode_var.get(), is_contended=self.is_game_running)
 
     def _cleanup_all_partial_downloads(self, preserve_significant_progress: bool = False):
         """Comprehensive cleanup of all partial download state to prevent UI issues on restart."""
@@ -3368,7 +1521,8 @@ class AppController:
             else:
                 logger.log("Cleaning up all partial download state before starting new update...", "INFO")
             
-            # Clear the cache directory of partial downloads and progress files
+            # Clear the cache directory of partial downloads and progress files; verified archives sit in the
+            # archive store (a subfolder) and are only ever evicted by ArchiveStore.evict
             if Constants.CACHE_DIR.exists():
                 for file_path in Constants.CACHE_DIR.iterdir():
                     try:
@@ -3466,11 +1620,7 @@ class AppController:
                 self.updater_cancel_event.clear()  # Clear cancel flag
                 
             # Clear any lingering progress queue messages
-            try:
-                while True:
-                    self.progress_queue.get_nowait()
-            except queue.Empty:
-                pass  # Queue is now empty
+            self.progress_queue.clear()
                 
             logger.log("Partial download cleanup completed.", "INFO")
             
@@ -3553,7 +1703,7 @@ class AppController:
         self.view.updater_pause_button.config(text=f"{Constants.ICON_PAUSE} Pause", command=self.pause_resume_download)
         self.view.updater_cancel_button.config(command=self.cancel_update)
 
-        workflow = UpdateWorkflow(self.game_dir.get(), Constants.CACHE_DIR, self.updates_to_install, self.update_data, self.progress_queue, self.updater_cancel_event, self.downloader_pause_event, self.verify_checksum_enabled.get(), self.decision_queue)
+        workflow = UpdateWorkflow(self.game_dir.get(), Constants.CACHE_DIR, self.updates_to_install, self.update_data, self.progress_queue, self.updater_cancel_event, self.downloader_pause_event, self.verify_checksum_enabled.get(), self.decision_queue, self._create_scheduler())
         
         # Enhanced heartbeat with appropriate messaging based on mode
         def update_heartbeat():
@@ -3882,9 +2032,8 @@ class AppController:
         )
 
     def update_cache_size_label(self):
-        def _task():
-            if not Constants.CACHE_DIR.exists(): return "0 B"
-            total_size = sum(f.stat().st_size for f in Constants.CACHE_DIR.glob('**/*') if f.is_file()); return format_bytes(total_size)
+        if not hasattr(self.view, 'cache_size_label'): return  # Utilities tab not built yet; it asks again when it is
+        def _task(): return format_bytes(download_cache_size()) if Constants.CACHE_DIR.exists() else "0 B"  # Store index total, no tree walk
 
         self.task_manager.submit(_task, on_done=lambda s: self.view.cache_size_label.config(text=f"Size: {s}"))
 
@@ -3896,8 +2045,8 @@ class AppController:
             self.set_state(AppState.IDLE)
             return
 
-        total_size = sum(f.stat().st_size for f in cache_dir.glob('**/*') if f.is_file())
-        if not messagebox.askyesno("Confirm Clear Cache", f"This will delete all cached update files, freeing up {format_bytes(total_size)}.\n\nAre you sure?", icon='warning'):
+        total_size = download_cache_size(cache_dir)
+        if not messagebox.askyesno("Confirm Clear Cache", f"This will delete all cached update files, freeing up about {format_bytes(total_size)}.\n\nAre you sure?", icon='warning'):
             self.set_state(AppState.IDLE)
             return
 
@@ -4099,7 +2248,10 @@ class AppController:
     @manage_state(AppState.VERIFYING)
     def start_verification(self):
         logger.log("User clicked 'Verify Game Files'.", "INFO")
-        if self.is_game_running(): messagebox.showwarning("Game Running", "Please close Cricket 26 before verifying."); self.set_state(AppState.IDLE); return
+        if self.is_game_running() and not self.view.background_mode_var.get():
+            if not messagebox.askyesno("Game Running", f"Cricket 26 is running.\n\nVerify in background mode instead? Hashing runs at low priority and is limited to {Constants.BACKGROUND_HASH_LIMIT_MB_S} MB/s until the game closes."):
+                self.set_state(AppState.IDLE); return
+            self.view.background_mode_var.set(True)
         if not self.game_dir.get() or not Path(self.game_dir.get()).exists(): messagebox.showerror("Error", "Please select a valid game directory first."); self.set_state(AppState.IDLE); return
         if not self.current_version: messagebox.showerror("Error", "Could not detect game version. Re-select directory."); self.set_state(AppState.IDLE); return
 
@@ -4130,40 +2282,32 @@ class AppController:
         report_text.insert(tk.END, "--- Issues Found ---\n", "Header")
         report_text.config(state='disabled')
 
-        self.task_manager.submit(self._load_manifest_worker, on_done=self._on_manifest_loaded, on_error=self._on_verify_error)
+        self.task_manager.submit(self._load_verification_inputs, on_done=self._on_manifest_loaded, on_error=self._on_verify_error, args=(Path(self.game_dir.get()),))
 
-    def _load_manifest_worker(self) -> Dict:
-        # Check for cancellation before starting
-        if self.verifier_cancel_event.is_set():
-            raise InterruptedError("Verification cancelled during initialization.")
-            
-        manifest_api_url = self.update_data.get('manifest_links', {}).get(self.current_version)
-        if not manifest_api_url: raise ValueError(f"A verification manifest for v{self.current_version} is not available.")
-        
-        # Check for cancellation before download
-        if self.verifier_cancel_event.is_set():
-            raise InterruptedError("Verification cancelled before downloading manifest.")
-            
-        try:
-            response = requests.get(manifest_api_url, headers={'Accept': 'application/vnd.github.v3.raw'}, timeout=15); response.raise_for_status()
-            
-            # Check for cancellation after download
-            if self.verifier_cancel_event.is_set():
-                raise InterruptedError("Verification cancelled after downloading manifest.")
-                
-            logger.log("Manifest downloaded successfully.", "INFO"); return response.json()
-        except json.JSONDecodeError as e: logger.log(f"Failed to parse manifest JSON: {e}", "CRITICAL"); raise ValueError("Downloaded manifest file is corrupted or not valid JSON.")
-        except requests.RequestException as e: logger.log(f"Failed to download manifest: {e}", "ERROR"); raise ConnectionError("Could not download the verification manifest.")
+    def _load_verification_inputs(self, game_dir: Path) -> Tuple[Dict, VerificationJournal, Optional[Dict]]:
+        """Loads the manifest plus any matching checkpoint from an interrupted run."""
+        manifest = self.manifest_store.load(self.update_data, self.current_version, self.verifier_cancel_event)
+        journal = VerificationJournal(game_dir, manifest)
+        return manifest, journal, journal.read_checkpoint()
 
-    def _on_manifest_loaded(self, manifest_data: Dict):
+    def _on_manifest_loaded(self, inputs: Tuple[Dict, VerificationJournal, Optional[Dict]]):
+        manifest_data, journal, checkpoint = inputs
         logger.log("Manifest loaded, starting verifier worker.", "INFO")
+        self.last_verify_manifest = manifest_data
+        if checkpoint:
+            if messagebox.askyesno("Resume Verification", f"A previous verification of this folder stopped after {len(checkpoint)} files.\n\nResume from where it left off? Files changed since then are checked again."):
+                logger.log(f"Resuming verification from checkpoint ({len(checkpoint)} entries).", "INFO")
+            else:
+                checkpoint = None; journal.discard()
         self.view.verifier_bar.stop(); self.view.verifier_bar.config(mode='determinate')
         report_text = self.view.verify_report_text; report_text.config(state='normal')
         status_range = report_text.tag_ranges("StatusLine")
         if status_range: report_text.delete(status_range[0], status_range[1])
         report_text.config(state='disabled')
 
-        verifier = GameVerifier(Path(self.game_dir.get()), manifest_data, self.progress_queue, self.verifier_cancel_event, self.verifier_pause_event)
+        game_dir = Path(self.game_dir.get())
+        verifier = GameVerifier(game_dir, manifest_data, self.progress_queue, self.verifier_cancel_event, self.verifier_pause_event,
+                                hash_cache=LocalHashCache(game_dir).load(), journal=journal, checkpoint=checkpoint, scheduler=self._create_scheduler())
         self.task_manager.submit(verifier.run)
 
     def pause_verification(self):
@@ -4194,6 +2338,31 @@ class AppController:
         threading.Thread(target=force_reset_after_timeout, daemon=True).start()
         logger.log("Verification cancellation initiated.", "SETTING")
 
+    @manage_state(AppState.BUSY)
+    def repair_bad_blocks(self):
+        """Rewrites only the bad blocks found by the last verification, from an online or local source."""
+        bad_blocks = self.last_verify_results.get('bad_blocks') or {}
+        if not bad_blocks: messagebox.showinfo("Nothing to Repair", "The last verification found no block-repairable files."); self.set_state(AppState.IDLE); return
+        if self.is_game_running(): messagebox.showwarning("Game Running", "Please close Cricket 26 before repairing files."); self.set_state(AppState.IDLE); return
+
+        remote_base_url = (self.update_data or {}).get('repair_sources', {}).get(self.current_version); local_source = None
+        if not remote_base_url:
+            use_archive = messagebox.askyesnocancel("Select Repair Source", "No online repair source is published for this version.\n\nRepair from a local patch archive (.zip)?\n\nYes = select a .zip archive, No = select a folder containing the original files.")
+            if use_archive is None: self.set_state(AppState.IDLE); return
+            source = filedialog.askopenfilename(title="Select Patch Archive", filetypes=[("ZIP Archives", "*.zip"), ("All Files", "*.*")]) if use_archive else filedialog.askdirectory(title="Select Folder With Original Files")
+            if not source: self.set_state(AppState.IDLE); return
+            local_source = Path(source)
+        logger.log(f"Repairing {sum(len(v) for v in bad_blocks.values())} bad block(s) in {len(bad_blocks)} file(s) from {remote_base_url or local_source}.", "INFO")
+
+        def _task():
+            results = BlockRepairer(Path(self.game_dir.get()), self.last_verify_manifest).repair(bad_blocks, remote_base_url, local_source)
+            for rel_path in results['repaired']: bad_blocks.pop(rel_path, None)
+            message = f"Repaired {len(results['repaired'])} file(s) by rewriting only their bad blocks."
+            if results['failed']: message += f"\n\n{len(results['failed'])} file(s) could not be repaired this way:\n" + '\n'.join(p.replace('/', os.sep) for p in results['failed'][:10])
+            return message + "\n\nRun verification again to confirm."
+
+        self.task_manager.submit(_task, on_done=self._on_utility_complete, on_error=lambda msg: self._on_utility_error("Block Repair Failed", msg), is_utility_task=True)
+
     def generate_full_report_text(self, r: dict) -> str:
         ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         summary_lines = [
@@ -4202,6 +2371,7 @@ class AppController:
             "\n--- CORRUPTED FILES (Hash mismatch) ---", '\n'.join(p.replace('/', os.sep) for p in r.get('corrupted', [])) or "None.",
             "\n--- MISSING FILES (Expected but not found) ---", '\n'.join(p.replace('/', os.sep) for p in r.get('missing', [])) or "None.",
             "\n--- UNREADABLE FILES (Check Permissions) ---", '\n'.join(p.replace('/', os.sep) for p in r.get('unreadable', [])) or "None.",
+            "\n--- REPAIRABLE BLOCKS (Corrupted files with block hashes) ---", '\n'.join(f"{p.replace('/', os.sep)}: blocks {', '.join(map(str, b)) or 'none (size only)'}" for p, b in r.get('bad_blocks', {}).items()) or "None.",
             "\n--- EXTRA FILES (Not in manifest) ---", '\n'.join(p.replace('/', os.sep) for p in r.get('extra', [])) or "None.",
             "\n--- GOOD FILES (Verified OK) ---", '\n'.join(p.replace('/', os.sep) for p in r.get('good', [])) or "None."
         ]
@@ -4463,6 +2633,7 @@ Unreadable Files: {len(unreadable)}
         file_path = filedialog.asksaveasfilename(title="Export Current Log", defaultextension=".log", filetypes=[("Log Files", "*.log"), ("Text Files", "*.txt")], initialfile=Constants.LOG_FILENAME)
         if not file_path: self.set_state(AppState.IDLE); return
         def _task():
+            logger.flush()
             shutil.copy(logger.log_file, file_path)
             return 'Logs exported successfully.'
         self.task_manager.submit(_task, on_done=self._on_utility_complete, on_error=lambda msg: self._on_utility_error("Export Log Failed", msg), is_utility_task=True)
@@ -4477,6 +2648,7 @@ Unreadable Files: {len(unreadable)}
 
     def _on_initial_data_loaded(self, result: Tuple[Dict, str]):
         data, source = result
+        if data is None: self._on_initial_data_load_error("No version data from the API or the cache."); return
         self.update_data = data
         self.view.dashboard_latest_version_label.config(text=f"v{data.get('latest_version', '???')}")
         if source == 'CACHE':
@@ -4494,6 +2666,45 @@ Unreadable Files: {len(unreadable)}
                 except Exception as e: logger.log(f"Error running startup action {func.__name__}: {e}", "ERROR")
         
         self.set_state(AppState.IDLE)
+        self._mark_startup('interactive')
+        if source == 'CACHE': self.task_manager.submit(self._revalidate_update_data)
+        else: self._log_startup_timings(source)
+
+    def _handle_update_data(self, msg: Dict[str, Any]):
+        """Swaps in revalidated update data. Running workflows keep the dict they were started with."""
+        data, source = msg.get('data'), msg.get('source')
+        if source != 'CACHE': self.view.dashboard_latest_version_label.config(style='TLabel')
+        if data is not None:
+            previous = (self.update_data or {}).get('latest_version')
+            self.update_data = data  # One reference swap; readers never see a half-updated dict
+            self.view.dashboard_latest_version_label.config(text=f"v{data.get('latest_version', '???')}")
+            if previous != data.get('latest_version'): logger.log(f"Update data refreshed: latest version is now v{data.get('latest_version')} (was v{previous}).", "INFO")
+            else: logger.log("Update data refreshed from GitHub.", "INFO")
+            if self.plan_data is not None and self._plan_inputs(self.plan_data) != self._plan_inputs(data): self._invalidate_plan()
+        self._log_startup_timings(source)
+
+    PLAN_INPUT_KEYS = ('latest_version', 'versions', 'hosts', 'host_preference_order', 'update_sizes', 'update_archives', 'updates')
+
+    @classmethod
+    def _plan_inputs(cls, data: Dict[str, Any]) -> Dict[str, Any]:
+        """The parts of update data a plan depends on: target version and patch set."""
+        return {key: data.get(key) for key in cls.PLAN_INPUT_KEYS}
+
+    def _invalidate_plan(self):
+        """Drops a plan computed from superseded update data, and plans again when no operation is running."""
+        self.plan_data = None; self.updates_to_install = []  # Rebound, not cleared: a running workflow may hold the old list
+        if self.state != AppState.IDLE:
+            logger.log("Update data changed during an operation; check for updates again once it finishes.", "INFO"); return
+        logger.log("Update data changed since the last check; checking for updates again.", "INFO")
+        self.view.update_plan_text.config(state='normal'); self.view.update_plan_text.delete(1.0, tk.END); self.view.update_plan_text.config(state='disabled')
+        self.check_updates()
+
+    def _log_startup_timings(self, source: str):
+        timings = ", ".join(f"{name} {ms:.0f} ms" for name, ms in self.startup_timings.items())
+        imports = ", ".join(f"{name} {ms:.0f} ms" for name, ms in IMPORT_TIMINGS.items())
+        logger.log(f"Startup timings ({source}): {timings}", "INFO")
+        logger.log(f"Import timings: {imports}", "DIAG")
+        logger.metric('startup', source=source, **self.startup_timings, imports=dict(IMPORT_TIMINGS))
 
 
     def _on_initial_data_load_error(self, message: str):
@@ -4946,7 +3157,8 @@ Unreadable Files: {len(unreadable)}
             progress_val = (data.get('total', 0) > 0 and (data.get('processed', 0) / data['total'] * 100)) or 0
             self.view.verifier_bar['value'] = progress_val
             # Update with colored icons and numbers
-            stats_label.config(text=f"📊 Progress: {data.get('processed',0)}/{data.get('total',0)}")
+            rate_text = f" | {format_bytes(data['rate'])}/s | ETA: {format_eta(data.get('eta', -1))}" if data.get('rate') else ""
+            stats_label.config(text=f"📊 Progress: {data.get('processed',0)}/{data.get('total',0)}{rate_text}{' (background)' if data.get('throttled') else ''}")
             missing_label.config(text=f"⚠️ Missing: {data.get('missing',0)}")
             corrupted_label.config(text=f"❌ Corrupted: {data.get('corrupted',0)}")
             file_label.config(text=f"Now Scanning: {data.get('current_file','N/A')}")
@@ -4962,6 +3174,7 @@ Unreadable Files: {len(unreadable)}
         self.view.save_full_report_button.config(state='normal')
         self.view.save_problem_report_button.config(state='normal' if num_problems > 0 else 'disabled')
         self.view.copy_problem_files_button.config(state='normal' if num_problems > 0 else 'disabled')
+        self.view.repair_blocks_button.config(state='normal' if r.get('bad_blocks') else 'disabled')
         
         report_text = self.view.verify_report_text; report_text.config(state='normal')
         
@@ -4975,6 +3188,8 @@ Unreadable Files: {len(unreadable)}
             report_text.insert(tk.END, f"❌ Corrupted Files: {num_corrupted}\n", "error")
         if num_unreadable > 0:
             report_text.insert(tk.END, f"🔒 Unreadable Files: {num_unreadable}\n", "error")
+        if r.get('bad_blocks'):
+            report_text.insert(tk.END, f"🧩 Block-Repairable Files: {len(r['bad_blocks'])} ({sum(len(b) for b in r['bad_blocks'].values())} bad blocks)\n", "info")
         if num_extra > 0:
             report_text.insert(tk.END, f"📁 Extra Files: {num_extra}\n", "info")
         
@@ -4997,6 +3212,7 @@ Unreadable Files: {len(unreadable)}
         self.view.save_full_report_button.config(state='disabled')
         self.view.save_problem_report_button.config(state='disabled')
         self.view.copy_problem_files_button.config(state='disabled')
+        self.view.repair_blocks_button.config(state='disabled')
 
     def _handle_verify_issues_batch(self, msg: dict):
         batch = msg.get('batch', [])
@@ -5013,6 +3229,7 @@ Unreadable Files: {len(unreadable)}
 
     def _populate_diag_ui_from_cache(self):
         if not self.last_diag_report: logger.log("Tried to populate diagnostics UI, but no data cached.", "WARNING"); return
+        if not hasattr(self.view, 'diag_labels'): return  # Diagnostics tab not built yet; it populates from the cache when first shown
         for key, value in self.last_diag_report.get('system', {}).items():
             if key in self.view.diag_labels: self.view.diag_labels[key].config(text=str(value))
         self.view.crash_log_text.config(state='normal'); self.view.crash_log_text.delete(1.0, tk.END); self.view.crash_log_text.insert(tk.END, self.last_diag_report.get('crashes', 'Error retrieving data.')); self.view.crash_log_text.config(state='disabled')
@@ -5074,10 +3291,19 @@ class AppGUI(tk.Tk):
         self.controller: Optional[AppController] = None
         self.game_dir_var = tk.StringVar(value="")
         self.verify_checksum_var = tk.BooleanVar(value=True)
+        self.background_mode_var = tk.BooleanVar(value=False)
+        self.plan_by_time_var = tk.BooleanVar(value=False)
         self.download_source_var = tk.StringVar(value="Automatic")
         self.dark_mode = True
-        self.log_file_last_pos = 0
-        self.log_content_has_changed = False
+        # Logs tab view state: rows are the event-log block followed by (filtered) LogIndex lines
+        self.log_header: Tuple[str, List[Tuple[str, int, int]]] = ("", []); self.log_header_rows = 0
+        self.log_total, self.log_top, self.log_follow = 0, 0, True
+        self.log_rows: Optional[array] = None  # Global line numbers passing the level filter, None when unfiltered
+        self.log_search_query, self.log_search_hit = "", None
+        self.log_line_height = 0
+        self.log_filter_var = tk.StringVar(value="All levels")
+        self.log_search_var, self.log_goto_var = tk.StringVar(), tk.StringVar()
+        self.deferred_tabs: Dict[str, Tuple[str, Callable]] = {}  # Placeholder frame path -> (tab name, builder)
         self.is_admin = is_admin()
         
         # Modern window configuration
@@ -5138,13 +3364,13 @@ class AppGUI(tk.Tk):
         except tk.TclError:
             return
 
+        if self._build_deferred_tab(self.notebook.select()): return  # Selecting the new tab raised this event again
+
         if "Diagnostics" in selected_tab_text:
             if self.controller.diag_info_fetched: self.controller._populate_diag_ui_from_cache()
             else: self.controller.run_initial_diagnostics()
         elif "Logs" in selected_tab_text:
-            if self.log_content_has_changed:
-                self.log_text.see(tk.END)
-                self.log_content_has_changed = False
+            self._log_set_top(self._log_row_count() if self.log_follow else self.log_top)
 
     def _on_game_dir_changed(self, *args):
         if not self.controller: return
@@ -5171,15 +3397,36 @@ class AppGUI(tk.Tk):
         self.notebook = ttk.Notebook(main_frame, style='TNotebook')
         self.notebook.pack(fill=tk.BOTH, expand=True, pady=layout['spacing']['widget_gap'])
 
-        # Add tabs with modern icons and enhanced spacing
+        # Add tabs with modern icons and enhanced spacing; only the first two are built before the window appears
         self.notebook.add(self.create_updater_tab(), text=f" {Constants.ICON_CLOUD_DOWNLOAD}  Updater ")
         self.notebook.add(self.create_verifier_tab(), text=f" {Constants.ICON_CHECK_CIRCLE}  Verifier ")
-        self.notebook.add(self.create_utility_tab(), text=f" {Constants.ICON_TOOLS}  Utilities ")
-        self.notebook.add(self.create_diagnostics_tab(), text=f" {Constants.ICON_STETHOSCOPE}  Diagnostics ")
-        self.notebook.add(self.create_logs_tab(), text=f" {Constants.ICON_FILE_ALT}  Logs ")
-        self.notebook.add(self.create_credits_tab(), text=f" {Constants.ICON_STAR}  Credits ")
+        for icon, name, builder in ((Constants.ICON_TOOLS, "Utilities", self.create_utility_tab),
+                                    (Constants.ICON_STETHOSCOPE, "Diagnostics", self.create_diagnostics_tab),
+                                    (Constants.ICON_FILE_ALT, "Logs", self.create_logs_tab),
+                                    (Constants.ICON_STAR, "Credits", self.create_credits_tab)):
+            placeholder = ttk.Frame(self.notebook, padding=40)
+            ttk.Label(placeholder, text=f"Loading {name}...", style="Modern.Muted.TLabel").pack()
+            self.notebook.add(placeholder, text=f" {icon}  {name} ")
+            self.deferred_tabs[str(placeholder)] = (name, builder)
         self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
 
+    def _build_deferred_tab(self, tab_id) -> bool:
+        """Replaces a placeholder with its real tab and selects it; False when tab_id is not a placeholder."""
+        entry = self.deferred_tabs.pop(str(tab_id), None)
+        if entry is None: return False
+        name, builder = entry
+        started = time.perf_counter()
+        placeholder = self.nametowidget(str(tab_id))
+        index, text = self.notebook.index(placeholder), self.notebook.tab(placeholder, "text")
+        tab = builder()
+        self.notebook.insert(index, tab, text=text)
+        self._define_widget_groups()
+        if self.controller: self.update_ui_for_state(self.controller.state)
+        self.notebook.select(tab)
+        self.notebook.forget(placeholder); placeholder.destroy()
+        logger.log(f"Built the {name} tab on first use in {(time.perf_counter() - started) * 1000:.0f} ms.", "DIAG")
+        return True
+
     def create_updater_tab(self):
         layout = ThemeManager.LAYOUT_CONFIG
         self.updater_tab = ttk.Frame(self.notebook, padding=layout['padding']['section_frame'])
@@ -5286,6 +3533,15 @@ class AppGUI(tk.Tk):
         )
         self.checksum_checkbox.pack(side=tk.LEFT, padx=(0, 20), pady=6)
         
+        # Route planning: smallest download (default) or fastest estimated time from measured host speeds
+        self.plan_by_time_checkbox = ttk.Checkbutton(
+            options_container, 
+            text="Fastest Route", 
+            variable=self.plan_by_time_var, 
+            style="Switch.TCheckbutton"
+        )
+        self.plan_by_time_checkbox.pack(side=tk.LEFT, padx=(0, 20), pady=6)
+        
         # Clear Downloads button
         clear_downloads_btn = ttk.Button(
             options_container, 
@@ -5331,6 +3587,11 @@ class AppGUI(tk.Tk):
                                        command=self.controller.start_verification, 
                                        style="Accent.TButton")
         self.verify_button.pack(ipady=10, ipadx=30)
+        self.background_mode_checkbox = ttk.Checkbutton(button_container, 
+                                                        text="Background Mode (low priority while the game runs)", 
+                                                        variable=self.background_mode_var, 
+                                                        style="Switch.TCheckbutton")
+        self.background_mode_checkbox.pack(pady=(10, 0))
 
         self.verifier_progress_frame = self._create_progress_view(self.verifier_action_progress_frame, "Verifier")
 
@@ -5377,7 +3638,14 @@ class AppGUI(tk.Tk):
                                                     state='disabled', 
                                                     command=self.controller.copy_problem_files_list, 
                                                     style="Modern.Secondary.TButton")
-        self.copy_problem_files_button.pack(side=tk.LEFT, ipady=6, ipadx=10)
+        self.copy_problem_files_button.pack(side=tk.LEFT, padx=(0, 12), ipady=6, ipadx=10)
+        
+        self.repair_blocks_button = ttk.Button(report_actions, 
+                                               text=f" {Constants.ICON_TOOLS}  Repair Bad Blocks", 
+                                               state='disabled', 
+                                               command=self.controller.repair_bad_blocks, 
+                                               style="Modern.Secondary.TButton")
+        self.repair_blocks_button.pack(side=tk.LEFT, ipady=6, ipadx=10)
         
         return dashboard_frame
 
@@ -5565,6 +3833,7 @@ class AppGUI(tk.Tk):
         self.cache_size_label = ttk.Label(cache_info_section, text="Calculating...", 
                                          foreground="#B0BEC5", font=("Segoe UI", 9))
         self.cache_size_label.grid(row=1, column=1, sticky='w', pady=6)
+        if self.controller.update_data is not None: self.controller.update_cache_size_label()
         
         return tab
 
@@ -5671,19 +3940,39 @@ class AppGUI(tk.Tk):
         # Enhanced log frame with better styling
         log_frame = ttk.LabelFrame(tab, text="Log Output", padding=10)
         log_frame.grid(row=1, column=0, sticky='nsew', pady=(0, 15))
-        log_frame.rowconfigure(0, weight=1)
+        log_frame.rowconfigure(1, weight=1)
         log_frame.columnconfigure(0, weight=1)
 
-        scroll = ttk.Scrollbar(log_frame, orient=tk.VERTICAL)
+        # Toolbar: level filter, search across the full history, jump to line
+        toolbar = ttk.Frame(log_frame)
+        toolbar.grid(row=0, column=0, columnspan=2, sticky='ew', pady=(0, 8))
+        ttk.Label(toolbar, text="Level:").pack(side=tk.LEFT)
+        log_filter = ttk.Combobox(toolbar, textvariable=self.log_filter_var, values=list(LOG_VIEW_FILTERS), state='readonly', width=16)
+        log_filter.pack(side=tk.LEFT, padx=(5, 15)); log_filter.bind("<<ComboboxSelected>>", self._on_log_filter_changed)
+        ttk.Label(toolbar, text="Find:").pack(side=tk.LEFT)
+        search_entry = ttk.Entry(toolbar, textvariable=self.log_search_var, width=24)
+        search_entry.pack(side=tk.LEFT, padx=(5, 2)); search_entry.bind("<Return>", lambda e: self._on_log_search(True)); search_entry.bind("<Shift-Return>", lambda e: self._on_log_search(False))
+        ttk.Button(toolbar, text="▲", width=3, command=lambda: self._on_log_search(False), style="Modern.Small.TButton").pack(side=tk.LEFT, padx=1)
+        ttk.Button(toolbar, text="▼", width=3, command=lambda: self._on_log_search(True), style="Modern.Small.TButton").pack(side=tk.LEFT, padx=(1, 15))
+        ttk.Label(toolbar, text="Line:").pack(side=tk.LEFT)
+        goto_entry = ttk.Entry(toolbar, textvariable=self.log_goto_var, width=9)
+        goto_entry.pack(side=tk.LEFT, padx=(5, 15)); goto_entry.bind("<Return>", self._on_log_goto)
+        self.log_position_label = ttk.Label(toolbar, text="", style="Modern.Muted.TLabel")
+        self.log_position_label.pack(side=tk.RIGHT)
+
+        # Only the visible window (plus a margin) is rendered; the scrollbars drive the LogIndex position
+        scroll = ttk.Scrollbar(log_frame, orient=tk.VERTICAL, command=self._on_log_scrollbar)
+        xscroll = ttk.Scrollbar(log_frame, orient=tk.HORIZONTAL)
+        self.log_vscroll = scroll
         self.log_text = tk.Text(
             log_frame, 
-            wrap=tk.WORD, 
+            wrap=tk.NONE, 
             state='disabled', 
             font=("Consolas", 9), 
             relief='flat', 
             padx=10, 
             pady=10, 
-            yscrollcommand=scroll.set, 
+            xscrollcommand=xscroll.set, 
             bd=0, 
             highlightthickness=0,
             background='#1e1e1e',
@@ -5695,10 +3984,17 @@ class AppGUI(tk.Tk):
         self.log_text.tag_config("warning", foreground="#f39c12")   # Orange for warnings  
         self.log_text.tag_config("info", foreground="#3498db")      # Blue for info/settings/diag
         self.log_text.tag_config("success", foreground="#27ae60")   # Green for success operations
-        
-        scroll.config(command=self.log_text.yview)
-        scroll.pack(side=tk.RIGHT, fill=tk.Y, padx=(5, 0))
-        self.log_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.log_text.tag_config("search_hit", background="#44475a")
+        
+        xscroll.config(command=self.log_text.xview)
+        scroll.grid(row=1, column=1, sticky='ns', padx=(5, 0))
+        xscroll.grid(row=2, column=0, sticky='ew')
+        self.log_text.grid(row=1, column=0, sticky='nsew')
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"): self.log_text.bind(sequence, self._on_log_wheel)
+        for sequence, rows in (("<Prior>", -1), ("<Next>", 1)): self.log_text.bind(sequence, lambda e, rows=rows: self._on_log_scrollbar('scroll', rows, 'pages') or "break")
+        self.log_text.bind("<Home>", lambda e: self._log_set_top(0) or "break"); self.log_text.bind("<End>", lambda e: self._log_set_top(self._log_row_count()) or "break")
+        self.log_text.bind("<Button-1>", lambda e: self.log_text.focus_set())
+        self.log_text.bind("<Configure>", lambda e: self._log_set_top(self._log_row_count() if self.log_follow else self.log_top))
 
         # Enhanced controls frame - moved to bottom for better organization
         controls = ttk.LabelFrame(tab, text="Log Management", padding=10)
@@ -5876,11 +4172,13 @@ class AppGUI(tk.Tk):
         self.credits_text.config(state='disabled')
 
     def _define_widget_groups(self):
-        self.utility_buttons = [ self.dns_set_button, self.dns_reset_button, self.launch_game_button, self.backup_saves_button, self.restore_backup_button, self.manual_install_button, self.clear_cache_button, self.open_save_dir_button, self.open_backups_dir_button, self.create_shortcuts_button ]
+        """Regrouped after each deferred tab is built; widgets of tabs not built yet are left out."""
+        group = lambda *names: [getattr(self, name) for name in names if hasattr(self, name)]
+        self.utility_buttons = group('dns_set_button', 'dns_reset_button', 'launch_game_button', 'backup_saves_button', 'restore_backup_button', 'manual_install_button', 'clear_cache_button', 'open_save_dir_button', 'open_backups_dir_button', 'create_shortcuts_button')
         self.verifier_report_buttons = [ self.save_full_report_button, self.save_problem_report_button, self.copy_problem_files_button ]
-        self.log_buttons = [ self.log_refresh_btn, self.log_archive_btn, self.log_save_btn ]
-        self.diag_buttons = [self.diag_run_button, self.dxdiag_button, self.diag_save_button]
-        self.updater_option_widgets = [self.checksum_checkbox]
+        self.log_buttons = group('log_refresh_btn', 'log_archive_btn', 'log_save_btn')
+        self.diag_buttons = group('diag_run_button', 'dxdiag_button', 'diag_save_button')
+        self.updater_option_widgets = [self.checksum_checkbox, self.background_mode_checkbox]
 
     def update_status_with_color(self, message: str, status_type: str = "info"):
         """Update status message with appropriate color coding."""
@@ -5944,19 +4242,6 @@ class AppGUI(tk.Tk):
         self.verify_report_text.tag_config("Info", 
                                          foreground=colors['info'], 
                                          font=('Segoe UI', 10, 'normal'))
-
-        # Configure log text colors with modern hierarchy
-        self.log_text.tag_config("INFO", foreground=colors['success'])
-        self.log_text.tag_config("WARNING", foreground=colors['warning'])
-        self.log_text.tag_config("ERROR", 
-                                foreground=colors['error'], 
-                                font=theme['fonts']['mono'])
-        self.log_text.tag_config("CRITICAL", 
-                                foreground='white', 
-                                background=colors['error'], 
-                                font=theme['fonts']['mono'])
-        self.log_text.tag_config("SETTING", foreground=colors['info'])
-        self.log_text.tag_config("DIAG", foreground='#9C27B0')
         
         # Update window background
         self.configure(bg=colors['primary'])
@@ -5991,6 +4276,7 @@ class AppGUI(tk.Tk):
         can_use_reports = is_idle and self.controller and self.controller.last_verify_results
         for btn in self.verifier_report_buttons:
             btn.config(state='normal' if can_use_reports else 'disabled')
+        self.repair_blocks_button.config(state='normal' if can_use_reports and self.controller.last_verify_results.get('bad_blocks') else 'disabled')
 
         can_check = self.controller and self.controller.game_dir.get() != "" and self.controller.update_data is not None
         if is_idle:
@@ -6001,156 +4287,120 @@ class AppGUI(tk.Tk):
         else:
              self.update_dashboard_action_button.config(state='disabled')
 
-        self.diag_save_button.config(state='normal' if is_idle and self.controller.last_diag_report else 'disabled')
+        if hasattr(self, 'diag_save_button'): self.diag_save_button.config(state='normal' if is_idle and self.controller.last_diag_report else 'disabled')
 
-    def reset_log_position(self): self.log_file_last_pos = 0; self.log_text.delete(1.0, tk.END); self.refresh_logs()
+    def reset_log_position(self):
+        """Re-reads the log from the top; safe to call from worker threads."""
+        if self.controller: self.controller.log_service.request(reset=True)
 
     def refresh_logs(self):
-        self.log_text.config(state='normal')
-        
-        # Try to get Windows Event Logs first (Application and System logs)
+        """Asks the log service for new entries; they arrive through apply_log_batch."""
+        if self.controller: self.controller.log_service.request()
+
+    def apply_log_batch(self, batch: dict):
+        """Takes a LogService batch on the Tk thread: new event rows and line count, or a search result."""
+        if 'search' in batch: self._on_log_search_result(batch['search'], batch.get('line')); return
+        if batch.get('events') is not None: self.log_header = batch['events']; self.log_header_rows = batch['events'][0].count("\n")
+        index, levels = self.controller.log_service.index, LOG_VIEW_FILTERS.get(self.log_filter_var.get())
+        total = batch.get('total', self.log_total)
+        if batch.get('reset') or total < self.log_total:
+            self.log_search_hit, self.log_follow = None, True
+            self.log_rows = index.matching(levels) if levels else None
+        elif self.log_rows is not None and total > self.log_total:
+            self.log_rows.extend(index.matching(levels, self.log_total))
+        self.log_total = total
+        if hasattr(self, 'log_text'): self._log_set_top(self._log_row_count() if self.log_follow else self.log_top)
+
+    def _log_row_count(self) -> int:
+        return self.log_header_rows + (len(self.log_rows) if self.log_rows is not None else self.log_total)
+
+    def _log_visible_rows(self) -> int:
+        if not self.log_line_height: self.log_line_height = max(1, tkfont.Font(font=self.log_text.cget('font')).metrics('linespace'))
+        return max(1, (self.log_text.winfo_height() - 20) // self.log_line_height)  # 20 = vertical padding
+
+    def _log_line_at(self, row: int) -> Optional[int]:
+        """Global log line shown at a view row (None for event-log rows)."""
+        row -= self.log_header_rows
+        if row < 0: return None
+        return self.log_rows[row] if self.log_rows is not None else row
+
+    def _log_row_of(self, line: int) -> int:
+        """View row of a global line, or of the next line passing the filter."""
+        return self.log_header_rows + (bisect.bisect_left(self.log_rows, line) if self.log_rows is not None else line)
+
+    def _log_set_top(self, top: int):
+        rows, visible = self._log_row_count(), self._log_visible_rows()
+        self.log_top = max(0, min(top, rows - visible)); self.log_follow = self.log_top >= rows - visible
+        self._render_log_window()
+
+    def _render_log_window(self):
+        """Renders rows log_top .. log_top + visible + margin from the event rows and the LogIndex."""
+        rows, visible, header = self._log_row_count(), self._log_visible_rows(), self.log_header_rows
+        first, last = self.log_top, min(rows, self.log_top + visible + Constants.LOG_VIEW_MARGIN_ROWS)
+        head_text, head_ranges = slice_log_block(self.log_header, first, min(last, header)); head_rows = max(0, min(last, header) - first)
+        lines = [self._log_line_at(row) for row in range(max(first, header), last)]
+        hit_row = head_rows + lines.index(self.log_search_hit) if self.log_search_hit in lines else None
         try:
-            event_logs = []
-            
-            # Get recent application errors from Windows Event Viewer
-            try:
-                app_command = ['wevtutil', 'qe', 'Application', '/c:20', '/rd:true', '/f:text']
-                proc = subprocess.run(app_command, capture_output=True, text=True, 
-                                    creationflags=subprocess.CREATE_NO_WINDOW, 
-                                    encoding='utf-8', errors='ignore', timeout=10)
-                
-                if proc.returncode == 0 and proc.stdout.strip():
-                    app_events = proc.stdout.strip().split('Event[')
-                    for i, event in enumerate(app_events[1:6]):  # Show only first 5 events
-                        try:
-                            import re
-                            timestamp_match = re.search(r'TimeCreated SystemTime="([^"]+)"', event)
-                            level_match = re.search(r'Level>(\d+)<', event)
-                            source_match = re.search(r'Provider Name="([^"]+)"', event)
-                            event_id_match = re.search(r'EventID>(\d+)<', event)
-                            
-                            if timestamp_match:
-                                timestamp = timestamp_match.group(1)[:19].replace('T', ' ')
-                                level = "Error" if level_match and level_match.group(1) == "2" else "Warning" if level_match and level_match.group(1) == "3" else "Info"
-                                source = source_match.group(1) if source_match else "Unknown"
-                                event_id = event_id_match.group(1) if event_id_match else "Unknown"
-                                
-                                log_entry = f"🖥️ {timestamp} | {level} | {source} | Event ID: {event_id}"
-                                tag = "error" if level == "Error" else "warning" if level == "Warning" else "info"
-                                self.log_text.insert(tk.END, f"{log_entry}\n", tag)
-                        except:
-                            continue
-            except:
-                pass
-            
-            # Get system events
-            try:
-                sys_command = ['wevtutil', 'qe', 'System', '/c:10', '/rd:true', '/f:text']
-                proc = subprocess.run(sys_command, capture_output=True, text=True, 
-                                    creationflags=subprocess.CREATE_NO_WINDOW, 
-                                    encoding='utf-8', errors='ignore', timeout=10)
-                
-                if proc.returncode == 0 and proc.stdout.strip():
-                    sys_events = proc.stdout.strip().split('Event[')
-                    for i, event in enumerate(sys_events[1:4]):  # Show only first 3 system events
-                        try:
-                            import re
-                            timestamp_match = re.search(r'TimeCreated SystemTime="([^"]+)"', event)
-                            level_match = re.search(r'Level>(\d+)<', event)
-                            source_match = re.search(r'Provider Name="([^"]+)"', event)
-                            
-                            if timestamp_match:
-                                timestamp = timestamp_match.group(1)[:19].replace('T', ' ')
-                                level = "Error" if level_match and level_match.group(1) == "2" else "Warning" if level_match and level_match.group(1) == "3" else "Info"
-                                source = source_match.group(1) if source_match else "Unknown"
-                                
-                                log_entry = f"⚙️ {timestamp} | {level} | {source} (System)"
-                                tag = "error" if level == "Error" else "warning" if level == "Warning" else "info"
-                                self.log_text.insert(tk.END, f"{log_entry}\n", tag)
-                        except:
-                            continue
-            except:
-                pass
-                
-            # Add separator
-            self.log_text.insert(tk.END, "\n" + "="*60 + "\n", "info")
-            self.log_text.insert(tk.END, "📄 APPLICATION LOGS:\n", "info")
-            self.log_text.insert(tk.END, "="*60 + "\n\n", "info")
-            
+            read = self.controller.log_service.index.read(lines) if lines else []
+            body_text, body_ranges = render_log_lines([text for text, _ in read], [level for _, level in read])
         except Exception as e:
-            self.log_text.insert(tk.END, f"❌ Could not read Windows Event Logs: {e}\n\n", "error")
-        
-        # Then show application logs
-        log_levels = {
-            "[CRITICAL]": "error", 
-            "[ERROR]": "error", 
-            "[WARNING]": "warning", 
-            "[SETTING]": "info", 
-            "[DIAG]": "info",
-            "[INFO]": "success"  # Green for general info operations
-        }
+            body_text, body_ranges = f"❌ Could not read application log file: {e}\n", [("error", 0, 1)]
+        text, ranges = head_text + body_text, head_ranges + [(tag, a + head_rows, b + head_rows) for tag, a, b in body_ranges]
+        x_position = self.log_text.xview()[0]
+        self.log_text.config(state='normal')
         try:
-            if logger.log_file.exists():
-                current_size = logger.log_file.stat().st_size
-                if current_size < self.log_file_last_pos: 
-                    self.log_file_last_pos = 0
-                
-                new_content = False
-                with logger.log_file.open('r', encoding='utf-8') as f:
-                    f.seek(self.log_file_last_pos)
-                    lines_added = 0
-                    
-                    for line in f:
-                        new_content = True
-                        line_stripped = line.strip()
-                        
-                        # Limit log buffer size to prevent memory bloat
-                        if lines_added > 0 and lines_added % 100 == 0:
-                            current_lines = int(self.log_text.index('end-1c').split('.')[0])
-                            if current_lines > Constants.MAX_LOG_BUFFER_SIZE:
-                                # Delete oldest 20% of lines
-                                delete_count = int(Constants.MAX_LOG_BUFFER_SIZE * 0.2)
-                                self.log_text.delete('1.0', f'{delete_count}.0')
-                        
-                        # Determine the tag based on log level
-                        tag = "success"  # default to green for general operations
-                        for marker, level_tag in log_levels.items():
-                            if marker in line_stripped:
-                                tag = level_tag
-                                break
-                        
-                        # Get symbol for the log level
-                        level_markers = {
-                            "[CRITICAL]": "CRITICAL", "[ERROR]": "ERROR", 
-                            "[WARNING]": "WARNING", "[SETTING]": "SETTING", 
-                            "[DIAG]": "DIAG", "[INFO]": "INFO"
-                        }
-                        level = next((lvl for tag_marker, lvl in level_markers.items() if tag_marker in line_stripped), "INFO")
-                        symbol = Constants.LOG_SYMBOLS.get(level, 'ℹ️')
-                        
-                        # Insert with appropriate color tag
-                        self.log_text.insert(tk.END, f"{symbol} {line_stripped}\n", tag)
-                        lines_added += 1
-                    
-                    self.log_file_last_pos = f.tell()
-                
-                if new_content:
-                    self.log_content_has_changed = True
-                    # Safety check for notebook existence
-                    if hasattr(self, 'notebook') and self.notebook.winfo_exists():
-                        try:
-                            if "Logs" in self.notebook.tab(self.notebook.select(), "text"):
-                                self.log_text.see(tk.END)
-                                self.log_content_has_changed = False
-                        except (tk.TclError, Exception):
-                            pass  # Tab not selected or notebook destroyed
-            else:
-                self.log_text.insert(tk.END, "📄 No application log file found.\n", "warning")
-                self.log_file_last_pos = 0
-        except Exception as e:
-            self.log_text.insert(tk.END, f"❌ Could not read application log file: {e}\n", "error")
+            self.log_text.delete('1.0', tk.END); self.log_text.insert('1.0', text)
+            for tag, start, end in ranges: self.log_text.tag_add(tag, f"{start + 1}.0", f"{end + 1}.0")
+            if hit_row is not None: self.log_text.tag_add("search_hit", f"{hit_row + 1}.0", f"{hit_row + 2}.0")
+            self.log_text.xview_moveto(x_position)
         finally:
             self.log_text.config(state='disabled')
+        if rows: self.log_vscroll.set(first / rows, min(1.0, (first + visible) / rows))
+        else: self.log_vscroll.set(0.0, 1.0)
+        if not self.log_total: position = "No application log entries yet"
+        else:
+            first_line = self._log_line_at(max(first, header)); shown_total = len(self.log_rows) if self.log_rows is not None else self.log_total
+            position = f"Line {first_line + 1:,} · {shown_total:,} of {self.log_total:,} lines" if first_line is not None else f"{shown_total:,} of {self.log_total:,} lines"
+        self.log_position_label.config(text=position)
+
+    def _on_log_scrollbar(self, action: str, amount, unit: Optional[str] = None):
+        if action == 'moveto': self._log_set_top(int(float(amount) * self._log_row_count()))
+        elif action == 'scroll': self._log_set_top(self.log_top + int(amount) * (max(1, self._log_visible_rows() - 1) if unit == 'pages' else 1))
+
+    def _on_log_wheel(self, event):
+        self._log_set_top(self.log_top + (-3 if event.num == 4 or event.delta > 0 else 3))
+        return "break"
+
+    def _log_jump(self, line: int):
+        """Scrolls so a global line sits near the top of the view."""
+        self._log_set_top(self._log_row_of(line) - 3)
+
+    def _on_log_goto(self, event=None):
+        try: line = int(self.log_goto_var.get().replace(',', '').strip()) - 1
+        except ValueError: self.bell(); return
+        self._log_jump(max(0, min(line, self.log_total - 1)))
+
+    def _on_log_filter_changed(self, event=None):
+        levels = LOG_VIEW_FILTERS.get(self.log_filter_var.get())
+        anchor = self._log_line_at(max(self.log_top, self.log_header_rows))
+        self.log_rows = self.controller.log_service.index.matching(levels) if levels else None
+        if self.log_follow or anchor is None: self._log_set_top(self._log_row_count())
+        else: self._log_jump(anchor)
+
+    def _on_log_search(self, forward: bool = True):
+        query = self.log_search_var.get().strip()
+        if not query or not self.controller: return
+        if query == self.log_search_query and self.log_search_hit is not None: start = self.log_search_hit + 1 if forward else self.log_search_hit
+        else: start = self._log_line_at(max(self.log_top, self.log_header_rows)) or 0
+        self.log_search_query = query
+        self.log_position_label.config(text=f"Searching for '{query}'...")
+        self.controller.log_service.search(query, start, forward, LOG_VIEW_FILTERS.get(self.log_filter_var.get()))
+
+    def _on_log_search_result(self, query: str, line: Optional[int]):
+        if query != self.log_search_var.get().strip(): return  # The search box changed since
+        self.log_search_hit = line
+        if line is None: self._render_log_window(); self.log_position_label.config(text=f"No matches for '{query}'"); return
+        self._log_jump(line)
 
     def ask_user_to_select_interface(self, adapters: List[str]) -> Optional[str]:
         dialog = tk.Toplevel(self)
@@ -6193,14 +4443,15 @@ if __name__ == "__main__":
     multiprocessing.freeze_support()
 
     # Check for WMI dependency separately as it is part of pywin32
-    try:
-        import wmi
-        import pythoncom
-    except ImportError:
+    if importlib.util.find_spec("wmi") is None or importlib.util.find_spec("pythoncom") is None:
         root = tk.Tk(); root.withdraw()
         messagebox.showerror("Missing Dependency", "The 'pywin32' library is required for system diagnostics.\n\nPlease install it by running:\npip install pywin32")
         sys.exit(1)
 
+    if '--structured-log' in sys.argv:
+        logger.structured_file = Path(Constants.STRUCTURED_LOG_FILENAME)
+        sys.argv.remove('--structured-log')
+
     try:
         view = AppGUI()
         controller = AppController(view)
@@ -0,0 +1,4 @@
+"""
+CRICKET 26 UPDATER
+Headless engines (cricket26.core) and command line (python -m cricket26) behind CRICKET26_UTILITY_FULL.py
+"""
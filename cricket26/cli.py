@@ -0,0 +1,438 @@
+"""
+CRICKET 26 UPDATER CLI
+Headless update, verify, plan and bench commands over the cricket26.core engines
+
+    python -m cricket26 plan GAME_DIR [--by-time]
+    python -m cricket26 update GAME_DIR [--yes-checksum] [--background]
+    python -m cricket26 verify GAME_DIR [--report FILE]
+    python -m cricket26 bench [--game-dir DIR] [--hosts]
+    python -m cricket26 fleet GAME_DIR... [--from-file LIST] [--report FILE]
+    python -m cricket26 mirror [--port 8626] [--cache-dir DIR]
+
+Workers report through the same ProgressBus messages the GUI consumes. --json prints every
+event as one JSON object per line ({"event": <Q_MSG type>, "t": <seconds>, ...}) for scripts;
+the default text output prints status changes and a throttled progress line.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import queue
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Callable, Tuple
+
+from .core import (
+    Constants, Q_MSG, logger, format_bytes, format_eta, is_game_running, requests,
+    APIHandler, GameManager, BackgroundScheduler, HostStats, UpdatePlanner, ordered_links, UpdateWorkflow, ArchiveStore,
+    ManifestStore, LocalHashCache, VerificationJournal, GameVerifier, ProgressBus, FleetUpdater, serve_mirror,
+)
+
+EXIT_OK, EXIT_FAILED, EXIT_CANCELLED = 0, 1, 130
+POLL_INTERVAL_S = 0.2
+PROGRESS_INTERVAL_S = 1.0  # Text mode prints at most one progress line per interval
+BENCH_READ_SIZE = 4 * 1024 * 1024
+
+
+class EventPrinter:
+    """Renders progress-bus messages as text lines or JSON lines on stdout"""
+
+    def __init__(self, as_json: bool, stream=None):
+        self.as_json = as_json
+        self.stream = stream or sys.stdout
+        self.started = time.monotonic()
+        self._last_message: Dict[Tuple[str, Optional[str]], str] = {}
+        # Progress state per fleet target (None outside fleet mode)
+        self._progress: Dict[Optional[str], Dict[str, Any]] = {}
+        self._progress_printed: Dict[Optional[str], float] = {}
+        self._progress_dirty: set = set()
+
+    def emit(self, event: str, **fields):
+        """Prints one record: a JSON object, or the 'message' field as a text line"""
+        if self.as_json:
+            record = {'event': event, 't': round(time.monotonic() - self.started, 3), **fields}
+            self.stream.write(json.dumps(record, default=str, ensure_ascii=False) + "\n")
+        elif fields.get('message'):
+            self.stream.write(f"{fields['message']}\n")
+        self.stream.flush()
+
+    def show(self, msg: Dict[str, Any]):
+        msg_type = msg.get('type')
+        if self.as_json:
+            fields = {k: v for k, v in msg.items() if k != 'type'}
+            if msg_type == Q_MSG.VERIFY_COMPLETE:
+                fields['results'] = summarize_results(msg.get('results') or {})
+            self.emit(msg_type, **fields)
+            return
+        target = msg.get('target'); prefix = f"[{target}] " if target else ""
+        if msg_type in (Q_MSG.STATUS, Q_MSG.OVERALL_STATUS):
+            message = str(msg.get('message', '')).strip()
+            if message and self._last_message.get((msg_type, target)) != message:
+                self._last_message[(msg_type, target)] = message
+                self.emit(msg_type, message=f"{prefix}{message}" if msg_type == Q_MSG.OVERALL_STATUS else f"  {prefix}{message}")
+        elif msg_type == Q_MSG.PROGRESS:
+            self._progress.setdefault(target, {})['percent'] = msg.get('value', 0); self._print_progress(target)
+        elif msg_type == Q_MSG.DOWNLOAD_SPEED:
+            self._progress.setdefault(target, {}).update(speed=msg.get('current_speed'), eta=msg.get('eta_seconds')); self._print_progress(target)
+        elif msg_type == Q_MSG.VERIFY_STATS:
+            data = msg.get('data') or {}
+            if 'status' in data: self.emit(msg_type, message=f"  {data['status']}")
+            else: self._progress.setdefault(target, {}).update(verify=data); self._print_progress(target)
+        elif msg_type == Q_MSG.VERIFY_ISSUES_BATCH:
+            for kind, rel_path in msg.get('batch', []): self.emit(msg_type, message=f"  {kind.upper()}: {rel_path}")
+        elif msg_type == Q_MSG.DOWNLOAD_FAILED:
+            self.emit(msg_type, message=f"❌ {prefix}Update failed: {msg.get('reason', 'unknown error')}")
+        elif msg_type == Q_MSG.ERROR:
+            self.emit(msg_type, message=f"❌ {prefix}{msg.get('message', 'An unknown error occurred.')}")
+        elif msg_type == Q_MSG.FLEET_TARGET_DONE:
+            self.flush_progress(target); self.emit(msg_type, message=describe_fleet_result(msg.get('result') or {}))
+        elif msg_type in (Q_MSG.CANCELLED, Q_MSG.VERIFY_CANCELLED):
+            self.emit(msg_type, message="⚠️ Cancelled.")
+
+    def flush_progress(self, target: Optional[str] = None):
+        """Prints the latest progress line(s) the throttle held back (all targets, or just one)"""
+        if self.as_json: return
+        for dirty in [t for t in self._progress_dirty if target is None or t == target]: self._print_progress(dirty, force=True)
+
+    def _print_progress(self, target: Optional[str] = None, force: bool = False):
+        now = time.monotonic(); self._progress_dirty.add(target)
+        if not force and now - self._progress_printed.get(target, 0.0) < PROGRESS_INTERVAL_S: return
+        self._progress_printed[target] = now; self._progress_dirty.discard(target)
+        progress, prefix = self._progress.get(target, {}), f"[{target}] " if target else ""
+        verify = progress.get('verify')
+        if verify:
+            line = f"  {verify.get('processed', 0)}/{verify.get('total', 0)} files checked, {verify.get('missing', 0)} missing, {verify.get('corrupted', 0)} corrupted"
+        else:
+            line = f"  {prefix}{progress.get('percent', 0):5.1f}%"
+            if progress.get('speed'): line += f"  {format_bytes(progress['speed'])}/s"
+            if progress.get('eta') is not None: line += f"  ETA {format_eta(progress['eta'])}"
+        self.emit('progress', message=line)
+
+
+def summarize_results(results: Dict[str, Any]) -> Dict[str, Any]:
+    """Verification results with the (usually huge) good-file list reduced to a count"""
+    summary = {k: v for k, v in results.items() if k != 'good'}
+    summary['good'] = len(results.get('good', []))
+    return summary
+
+
+def describe_fleet_result(result: Dict[str, Any]) -> str:
+    """One summary line for a fleet target"""
+    status, game_dir = result.get('status'), result.get('game_dir', '?')
+    if status == 'updated':
+        return f"✅ {game_dir}: v{result.get('version')} → v{result.get('final_version')} ({len(result.get('patches', []))} patch(es), {format_eta(result.get('seconds', 0))})"
+    if status == 'up_to_date': return f"✅ {game_dir}: already at v{result.get('version')}"
+    at = result.get('final_version') or result.get('version')
+    return f"{'⚠️' if status == 'cancelled' else '❌'} {game_dir}: {status}{f' at v{at}' if at else ''}: {result.get('error', 'unknown error')}"
+
+
+def checksum_answerer(args, printer: EventPrinter, decisions: queue.Queue) -> Callable[[Dict[str, Any]], None]:
+    """Answers the workers' checksum-mismatch questions from --yes-checksum"""
+    def answer(msg):
+        if msg.get('type') == Q_MSG.CHECKSUM_CONFIRM:
+            update_info = msg.get('update_info') or {}
+            printer.emit('checksum_decision', message=f"⚠️ Checksum mismatch for the patch to v{update_info.get('to', '?')}: {'continuing (--yes-checksum)' if args.yes_checksum else 'stopping'}.",
+                         proceed=args.yes_checksum)
+            decisions.put(args.yes_checksum)
+    return answer
+
+
+def run_worker(target: Callable[[], None], bus: ProgressBus, printer: EventPrinter, cancel_event: threading.Event,
+               on_message: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+    """Runs a worker on its own thread and prints its bus messages until it returns
+
+    Ctrl+C sets cancel_event once and waits for the worker to stop; a second Ctrl+C aborts.
+    Returns the discrete (non-coalesced) messages in order, for the caller to judge the outcome.
+    """
+    worker = threading.Thread(target=target, name='CliWorker', daemon=True)
+    worker.start()
+    events = []
+
+    def pump():
+        for msg in bus.drain():
+            if ProgressBus.slot_key(msg) is None: events.append(msg)
+            if on_message: on_message(msg)
+            printer.show(msg)
+
+    while worker.is_alive():
+        try:
+            worker.join(POLL_INTERVAL_S); pump()
+        except KeyboardInterrupt:
+            if cancel_event.is_set(): raise
+            printer.emit('cancelling', message="⚠️ Cancelling... (Ctrl+C again to abort)")
+            cancel_event.set()
+    pump()
+    printer.flush_progress()
+    return events
+
+
+def lan_address() -> str:
+    """This machine's address on the LAN (the interface outbound traffic would use)"""
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe:
+        try: probe.connect(("10.255.255.255", 1)); return probe.getsockname()[0]
+        except OSError: return socket.gethostname()
+
+
+def load_update_data(offline: bool) -> Optional[Dict[str, Any]]:
+    """version.json from GitHub, or the cached copy (with --offline or when GitHub is unreachable)"""
+    data, source = APIHandler.load_cached_update_data() if offline else APIHandler.load_update_data()
+    if data is not None: logger.log(f"CLI: update data loaded from {source}.", "INFO")
+    return data
+
+
+def detect_version(game_dir: Path) -> str:
+    if not game_dir.is_dir(): raise ValueError(f"{game_dir} is not a directory.")
+    version = GameManager(str(game_dir)).check_version()
+    if not version or version in GameManager.VERSION_ERRORS: raise ValueError(f"Could not detect the Cricket 26 version in {game_dir} ({version}).")
+    return version
+
+
+def plan_route(data: Dict[str, Any], version: str, args) -> Optional[Dict[str, Any]]:
+    planner = UpdatePlanner(data, Constants.CACHE_DIR, lambda key: ordered_links(data, key, args.source), HostStats(Constants.CACHE_DIR), ArchiveStore.for_cache(Constants.CACHE_DIR))
+    return planner.plan(version, data.get('latest_version'), by_time=args.by_time)
+
+
+# ==============================================================================
+# COMMANDS
+# ==============================================================================
+def cmd_plan(args, printer: EventPrinter) -> int:
+    data = load_update_data(args.offline)
+    if data is None: printer.emit(Q_MSG.ERROR, message="❌ No update data from GitHub or the cache."); return EXIT_FAILED
+    version, latest = detect_version(Path(args.game_dir)), data.get('latest_version')
+    if version == latest:
+        printer.emit('plan', message=f"✅ v{version} is the latest version.", version=version, latest=latest, route=[])
+        return EXIT_OK
+    plan = plan_route(data, version, args)
+    if plan is None: printer.emit(Q_MSG.ERROR, message=f"❌ No patch route from v{version} to v{latest}."); return EXIT_FAILED
+    hops = ' → '.join(f"v{v}" for v in [version] + [e['to'] for e in plan['route']])
+    route = [{'from': e['from'], 'to': e['to'], 'key': e['key'], 'size_bytes': e['size_bytes'], 'cached': e['cached']} for e in plan['route']]
+    alternatives = [{'label': a['label'], 'route': [e['key'] for e in a['route']], 'bytes': a['bytes'], 'seconds': a['seconds']} for a in plan['alternatives']]
+    printer.emit('plan', message=f"📦 {hops}: {format_bytes(plan['bytes'])} to download, est. {format_eta(plan['seconds'])}",
+                 version=version, latest=latest, by_time=plan['by_time'], route=route, bytes=plan['bytes'], seconds=plan['seconds'], alternatives=alternatives)
+    if not printer.as_json:
+        for edge in plan['route']:
+            note = " — already downloaded" if edge['cached'] else ("" if edge['size_bytes'] else " — size unknown")
+            printer.emit('plan', message=f"  • v{edge['from']} → v{edge['to']} ({edge['size']}){note}")
+        for alternative in alternatives:
+            printer.emit('plan', message=f"  Alternative ({alternative['label']}): {' + '.join(alternative['route'])} — {format_bytes(alternative['bytes'])}, est. {format_eta(alternative['seconds'])}")
+    return EXIT_OK
+
+
+def cmd_update(args, printer: EventPrinter) -> int:
+    data = load_update_data(args.offline)
+    if data is None: printer.emit(Q_MSG.ERROR, message="❌ No update data from GitHub or the cache."); return EXIT_FAILED
+    game_dir = Path(args.game_dir); version, latest = detect_version(game_dir), data.get('latest_version')
+    if version == latest: printer.emit(Q_MSG.COMPLETE, message=f"✅ v{version} is already the latest version.", final_version=version); return EXIT_OK
+    if is_game_running() and not args.force:
+        printer.emit(Q_MSG.ERROR, message=f"❌ {Constants.GAME_EXECUTABLE} is running; close it or pass --force."); return EXIT_FAILED
+    plan = plan_route(data, version, args)
+    if plan is None: printer.emit(Q_MSG.ERROR, message=f"❌ No patch route from v{version} to v{latest}."); return EXIT_FAILED
+    updates = [UpdatePlanner.to_install_entry(edge) for edge in plan['route']]
+    for update in updates: update['links'] = ordered_links(data, update['key'], args.source)
+    logger.log(f"CLI update: v{version} → v{latest} over {len(updates)} patch(es), {format_bytes(plan['bytes'])} to download.", "SETTING")
+
+    bus, decisions = ProgressBus(), queue.Queue()
+    cancel_event, pause_event = threading.Event(), threading.Event(); pause_event.set()
+    scheduler = BackgroundScheduler(enabled=args.background, is_contended=is_game_running)
+    workflow = UpdateWorkflow(str(game_dir), Constants.CACHE_DIR, updates, data, bus, cancel_event, pause_event, not args.no_checksum, decisions, scheduler)
+    events = run_worker(workflow.run, bus, printer, cancel_event, checksum_answerer(args, printer, decisions))
+    kinds = {msg.get('type') for msg in events}
+    if Q_MSG.CANCELLED in kinds: return EXIT_CANCELLED
+    if Q_MSG.COMPLETE in kinds:
+        printer.emit('summary', message=f"✅ Game updated to v{latest}.", final_version=latest)
+        return EXIT_OK
+    return EXIT_FAILED
+
+
+def cmd_fleet(args, printer: EventPrinter) -> int:
+    """Updates every listed game folder; each patch is downloaded once and shared"""
+    game_dirs = list(args.game_dirs)
+    if args.from_file:
+        lines = Path(args.from_file).read_text(encoding='utf-8').splitlines()
+        game_dirs += [line.strip() for line in lines if line.strip() and not line.lstrip().startswith('#')]
+    if not game_dirs: raise ValueError("No game folders given; list them as arguments or in --from-file.")
+    data = load_update_data(args.offline)
+    if data is None: printer.emit(Q_MSG.ERROR, message="❌ No update data from GitHub or the cache."); return EXIT_FAILED
+    if is_game_running() and not args.force:
+        printer.emit(Q_MSG.ERROR, message=f"❌ {Constants.GAME_EXECUTABLE} is running; close it or pass --force."); return EXIT_FAILED
+
+    bus, decisions = ProgressBus(), queue.Queue()
+    cancel_event, pause_event = threading.Event(), threading.Event(); pause_event.set()
+    fleet = FleetUpdater(game_dirs, data, Constants.CACHE_DIR, bus, cancel_event, pause_event, not args.no_checksum, decisions,
+                         lambda key: ordered_links(data, key, args.source), by_time=args.by_time, installs_per_volume=args.installs_per_volume,
+                         scheduler=BackgroundScheduler(enabled=args.background, is_contended=is_game_running))
+    logger.log(f"CLI fleet update: {len(fleet.game_dirs)} game folder(s) to v{data.get('latest_version')}.", "SETTING")
+    events = run_worker(fleet.run, bus, printer, cancel_event, checksum_answerer(args, printer, decisions))
+    summary = next((msg['summary'] for msg in events if msg.get('type') == Q_MSG.FLEET_COMPLETE), None)
+    if summary is None: return EXIT_FAILED
+    if args.report: Path(args.report).write_text(json.dumps(summary, indent=2), encoding='utf-8')
+    counts = summary['counts']; failed, cancelled = counts.get('failed', 0), counts.get('cancelled', 0)
+    printer.emit('summary', message=f"{'❌' if failed or cancelled else '✅'} Fleet: {counts.get('updated', 0)} updated, {counts.get('up_to_date', 0)} up to date, {failed} failed, {cancelled} cancelled; "
+                                    f"{summary['patches_downloaded']} patch(es), {format_bytes(summary['bytes_downloaded'])} downloaded in {format_eta(summary['seconds'])}", **summary)
+    if cancel_event.is_set(): return EXIT_CANCELLED
+    return EXIT_FAILED if failed or cancelled else EXIT_OK
+
+
+def cmd_mirror(args, printer: EventPrinter) -> int:
+    """Serves cached patches to the LAN, fetching missing ones upstream on the first request"""
+    data = load_update_data(args.offline)
+    if data is None: printer.emit(Q_MSG.ERROR, message="❌ No update data from GitHub or the cache."); return EXIT_FAILED
+    cache_dir = Path(args.cache_dir) if args.cache_dir else Constants.CACHE_DIR
+    server = serve_mirror(data, args.bind, args.port, cache_dir)
+    url = f"http://{lan_address() if args.bind in ('', '0.0.0.0') else args.bind}:{server.server_address[1]}"
+    printer.emit('mirror', message=f"🌐 Serving patches at {url} from {cache_dir} (Ctrl+C to stop)", url=url, cache_dir=str(cache_dir))
+    printer.emit('mirror', message=f"  Clients: set {Constants.MIRROR_ENV_VAR}={url} or put the URL in {Constants.MIRROR_CONFIG_FILENAME} beside the app.")
+    worker = threading.Thread(target=server.serve_forever, name='MirrorServer', daemon=True); worker.start()
+    try:
+        while worker.is_alive(): worker.join(POLL_INTERVAL_S)
+    except KeyboardInterrupt:
+        printer.emit('mirror', message="⚠️ Stopping the mirror...")
+    finally:
+        server.shutdown(); server.server_close()
+    return EXIT_OK
+
+
+def cmd_verify(args, printer: EventPrinter) -> int:
+    game_dir = Path(args.game_dir); version = detect_version(game_dir)
+    data = load_update_data(args.offline)
+    bus = ProgressBus()
+    cancel_event, pause_event = threading.Event(), threading.Event(); pause_event.set()
+    printer.emit(Q_MSG.OVERALL_STATUS, message=f"Loading the v{version} manifest...")
+    manifest = ManifestStore(Constants.MANIFEST_STORE_DIR).load(data, version, cancel_event)
+    journal = VerificationJournal(game_dir, manifest)
+    checkpoint = journal.read_checkpoint() if args.resume else None
+    if checkpoint: printer.emit('resume', message=f"  Resuming after {len(checkpoint)} files checked by an interrupted run.", files=len(checkpoint))
+    elif not args.resume: journal.discard()
+    verifier = GameVerifier(game_dir, manifest, bus, cancel_event, pause_event, hash_cache=LocalHashCache(game_dir).load(), journal=journal,
+                            checkpoint=checkpoint, scheduler=BackgroundScheduler(enabled=args.background, is_contended=is_game_running))
+    events = run_worker(verifier.run, bus, printer, cancel_event)
+    results = next((msg['results'] for msg in events if msg.get('type') == Q_MSG.VERIFY_COMPLETE), None)
+    if results is None: return EXIT_CANCELLED if any(msg.get('type') == Q_MSG.VERIFY_CANCELLED for msg in events) else EXIT_FAILED
+    if args.report:
+        Path(args.report).write_text(json.dumps({'game_dir': str(game_dir), 'version': version, **results}, indent=2), encoding='utf-8')
+    problems = len(results['missing']) + len(results['corrupted'])
+    printer.emit('summary', message=f"{'❌' if problems else '✅'} v{version}: {len(results['good'])} good, {len(results['missing'])} missing, {len(results['corrupted'])} corrupted, {len(results['extra'])} extra",
+                 version=version, **summarize_results(results))
+    return EXIT_FAILED if problems else EXIT_OK
+
+
+def cmd_bench(args, printer: EventPrinter) -> int:
+    """Hashing, disk and per-host download throughput; host results feed plan --by-time"""
+    size = args.size_mb * 1024 * 1024
+
+    def report(name: str, nbytes: int, seconds: float, **fields):
+        rate = nbytes / seconds if seconds > 0 else 0.0
+        printer.emit('bench', message=f"  {name:<24} {format_bytes(nbytes):>12} in {seconds:6.2f}s  {format_bytes(rate)}/s",
+                     name=name, bytes=nbytes, seconds=round(seconds, 3), rate=round(rate), **fields)
+
+    block = os.urandom(BENCH_READ_SIZE); sha256 = hashlib.sha256(); started = time.perf_counter()
+    for _ in range(max(1, size // len(block))): sha256.update(block)
+    report("sha256 (memory)", max(1, size // len(block)) * len(block), time.perf_counter() - started)
+
+    if args.game_dir:
+        files = sorted((p for p in Path(args.game_dir).rglob('*') if p.is_file()), key=lambda p: p.stat().st_size, reverse=True)
+        read, started, sha256 = 0, time.perf_counter(), hashlib.sha256()
+        for path in files:
+            with open(path, 'rb') as f:
+                while read < size and (chunk := f.read(BENCH_READ_SIZE)): sha256.update(chunk); read += len(chunk)
+            if read >= size: break
+        report("read + sha256 (game dir)", read, time.perf_counter() - started, path=str(args.game_dir))
+
+    if args.hosts:
+        data = load_update_data(args.offline)
+        if data is None: printer.emit(Q_MSG.ERROR, message="❌ No update data from GitHub or the cache."); return EXIT_FAILED
+        host_stats, sample = HostStats(Constants.CACHE_DIR), min(size, args.host_sample_mb * 1024 * 1024)
+        for host in data.get('hosts', []):
+            link = next(iter(host.get('links', {}).values()), None)
+            if not link: continue
+            read, started = 0, time.perf_counter()
+            try:
+                with requests.get(link, headers={'Range': f"bytes=0-{sample - 1}"}, stream=True, timeout=Constants.DOWNLOAD_TIMEOUT_SECONDS) as response:
+                    response.raise_for_status()
+                    for chunk in response.iter_content(chunk_size=Constants.DOWNLOAD_BUFFER_SIZE):
+                        read += len(chunk)
+                        if read >= sample: break
+            except requests.RequestException as e:
+                printer.emit('bench', message=f"  host {host.get('id')}: ❌ {type(e).__name__}", name=f"host {host.get('id')}", error=str(e)); continue
+            seconds = time.perf_counter() - started
+            host_stats.record(host.get('id'), read, seconds)
+            report(f"host {host.get('id')}", read, seconds, host=host.get('id'))
+    return EXIT_OK
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m cricket26", description="Update and verify Cricket 26 installs without the GUI.")
+    parser.add_argument("--json", action="store_true", help="Print progress events as JSON lines")
+    parser.add_argument("--structured-log", action="store_true", help=f"Also write {Constants.STRUCTURED_LOG_FILENAME} (JSON-lines log)")
+    parser.add_argument("--offline", action="store_true", help="Use the cached version.json instead of fetching it")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def with_route_options(command):
+        command.add_argument("--by-time", action="store_true", help="Rank routes by estimated time instead of bytes")
+        command.add_argument("--source", default="Automatic", help="Download only from this host name (default: every host, in preference order)")
+
+    plan = commands.add_parser("plan", help="Show the patch route to the latest version")
+    plan.add_argument("game_dir", help="Cricket 26 installation directory")
+    with_route_options(plan)
+
+    update = commands.add_parser("update", help="Download and install every patch up to the latest version")
+    update.add_argument("game_dir", help="Cricket 26 installation directory")
+    with_route_options(update)
+    update.add_argument("--no-checksum", action="store_true", help="Skip SHA256 checks of downloaded patches")
+    update.add_argument("--yes-checksum", action="store_true", help="Install a patch even if its checksum does not match (default: stop)")
+    update.add_argument("--background", action="store_true", help="Throttle hashing and lower priority while the game runs")
+    update.add_argument("--force", action="store_true", help=f"Update even if {Constants.GAME_EXECUTABLE} is running")
+
+    verify = commands.add_parser("verify", help="Check the installed files against the version's manifest")
+    verify.add_argument("game_dir", help="Cricket 26 installation directory")
+    verify.add_argument("--report", help="Write the full results (missing, corrupted, extra, good, bad blocks) to this JSON file")
+    verify.add_argument("--no-resume", dest="resume", action="store_false", help="Ignore the checkpoint of an interrupted run")
+    verify.add_argument("--background", action="store_true", help="Throttle hashing and lower priority while the game runs")
+
+    fleet = commands.add_parser("fleet", help="Update many game folders, downloading each patch once")
+    fleet.add_argument("game_dirs", nargs="*", metavar="game_dir", help="Cricket 26 installation directories")
+    fleet.add_argument("--from-file", help="Text file with one installation directory per line (# starts a comment)")
+    with_route_options(fleet)
+    fleet.add_argument("--installs-per-volume", type=int, default=Constants.FLEET_INSTALLS_PER_VOLUME,
+                       help=f"Extract/install jobs at once on one disk (default: {Constants.FLEET_INSTALLS_PER_VOLUME}; raise for SSDs)")
+    fleet.add_argument("--report", help="Write the per-folder results to this JSON file")
+    fleet.add_argument("--no-checksum", action="store_true", help="Skip SHA256 checks of downloaded patches")
+    fleet.add_argument("--yes-checksum", action="store_true", help="Install a patch even if its checksum does not match (default: stop)")
+    fleet.add_argument("--background", action="store_true", help="Throttle hashing and lower priority while the game runs")
+    fleet.add_argument("--force", action="store_true", help=f"Update even if {Constants.GAME_EXECUTABLE} is running")
+
+    mirror = commands.add_parser("mirror", help="Serve patches to the LAN as a caching mirror")
+    mirror.add_argument("--bind", default="0.0.0.0", help="Address to listen on (default: all interfaces)")
+    mirror.add_argument("--port", type=int, default=Constants.MIRROR_PORT, help=f"Port to listen on (default: {Constants.MIRROR_PORT})")
+    mirror.add_argument("--cache-dir", help="Folder for the mirrored archives (default: the updater cache)")
+
+    bench = commands.add_parser("bench", help="Measure hashing, disk and download throughput")
+    bench.add_argument("--game-dir", help="Also measure read + hash throughput on this directory")
+    bench.add_argument("--hosts", action="store_true", help="Also sample each download host (results are kept for plan --by-time)")
+    bench.add_argument("--size-mb", type=int, default=256, help="Bytes to hash / read, in MB (default: 256)")
+    bench.add_argument("--host-sample-mb", type=int, default=16, help="Bytes to download per host, in MB (default: 16)")
+    return parser
+
+
+COMMANDS = {'plan': cmd_plan, 'update': cmd_update, 'fleet': cmd_fleet, 'mirror': cmd_mirror, 'verify': cmd_verify, 'bench': cmd_bench}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.structured_log: logger.structured_file = Path(Constants.STRUCTURED_LOG_FILENAME)
+    printer = EventPrinter(args.json)
+    logger.log(f"CLI started: {args.command}", "SETTING")
+    try:
+        Constants.CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        return COMMANDS[args.command](args, printer)
+    except KeyboardInterrupt:
+        printer.emit(Q_MSG.CANCELLED, message="⚠️ Aborted."); return EXIT_CANCELLED
+    except (OSError, ValueError, ConnectionError, InterruptedError) as e:
+        logger.log(f"CLI {args.command} failed: {e}", "ERROR")
+        printer.emit(Q_MSG.ERROR, message=f"❌ Error: {e}"); return EXIT_FAILED
+    finally:
+        logger.close()
@@ -0,0 +1,3935 @@
+"""
+CRICKET 26 UPDATER CORE
+Update, verification and manifest engines shared by the GUI and the command line.
+
+Nothing here imports tkinter or Windows-only modules at load time: the engines report through
+a progress queue (Q_MSG messages) and take decisions from a decision queue, so they run the
+same under the GUI, the CLI (python -m cricket26) or a script on a Linux build box.
+"""
+
+import os
+import re
+import sys
+import subprocess
+import shutil
+import tempfile
+import threading
+import queue
+import hashlib
+import zipfile
+import zlib
+import json
+import heapq
+import time
+import atexit
+import importlib
+from pathlib import Path
+from datetime import datetime
+from urllib.parse import urlsplit, urlunsplit, quote, unquote
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Optional, Dict, Any, List, Tuple, Callable, Iterable, BinaryIO, Union
+from collections import deque, Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed, Future
+
+from .manifest_format import BinaryManifestDecoder, build_merkle_tree, merkle_children
+from . import manifest_store
+from .delta_format import DELTA_DIR, DELTA_SUFFIX, DeltaError, apply_delta, read_delta_header, source_matches
+
+IMPORT_TIMINGS: Dict[str, float] = {}  # ms per lazily imported module, in load order
+
+# ==============================================================================
+# --- LAZY IMPORTS ---
+# ==============================================================================
+class LazyModule:
+    """Stands in for a heavy dependency and imports it on first attribute access, recording the import time."""
+    def __init__(self, name: str):
+        self._name, self._module, self._lock = name, None, threading.Lock()
+
+    def __getattr__(self, attr: str):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    started = time.perf_counter()
+                    module = importlib.import_module(self._name)
+                    IMPORT_TIMINGS[self._name] = round((time.perf_counter() - started) * 1000, 1)
+                    self._module = module
+        return getattr(self._module, attr)
+
+requests, psutil, gdown = LazyModule("requests"), LazyModule("psutil"), LazyModule("gdown")
+NO_WINDOW = getattr(subprocess, 'CREATE_NO_WINDOW', 0)  # Console-less child processes on Windows; no-op elsewhere
+
+# ==============================================================================
+# --- CONSTANTS AND MESSAGE TYPES ---
+# ==============================================================================
+class Constants:
+    SCRIPT_VERSION = "v1.0"
+    APP_NAME = "Cricket 26 Auto Updater"
+    APP_VERSION = "v1.0"
+    AUTHOR = "XLR8"
+    CREATOR_DISCORD = "xlr8_boi"
+    API_URL = "https://raw.githubusercontent.com/aman71711/CRICKET26_Utility/main/version.json"
+    REVALIDATE_TIMEOUT = (5, 15)  # Background conditional GET of version.json once the cached copy is on screen
+    LOG_FILENAME = "cricket26_updater.log"
+    STRUCTURED_LOG_FILENAME = "cricket26_updater.jsonl"  # JSON-lines sink, enabled with --structured-log
+    DISCORD_LINK = "https://discord.gg/5gWWv3ar"
+    LOG_SYMBOLS = {"INFO": "✅", "WARNING": "⚠️", "ERROR": "❌", "CRITICAL": "🛑", "SETTING": "⚙️", "DIAG": "🩺" }
+    CACHE_DIR = Path(tempfile.gettempdir()) / "cricket26_updater_cache"
+    VERIFICATION_LOGS_DIR = CACHE_DIR / "Verification_Logs"
+    BINARY_MANIFEST_SUFFIX = ".c26m"  # Compact manifest published next to each JSON manifest
+    MANIFEST_STORE_DIR = CACHE_DIR / "manifests"  # Shared with the admin panel (see cricket26/manifest_store.py)
+    HASH_CACHE_DIR = CACHE_DIR / "hash_cache"  # Per-install file digests keyed by size + mtime
+    BACKGROUND_HASH_LIMIT_MB_S = 40  # Hashing throughput cap in background mode while the game runs
+    PLAN_DEFAULT_RATE = 5 * 1024 * 1024  # Assumed download speed (bytes/s) for hosts without measurements
+    PLAN_INSTALL_OVERHEAD_S = 15  # Fixed cost per patch (connect, extract, verify) when ranking routes by time
+    PLAN_INSTALL_RATE = 150 * 1024 * 1024  # Extract-and-copy throughput assumed when ranking routes by time
+    FLEET_MAX_TARGETS = 8  # Game folders a fleet update works on at once
+    MIRROR_ENV_VAR = "CRICKET26_MIRROR"  # http://host:port of a LAN mirror (python -m cricket26 mirror), tried before the internet hosts
+    MIRROR_CONFIG_FILENAME = "c26_mirror.txt"  # Or put the mirror URL on the first line of this file beside the app
+    MIRROR_HOST_ID = "lan_mirror"
+    MIRROR_PORT = 8626
+    MIRROR_BLOCK_SIZE = 4 * 1024 * 1024  # Upstream fetch unit; concurrent requests for one block share a single fetch
+    MIRROR_RETRY_AFTER_S = 30  # Retry-After while a gdrive-only patch is downloaded whole
+    MIRROR_REFRESH_S = 300  # Minimum gap between version.json revalidations for unknown patch keys
+    FLEET_INSTALLS_PER_VOLUME = 1  # Concurrent extract/install jobs per disk in fleet mode; more only helps on SSD arrays
+    ARCHIVE_STORE_DIRNAME = "archives"  # <cache dir>/archives/<sha256>.zip plus index.json
+    ARCHIVE_STORE_MAX_BYTES = 10 * 1024 * 1024 * 1024  # Verified archives kept for reuse; least recently used go first
+    ARCHIVE_STORE_TOUCH_S = 60  # Last-access times are written back at most this often per archive
+    GAME_EXECUTABLE = "cricket26.exe"
+    DOWNLOAD_TIMEOUT_SECONDS = 15
+    DOWNLOAD_THREADS = 6  # Number of concurrent download threads for smart system
+    DOWNLOAD_CONCURRENT_CHUNKS = 8  # Increased from 4 to 8 for better speed
+    DOWNLOAD_CHUNK_SIZE = 10 * 1024 * 1024  # 10MB chunks for optimal performance
+    DOWNLOAD_BUFFER_SIZE = 128 * 1024  # 128KB buffer for file writing
+    DIAG_PROCESS_TIMEOUT_SECONDS = 60
+    DXDIAG_TIMEOUT_SECONDS = 180
+    WMI_TIMEOUT_SECONDS = 20
+    
+    # UI Performance Optimization Constants
+    QUEUE_PROCESS_INTERVAL_ACTIVE = 30  # ms during active operations (was 50)
+    QUEUE_PROCESS_INTERVAL_IDLE = 100  # ms during idle (was 100)
+    MAX_QUEUE_MESSAGES_PER_CYCLE = 20  # Limit discrete events per cycle to prevent UI freeze (coalesced slots are always sampled)
+    LOG_VIEW_MARGIN_ROWS = 40  # Rows rendered past the visible window of the Logs tab
+    CLEANUP_INTERVAL_CYCLES = 300  # Cleanup every N cycles (300 * 30ms = 9s)
+    
+    # --- Modern Unicode Icons (No FontAwesome dependency needed) ---
+    ICON_SHIELD = '🛡️'              # shield (protection/security)
+    ICON_SUN = '☀️'                 # sun (light theme)
+    ICON_MOON = '🌙'                # moon (dark theme)
+    ICON_CLOUD_DOWNLOAD = '🔄'      # sync/updater (better than cloud for updates)
+    ICON_CHECK_CIRCLE = '✅'        # check circle (verification success)
+    ICON_TOOLS = '🔧'               # tools (maintenance/settings)
+    ICON_STETHOSCOPE = '🩺'         # stethoscope (diagnostics)
+    ICON_FILE_ALT = '📄'            # file (documents/logs)
+    ICON_SEARCH = '🔍'              # search (check for updates)
+    ICON_CHECK = '✓'                # check (confirmation)
+    ICON_DOWNLOAD = '⬇️'            # download (download action)
+    ICON_PAUSE = '⏸️'               # pause (pause download)
+    ICON_PLAY = '▶️'                # play (resume download)
+    ICON_TIMES = '❌'               # times (cancel/close)
+    ICON_SHIELD_CHECK = '🛡️✓'      # shield-check (verified protection)
+    ICON_SAVE = '💾'                # save (backup saves)
+    ICON_UPLOAD = '⬆️'              # upload (restore backup)
+    ICON_COPY = '📋'                # copy (copy to clipboard)
+    ICON_GAMEPAD = '🎮'             # gamepad (launch game)
+    ICON_DATABASE = '🗄️'           # database (data management)
+    ICON_HISTORY = '📚'             # history (version history)
+    ICON_ARCHIVE = '📦'             # archive (compressed files)
+    ICON_FOLDER = '📁'              # folder (directory selection)
+    ICON_FOLDER_OPEN = '📂'         # folder-open (opened directory)
+    ICON_TRASH = '🗑️'              # trash (clear cache)
+    ICON_BROOM = '🧹'               # broom (cleanup/clear cache)
+    ICON_ERASER = '🧽'              # eraser (clear/delete)
+    ICON_RETRY = '🔄'               # retry (retry failed download)
+    ICON_FILE_EXPORT = '📤'         # file-export (export logs)
+    ICON_REFRESH = '🔄'             # refresh (reload/update)
+    ICON_WARNING = '⚠️'             # warning (alerts)
+    ICON_QUESTION = '❓'            # question (help/info)
+    ICON_COG = '⚙️'                 # cog (settings)
+    ICON_MAGIC = '✨'               # magic (auto-features)
+    ICON_ROCKET = '🚀'              # rocket (launch/start)
+    ICON_STAR = '⭐'                # star (featured/important)
+    ICON_SHORTCUT = '🔗'            # shortcut creation
+    ICON_HEART = '❤️'               # heart (favorites)
+    ICON_SYNC = '🔄'                # sync (synchronization)
+    ICON_BOLT = '⚡'                # bolt (fast/performance)
+    ICON_CHART_LINE = '📈'          # chart-line (statistics)
+    ICON_USER_SHIELD = '👤🛡️'       # user-shield (admin privileges)
+    ICON_GDRIVE = '📂'              # Google Drive icon
+
+
+class Q_MSG:
+    STATUS = 'status'; OVERALL_STATUS = 'overall_status'; PROGRESS = 'progress'
+    PROGRESS_MODE = 'progress_mode'
+    COMPLETE = 'complete'; CANCELLED = 'cancelled'; CHECKSUM_CONFIRM = 'checksum_mismatch_confirm'
+    DOWNLOAD_FAILED = 'download_failed_persistently'; VERIFY_STATS = 'verify_stats_update'
+    DOWNLOAD_RETRY_WAIT = 'download_retry_wait'; DOWNLOAD_SPEED = 'download_speed'  # NEW: Speed/ETA display
+    DOWNLOAD_ERROR_RETRY = 'download_error_retry'  # NEW: Error recovery
+    VERIFY_COMPLETE = 'verify_complete'; VERIFY_CANCELLED = 'verify_cancelled'
+    VERIFY_ISSUES_BATCH = 'verify_issues_batch'
+    MANUAL_INSTALL_CONFIRM = 'manual_install_confirm'
+    MANUAL_INSTALL_COMPLETE = 'manual_install_complete'
+    UPDATE_DATA = 'update_data'  # version.json revalidated in the background
+    FLEET_TARGET_DONE = 'fleet_target_done'; FLEET_COMPLETE = 'fleet_complete'  # Fleet mode: one per game folder, then the summary
+    ERROR = 'error'
+
+
+# ==============================================================================
+# --- HELPER FUNCTIONS & LOGGING ---
+# ==============================================================================
+def format_bytes(byte_count: int) -> str:
+    """Formats a byte count into a human-readable string (KB, MB, GB)."""
+    if byte_count is None: return "N/A"
+    power = 1024; n = 0; power_labels = {0: '', 1: 'K', 2: 'M', 3: 'G', 4: 'T'}
+    while byte_count >= power and n < len(power_labels) -1: byte_count /= power; n += 1
+    return f"{byte_count:.2f} {power_labels[n]}B"
+
+def format_eta(seconds: float) -> str:
+    """Formats a remaining-time estimate as '42s', '3m 5s' or '1h 20m'."""
+    if not (0 <= seconds <= 3600 * 24 * 7): return "--:--"
+    if seconds < 60: return f"{int(seconds)}s"
+    if seconds < 3600: return f"{int(seconds // 60)}m {int(seconds % 60)}s"
+    return f"{int(seconds // 3600)}h {int((seconds % 3600) // 60)}m"
+
+def is_game_running() -> bool:
+    return any(Constants.GAME_EXECUTABLE in (p.info['name'] or '').lower() for p in psutil.process_iter(['name']))
+
+class Logger:
+    """Asynchronous file logger with rotation and an optional JSON-lines sink.
+
+    `log()` only stamps the record and puts it on a SimpleQueue. A single writer thread keeps
+    the log open, writes whatever has queued up as one batch, rotates once its byte counter
+    passes MAX_LOG_SIZE, and flushes every FLUSH_INTERVAL_S: at once for ERROR/CRITICAL, and
+    at exit through atexit. `flush()` returns once everything logged before it is on disk.
+    Nothing happens at construction: the log file, the writer and the atexit hook are set up by
+    the first record or call, so importing the module that holds `logger` has no side effects.
+    When `structured_file` is set, every record (plus `metric()` records, which skip the text
+    log) is also written there as one JSON object per line.
+    """
+    MAX_LOG_SIZE = 10 * 1024 * 1024  # 10MB max log size
+    MAX_BACKUP_FILES = 5  # Keep up to 5 backup log files
+    FLUSH_INTERVAL_S = 0.5
+    MAX_BATCH_RECORDS = 512
+    URGENT_LEVELS = ("ERROR", "CRITICAL")
+    
+    def __init__(self, filename: str, structured_filename: Optional[str] = None):
+        self.log_file = Path(filename)
+        self.structured_file = Path(structured_filename) if structured_filename else None
+        self.log_lock = threading.Lock()  # Held while the files are written, rotated or archived
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._handles: Dict[Path, BinaryIO] = {}; self._sizes: Dict[Path, int] = {}
+        self._dirty = False; self._last_flush = time.monotonic()
+        self._writer: Optional[threading.Thread] = None; self._closed = False
+        self._start_lock = threading.Lock()
+    
+    def ensure_log_file_exists(self):
+        try:
+            if not self.log_file.parent.exists(): 
+                self.log_file.parent.mkdir(parents=True, exist_ok=True)
+            if not self.log_file.exists(): 
+                self.log_file.write_text(f"{Constants.APP_NAME} Log File\n{'='*40}\n\n", encoding='utf-8')
+        except (IOError, PermissionError) as e: 
+            print(f"CRITICAL: Could not create log file '{self.log_file}': {e}")
+    
+    def log(self, message: str, level: str = "INFO", **fields):
+        """Queues a line for the log; keyword fields (phase, host, chunk, bytes, duration) go to the JSON-lines sink."""
+        self._submit(('log', time.time(), level.upper(), message, fields))
+
+    def metric(self, phase: str, **fields):
+        """Queues a structured-only record (no text line); free when the JSON-lines sink is off."""
+        if self.structured_file is not None: self._submit(('log', time.time(), None, "", dict(fields, phase=phase)))
+
+    def flush(self, timeout: float = 5.0):
+        """Blocks until every record logged so far has been written and flushed."""
+        self._call(lambda: None, timeout)
+
+    def close(self):
+        """Drains the queue, flushes and stops the writer; later records are written synchronously."""
+        with self._start_lock: self._closed = True; writer, self._writer = self._writer, None
+        if writer is not None and writer.is_alive():
+            self._queue.put(('stop',)); writer.join(timeout=5)
+        with self.log_lock: self._close_handles()
+
+    def archive(self) -> str:
+        def _archive():
+            self._close_handles()
+            self.ensure_log_file_exists()
+            timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
+            archive_name = self.log_file.with_name(f"{self.log_file.stem}_manual_archive_{timestamp}{self.log_file.suffix}")
+            if self.log_file.exists():
+                self.log_file.rename(archive_name)
+                return str(archive_name)
+            raise FileNotFoundError("Log file does not exist.")
+        archive_name = self._call(_archive)
+        self.log("Log file manually archived.", "INFO")
+        return archive_name
+
+    def _start(self) -> Optional[threading.Thread]:
+        """Creates the log file and starts the writer on first use; None once closed."""
+        with self._start_lock:
+            if self._writer is None and not self._closed:
+                self.ensure_log_file_exists()
+                self._writer = threading.Thread(target=self._write_loop, name='LogWriter', daemon=True); self._writer.start()
+                atexit.register(self.close)
+            return self._writer
+
+    def _submit(self, item: tuple):
+        if (self._writer or self._start()) is not None: self._queue.put(item)
+        else:
+            with self.log_lock: self._write_batch([item]); self._flush_handles()
+
+    def _call(self, func: Callable[[], Any], timeout: float = 30.0) -> Any:
+        """Runs func on the writer after the records queued before it (directly once the writer is gone)."""
+        writer = self._writer or self._start()
+        if writer is None or not writer.is_alive() or threading.current_thread() is writer:
+            with self.log_lock: self._flush_handles(); return func()
+        done, outcome = threading.Event(), {}
+        self._queue.put(('call', func, done, outcome))
+        if not done.wait(timeout): raise TimeoutError("Log writer did not respond")
+        if 'error' in outcome: raise outcome['error']
+        return outcome.get('result')
+
+    def _write_loop(self):
+        while True:
+            try: batch = [self._queue.get(timeout=self.FLUSH_INTERVAL_S if self._dirty else None)]
+            except queue.Empty: batch = []
+            while len(batch) < self.MAX_BATCH_RECORDS:
+                try: batch.append(self._queue.get_nowait())
+                except queue.Empty: break
+            with self.log_lock:
+                stop = self._write_batch(batch)
+                if self._dirty and (stop or time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL_S): self._flush_handles()
+                if stop: self._close_handles(); return
+
+    def _write_batch(self, batch: List[tuple]) -> bool:
+        """Writes log records, running queued calls in order; True when a stop request was seen."""
+        lines: List[str] = []; records: List[str] = []; urgent = stop = False
+        for item in batch:
+            if item[0] == 'log':
+                _, created, level, message, fields = item
+                stamp = datetime.fromtimestamp(created)
+                if level is not None:
+                    lines.append(f"[{stamp.strftime('%Y-%m-%d %H:%M:%S')}] [{level}] {message}\n"); urgent = urgent or level in self.URGENT_LEVELS
+                if self.structured_file is not None:
+                    records.append(json.dumps({'time': stamp.isoformat(timespec='milliseconds'), 'level': level or "METRIC", 'message': message, **fields}, default=str, ensure_ascii=False) + "\n")
+                continue
+            self._append(lines, records); lines, records = [], []
+            if item[0] == 'stop': stop = True
+            elif item[0] == 'call':
+                _, func, done, outcome = item
+                try: self._flush_handles(); outcome['result'] = func()
+                except Exception as e: outcome['error'] = e
+                done.set()
+        self._append(lines, records)
+        if urgent: self._flush_handles()
+        return stop
+
+    def _append(self, lines: List[str], records: List[str]):
+        for path, chunk in ((self.log_file, lines), (self.structured_file, records)):
+            if not chunk or path is None: continue
+            data = "".join(chunk).encode('utf-8')
+            try:
+                handle = self._handles.get(path) or self._open(path)
+                handle.write(data); self._sizes[path] += len(data); self._dirty = True
+                if self._sizes[path] > self.MAX_LOG_SIZE: self._rotate(path)
+            except (IOError, PermissionError) as e:
+                print(f"Failed to write to log file: {e}")
+                self._handles.pop(path, None)
+                self.ensure_log_file_exists()
+
+    def _open(self, path: Path) -> BinaryIO:
+        if path == self.log_file: self.ensure_log_file_exists()
+        handle = path.open('ab', buffering=256 * 1024)
+        self._handles[path], self._sizes[path] = handle, handle.seek(0, os.SEEK_END)
+        return handle
+
+    def _rotate(self, path: Path):
+        """Archive the file and start a new one, keeping only MAX_BACKUP_FILES archives."""
+        try:
+            handle = self._handles.pop(path); handle.close()
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            path.rename(path.with_name(f"{path.stem}_{timestamp}{path.suffix}"))
+            backup_files = sorted(path.parent.glob(f"{path.stem}_*{path.suffix}"))
+            while len(backup_files) > self.MAX_BACKUP_FILES:
+                backup_files.pop(0).unlink(missing_ok=True)
+        except Exception as e:
+            print(f"Warning: Log rotation failed: {e}")
+
+    def _flush_handles(self):
+        for handle in self._handles.values():
+            try: handle.flush()
+            except (IOError, ValueError): pass
+        self._dirty = False; self._last_flush = time.monotonic()
+
+    def _close_handles(self):
+        self._flush_handles()
+        for handle in self._handles.values():
+            try: handle.close()
+            except (IOError, ValueError): pass
+        self._handles.clear()
+
+logger = Logger(Constants.LOG_FILENAME)
+
+
+# ==============================================================================
+# --- CORE LOGIC COMPONENTS (WORKER CLASSES) ---
+# ==============================================================================
+class APIHandler:
+    """Enhanced API handler with robust error handling and recovery."""
+    
+    @staticmethod
+    def _validate_update_data(data: Any) -> Dict[str, Any]:
+        """Checks a freshly downloaded version.json and flattens the v2.0 schema; raises ValueError."""
+        # Validate essential fields for both old and new schema
+        if not isinstance(data, dict):
+            raise ValueError("Invalid API response format - not a dict")
+        
+        # Check for new schema (v2.0) with sequential updates
+        schema_version = data.get('metadata', {}).get('schema_version', '1.0')
+        
+        if schema_version == '2.0':
+            # New Cricket 26 schema validation
+            logger.log("Detected new schema version 2.0 (Cricket 26 sequential updates)", "INFO")
+            
+            # Check for required top-level sections
+            required_sections = ['metadata', 'game_info', 'updates']
+            missing_sections = [s for s in required_sections if s not in data]
+            if missing_sections:
+                raise ValueError(f"Invalid v2.0 schema - missing sections: {missing_sections}")
+            
+            # Check metadata fields
+            metadata = data.get('metadata', {})
+            if 'game_name' not in metadata:
+                raise ValueError("Invalid v2.0 schema - metadata missing game_name")
+            
+            # Check game_info fields
+            game_info = data.get('game_info', {})
+            if 'latest_version' not in game_info:
+                raise ValueError("Invalid v2.0 schema - game_info missing latest_version")
+            
+            # Validate updates structure
+            for idx, update in enumerate(data.get('updates', [])):
+                required_update_fields = ['from_version', 'to_version', 'downloads']
+                missing = [f for f in required_update_fields if f not in update]
+                if missing:
+                    raise ValueError(f"Update {idx} missing fields: {missing}")
+                
+                # Validate downloads structure
+                downloads = update.get('downloads', {})
+                if 'primary' not in downloads:
+                    raise ValueError(f"Update {idx} missing primary download source")
+                
+                # Validate primary download has required fields
+                primary = downloads['primary']
+                if 'type' not in primary:
+                    raise ValueError(f"Update {idx} primary download missing type")
+            
+            logger.log(f"Schema v2.0 validation passed: {len(data['updates'])} sequential updates", "INFO")
+            
+            # Normalize v2.0 schema by flattening for backward compatibility
+            data['latest_version'] = data['game_info']['latest_version']
+            data['game_name'] = data['metadata']['game_name']
+            data['versions'] = data['game_info'].get('all_versions', [])
+        
+        elif 'latest_version' not in data:
+            # Old schema requires at least latest_version
+            raise ValueError("Invalid API response format - missing latest_version")
+        return data
+
+    @staticmethod
+    def _read_cache(warn_age: bool = False) -> Optional[Dict[str, Any]]:
+        """Reads the cached version.json, or None (removing it) when it is missing or corrupted."""
+        cache_path = Constants.CACHE_DIR / "version.json"
+        if not cache_path.exists(): return None
+        try:
+            # Check cache age
+            cache_age = time.time() - cache_path.stat().st_mtime
+            cache_hours = cache_age / 3600
+            
+            if warn_age and cache_hours > 24:  # Cache older than 24 hours
+                logger.log(f"Cache is {cache_hours:.1f} hours old, but using due to API failure", "WARNING")
+            
+            data = json.loads(cache_path.read_text(encoding="utf-8"))
+            
+            # Validate cached data - check for v2.0 schema first
+            if not isinstance(data, dict):
+                raise ValueError("Invalid cached data format - not a dict")
+            
+            # Normalize v2.0 schema if present
+            schema_version = data.get('metadata', {}).get('schema_version', '1.0')
+            if schema_version == '2.0':
+                # Flatten v2.0 structure for backward compatibility
+                if 'game_info' in data and 'latest_version' in data['game_info']:
+                    data['latest_version'] = data['game_info']['latest_version']
+                if 'metadata' in data and 'game_name' in data['metadata']:
+                    data['game_name'] = data['metadata']['game_name']
+                if 'game_info' in data and 'all_versions' in data['game_info']:
+                    data['versions'] = data['game_info']['all_versions']
+            
+            # Now validate required field exists
+            if 'latest_version' not in data:
+                raise ValueError("Invalid cached data format - missing latest_version")
+            
+            logger.log(f"Successfully loaded from cache: v{data.get('latest_version')}", "INFO")
+            return data
+            
+        except (json.JSONDecodeError, IOError, ValueError) as e:
+            logger.log(f"Cache fallback failed: {e}", "ERROR")
+            # Try to remove corrupted cache
+            try:
+                cache_path.unlink(missing_ok=True)
+                (Constants.CACHE_DIR / "version.meta.json").unlink(missing_ok=True)
+                logger.log("Removed corrupted cache file", "INFO")
+            except:
+                pass
+            return None
+
+    @staticmethod
+    def _write_cache(data: Dict[str, Any], response: 'requests.Response'):
+        """Caches version.json plus the ETag/Last-Modified validators used to revalidate it."""
+        cache_path = Constants.CACHE_DIR / "version.json"
+        meta = {'etag': response.headers.get('ETag'), 'last_modified': response.headers.get('Last-Modified'), 'fetched_at': time.time()}
+        try:
+            for path, text in ((cache_path, json.dumps(data, indent=2)), (cache_path.with_name("version.meta.json"), json.dumps(meta))):
+                tmp_path = path.with_name(path.name + '.tmp'); tmp_path.write_text(text, encoding='utf-8'); os.replace(tmp_path, path)
+            logger.log("API response cached successfully", "INFO")
+        except Exception as cache_error:
+            logger.log(f"Failed to cache API response: {cache_error}", "WARNING")
+
+    @staticmethod
+    def load_cached_update_data() -> Tuple[Optional[Dict[str, Any]], str]:
+        """Instant startup path: the cached version.json as (data, 'CACHE'), or (None, 'NONE')."""
+        data = with_mirror_host(APIHandler._read_cache(), configured_mirror())
+        return (data, "CACHE") if data is not None else (None, "NONE")
+
+    @staticmethod
+    def revalidate_update_data() -> Tuple[Optional[Dict[str, Any]], str]:
+        """
+        One conditional GET for version.json using the cached ETag/Last-Modified.
+        Returns (None, 'NOT_MODIFIED') on 304, else (data, 'API') after re-caching it.
+        Network and format errors propagate; the caller keeps the cached data.
+        """
+        headers = {'Accept': 'application/vnd.github.v3.raw'}
+        try: meta = json.loads((Constants.CACHE_DIR / "version.meta.json").read_text(encoding='utf-8'))
+        except (OSError, ValueError): meta = {}
+        if meta.get('etag'): headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'): headers['If-Modified-Since'] = meta['last_modified']
+        response = requests.get(Constants.API_URL, headers=headers, timeout=Constants.REVALIDATE_TIMEOUT, allow_redirects=True)
+        if response.status_code == 304:
+            return None, "NOT_MODIFIED"
+        response.raise_for_status()
+        data = APIHandler._validate_update_data(response.json())
+        APIHandler._write_cache(data, response)
+        return with_mirror_host(data, configured_mirror()), "API"
+
+    @staticmethod
+    def load_update_data() -> Tuple[Optional[Dict[str, Any]], str]:
+        """
+        Loads update data with enhanced error handling and multiple fallback strategies.
+        Returns a tuple of (data, source), where source is 'API', 'CACHE', or 'NONE'.
+        """
+        api_url = Constants.API_URL
+        headers = {'Accept': 'application/vnd.github.v3.raw'}
+        cache_path = Constants.CACHE_DIR / "version.json"
+        
+        # Ensure cache directory exists
+        try:
+            Constants.CACHE_DIR.mkdir(exist_ok=True, parents=True)
+        except Exception as e:
+            logger.log(f"Failed to create cache directory: {e}", "WARNING")
+        
+        # Try primary API with enhanced error handling
+        for attempt in range(3):  # 3 attempts with different strategies
+            try:
+                logger.log(f"Fetching version data from GitHub API (attempt {attempt + 1}/3)...", "INFO")
+                
+                timeout_values = [(5, 10), (10, 20), (15, 30)][attempt]  # Progressive timeout
+                
+                response = requests.get(
+                    api_url, 
+                    headers=headers, 
+                    timeout=timeout_values,
+                    allow_redirects=True,
+                    verify=True  # Ensure SSL verification
+                )
+                response.raise_for_status()
+                
+                # Validate response content
+                if not response.content:
+                    raise ValueError("Empty response from API")
+                
+                data = response.json()
+                
+                data = APIHandler._validate_update_data(data)
+                
+                logger.log(f"Successfully loaded from GitHub API: v{data.get('latest_version')}", "INFO")
+                
+                # Cache the successful response (without the LAN mirror, which is local configuration)
+                APIHandler._write_cache(data, response)
+                
+                return with_mirror_host(data, configured_mirror()), "API"
+                
+            except requests.exceptions.SSLError as e:
+                logger.log(f"SSL error on attempt {attempt + 1}: {e}", "ERROR")
+                if attempt == 2:  # Last attempt
+                    logger.log("All SSL attempts failed, falling back to cache", "WARNING")
+                    
+            except requests.exceptions.Timeout as e:
+                logger.log(f"Timeout on attempt {attempt + 1}: {e}", "WARNING")
+                if attempt < 2:
+                    time.sleep(2 ** attempt)  # Exponential backoff
+                    
+            except requests.exceptions.ConnectionError as e:
+                logger.log(f"Connection error on attempt {attempt + 1}: {e}", "WARNING")
+                if attempt < 2:
+                    time.sleep(2 ** attempt)
+                    
+            except requests.exceptions.HTTPError as e:
+                status_code = getattr(e.response, 'status_code', 'unknown')
+                logger.log(f"HTTP error {status_code} on attempt {attempt + 1}: {e}", "ERROR")
+                if status_code in [429, 503]:  # Rate limit or service unavailable
+                    if attempt < 2:
+                        time.sleep(5 * (attempt + 1))
+                else:
+                    break  # Don't retry for client errors (4xx)
+                    
+            except (ValueError, json.JSONDecodeError) as e:
+                logger.log(f"Invalid API response on attempt {attempt + 1}: {e}", "ERROR")
+                break  # Don't retry for data format errors
+                
+            except Exception as e:
+                logger.log(f"Unexpected error on attempt {attempt + 1}: {e}", "ERROR")
+                if attempt < 2:
+                    time.sleep(1)
+        
+        # Fallback to cache
+        if cache_path.exists():
+            logger.log("API failed, attempting to load from cache...", "INFO")
+            data = APIHandler._read_cache(warn_age=True)
+            if data is not None: return with_mirror_host(data, configured_mirror()), "CACHE"
+        
+        logger.log("All data sources failed - API and cache both unavailable", "CRITICAL")
+        return None, "NONE"
+
+
+# ==============================================================================
+# --- GOOGLE DRIVE DOWNLOAD SUPPORT ---
+# ==============================================================================
+
+def download_from_gdrive(file_id: str, output_path: Path, 
+                        progress_queue: queue.Queue,
+                        cancel_event: threading.Event) -> bool:
+    """
+    Download file from Google Drive using gdown library.
+    
+    Args:
+        file_id: Google Drive file ID or full URL
+        output_path: Where to save the downloaded file
+        progress_queue: Queue for progress messages
+        cancel_event: Event to check for cancellation
+    
+    Returns:
+        True if download successful, False otherwise
+    """
+    try:
+        # Extract file ID from URL if needed
+        if 'drive.google.com' in file_id:
+            import re
+            match = re.search(r'/d/([a-zA-Z0-9_-]+)', file_id)
+            if match:
+                file_id = match.group(1)
+            else:
+                match = re.search(r'id=([a-zA-Z0-9_-]+)', file_id)
+                if match:
+                    file_id = match.group(1)
+        
+        # Construct download URL
+        url = f"https://drive.google.com/uc?id={file_id}"
+        
+        # Send status update
+        progress_queue.put({
+            'type': Q_MSG.STATUS,
+            'message': f'{Constants.ICON_GDRIVE} Downloading from Google Drive...'
+        })
+        
+        logger.log(f"Starting Google Drive download: {file_id}", "INFO")
+        
+        # Check if user cancelled before starting download
+        if cancel_event.is_set():
+            logger.log("Google Drive download cancelled before start", "WARNING")
+            return False
+        
+        # Download with gdown
+        result = gdown.download(
+            url, 
+            str(output_path), 
+            quiet=False,
+            fuzzy=True  # Handle shared link variations
+        )
+        
+        # Check for cancellation after download
+        if cancel_event.is_set():
+            logger.log("Google Drive download cancelled - cleaning up", "WARNING")
+            if output_path.exists():
+                output_path.unlink()  # Delete partial file
+            return False
+        
+        # Check if download succeeded
+        if result and output_path.exists() and output_path.stat().st_size > 0:
+            logger.log(f"Google Drive download complete: {output_path.name}", "INFO")
+            progress_queue.put({
+                'type': Q_MSG.STATUS,
+                'message': '✅ Google Drive download complete'
+            })
+            return True
+        else:
+            raise RuntimeError("Download failed - file is empty or doesn't exist")
+            
+    except Exception as e:
+        logger.log(f"Google Drive download failed: {e}", "ERROR")
+        progress_queue.put({
+            'type': Q_MSG.STATUS,
+            'message': f'❌ Google Drive download failed: {str(e)[:50]}'
+        })
+        
+        # Clean up partial files
+        if output_path.exists():
+            try:
+                output_path.unlink()
+            except:
+                pass
+        
+        return False
+
+# ==============================================================================
+# --- MULTI-THREADED CONCURRENT DOWNLOADER ---
+# ==============================================================================
+
+class ConcurrentDownloader:
+    """Manages multi-threaded, pausable, and resumable file downloads with intelligent host failover."""
+    def __init__(self, progress_queue: queue.Queue, cancel_event: threading.Event, pause_event: threading.Event):
+        self.progress_queue = progress_queue
+        self.cancel_event = cancel_event
+        self.pause_event = pause_event
+        self.speed_buffer = deque(maxlen=10)
+        self.total_downloaded = 0
+        self.download_lock = threading.Lock()
+        self.host_performance = {}  # Track host performance for smart ordering
+        self.current_primary_host = None
+        self.current_backup_host = None
+        self.retry_count = 0
+        self.max_retries = 4  # Maximum retry attempts per host
+        
+        # NEW: Enhanced tracking for speed/ETA and error recovery
+        self.download_start_time = None
+        self.last_speed_calculation = 0
+        self.error_history = []  # Track recent errors for smart recovery
+        self.consecutive_failures = 0
+        self.last_successful_host = None
+        self.download_session_stats = {
+            'total_bytes': 0,
+            'bytes_downloaded': 0,
+            'average_speed': 0,
+            'peak_speed': 0,
+            'time_elapsed': 0,
+            'eta_seconds': 0
+        }
+
+    def _format_eta(self, seconds: float) -> str: return format_eta(seconds)
+    
+    def _record_error(self, error_type: str, host_id: str, details: str = ""):
+        """Record download errors for smart recovery analysis."""
+        error_record = {
+            'timestamp': time.time(),
+            'type': error_type,
+            'host_id': host_id,
+            'details': details
+        }
+        self.error_history.append(error_record)
+        
+        # Keep only recent errors (last 5 minutes)
+        cutoff_time = time.time() - 300  # 5 minutes
+        self.error_history = [e for e in self.error_history if e['timestamp'] > cutoff_time]
+        
+        # Track consecutive failures
+        if error_type in ['SSL', 'Connection', 'Timeout']:
+            self.consecutive_failures += 1
+        
+        logger.log(f"Error recorded: {error_type} on {host_id} - {details}", "WARNING")
+    
+    def _analyze_error_patterns(self) -> Dict[str, Any]:
+        """Analyze recent error patterns to suggest recovery strategies."""
+        if not self.error_history:
+            return {'strategy': 'normal', 'suggestion': 'Continue normal operation'}
+        
+        recent_errors = [e for e in self.error_history if e['timestamp'] > time.time() - 60]  # Last minute
+        
+        # Count error types
+        error_counts = {}
+        host_errors = {}
+        for error in recent_errors:
+            error_counts[error['type']] = error_counts.get(error['type'], 0) + 1
+            host_errors[error['host_id']] = host_errors.get(error['host_id'], 0) + 1
+        
+        # Determine recovery strategy
+        if error_counts.get('SSL', 0) >= 3:
+            return {
+                'strategy': 'dns_fix',
+                'suggestion': 'Multiple SSL errors detected. Consider DNS configuration.',
+                'action': 'offer_dns_fix'
+            }
+        elif error_counts.get('Connection', 0) >= 3:
+            return {
+                'strategy': 'network_check',
+                'suggestion': 'Network connectivity issues detected.',
+                'action': 'check_connectivity'
+            }
+        elif self.consecutive_failures >= 5:
+            return {
+                'strategy': 'cooldown',
+                'suggestion': 'Multiple consecutive failures. Recommend brief pause.',
+                'action': 'suggest_pause'
+            }
+        else:
+            return {'strategy': 'normal', 'suggestion': 'Continue with current approach'}
+    
+    def _update_session_stats(self, bytes_downloaded: int, total_bytes: int):
+        """Update download session statistics for detailed reporting."""
+        current_time = time.time()
+        
+        if self.download_start_time is None:
+            self.download_start_time = current_time
+        
+        self.download_session_stats['bytes_downloaded'] = bytes_downloaded
+        self.download_session_stats['total_bytes'] = total_bytes
+        self.download_session_stats['time_elapsed'] = current_time - self.download_start_time
+        
+        # Calculate speeds
+        if self.download_session_stats['time_elapsed'] > 0:
+            self.download_session_stats['average_speed'] = bytes_downloaded / self.download_session_stats['time_elapsed']
+        
+        # Calculate ETA
+        if len(self.speed_buffer) > 0:
+            current_speed = sum(self.speed_buffer) / len(self.speed_buffer)
+            remaining_bytes = total_bytes - bytes_downloaded
+            if current_speed > 0:
+                self.download_session_stats['eta_seconds'] = remaining_bytes / current_speed
+            
+            # Track peak speed
+            if current_speed > self.download_session_stats['peak_speed']:
+                self.download_session_stats['peak_speed'] = current_speed
+
+    def _download_chunk(self, url: str, start_byte: int, end_byte: int, output_path: Path, progress_path: Path, chunk_index: int) -> bool:
+        headers = {'Range': f'bytes={start_byte}-{end_byte}'}
+        
+        for attempt in range(self.max_retries):
+            self.pause_event.wait()
+            if self.cancel_event.is_set(): return False
+            
+            # Aggressive timeout strategy: start fast, escalate moderately
+            timeout = 6 if attempt == 0 else (8 if attempt == 1 else (10 if attempt == 2 else 12))
+            
+            try:
+                started = time.monotonic()
+                with requests.get(url, headers=headers, stream=True, timeout=timeout) as r:
+                    r.raise_for_status()
+                    with open(output_path, "r+b") as f:
+                        f.seek(start_byte)
+                        chunk_size_downloaded = 0
+                        for chunk in r.iter_content(chunk_size=8192):
+                            self.pause_event.wait()
+                            if self.cancel_event.is_set(): return False
+                            f.write(chunk)
+                            chunk_size_downloaded += len(chunk)
+                            
+                            # Update total downloaded in real-time for smooth progress
+                            with self.download_lock: 
+                                self.total_downloaded += len(chunk)
+                
+                # Immediately flush progress to disk for resume reliability
+                with progress_path.open("a", encoding='utf-8') as pf:
+                    pf.write(f"{chunk_index}\n")
+                logger.metric('download_chunk', host=urlsplit(url).hostname, chunk=chunk_index, bytes=chunk_size_downloaded, duration=round(time.monotonic() - started, 3), attempt=attempt + 1)
+                return True
+                
+            except (requests.exceptions.HTTPError, requests.exceptions.SSLError, requests.exceptions.ConnectionError) as e:
+                # Critical errors - fail immediately to trigger host switch
+                if isinstance(e, requests.exceptions.HTTPError):
+                    if e.response.status_code in [404, 403, 410]:  # File not found errors
+                        logger.log(f"Chunk {chunk_index}: File not accessible on this host (HTTP {e.response.status_code}). Switching host immediately.", "ERROR")
+                        self._record_error("HTTP", getattr(self, 'current_primary_host', 'unknown'), f"Status {e.response.status_code}")
+                        return False
+                    error_msg = f"HTTP {e.response.status_code}"
+                    self._record_error("HTTP", getattr(self, 'current_primary_host', 'unknown'), error_msg)
+                elif isinstance(e, requests.exceptions.SSLError):
+                    error_msg = "SSL/TLS Error"
+                    self._record_error("SSL", getattr(self, 'current_primary_host', 'unknown'), str(e))
+                    # Immediate UI feedback for SSL/TLS errors to prevent appearance of being stuck
+                    self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"⚠️ SSL/TLS error on chunk {chunk_index}, switching host..."})
+                else:
+                    error_msg = "Connection Refused"
+                    self._record_error("Connection", getattr(self, 'current_primary_host', 'unknown'), str(e))
+                    
+                logger.log(f"Chunk {chunk_index}: Critical failure ({error_msg}). Will switch host after retries.", "ERROR")
+                
+                # For critical errors, only retry once quickly before switching host
+                if attempt == 0:
+                    time.sleep(0.3)  # Very short wait for immediate retry
+                    continue
+                else:
+                    # Check for error patterns and suggest recovery
+                    error_analysis = self._analyze_error_patterns()
+                    if error_analysis['strategy'] != 'normal':
+                        self.progress_queue.put({
+                            'type': Q_MSG.DOWNLOAD_ERROR_RETRY,
+                            'analysis': error_analysis,
+                            'chunk_index': chunk_index
+                        })
+                    
+                    # Immediate status update before returning failure
+                    if isinstance(e, requests.exceptions.SSLError):
+                        self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"❌ SSL/TLS errors, switching to backup host..."})
+                    return False  # Switch host after 1 retry for critical errors
+                
+            except (requests.exceptions.Timeout, requests.exceptions.ReadTimeout) as e:
+                # Timeout errors - more forgiving, allow more retries
+                self._record_error("Timeout", getattr(self, 'current_primary_host', 'unknown'), f"Timeout after {timeout}s")
+                logger.log(f"Chunk {chunk_index}: Timeout on attempt {attempt+1}/{self.max_retries} ({timeout}s): {type(e).__name__}", "WARNING")
+                if self.cancel_event.is_set(): return False
+                if attempt < self.max_retries - 1:
+                    # Escalating wait times: 0.3s, 0.7s, 1.2s
+                    wait_time = 0.3 + (attempt * 0.4)
+                    time.sleep(wait_time)
+                    
+            except requests.RequestException as e:
+                # Other network errors - moderate retry strategy
+                logger.log(f"Chunk {chunk_index}: Network error on attempt {attempt+1}/{self.max_retries}: {type(e).__name__}", "WARNING")
+                if self.cancel_event.is_set(): return False
+                if attempt < self.max_retries - 1:
+                    # Faster retry for network errors: 0.5s, 1.0s, 1.5s
+                    wait_time = 0.5 + (attempt * 0.5)
+                    time.sleep(wait_time)
+                    
+        logger.log(f"Chunk {chunk_index}: Failed after {self.max_retries} attempts. Switching to backup host.", "ERROR")
+        return False
+
+    def _test_host_parallel(self, link_info: Dict[str, str], results: List, index: int) -> None:
+        """Test a single host in parallel and store results."""
+        link = link_info['link']
+        host_id = link_info['host_id']
+        start_time = time.time()
+        
+        try:
+            # Quick connection test with tight timeout
+            response = requests.head(link, timeout=4, allow_redirects=True)
+            response.raise_for_status()
+            response_time = time.time() - start_time
+            size = int(response.headers.get('content-length', 0))
+            
+            if size > 0:
+                # Store performance metrics
+                self.host_performance[host_id] = {
+                    'response_time': response_time,
+                    'size': size,
+                    'success': True,
+                    'last_test': time.time()
+                }
+                results[index] = {
+                    'host_info': link_info,
+                    'size': size,
+                    'response_time': response_time,
+                    'success': True
+                }
+                logger.log(f"✅ Host '{host_id}' responded in {response_time:.2f}s - {format_bytes(size)}", "INFO")
+            else:
+                results[index] = {'success': False, 'host_info': link_info, 'error': 'No content-length'}
+                logger.log(f"❌ Host '{host_id}' returned no file size", "WARNING")
+                
+        except requests.RequestException as e:
+            response_time = time.time() - start_time
+            results[index] = {
+                'success': False, 
+                'host_info': link_info, 
+                'error': str(e),
+                'response_time': response_time
+            }
+            logger.log(f"❌ Host '{host_id}' failed in {response_time:.2f}s: {type(e).__name__}", "WARNING")
+
+    def _get_remote_file_info(self, links: List[Dict[str, str]]) -> Tuple[int, Dict[str, str], Dict[str, str]]:
+        """Smart host testing - optimized for single vs multi-host scenarios."""
+        if not links:
+            return 0, {}, {}
+        
+        # INTELLIGENT MODE DETECTION - Single host vs Multi-host behavior
+        is_single_host_mode = len(links) == 1
+        
+        if is_single_host_mode:
+            # SINGLE HOST MODE - Direct connection, no racing messages
+            single_host = links[0]
+            logger.log(f"📡 SINGLE HOST MODE: Connecting to {single_host['host_id']}...", "INFO")
+            self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"📡 Connecting to {single_host['host_id']}..."})
+            
+            # Test the single host directly
+            results = [None]
+            self._test_host_parallel(single_host, results, 0)
+            
+            if results[0] and results[0].get('success'):
+                host_result = results[0]
+                host_info = host_result['host_info']
+                
+                logger.log(f"✅ Connected to {host_info['host_id']} ({host_result['response_time']:.2f}s)", "INFO")
+                self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"✅ Connected to {host_info['host_id']}"})
+                
+                self.current_primary_host = host_info['host_id']
+                self.current_backup_host = host_info['host_id']  # Same host as backup
+                
+                return host_result['size'], host_info, host_info
+            else:
+                logger.log(f"❌ Failed to connect to {single_host['host_id']}", "ERROR")
+                self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"❌ Failed to connect to {single_host['host_id']}"})
+                return 0, {}, {}
+        else:
+            # MULTI-HOST SMART MODE - Parallel racing for best performance
+            logger.log(f"🚀 SMART PARALLEL TESTING: Racing {len(links)} hosts to find the fastest...", "INFO")
+            self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"🏁 Racing {len(links)} hosts for fastest response..."})
+            
+            # Prepare parallel testing
+            results = [None] * len(links)
+            threads = []
+            
+            # Start all host tests simultaneously
+            for i, link_info in enumerate(links):
+                thread = threading.Thread(
+                    target=self._test_host_parallel,
+                    args=(link_info, results, i),
+                    daemon=True
+                )
+                threads.append(thread)
+                thread.start()
+            
+            # Show progress while waiting
+            start_time = time.time()
+            successful_hosts = []
+            
+            # Wait for all tests to complete with timeout
+            for i, thread in enumerate(threads):
+                thread.join(timeout=5)  # 5 second timeout per host
+                
+                # Update progress
+                completed = i + 1
+                self.progress_queue.put({
+                    'type': Q_MSG.STATUS, 
+                    'message': f"🔍 Testing progress: {completed}/{len(links)} hosts checked..."
+                })
+                
+                # Check if we have a successful result
+                if results[i] and results[i].get('success'):
+                    successful_hosts.append(results[i])
+            
+            # Filter and sort successful hosts by response time
+            successful_hosts = [r for r in results if r and r.get('success')]
+            
+            if not successful_hosts:
+                logger.log("🚫 PARALLEL TEST FAILED: No hosts responded successfully!", "ERROR")
+                self.progress_queue.put({'type': Q_MSG.STATUS, 'message': "❌ All hosts failed - check connection"})
+                return 0, {}, {}
+            
+            # Sort by response time (fastest first); a responding LAN mirror always wins, since it serves at LAN speed once warm
+            successful_hosts.sort(key=lambda x: (x['host_info']['host_id'] != Constants.MIRROR_HOST_ID, x['response_time']))
+            primary_host = successful_hosts[0]
+            backup_host = successful_hosts[1] if len(successful_hosts) > 1 else successful_hosts[0]
+            
+            total_time = time.time() - start_time
+            primary_info = primary_host['host_info']
+            backup_info = backup_host['host_info']
+            
+            logger.log(f"🎯 WINNER: '{primary_info['host_id']}' ({primary_host['response_time']:.2f}s) | Backup: '{backup_info['host_id']}' ({backup_host['response_time']:.2f}s)", "INFO")
+            logger.log(f"📊 Parallel test completed in {total_time:.2f}s - {len(successful_hosts)}/{len(links)} hosts available", "INFO")
+            
+            self.current_primary_host = primary_info['host_id']
+            self.current_backup_host = backup_info['host_id']
+            
+            self.progress_queue.put({
+                'type': Q_MSG.STATUS, 
+                'message': f"🏆 Primary: {primary_info['host_id']} | Backup: {backup_info['host_id']}"
+            })
+            
+            return primary_host['size'], primary_info, backup_info
+
+    def download_file(self, links: List[Dict[str, str]], destination_folder: Path, output_filename: str) -> Optional[Tuple[Path, str]]:
+        output_path = destination_folder / output_filename
+        progress_path = output_path.with_suffix(output_path.suffix + '.progress')
+        host_info_path = output_path.with_suffix(output_path.suffix + '.hostinfo')
+        
+        # INTELLIGENT MODE DETECTION for appropriate messaging
+        is_single_host_mode = len(links) == 1
+        selected_host_name = links[0]['host_id'] if is_single_host_mode else "multiple hosts"
+        
+        if is_single_host_mode:
+            logger.log(f"� SINGLE HOST DOWNLOAD: Starting '{output_filename}' from {selected_host_name}", "INFO")
+            self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"📱 Starting download from {selected_host_name}..."})
+            self.progress_queue.put({'type': Q_MSG.OVERALL_STATUS, 'message': f"📡 Downloading {output_filename} from {selected_host_name}"})
+        else:
+            logger.log(f"🚀 SMART DOWNLOAD: Starting '{output_filename}' with {len(links)} available hosts", "INFO")
+            self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"🔍 Initializing smart download for {output_filename}..."})
+            self.progress_queue.put({'type': Q_MSG.OVERALL_STATUS, 'message': f"🧠 Smart host selection for {output_filename}"})
+
+        # Smart host testing - optimized for single vs multi-host scenarios
+        total_size, primary_host_info, backup_host_info = self._get_remote_file_info(links)
+        if total_size == 0:
+            if is_single_host_mode:
+                raise ConnectionError(f"DOWNLOAD FAILED: Could not connect to {selected_host_name} for {output_filename}.")
+            else:
+                raise ConnectionError(f"SMART DOWNLOAD FAILED: No hosts responded for {output_filename} out of {len(links)} available hosts.")
+
+        # Create optimized download order with intelligent fallback and progress-aware prioritization
+        download_sequence = []
+        
+        # Check for existing progress to prioritize accordingly
+        existing_progress_info = None
+        if progress_path.exists() and output_path.exists() and host_info_path.exists():
+            try:
+                # Load previous download state
+                previous_host_info = {}
+                with host_info_path.open("r", encoding='utf-8') as hf:
+                    for line in hf:
+                        if line.strip():
+                            key, value = line.strip().split('=', 1)
+                            previous_host_info[key] = value
+                
+                previous_host_id = previous_host_info.get('host_id', 'unknown')
+                previous_file_size = int(previous_host_info.get('file_size', '0'))
+                current_size = output_path.stat().st_size if output_path.exists() else 0
+                completion_percentage = (current_size / total_size * 100) if total_size > 0 and previous_file_size == total_size else 0
+                
+                if completion_percentage > 60:  # 60% threshold for smart resume
+                    existing_progress_info = {
+                        'host_id': previous_host_id,
+                        'completion': completion_percentage,
+                        'file_size_match': previous_file_size == total_size
+                    }
+                    logger.log(f"🔍 FOUND EXISTING PROGRESS: {completion_percentage:.1f}% from host '{previous_host_id}'", "INFO")
+                    
+            except Exception as e:
+                logger.log(f"⚠️ Could not read existing progress: {e}", "WARNING")
+        
+        # Build download sequence with intelligent progress-aware prioritization
+        if existing_progress_info and existing_progress_info['file_size_match']:
+            # Smart host prioritization based on progress
+            previous_host_id = existing_progress_info['host_id']
+            completion = existing_progress_info['completion']
+            
+            # Find the host with existing progress
+            existing_host = next((h for h in links if h['host_id'] == previous_host_id), None)
+            
+            if existing_host and completion > 60:
+                # >60% downloaded - LOCK to this host as primary priority
+                logger.log(f"🔒 HOST LOCK: '{previous_host_id}' has {completion:.1f}% progress - using as primary host", "INFO")
+                download_sequence = [existing_host]
+                
+                # Add other hosts as backups only (will only be used if primary fails)
+                for link_info in links:
+                    if link_info['host_id'] != previous_host_id:
+                        download_sequence.append(link_info)
+                        
+            elif existing_host and completion > 0:
+                # Some progress but <60% - prefer this host but don't lock to it
+                logger.log(f"🚀 PROGRESS PRIORITY: Using '{previous_host_id}' first ({completion:.1f}% already downloaded)", "INFO")
+                download_sequence = [existing_host]
+                
+                # Add fastest host as second priority if different
+                if primary_host_info['host_id'] != previous_host_id:
+                    download_sequence.append(primary_host_info)
+                if backup_host_info and backup_host_info['host_id'] != previous_host_id and backup_host_info != primary_host_info:
+                    download_sequence.append(backup_host_info)
+                    
+                # Add remaining hosts
+                for link_info in links:
+                    if link_info not in download_sequence:
+                        download_sequence.append(link_info)
+            else:
+                logger.log(f"⚠️ Host '{previous_host_id}' with progress not available, using speed priority", "WARNING")
+                # Fall back to speed-based priority
+                download_sequence = [primary_host_info]
+                if backup_host_info and backup_host_info != primary_host_info:
+                    download_sequence.append(backup_host_info)
+                
+                # Add remaining hosts as tertiary backups
+                for link_info in links:
+                    if link_info not in download_sequence:
+                        download_sequence.append(link_info)
+        else:
+            # No significant progress or file size mismatch - use speed-based priority
+            download_sequence = [primary_host_info]
+            if backup_host_info and backup_host_info != primary_host_info:
+                download_sequence.append(backup_host_info)
+            
+            # Add remaining hosts as tertiary backups
+            for link_info in links:
+                if link_info not in download_sequence:
+                    download_sequence.append(link_info)
+
+        logger.log(f"📋 OPTIMIZED DOWNLOAD SEQUENCE: {[h['host_id'] for h in download_sequence[:3]]}{'...' if len(download_sequence) > 3 else ''}", "INFO")
+
+        # Smart resume logic with ENHANCED same-host resume and intelligent host switching
+        completed_chunks = set()
+        current_host_id = primary_host_info['host_id']
+        
+        if progress_path.exists() and output_path.exists() and host_info_path.exists():
+            logger.log("🔍 Checking resume compatibility...", "INFO")
+            try:
+                # Load previous download state
+                previous_host_info = {}
+                try:
+                    with host_info_path.open("r", encoding='utf-8') as hf:
+                        for line in hf:
+                            if line.strip():
+                                key, value = line.strip().split('=', 1)
+                                previous_host_info[key] = value
+                except Exception:
+                    previous_host_info = {}
+                
+                previous_host_id = previous_host_info.get('host_id', 'unknown')
+                previous_file_size = int(previous_host_info.get('file_size', '0'))
+                current_size = output_path.stat().st_size if output_path.exists() else 0
+                completion_percentage = (current_size / total_size * 100) if total_size > 0 else 0
+                
+                # ENHANCED RESUME LOGIC - Your requirements implemented:
+                # 1. Resume from any size if same host
+                # 2. Only switch hosts if >60% progress and current host fails  
+                # 3. Always use fastest host but delete partial files when switching
+                
+                if previous_host_id == current_host_id and previous_file_size == total_size:
+                    # SAME HOST RESUME - Resume from any size (no minimum threshold)
+                    if current_size > 0 and current_size <= total_size:
+                        try:
+                            with progress_path.open("r", encoding='utf-8') as pf:
+                                completed_chunks = {int(line) for line in pf if line.strip()}
+                            logger.log(f"✅ SAME HOST RESUME: Continuing from {previous_host_id} with {completion_percentage:.1f}% progress", "INFO")
+                            self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"⚡ Resuming from {current_host_id} ({completion_percentage:.1f}% done)..."})
+                        except (ValueError, IOError):
+                            logger.log("⚠️ Progress file corrupted, restarting from beginning", "WARNING")
+                            self._cleanup_partial_files(output_path, progress_path, host_info_path)
+                    else:
+                        logger.log(f"⚠️ Invalid file size {current_size}, restarting", "WARNING")
+                        self._cleanup_partial_files(output_path, progress_path, host_info_path)
+                        
+                elif previous_host_id != current_host_id:
+                    # DIFFERENT HOST - Smart decision based on progress and host availability
+                    
+                    if completion_percentage > 60:
+                        # >60% downloaded - Try to continue with original host if available (HOST LOCK)
+                        original_host = next((h for h in download_sequence if h['host_id'] == previous_host_id), None)
+                        
+                        if original_host:
+                            logger.log(f"� HOST LOCK ACTIVATED: {completion_percentage:.1f}% from '{previous_host_id}' - prioritizing original host", "INFO")
+                            # Move original host to front to prioritize it
+                            if download_sequence[0]['host_id'] != previous_host_id:
+                                download_sequence.remove(original_host)
+                                download_sequence.insert(0, original_host)
+                            current_host_id = previous_host_id
+                            
+                            try:
+                                with progress_path.open("r", encoding='utf-8') as pf:
+                                    completed_chunks = {int(line) for line in pf if line.strip()}
+                                self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"� Host locked: Resuming from {previous_host_id} ({completion_percentage:.1f}%)..."})
+                            except (ValueError, IOError):
+                                logger.log("⚠️ Progress file corrupted but preserving host priority", "WARNING")
+                                self._cleanup_partial_files(output_path, progress_path, host_info_path)
+                        else:
+                            # Original host not available - delete partial file and use fastest host
+                            logger.log(f"⚠️ HOST SWITCH REQUIRED: Original host '{previous_host_id}' unavailable, deleting partial file", "WARNING")
+                            self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"🔄 Host switched: Deleting partial file and using fastest host..."})
+                            self._cleanup_partial_files(output_path, progress_path, host_info_path)
+                    else:
+                        # <60% downloaded - Always use fastest host, delete partial file
+                        logger.log(f"🚀 OPTIMAL HOST SWITCH: {completion_percentage:.1f}% from '{previous_host_id}' → '{current_host_id}' (faster)", "INFO")
+                        self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"🚀 Switching to faster host {current_host_id}, deleting partial file..."})
+                        self._cleanup_partial_files(output_path, progress_path, host_info_path)
+                        
+                elif previous_file_size != total_size:
+                    # File size changed - Always restart
+                    logger.log(f"🔄 SIZE CHANGE: File size changed from {previous_file_size} to {total_size}, restarting", "WARNING")
+                    self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"🔄 File size changed, restarting download..."})
+                    self._cleanup_partial_files(output_path, progress_path, host_info_path)
+                    
+            except (ValueError, IOError, OSError) as e:
+                logger.log(f"⚠️ Resume state corrupted, restarting fresh: {e}", "WARNING")
+                self._cleanup_partial_files(output_path, progress_path, host_info_path)
+
+        # Initialize fresh download if needed
+        if not output_path.exists():
+            logger.log(f"🆕 FRESH DOWNLOAD: Preparing {output_filename} ({format_bytes(total_size)})", "INFO")
+            with open(output_path, "wb") as f: 
+                f.truncate(total_size)
+            completed_chunks.clear()
+            
+            # Create host tracking file
+            self._create_host_info_file(host_info_path, current_host_id, total_size)
+
+        # Prepare chunk structure
+        chunk_size = Constants.DOWNLOAD_CHUNK_SIZE
+        num_chunks = max(1, (total_size + chunk_size - 1) // chunk_size)
+        all_chunks = [{'index': i, 'start': i * chunk_size, 'end': min((i + 1) * chunk_size - 1, total_size - 1)} for i in range(num_chunks)]
+
+        # INTELLIGENT MULTI-HOST DOWNLOAD with smart failover
+        for attempt, host_info in enumerate(download_sequence):
+            if self.cancel_event.is_set(): 
+                break
+                
+            host_id = host_info['host_id']
+            link = host_info['link']
+            
+            logger.log(f"📡 DOWNLOAD ATTEMPT {attempt + 1}/{len(download_sequence)}: Using host '{host_id}'", "INFO")
+            
+            if attempt > 0:
+                # Switching hosts due to failure - implement smart host preservation logic
+                self.progress_queue.put({
+                    'type': Q_MSG.STATUS, 
+                    'message': f"🔄 Switching to host {host_id} (attempt {attempt + 1})..."
+                })
+                
+                # SMART HOST SWITCHING LOGIC:
+                # 1. Resume from any size if continuing with same host
+                # 2. If >60% downloaded from previous host, try to stick with that host unless it fails
+                # 3. Only delete partial files when actually switching to different host
+                should_clean = False
+                
+                if existing_progress_info:
+                    previous_host_id = existing_progress_info['host_id']
+                    completion_percentage = existing_progress_info['completion']
+                    current_host_id = host_id
+                    
+                    if previous_host_id == current_host_id:
+                        # Same host - ALWAYS try to resume from any size
+                        logger.log(f"🔄 SAME HOST RESUME: Continuing with '{host_id}' from {completion_percentage:.1f}%", "INFO")
+                        should_clean = False
+                        
+                        # Verify we can still resume
+                        try:
+                            with progress_path.open("r", encoding='utf-8') as pf:
+                                completed_chunks = {int(line) for line in pf if line.strip()}
+                            if len(completed_chunks) > 0:
+                                logger.log(f"✅ SAME HOST RESUME: {len(completed_chunks)} chunks already downloaded", "INFO")
+                            else:
+                                logger.log("⚠️ No valid chunks found, will restart with same host", "WARNING")
+                                should_clean = True
+                        except Exception as e:
+                            logger.log(f"⚠️ Could not verify resume state: {e}", "WARNING")
+                            should_clean = True
+                    else:
+                        # Different host - check if we should preserve >60% progress
+                        if completion_percentage > 60:
+                            # >60% downloaded - try to stick with previous host first
+                            previous_host_available = next((h for h in download_sequence if h['host_id'] == previous_host_id), None)
+                            if previous_host_available and previous_host_id != current_host_id:
+                                logger.log(f"🔒 HOST LOCK: {completion_percentage:.1f}% done with '{previous_host_id}', trying to continue with it instead of switching to '{current_host_id}'", "INFO")
+                                # Skip this host and try to continue with the previous one
+                                continue
+                            else:
+                                # Previous host not available anymore, switch and delete
+                                logger.log(f"🗑️ FORCED SWITCH: Previous host '{previous_host_id}' unavailable, deleting {completion_percentage:.1f}% progress and switching to '{current_host_id}'", "WARNING")
+                                should_clean = True
+                        else:
+                            # <60% downloaded - normal switch, delete partial file
+                            logger.log(f"🧹 CLEAN SWITCH: Only {completion_percentage:.1f}% done, switching from '{previous_host_id}' to '{current_host_id}'", "INFO")
+                            should_clean = True
+                else:
+                    # No existing progress info - start fresh
+                    should_clean = True
+                
+                if should_clean:
+                    # Delete partial files when switching hosts
+                    logger.log(f"🧹 CLEANING: Removing partial files before switching to host '{host_id}'", "INFO")
+                    self._cleanup_partial_files(output_path, progress_path, host_info_path)
+                    completed_chunks.clear()
+                    
+                    # Verify new host has correct file size
+                    if not self._verify_host_file_size(link, total_size, host_id):
+                        continue
+                    
+                    # Recreate files for new host
+                    with open(output_path, "wb") as f: 
+                        f.truncate(total_size)
+                    self._create_host_info_file(host_info_path, host_id, total_size)
+                else:
+                    # Just update the host info file for resume (same host)
+                    self._create_host_info_file(host_info_path, host_id, total_size)
+                
+                # Brief pause before retry (escalating)
+                retry_delay = min(0.5 + (attempt * 0.3), 2.0)  # 0.5s, 0.8s, 1.1s, max 2s
+                time.sleep(retry_delay)
+
+            try:
+                # Execute download with current host
+                attempt_started = time.monotonic()
+                success = self._execute_download_with_host(
+                    link, host_id, output_path, progress_path, 
+                    all_chunks, completed_chunks, total_size, output_filename
+                )
+                
+                if success:
+                    logger.log(f"✅ DOWNLOAD SUCCESS: '{output_filename}' completed via host '{host_id}'", "INFO",
+                               phase='download', host=host_id, bytes=total_size, duration=round(time.monotonic() - attempt_started, 3))
+                    return output_path, host_id
+                else:
+                    # Download failed, try next host
+                    logger.log(f"❌ HOST FAILED: '{host_id}' failed download, trying next host...", "WARNING")
+                    continue
+                    
+            except Exception as e:
+                logger.log(f"💥 HOST EXCEPTION: '{host_id}' encountered error: {e}", "ERROR")
+                continue
+
+        # All hosts failed - ensure UI can recover
+        logger.log(f"🚫 COMPLETE FAILURE: All {len(download_sequence)} hosts failed for '{output_filename}'", "ERROR")
+        
+        # Send immediate status update to prevent UI lock
+        self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"❌ All {len(download_sequence)} hosts failed for {output_filename}"})
+        
+        # Force progress update to show failure state
+        self.progress_queue.put({'type': Q_MSG.PROGRESS, 'value': 0})
+        
+        return None
+
+    def _cleanup_partial_files(self, output_path: Path, progress_path: Path, host_info_path: Path):
+        """Clean up partial download files."""
+        for path in [output_path, progress_path, host_info_path]:
+            if path.exists():
+                path.unlink(missing_ok=True)
+
+    def _create_host_info_file(self, host_info_path: Path, host_id: str, total_size: int):
+        """Create host tracking file."""
+        with host_info_path.open("w", encoding='utf-8') as hf:
+            hf.write(f"host_id={host_id}\n")
+            hf.write(f"file_size={total_size}\n")
+            hf.write(f"start_time={time.time()}\n")
+
+    def _verify_host_file_size(self, link: str, expected_size: int, host_id: str) -> bool:
+        """Verify host has correct file size when switching."""
+        try:
+            response = requests.head(link, timeout=4, allow_redirects=True)
+            response.raise_for_status()
+            actual_size = int(response.headers.get('content-length', 0))
+            
+            size_tolerance = min(expected_size * 0.01, 1024 * 1024)  # 1% or 1MB tolerance
+            size_diff = abs(actual_size - expected_size)
+            
+            if size_diff > size_tolerance:
+                logger.log(f"❌ Host '{host_id}' has wrong file size: {format_bytes(actual_size)} vs expected {format_bytes(expected_size)}", "ERROR")
+                return False
+            elif size_diff > 0:
+                logger.log(f"⚠️ Host '{host_id}' has slight size difference: {format_bytes(size_diff)}", "WARNING")
+            
+            return True
+            
+        except requests.RequestException as e:
+            logger.log(f"❌ Cannot verify size for host '{host_id}': {e}", "ERROR")
+            return False
+
+    def _execute_download_with_host(self, link: str, host_id: str, output_path: Path, 
+                                  progress_path: Path, all_chunks: List, completed_chunks: set, 
+                                  total_size: int, output_filename: str) -> bool:
+        """Execute the actual download with detailed progress tracking."""
+        chunks_to_download = [c for c in all_chunks if c['index'] not in completed_chunks]
+        if not chunks_to_download:
+            return True  # Already complete
+
+        # Enhanced UI feedback
+        self.progress_queue.put({
+            'type': Q_MSG.STATUS, 
+            'message': f"⬇️ Downloading from {host_id} | {len(chunks_to_download)} chunks remaining"
+        })
+        self.progress_queue.put({
+            'type': Q_MSG.OVERALL_STATUS, 
+            'message': f"📥 Active download: {output_filename} from {host_id}"
+        })
+
+        # Initialize download tracking
+        initial_downloaded_size = sum((c['end'] - c['start'] + 1) for c in all_chunks if c['index'] in completed_chunks)
+        with self.download_lock: 
+            self.total_downloaded = initial_downloaded_size
+        self.speed_buffer.clear()
+        last_update_time, last_update_size = time.time(), self.total_downloaded
+
+        # Show initial progress
+        initial_progress = (self.total_downloaded / total_size) * 100 if total_size > 0 else 0
+        initial_progress = min(initial_progress, 100.0)
+        
+        if initial_progress > 0:
+            self.progress_queue.put({
+                'type': Q_MSG.STATUS, 
+                'message': f"⬇️ Resuming | {initial_progress:.1f}% | {host_id}"
+            })
+            self.progress_queue.put({'type': Q_MSG.PROGRESS, 'value': initial_progress})
+        else:
+            self.progress_queue.put({
+                'type': Q_MSG.STATUS, 
+                'message': f"⬇️ Starting fresh | 0% | {host_id}"
+            })
+            self.progress_queue.put({'type': Q_MSG.PROGRESS, 'value': 0})
+
+        # Multi-threaded download with REAL-TIME progress tracking
+        failed_chunks = []
+        chunk_futures = {}
+        
+        with ThreadPoolExecutor(max_workers=Constants.DOWNLOAD_THREADS) as executor:
+            # Submit all chunks
+            for chunk in chunks_to_download:
+                if self.cancel_event.is_set(): 
+                    break
+                future = executor.submit(
+                    self._download_chunk, link, chunk['start'], chunk['end'], 
+                    output_path, progress_path, chunk['index']
+                )
+                chunk_futures[future] = chunk
+
+            # REAL-TIME progress monitoring with continuous updates
+            completed_count = 0
+            total_chunks = len(chunks_to_download)
+            
+            # Start continuous progress monitoring thread
+            def real_time_progress_monitor():
+                """Monitor progress in real-time with frequent updates."""
+                last_update = time.time()
+                last_size = self.total_downloaded
+                
+                while chunk_futures and not self.cancel_event.is_set():
+                    self.pause_event.wait()  # Respect pause state
+                    
+                    current_time = time.time()
+                    current_size = self.total_downloaded
+                    time_diff = current_time - last_update
+                    
+                    # Update UI every 200ms for smooth progress
+                    if time_diff >= 0.2:
+                        with self.download_lock:
+                            progress = (current_size / total_size) * 100 if total_size > 0 else 0
+                            progress = min(progress, 100.0)
+                            
+                            # Calculate real-time speed
+                            size_diff = current_size - last_size
+                            instant_speed = size_diff / time_diff if time_diff > 0 else 0
+                            
+                            # Update speed buffer for smoothing
+                            if instant_speed > 0:
+                                self.speed_buffer.append(instant_speed)
+                            
+                            avg_speed = sum(self.speed_buffer) / len(self.speed_buffer) if self.speed_buffer else 0
+                            remaining_bytes = total_size - current_size
+                            eta = remaining_bytes / avg_speed if avg_speed > 0 else 0
+                            
+                            # Update session statistics
+                            self._update_session_stats(current_size, total_size)
+                            
+                            # Enhanced status with more details
+                            if not self.pause_event.is_set():
+                                status_msg = f"⏸️ PAUSED | {progress:.1f}% | {format_bytes(avg_speed)}/s | Host: {host_id}"
+                            else:
+                                chunks_remaining = len(chunk_futures)
+                                # Enhanced display with peak speed and session stats
+                                peak_speed_str = f"Peak: {format_bytes(self.download_session_stats['peak_speed'])}/s" if self.download_session_stats['peak_speed'] > 0 else ""
+                                status_msg = f"⬇️ {host_id} | {progress:.1f}% | {format_bytes(avg_speed)}/s | ETA: {self._format_eta(eta)} | {chunks_remaining} chunks"
+                            
+                            # Send enhanced real-time updates
+                            self.progress_queue.put({'type': Q_MSG.STATUS, 'message': status_msg})
+                            self.progress_queue.put({'type': Q_MSG.PROGRESS, 'value': progress})
+                            
+                            # Send detailed speed/ETA information for UI enhancement
+                            self.progress_queue.put({
+                                'type': Q_MSG.DOWNLOAD_SPEED,
+                                'current_speed': avg_speed,
+                                'peak_speed': self.download_session_stats['peak_speed'],
+                                'average_speed': self.download_session_stats['average_speed'],
+                                'eta_seconds': eta,
+                                'eta_formatted': self._format_eta(eta),
+                                'time_elapsed': self.download_session_stats['time_elapsed'],
+                                'bytes_remaining': remaining_bytes,
+                                'progress_percent': progress
+                            })
+                            
+                            last_update = current_time
+                            last_size = current_size
+                    
+                    time.sleep(0.1)  # Check every 100ms for responsiveness
+            
+            # Start real-time monitoring
+            monitor_thread = threading.Thread(target=real_time_progress_monitor, daemon=True)
+            monitor_thread.start()
+            
+            # Process completed chunks as they finish
+            for future in as_completed(chunk_futures):
+                if self.cancel_event.is_set(): 
+                    break
+                    
+                chunk = chunk_futures.pop(future)  # Remove from active futures
+                try:
+                    success = future.result()
+                    if success:
+                        completed_count += 1
+                        completed_chunks.add(chunk['index'])
+                        
+                        # Immediate progress update when chunk completes
+                        with self.download_lock:
+                            progress = (self.total_downloaded / total_size) * 100 if total_size > 0 else 0
+                            progress = min(progress, 100.0)
+                        
+                        # Quick update for chunk completion
+                        chunks_remaining = len(chunk_futures)
+                        if chunks_remaining > 0:
+                            self.progress_queue.put({
+                                'type': Q_MSG.STATUS, 
+                                'message': f"⬇️ {host_id} | {progress:.1f}% | Chunk {completed_count}/{total_chunks} | {chunks_remaining} remaining"
+                            })
+                        
+                    else:
+                        # Chunk failed
+                        failed_chunks.append(chunk)
+                        logger.log(f"⚠️ Chunk {chunk['index']} failed from host '{host_id}'", "WARNING")
+                        
+                except Exception as e:
+                    failed_chunks.append(chunk)
+                    logger.log(f"💥 Chunk {chunk['index']} exception from host '{host_id}': {e}", "ERROR")
+
+        # Check download success
+        if self.cancel_event.is_set():
+            return False
+            
+        if failed_chunks:
+            failure_rate = len(failed_chunks) / total_chunks * 100
+            logger.log(f"⚠️ Host '{host_id}' had {len(failed_chunks)}/{total_chunks} failed chunks ({failure_rate:.1f}%)", "WARNING")
+            
+            # Critical failure detection - if too many SSL/TLS errors, fail immediately
+            ssl_errors = sum(1 for chunk in failed_chunks if any("SSL/TLS Error" in str(e) for e in [chunk.get('error', '')]))
+            critical_failure_rate = ssl_errors / total_chunks * 100 if total_chunks > 0 else 0
+            
+            # If failure rate is too high, abandon this host
+            if failure_rate > 20:  # More than 20% failed
+                if critical_failure_rate > 10:  # SSL/TLS errors are critical
+                    logger.log(f"❌ Host '{host_id}' has critical SSL/TLS failure rate ({critical_failure_rate:.1f}%), abandoning immediately", "ERROR")
+                    self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"❌ Critical SSL/TLS errors from {host_id}, switching..."})
+                    return False
+                else:
+                    logger.log(f"❌ Host '{host_id}' failure rate too high ({failure_rate:.1f}%), switching host", "ERROR")
+                    self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"❌ Host {host_id} failed, switching..."})
+                    return False
+            else:
+                # Retry failed chunks once, but not SSL/TLS errors
+                retryable_chunks = [chunk for chunk in failed_chunks if not any("SSL/TLS Error" in str(e) for e in [chunk.get('error', '')])]
+                if retryable_chunks:
+                    logger.log(f"🔄 Retrying {len(retryable_chunks)} non-critical failed chunks from host '{host_id}'", "INFO")
+                    self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"🔄 Retrying {len(retryable_chunks)} chunks from {host_id}..."})
+                    
+                    for chunk in retryable_chunks[:5]:  # Limit retries to avoid infinite loops
+                        if self.cancel_event.is_set():
+                            break
+                        success = self._download_chunk(link, chunk['start'], chunk['end'], output_path, progress_path, chunk['index'])
+                        if success:
+                            completed_chunks.add(chunk['index'])
+                        else:
+                            logger.log(f"❌ Final retry failed for chunk {chunk['index']} from host '{host_id}'", "ERROR")
+                            self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"❌ Final retry failed for chunk {chunk['index']}"})
+                            return False
+                
+                # If SSL/TLS errors remain, fail
+                if ssl_errors > 0:
+                    logger.log(f"❌ {ssl_errors} SSL/TLS errors cannot be retried, host '{host_id}' failed", "ERROR")
+                    self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"❌ SSL/TLS errors on {host_id}, cannot continue"})
+                    return False
+
+        # Final verification
+        final_chunks_to_download = [c for c in all_chunks if c['index'] not in completed_chunks]
+        if final_chunks_to_download:
+            logger.log(f"❌ Download incomplete: {len(final_chunks_to_download)} chunks still missing from host '{host_id}'", "ERROR")
+            return False
+
+        # Success!
+        self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"✅ Download complete from {host_id}"})
+        self.progress_queue.put({'type': Q_MSG.PROGRESS, 'value': 100})
+        return True
+
+class DeltaPatcher:
+    """Applies binary deltas (.c26d) that patch archives ship as __c26_delta__/<path>.c26d.
+
+    The format, header reader and applier live in cricket26/delta_format.py, shared with the builder in
+    manifests/delta_patch.py. This adds what the installer needs on top: cancellation, replacing the
+    installed file only once the rebuilt one checks out, and the full-file download when a delta does not fit.
+    """
+    DELTA_DIR = DELTA_DIR; SUFFIX = DELTA_SUFFIX
+    read_header = staticmethod(read_delta_header)
+
+    @staticmethod
+    def _checkpoint(cancel_event: threading.Event) -> Callable[[], None]:
+        def checkpoint() -> None:
+            if cancel_event.is_set(): raise InterruptedError("Installation cancelled by user.")
+        return checkpoint
+
+    def source_matches(self, header: Dict[str, Any], file_path: Path, cancel_event: threading.Event) -> bool:
+        return source_matches(header, file_path, self._checkpoint(cancel_event))
+
+    def apply(self, delta_path: Path, dest_path: Path, cancel_event: threading.Event) -> None:
+        """Rebuilds dest_path in place; raises DeltaError (a ValueError, leaving it untouched) if the delta does not fit."""
+        temp_path = dest_path.with_name(dest_path.name + '.c26new')
+        try:
+            apply_delta(dest_path, delta_path, temp_path, self._checkpoint(cancel_event)); os.replace(temp_path, dest_path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+    def fetch_full_file(self, base_url: str, rel_path: str, dest_path: Path, expected_sha256: str, cancel_event: threading.Event) -> None:
+        """Replaces dest_path with the full file from a repair source (<base URL>/<relative path>), checked against expected_sha256."""
+        temp_path = dest_path.with_name(dest_path.name + '.c26new'); sha256 = hashlib.sha256()
+        try:
+            with requests.get(f"{base_url.rstrip('/')}/{quote(rel_path)}", stream=True, timeout=Constants.DOWNLOAD_TIMEOUT_SECONDS) as response:
+                response.raise_for_status()
+                with open(temp_path, 'wb') as out:
+                    for chunk in response.iter_content(chunk_size=1024 * 1024):
+                        if cancel_event.is_set(): raise InterruptedError("Installation cancelled by user.")
+                        out.write(chunk); sha256.update(chunk)
+            if sha256.hexdigest() != expected_sha256: raise ValueError(f"Downloaded {dest_path.name} does not match the expected hash.")
+            os.replace(temp_path, dest_path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+class Extractor:
+    @staticmethod
+    def find_7zip_executable() -> Optional[str]:
+        base_path = getattr(sys, '_MEIPASS', Path(__file__).resolve().parent.parent); bundled_exe_path = Path(base_path) / "7z.exe"
+        if bundled_exe_path.exists(): return str(bundled_exe_path)
+        logger.log("Bundled 7-Zip not found. Searching system...", "WARNING")
+        if sys.platform == 'win32':
+            import winreg
+            registry_paths = [ (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\7-Zip"), (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\WOW6432Node\7-Zip") ]
+            for hive, key_path in registry_paths:
+                try:
+                    with winreg.OpenKey(hive, key_path) as key:
+                        path, _ = winreg.QueryValueEx(key, "Path"); exe = Path(path) / "7z.exe"
+                        if exe.exists(): logger.log(f"Found 7-Zip in registry: {exe}", "INFO"); return str(exe)
+                except FileNotFoundError: continue
+        exe = shutil.which("7z") or shutil.which("7za");
+        if exe: logger.log(f"Found 7-Zip in system PATH: {exe}", "INFO"); return str(exe)
+        logger.log("7-Zip executable could not be found anywhere.", "CRITICAL"); return None
+
+    def extract_archive(self, archive_path: Path, dest_dir: Path, progress_queue: queue.Queue, cancel_event: threading.Event) -> None:
+        seven_zip_exe = self.find_7zip_executable()
+        if not seven_zip_exe:
+            raise FileNotFoundError("7-Zip executable not found. Please place 7z.exe in the application folder.")
+        command = [seven_zip_exe, 'x', str(archive_path), f'-o{dest_dir}', '-y']
+        logger.log(f"Executing asynchronous extraction: {' '.join(command)}", "INFO"); started = time.monotonic()
+        progress_queue.put({'type': Q_MSG.PROGRESS_MODE, 'mode': 'indeterminate'})
+        proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, creationflags=NO_WINDOW)
+        while proc.poll() is None:
+            if cancel_event.is_set():
+                proc.terminate()
+                try:
+                    proc.wait(timeout=3.0)  # Give it 3 seconds to terminate gracefully
+                except subprocess.TimeoutExpired:
+                    proc.kill()  # Force kill if it doesn't terminate
+                    logger.log("Extraction process force killed", "WARNING")
+                logger.log("Extraction cancelled by user.", "INFO")
+                raise InterruptedError("Extraction cancelled.")
+            time.sleep(0.2)
+        progress_queue.put({'type': Q_MSG.PROGRESS_MODE, 'mode': 'determinate'})
+        stdout, stderr = proc.communicate()
+        if proc.returncode != 0:
+            error_details = stderr or stdout or "Unknown 7-Zip error."
+            logger.log(f"Extraction failed for '{archive_path.name}': {error_details}", "ERROR")
+            raise RuntimeError(f"Extraction failed: {error_details}")
+        logger.log(f"Successfully extracted '{archive_path.name}'.", "INFO", phase='extract', bytes=archive_path.stat().st_size, duration=round(time.monotonic() - started, 3))
+
+    def install_files(self, source_dir: Path, game_dir: Path, progress_queue: queue.Queue, cancel_event: threading.Event, full_file_base_url: Optional[str] = None) -> None:
+        """Copies a patch's files into the game folder and applies its binary deltas.
+
+        A delta whose source does not match the installed file falls back to downloading the full
+        file from full_file_base_url (the target version's repair source) when one is given.
+        """
+        logger.log(f"Preparing to install files from '{source_dir}' to '{game_dir}'.", "INFO")
+        progress_queue.put({'type': Q_MSG.STATUS, 'message': "Analyzing patch files..."})
+        files_to_copy = []
+        total_size = 0
+        source_root = next((Path(root) for root, _, files in os.walk(source_dir) if Constants.GAME_EXECUTABLE in files), source_dir)
+        logger.log(f"Determined effective source root for copy: {source_root}", "INFO")
+
+        # Security: Resolve absolute paths to prevent path traversal
+        game_dir_resolved = game_dir.resolve()
+        source_root_resolved = source_root.resolve()
+
+        for root, _, files in os.walk(source_root):
+            if cancel_event.is_set(): 
+                raise InterruptedError("Installation cancelled during analysis.")
+            for file in files:
+                src_path = Path(root) / file
+                try:
+                    rel_path = src_path.relative_to(source_root); delta_header = None
+                    # Binary deltas rebuild the file at the same path without the delta folder and suffix
+                    if rel_path.parts[0] == DeltaPatcher.DELTA_DIR and rel_path.name.endswith(DeltaPatcher.SUFFIX):
+                        rel_path = Path(*rel_path.parts[1:]); rel_path = rel_path.with_name(rel_path.name[:-len(DeltaPatcher.SUFFIX)])
+                        with open(src_path, 'rb') as f: delta_header = DeltaPatcher.read_header(f)
+                    dest_path = game_dir / rel_path
+                    
+                    # Security: Validate destination path to prevent path traversal
+                    dest_path_resolved = dest_path.resolve()
+                    if not str(dest_path_resolved).startswith(str(game_dir_resolved)):
+                        logger.log(f"SECURITY: Skipping file with suspicious path: {rel_path}", "WARNING")
+                        continue
+                    
+                    # Additional security: Check for dangerous file extensions
+                    if dest_path.suffix.lower() in ['.exe', '.bat', '.cmd', '.scr', '.com', '.pif'] and dest_path.name != Constants.GAME_EXECUTABLE:
+                        logger.log(f"SECURITY: Skipping potentially dangerous file: {dest_path.name}", "WARNING")
+                        continue
+                    
+                    file_size = delta_header['target_size'] if delta_header else src_path.stat().st_size
+                    files_to_copy.append({'src': src_path, 'dest': dest_path, 'size': file_size, 'delta': delta_header})
+                    total_size += file_size
+                    
+                except (ValueError, FileNotFoundError) as e:
+                    logger.log(f"File analysis error for {src_path}: {e}. Skipping.", "WARNING")
+
+        logger.log(f"Analysis complete. Found {len(files_to_copy)} files to install, totaling {format_bytes(total_size)}.", "INFO")
+        # Files about to be replaced must be re-hashed by the next verification
+        hash_cache = LocalHashCache(game_dir).load(); hash_cache.forget(f['dest'].relative_to(game_dir).as_posix() for f in files_to_copy); hash_cache.save()
+        copied_size = 0
+        last_update_time = time.time()
+
+        for i, file_info in enumerate(files_to_copy):
+            if cancel_event.is_set(): 
+                raise InterruptedError("Installation cancelled by user.")
+            
+            try:
+                # Ensure parent directory exists
+                file_info['dest'].parent.mkdir(parents=True, exist_ok=True)
+                
+                # Copy with verification
+                if file_info['delta']: self._apply_delta(file_info, game_dir, progress_queue, cancel_event, full_file_base_url)
+                else: shutil.copy2(file_info['src'], file_info['dest'])
+                copied_size += file_info['size']
+                
+                # Update progress
+                current_time = time.time()
+                if current_time - last_update_time > 0.05:
+                    progress = (copied_size / total_size) * 100 if total_size > 0 else 100
+                    progress_queue.put({'type': Q_MSG.PROGRESS, 'value': progress})
+                    progress_queue.put({'type': Q_MSG.STATUS, 'message': f"Copying: {file_info['dest'].name}"})
+                    last_update_time = current_time
+                    
+            except (IOError, OSError) as e:
+                logger.log(f"Failed to copy {file_info['src']} to {file_info['dest']}: {e}", "ERROR")
+                raise RuntimeError(f"Installation failed: Could not copy {file_info['dest'].name}")
+        
+        logger.log("All files installed successfully.", "INFO")
+
+    def _apply_delta(self, file_info: Dict[str, Any], game_dir: Path, progress_queue: queue.Queue, cancel_event: threading.Event, full_file_base_url: Optional[str]) -> None:
+        dest_path = file_info['dest']; rel_path = dest_path.relative_to(game_dir).as_posix(); patcher = DeltaPatcher()
+        progress_queue.put({'type': Q_MSG.STATUS, 'message': f"Patching: {dest_path.name}"})
+        try:
+            patcher.apply(file_info['src'], dest_path, cancel_event); logger.log(f"Applied delta patch to {rel_path}.", "INFO")
+        except DeltaError as e:
+            if not full_file_base_url: raise RuntimeError(f"Installation failed: {e}. Verify and repair the game files, then update again.")
+            logger.log(f"{e}. Downloading the full file instead.", "WARNING")
+            progress_queue.put({'type': Q_MSG.STATUS, 'message': f"Downloading full file: {dest_path.name}"})
+            try: patcher.fetch_full_file(full_file_base_url, rel_path, dest_path, file_info['delta']['target_sha256'], cancel_event)
+            except (requests.RequestException, ValueError) as fetch_error: raise RuntimeError(f"Installation failed: could not patch or download {dest_path.name}: {fetch_error}")
+            logger.log(f"Replaced {rel_path} with the full file from the repair source.", "INFO")
+
+class GameManager:
+    """Manages game-specific operations like version checking, launching, and save backups."""
+    VERSION_ERRORS = ("NOT_FOUND", "INVALID_FORMAT", "READ_ERROR")  # check_version() results that are not versions
+    def __init__(self, game_dir: str): self.game_dir = Path(game_dir) if game_dir else None
+    def check_version(self) -> Optional[str]:
+        if not self.game_dir: return None
+        version_file = self.game_dir / "version.txt"
+        if not version_file.exists(): logger.log(f"version.txt not found in {self.game_dir}", "WARNING"); return "NOT_FOUND"
+        try:
+            content = version_file.read_text().strip(); parts = content.split('.')
+            if len(parts) >= 3: version = parts[2].split()[0]; logger.log(f"Detected game version: v{version}", "INFO"); return version
+            else: logger.log(f"Invalid version format in version.txt: {content}", "WARNING"); return "INVALID_FORMAT"
+        except IOError as e: logger.log(f"Error reading version.txt: {e}", "ERROR"); return "READ_ERROR"
+    def launch_game(self) -> Optional[str]:
+        if not self.game_dir: return "Game directory not set."
+        exe_path = self.game_dir / Constants.GAME_EXECUTABLE
+        if not exe_path.exists(): return f"{Constants.GAME_EXECUTABLE} not found in the selected directory."
+        try: subprocess.Popen([str(exe_path)], cwd=str(self.game_dir)); logger.log("Game launched successfully.", "INFO"); return None
+        except OSError as e: logger.log(f"Failed to launch game: {e}", "ERROR"); return f"Failed to launch game: {e}"
+    def backup_saved_games(self) -> str:
+        saved_games_path = Path.home() / "Saved Games" / "Cricket 24"
+        if not saved_games_path.exists(): msg = f"Saved games folder not found at: {saved_games_path}"; logger.log(msg, "WARNING"); raise FileNotFoundError(msg)
+        backup_dir = saved_games_path.parent / "Cricket 26 Backups"; backup_dir.mkdir(exist_ok=True)
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        backup_zip_path = backup_dir / f"Cricket26_Save_{timestamp}.zip"
+        shutil.make_archive(str(backup_zip_path.with_suffix('')), 'zip', str(saved_games_path))
+        logger.log(f"Backup created successfully: {backup_zip_path}", "INFO"); return f"Backup complete: {backup_zip_path}"
+    def restore_backup(self, backup_zip_path_str: str) -> str:
+        backup_zip_path = Path(backup_zip_path_str)
+        saved_games_path = Path.home() / "Saved Games" / "Cricket 26"
+        saved_games_parent = saved_games_path.parent
+        with tempfile.TemporaryDirectory(prefix="c26-restore-", dir=saved_games_parent) as temp_restore_dir:
+            logger.log(f"Unpacking backup '{backup_zip_path.name}' to a temporary location...", "INFO")
+            try:
+                shutil.unpack_archive(backup_zip_path, temp_restore_dir)
+                logger.log("Unpacking successful.", "INFO")
+            except Exception as e:
+                logger.log(f"CRITICAL: Failed to unpack the backup archive '{backup_zip_path.name}'. Details: {e}", "ERROR")
+                raise RuntimeError(f"Could not restore backup. The archive file might be corrupted.\nDetails: {e}")
+            unpacked_source_dir = Path(temp_restore_dir) / "Cricket 26"
+            if not unpacked_source_dir.exists():
+                logger.log("CRITICAL: Backup archive has an unexpected structure. Expected a 'Cricket 26' folder inside.", "ERROR")
+                raise ValueError("Backup archive has an unexpected structure. Cannot proceed with restore.")
+            original_data_temp_name = None
+            if saved_games_path.exists():
+                original_data_temp_name = saved_games_path.with_name(f"Cricket 26_pre-restore_{int(time.time())}")
+                logger.log(f"Temporarily renaming current save data to '{original_data_temp_name.name}'...", "INFO")
+                saved_games_path.rename(original_data_temp_name)
+            try:
+                logger.log("Moving new data into place...", "INFO")
+                unpacked_source_dir.rename(saved_games_path)
+            except Exception as e:
+                logger.log(f"CRITICAL: Failed to move new data into place: {e}. Attempting rollback.", "CRITICAL")
+                if original_data_temp_name and original_data_temp_name.exists():
+                    logger.log("Attempting to roll back by restoring original save data...", "INFO")
+                    original_data_temp_name.rename(saved_games_path)
+                    logger.log("Rollback successful. Your original save data is safe.", "INFO")
+                    raise RuntimeError(f"A critical error occurred while finalizing the restore.\n\nYour original save data has been automatically restored.\nPlease check the log for details about the failure: {e}")
+                else:
+                    logger.log("CRITICAL: Rollback failed. Original data backup could not be found.", "CRITICAL")
+                    raise RuntimeError("A critical error occurred and the automatic rollback FAILED. Please check your 'Saved Games' folder for a '_pre-restore_' backup.")
+
+            if original_data_temp_name and original_data_temp_name.exists():
+                logger.log("Restore complete. Cleaning up old save data...", "INFO")
+                shutil.rmtree(original_data_temp_name)
+        logger.log(f"Successfully restored backup from: {backup_zip_path.name}", "INFO")
+        return f"Successfully restored backup:\n{backup_zip_path.name}"
+
+# ==============================================================================
+# --- BACKGROUND SCHEDULING ---
+# ==============================================================================
+class BackgroundScheduler:
+    """Measures hashing throughput and, in background mode, throttles it while the game is running.
+
+    When enabled and `is_contended()` reports the game as running (re-polled every few seconds),
+    reads are paced by a token bucket capped at `limit_mb_s` and the process CPU/I/O priority is
+    lowered through psutil where supported. Both are lifted as soon as the game exits.
+    """
+    CONTENTION_POLL_S = 3.0
+    RATE_WINDOW_S = 5.0
+
+    def __init__(self, enabled: bool = False, limit_mb_s: float = Constants.BACKGROUND_HASH_LIMIT_MB_S, is_contended: Optional[Callable[[], bool]] = None):
+        self.enabled, self.rate_limit = enabled, limit_mb_s * 1024 * 1024
+        self.is_contended = is_contended or (lambda: True)
+        self.throttled = False
+        self._lock = threading.Lock(); self._tokens = 0.0; self._last_refill = self._last_poll = 0.0
+        self._window: deque = deque(); self._window_bytes = 0
+        self._saved_priority: Optional[Tuple[Any, Any]] = None
+
+    def consume(self, nbytes: int):
+        """Accounts for bytes just read, sleeping as needed to stay under the cap."""
+        now, wait = time.monotonic(), 0.0
+        with self._lock:
+            self._window.append((now, nbytes)); self._window_bytes += nbytes
+            while self._window and now - self._window[0][0] > self.RATE_WINDOW_S: self._window_bytes -= self._window.popleft()[1]
+            if not self.enabled: return
+            if now - self._last_poll > self.CONTENTION_POLL_S:
+                self._last_poll = now; self._set_throttled(self._poll_contention())
+            if not self.throttled: return
+            self._tokens = min(self.rate_limit, self._tokens + (now - self._last_refill) * self.rate_limit); self._last_refill = now
+            self._tokens -= nbytes
+            if self._tokens < 0: wait = -self._tokens / self.rate_limit
+        if wait: time.sleep(wait)
+
+    def rate(self) -> float:
+        """Observed bytes/second over the last few seconds (reflects any throttling)."""
+        with self._lock:
+            if not self._window: return 0.0
+            span = max(time.monotonic() - self._window[0][0], 0.5)
+            return self._window_bytes / span
+
+    def close(self):
+        with self._lock: self._set_throttled(False)
+
+    def _poll_contention(self) -> bool:
+        try: return bool(self.is_contended())
+        except Exception: return True
+
+    def _set_throttled(self, throttled: bool):
+        if throttled == self.throttled: return
+        self.throttled = throttled; self._tokens, self._last_refill = 0.0, time.monotonic()
+        if throttled:
+            logger.log(f"Background mode: game is running, limiting hashing to {self.rate_limit / (1024 * 1024):.0f} MB/s at low priority.", "SETTING"); self._lower_priority()
+        else:
+            logger.log("Background mode: game not running, hashing at full speed.", "SETTING"); self._restore_priority()
+
+    def _lower_priority(self):
+        try:
+            proc = psutil.Process()
+            self._saved_priority = (proc.nice(), proc.ionice() if hasattr(proc, 'ionice') else None)
+            proc.nice(psutil.BELOW_NORMAL_PRIORITY_CLASS if sys.platform == 'win32' else 10)
+            if hasattr(proc, 'ionice'):
+                if sys.platform == 'win32': proc.ionice(psutil.IOPRIO_VERYLOW)
+                else: proc.ionice(psutil.IOPRIO_CLASS_IDLE)
+        except (psutil.Error, OSError, AttributeError, ValueError) as e: logger.log(f"Could not lower process priority: {e}", "WARNING")
+
+    def _restore_priority(self):
+        if self._saved_priority is None: return
+        nice, io_priority = self._saved_priority; self._saved_priority = None
+        try:
+            proc = psutil.Process(); proc.nice(nice)
+            if io_priority is not None: proc.ionice(*io_priority) if isinstance(io_priority, tuple) else proc.ionice(io_priority)
+        except (psutil.Error, OSError, AttributeError, ValueError) as e: logger.log(f"Could not restore process priority: {e}", "WARNING")
+
+# ==============================================================================
+# --- ARCHIVE STORE ---
+# ==============================================================================
+def published_checksums(data: Dict[str, Any], key: str) -> set:
+    """Every SHA-256 the update data publishes for a patch (built archive, host checksums, v2.0 sources), lowercased."""
+    sums = set(); archive = data.get('update_archives', {}).get(key)
+    if isinstance(archive, dict): sums.add(archive.get('sha256'))
+    for host in data.get('hosts', []):
+        if isinstance(host.get('checksums'), dict): sums.add(host['checksums'].get(key))
+    for update in data.get('updates', []):
+        if f"{update.get('from_version')}_{update.get('to_version')}" != key or not isinstance(update.get('downloads'), dict): continue
+        for source in [update['downloads'].get('primary'), *update['downloads'].get('fallback', [])]:
+            if isinstance(source, dict): sums.add(source.get('checksum'))
+    return {s.lower() for s in sums if isinstance(s, str) and s}
+
+
+class ArchiveStore:
+    """
+    Downloaded patch archives kept by content: <cache dir>/archives/<sha256>.zip, entered only after the
+    digest matched a published checksum. index.json records per digest the size, the patch keys it was
+    stored for, the last access and when it was verified, plus a running total so the store's size never
+    needs a directory walk. Any plan whose patch publishes a stored digest reuses the archive as is.
+    evict() trims the store to ARCHIVE_STORE_MAX_BYTES, least recently used first, skipping protected digests.
+    Use for_cache(): every component of a process then shares one instance, and so one lock around each
+    read-modify-write of the index. Archives another process stored without indexing are adopted on first load.
+    """
+    _shared: Dict[str, 'ArchiveStore'] = {}; _shared_lock = threading.Lock()
+
+    @classmethod
+    def for_cache(cls, cache_dir: Path = Constants.CACHE_DIR) -> 'ArchiveStore':
+        """The process-wide store for a cache dir."""
+        key = os.path.normcase(os.path.abspath(cache_dir))
+        with cls._shared_lock:
+            if key not in cls._shared: cls._shared[key] = cls(cache_dir)
+            return cls._shared[key]
+
+    def __init__(self, cache_dir: Path = Constants.CACHE_DIR, max_bytes: int = Constants.ARCHIVE_STORE_MAX_BYTES):
+        self.root = Path(cache_dir) / Constants.ARCHIVE_STORE_DIRNAME; self.index_path = self.root / "index.json"; self.max_bytes = max_bytes
+        self._lock = threading.Lock(); self._index: Dict[str, Any] = {'total_bytes': 0, 'archives': {}}; self._mtime: Optional[int] = -1  # Not loaded yet; None = no index
+
+    def path_for(self, sha256: str) -> Path: return self.root / f"{sha256.lower()}.zip"
+
+    def holds(self, path: Path) -> bool:
+        """True if path is one of the store's archives (callers must not delete it)."""
+        return Path(path).parent == self.root and Path(path).suffix == '.zip'
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock: self._reload(); return self._index['total_bytes']
+
+    def lookup(self, key: str, expected: Iterable[str] = ()) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """(digest, index entry) of a stored archive whose digest is one of expected, or, when none is published, one stored under key."""
+        expected = {e.lower() for e in expected if e}
+        with self._lock:
+            self._reload(); archives = self._index['archives']
+            candidates = [sha for sha in expected if sha in archives] if expected else [sha for sha, entry in archives.items() if key in entry['keys']]
+            for sha in candidates:
+                if self.path_for(sha).is_file(): return sha, dict(archives[sha])
+                self._drop(sha); self._save()  # Deleted behind our back
+        return None
+
+    def touch(self, sha256: str):
+        """Marks an archive as just used, for LRU eviction."""
+        with self._lock:
+            self._reload(); entry = self._index['archives'].get(sha256.lower()); now = time.time()
+            if entry and now - entry['last_access'] > Constants.ARCHIVE_STORE_TOUCH_S: entry['last_access'] = now; self._save()
+
+    def add(self, file_path: Path, sha256: str, keys: Iterable[str]) -> Path:
+        """Moves a verified archive into the store under its digest and returns its new path."""
+        sha256 = sha256.lower(); dest = self.path_for(sha256); keys = list(keys)
+        with self._lock:
+            self._reload(); self.root.mkdir(parents=True, exist_ok=True)
+            if Path(file_path) != dest: os.replace(file_path, dest)
+            archives = self._index['archives']; old = archives.get(sha256); size = dest.stat().st_size; now = time.time()
+            archives[sha256] = {'size': size, 'keys': sorted(set(old['keys'] if old else []) | set(keys)), 'last_access': now, 'verified_at': now}
+            self._index['total_bytes'] += size - (old['size'] if old else 0); self._save()
+        logger.log(f"Stored {dest.name} ({format_bytes(size)}) for {', '.join(sorted(keys))}.", "INFO", phase='archive_store', bytes=size, store_bytes=self._index['total_bytes'])
+        return dest
+
+    def evict(self, protect: Iterable[str] = (), max_bytes: Optional[int] = None) -> List[str]:
+        """Deletes least recently used archives until the store fits max_bytes; protected digests are never evicted."""
+        limit = self.max_bytes if max_bytes is None else max_bytes; protect = {p.lower() for p in protect if p}; evicted = []
+        with self._lock:
+            self._reload()
+            for sha, entry in sorted(self._index['archives'].items(), key=lambda item: item[1]['last_access']):
+                if self._index['total_bytes'] <= limit: break
+                if sha in protect: continue
+                try: self.path_for(sha).unlink(missing_ok=True)
+                except OSError as e: logger.log(f"Could not evict {sha[:12]} from the archive store: {e}", "WARNING"); continue
+                self._drop(sha); evicted.append(sha)
+            if evicted: self._save()
+        if evicted: logger.log(f"Evicted {len(evicted)} archive(s) from the store; {format_bytes(self._index['total_bytes'])} kept.", "INFO")
+        return evicted
+
+    def _drop(self, sha256: str):
+        entry = self._index['archives'].pop(sha256, None)
+        if entry: self._index['total_bytes'] -= entry['size']
+
+    def _reload(self):
+        """
+        Re-reads index.json if another process changed it; rebuilds it from the files if it is missing or unreadable.
+        A missing index over an empty store is remembered too, so an unused store costs one stat per call.
+        """
+        try: mtime = self.index_path.stat().st_mtime_ns
+        except OSError: mtime = None
+        if mtime == self._mtime: return
+        first_load = self._mtime == -1
+        try:
+            index = json.loads(self.index_path.read_text(encoding='utf-8'))
+            if not isinstance(index.get('archives'), dict): raise ValueError("index.json has no archives table")
+            self._index, self._mtime = index, mtime
+            if first_load and self._adopt(self._scan()): self._save()
+            return
+        except (OSError, ValueError, AttributeError): pass
+        self._index = {'total_bytes': 0, 'archives': {}}; self._mtime = mtime
+        if self._adopt(self._scan()): self._save()
+
+    def _scan(self) -> Dict[str, Dict[str, Any]]:
+        """Unverified index entries for every <sha256>.zip in the store directory."""
+        archives = {}
+        for path in (self.root.glob('*.zip') if self.root.is_dir() else []):
+            if not re.fullmatch(r'[0-9a-f]{64}', path.stem): continue
+            try: stat = path.stat()
+            except OSError: continue
+            archives[path.stem] = {'size': stat.st_size, 'keys': [], 'last_access': stat.st_mtime, 'verified_at': None}
+        return archives
+
+    def _adopt(self, found: Dict[str, Dict[str, Any]]) -> int:
+        """Indexes the scanned archives the index doesn't know; returns how many."""
+        archives = self._index['archives']; orphans = {sha: entry for sha, entry in found.items() if sha not in archives}
+        if orphans:
+            archives.update(orphans); self._index['total_bytes'] += sum(e['size'] for e in orphans.values())
+            logger.log(f"Archive store: indexed {len(orphans)} unlisted archive(s); they will be re-verified on first use.", "WARNING")
+        return len(orphans)
+
+    def _save(self):
+        try:
+            tmp_path = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp"); tmp_path.write_text(json.dumps(self._index, indent=2), encoding='utf-8')
+            os.replace(tmp_path, self.index_path); self._mtime = self.index_path.stat().st_mtime_ns
+        except OSError as e: logger.log(f"Could not save the archive store index: {e}", "WARNING")
+
+
+def download_cache_size(cache_dir: Path = Constants.CACHE_DIR) -> int:
+    """Bytes held by the download cache: the archive store's running total plus the loose files at its top level (partial downloads)."""
+    total = ArchiveStore.for_cache(cache_dir).total_bytes
+    try: total += sum(entry.stat().st_size for entry in os.scandir(cache_dir) if entry.is_file())
+    except OSError: pass
+    return total
+
+# ==============================================================================
+# --- UPDATE PATH PLANNER ---
+# ==============================================================================
+def ordered_links(data: Dict[str, Any], update_key: str, source: str = "Automatic") -> List[Dict[str, str]]:
+    """Download links for one patch: the chosen host's only, or every host in host_preference_order."""
+    all_hosts_by_name = {host['name']: host for host in data.get('hosts', [])}
+
+    if source != "Automatic":
+        if source in all_hosts_by_name:
+            host = all_hosts_by_name[source]
+            link = host['links'].get(update_key)
+            return [{'link': link, 'host_id': host['id']}] if link else []
+        return []
+
+    ordered = []
+    preference_order = data.get('host_preference_order', [])
+    all_hosts_by_id = {host['id']: host for host in data.get('hosts', [])}
+    for host_id in preference_order:
+        if host_id in all_hosts_by_id:
+            host = all_hosts_by_id[host_id]
+            link = host['links'].get(update_key)
+            if link:
+                ordered.append({'link': link, 'host_id': host_id})
+    return ordered
+
+def link_source(link: Dict[str, str]) -> Dict[str, str]:
+    """
+    A hosts[*].links entry as a v2.0 download source. http(s) URLs are direct downloads; Google Drive
+    URLs and bare Drive file IDs (what version.json ships) are gdrive sources with their file_id.
+    """
+    url = link['link']
+    if re.match(r'https?://', url) and 'drive.google.com' not in url: return {'type': 'direct', 'url': url, 'name': link['host_id']}
+    match = re.search(r'/d/([a-zA-Z0-9_-]+)', url) or re.search(r'[?&]id=([a-zA-Z0-9_-]+)', url)
+    return {'type': 'gdrive', 'url': url, 'file_id': match.group(1) if match else url, 'name': link['host_id']}
+
+def parse_size_string(size_str: str) -> int:
+    """Parses an update_sizes entry such as '250 MB' or '1.2 GB' into bytes (0 when unknown)."""
+    try:
+        num_part = float(size_str.split()[0]); unit = size_str.upper()
+        if "GB" in unit: return int(num_part * 1024 * 1024 * 1024)
+        if "MB" in unit: return int(num_part * 1024 * 1024)
+        if "KB" in unit: return int(num_part * 1024)
+        return int(num_part)
+    except (ValueError, IndexError, AttributeError): return 0
+
+class HostStats:
+    """Download throughput per host, smoothed and kept in the cache dir so plans can be ranked by time."""
+    SMOOTHING = 0.3  # Weight of the newest sample
+    MIN_SAMPLE_BYTES = 1024 * 1024  # Smaller transfers say more about latency than throughput
+
+    def __init__(self, cache_dir: Path):
+        self.path = Path(cache_dir) / "host_stats.json"; self._lock = threading.Lock()
+        try: self.rates: Dict[str, float] = {k: float(v) for k, v in json.loads(self.path.read_text(encoding='utf-8')).items()}
+        except (OSError, ValueError, AttributeError): self.rates = {}
+
+    def rate(self, host_id: str) -> Optional[float]:
+        """Smoothed bytes/second for a host, or None if it has never been measured."""
+        with self._lock: return self.rates.get(host_id)
+
+    def record(self, host_id: str, nbytes: int, seconds: float):
+        if nbytes < self.MIN_SAMPLE_BYTES or seconds <= 0: return
+        sample = nbytes / seconds
+        with self._lock:
+            old = self.rates.get(host_id); self.rates[host_id] = sample if old is None else old + self.SMOOTHING * (sample - old)
+            data = json.dumps(self.rates, indent=2)
+        try:
+            tmp_path = self.path.with_name(self.path.name + '.tmp'); tmp_path.write_text(data, encoding='utf-8'); os.replace(tmp_path, self.path)
+        except OSError as e: logger.log(f"Could not save host speed stats: {e}", "WARNING")
+
+class UpdatePlanner:
+    """
+    Routes the user from their version to the target over every patch the update data offers.
+    The graph has one edge per hosts[*].links key ("<from>_<to>") and per v2.0 `updates` entry, so
+    cumulative patches (1.0_1.3.5) compete with the adjacent chain. Routes are ranked by bytes to
+    download or by estimated time from HostStats; archives already in the ArchiveStore (matched by their
+    published checksum) or in the cache under their version-pair name cost nothing to fetch.
+    """
+    def __init__(self, data: Dict[str, Any], cache_dir: Path, links_for: Callable[[str], List[Dict[str, str]]], host_stats: Optional[HostStats] = None,
+                 store: Optional[ArchiveStore] = None):
+        self.data, self.cache_dir, self.links_for, self.host_stats, self.store = data, Path(cache_dir), links_for, host_stats, store
+        self.edges: Dict[str, List[Dict[str, Any]]] = {}
+        self._build()
+
+    @staticmethod
+    def cached_archive_path(cache_dir: Path, from_ver: str, to_ver: str) -> Path:
+        return Path(cache_dir) / f"C26_Update_{from_ver}_to_{to_ver}.zip"
+
+    def _build(self):
+        update_sizes = self.data.get('update_sizes', {}); update_archives = self.data.get('update_archives', {})
+        v2_updates = {f"{u['from_version']}_{u['to_version']}": u for u in self.data.get('updates', []) if u.get('from_version') and u.get('to_version')}
+        keys = {key for host in self.data.get('hosts', []) for key in host.get('links', {})} | set(v2_updates)
+        for key in sorted(keys):
+            update = v2_updates.get(key)
+            if update: from_ver, to_ver = update['from_version'], update['to_version']
+            else:
+                from_ver, sep, to_ver = key.partition('_')
+                if not (sep and from_ver and to_ver): continue
+            links = self.links_for(key)
+            if not links and not (update and update.get('downloads', {}).get('primary')): continue
+            size_str = update_sizes.get(key, "0 B"); size_bytes = parse_size_string(size_str)
+            if update and update.get('size_mb') and not size_bytes: size_bytes = int(float(update['size_mb']) * 1024 * 1024); size_str = f"{update['size_mb']} MB"
+            # Archives built by the admin tools record their exact size
+            if isinstance(update_archives.get(key), dict) and update_archives[key].get('size_bytes'): size_bytes = int(update_archives[key]['size_bytes'])
+            stored = self.store.lookup(key, published_checksums(self.data, key)) if self.store else None
+            if stored: cached_path, cached_sha256, cached_verified = self.store.path_for(stored[0]), stored[0], bool(stored[1].get('verified_at'))
+            else: cached_path, cached_sha256 = self._cached_by_name(key, from_ver, to_ver); cached_verified = cached_sha256 is not None
+            cached = cached_path is not None
+            hosts = [link['host_id'] for link in links] or [src.get('name', src.get('type', 'direct')) for src in [update['downloads']['primary'], *update['downloads'].get('fallback', [])]]
+            self.edges.setdefault(from_ver, []).append({'from': from_ver, 'to': to_ver, 'key': key, 'links': links, 'update': update, 'size': size_str,
+                                                        'size_bytes': size_bytes, 'cached': cached, 'cached_path': cached_path, 'hosts': hosts,
+                                                        'cached_sha256': cached_sha256, 'cached_verified': cached_verified})
+        known = [e['size_bytes'] for edges in self.edges.values() for e in edges if e['size_bytes']]
+        self._unknown_size = max(known, default=1024 * 1024 * 1024)  # Pessimistic guess so unsized patches never look free
+
+    def _cached_by_name(self, key: str, from_ver: str, to_ver: str) -> Tuple[Optional[Path], Optional[str]]:
+        """
+        (path, digest) of a complete archive under its version-pair name, else (None, None). The file must have
+        the exact size_bytes update_archives records or, without one, hash to a published checksum; approximate
+        update_sizes prove nothing and an unverifiable file may be a truncated download. Hashed matches move
+        into the ArchiveStore so they are not hashed again.
+        """
+        path = self.cached_archive_path(self.cache_dir, from_ver, to_ver); built = self.data.get('update_archives', {}).get(key)
+        try:
+            if not path.is_file(): return None, None
+            if isinstance(built, dict) and built.get('size_bytes'): return (path, None) if path.stat().st_size == int(built['size_bytes']) else (None, None)
+            checksums = published_checksums(self.data, key)
+            if not checksums: return None, None
+            sha256 = hashlib.sha256()
+            with open(path, 'rb') as f:
+                while chunk := f.read(4 * 1024 * 1024): sha256.update(chunk)
+            digest = sha256.hexdigest()
+            if digest not in checksums: logger.log(f"{path.name} does not match the published checksum; it will be downloaded again.", "WARNING"); return None, None
+            return (self.store.add(path, digest, [key]) if self.store else path), digest
+        except (OSError, ValueError) as e:
+            logger.log(f"Could not check cached archive {path.name}: {e}", "WARNING"); return None, None
+
+    def edge_bytes(self, edge: Dict[str, Any]) -> int:
+        """Bytes this patch still needs to download (0 when its archive is cached)."""
+        return 0 if edge['cached'] else (edge['size_bytes'] or self._unknown_size)
+
+    def edge_seconds(self, edge: Dict[str, Any]) -> float:
+        rates = [r for r in (self.host_stats.rate(h) for h in edge['hosts']) if r] if self.host_stats else []
+        rate = max(rates, default=Constants.PLAN_DEFAULT_RATE)
+        return self.edge_bytes(edge) / rate + Constants.PLAN_INSTALL_OVERHEAD_S + (edge['size_bytes'] or self._unknown_size) / Constants.PLAN_INSTALL_RATE
+
+    def _cost(self, edge: Dict[str, Any], by_time: bool) -> Tuple[float, int]:
+        return (self.edge_seconds(edge) if by_time else self.edge_bytes(edge), 1)  # Fewer installs break ties
+
+    def shortest(self, start: str, target: str, by_time: bool = False, allowed: Optional[Callable[[Dict[str, Any]], bool]] = None) -> Optional[List[Dict[str, Any]]]:
+        """Dijkstra over the patch graph; returns the list of edges, or None if target is unreachable."""
+        best: Dict[str, Tuple[float, int]] = {start: (0, 0)}; previous: Dict[str, Dict[str, Any]] = {}
+        heap = [(0, 0, start)]
+        while heap:
+            cost, hops, version = heapq.heappop(heap)
+            if version == target: break
+            if (cost, hops) > best.get(version, (float('inf'), 0)): continue
+            for edge in self.edges.get(version, []):
+                if allowed and not allowed(edge): continue
+                step, extra = self._cost(edge, by_time); candidate = (cost + step, hops + extra)
+                if candidate < best.get(edge['to'], (float('inf'), 0)):
+                    best[edge['to']] = candidate; previous[edge['to']] = edge
+                    heapq.heappush(heap, (*candidate, edge['to']))
+        if target not in previous and start != target: return None
+        route = []; version = target
+        while version != start: edge = previous[version]; route.append(edge); version = edge['from']
+        return route[::-1]
+
+    def describe(self, route: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {'route': route, 'bytes': sum(self.edge_bytes(e) for e in route), 'seconds': sum(self.edge_seconds(e) for e in route),
+                'unknown_sizes': sum(1 for e in route if not e['size_bytes'] and not e['cached'])}
+
+    def plan(self, start: str, target: str, by_time: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        The best route plus alternatives: best by the other metric, the adjacent-version chain and
+        the direct patch, each when it exists and differs. Returns None when target is unreachable.
+        """
+        route = self.shortest(start, target, by_time)
+        if route is None: return None
+        versions = self.data.get('versions', [])
+        candidates = [("Smallest download" if by_time else "Fastest estimated time", self.shortest(start, target, not by_time))]
+        if start in versions and target in versions and versions.index(start) < versions.index(target):
+            chain = versions[versions.index(start):versions.index(target) + 1]; steps = set(zip(chain, chain[1:]))
+            candidates.append(("Step-by-step chain", self.shortest(start, target, by_time, lambda e: (e['from'], e['to']) in steps)))
+        candidates.append(("Direct patch", self.shortest(start, target, by_time, lambda e: e['from'] == start and e['to'] == target)))
+        seen = [[e['key'] for e in route]]; alternatives = []
+        for label, alternative in candidates:
+            if alternative and [e['key'] for e in alternative] not in seen:
+                seen.append([e['key'] for e in alternative]); alternatives.append({'label': label, **self.describe(alternative)})
+        return {**self.describe(route), 'by_time': by_time, 'alternatives': alternatives}
+
+    @staticmethod
+    def to_install_entry(edge: Dict[str, Any]) -> Dict[str, Any]:
+        """An updates_to_install entry for UpdateWorkflow; carries v2.0 fields for the sequential path too."""
+        update = edge['update'] or {}
+        downloads = update.get('downloads') or {
+            'primary': link_source(edge['links'][0]),
+            'fallback': [link_source(link) for link in edge['links'][1:]]}
+        return {**update, 'from': edge['from'], 'to': edge['to'], 'from_version': edge['from'], 'to_version': edge['to'], 'downloads': downloads,
+                'links': edge['links'], 'size': edge['size'], 'size_bytes': edge['size_bytes'], 'key': edge['key'],
+                'cached_path': str(edge['cached_path']) if edge['cached_path'] else None,
+                'cached_sha256': edge.get('cached_sha256'), 'cached_verified': edge.get('cached_verified', False)}
+
+class UpdateWorkflow:
+    """Encapsulates the entire multi-step update process."""
+    def __init__(self, game_dir: str, cache_dir: Path, updates: List, data: Dict, queue: queue.Queue, cancel: threading.Event, pause: threading.Event, verify: bool, decision_queue: queue.Queue, scheduler: Optional[BackgroundScheduler] = None):
+        self.game_dir, self.cache_dir = Path(game_dir), cache_dir; self.updates, self.data = updates, data
+        self.progress_queue, self.cancel_event, self.pause_event, self.verify_checksums = queue, cancel, pause, verify
+        self.decision_queue = decision_queue
+        self.scheduler = scheduler or BackgroundScheduler()
+        self.downloader = ConcurrentDownloader(self.progress_queue, self.cancel_event, self.pause_event)
+        self.extractor = Extractor()
+        self.host_stats = HostStats(cache_dir)
+        self.store = ArchiveStore.for_cache(cache_dir); self._verified_digests: Dict[str, str] = {}  # Archive path -> digest that passed _verify_checksum
+
+    def _cached_archive(self, update_info: Dict) -> Optional[Path]:
+        """The archive the planner found already downloaded, if it is still there."""
+        cached_path = update_info.get('cached_path')
+        if cached_path and Path(cached_path).is_file():
+            logger.log(f"Using cached archive {Path(cached_path).name}; skipping download.", "INFO")
+            if update_info.get('cached_sha256'): self.store.touch(update_info['cached_sha256'])
+            return Path(cached_path)
+        return None
+
+    def _store_archive(self, archive: Path, update_info: Dict) -> Path:
+        """Moves an archive whose checksum just passed into the ArchiveStore, evicting old ones; returns where it now lives."""
+        digest = self._verified_digests.pop(str(archive), None)
+        if not digest: return archive  # Unchecked, or a stored archive skipped as already verified
+        try: stored = self.store.add(archive, digest, [update_info['key']])
+        except OSError as e: logger.log(f"Could not add {archive.name} to the archive store: {e}", "WARNING"); return archive
+        for suffix in ('.progress', '.hostinfo'): archive.with_name(archive.name + suffix).unlink(missing_ok=True)  # Resume state of the finished download
+        self.store.evict(protect=self._plan_digests() | {digest})
+        return stored
+
+    def _plan_digests(self) -> set:
+        """Digests of every archive this run's plan may still use; eviction keeps them."""
+        return {u['cached_sha256'] for u in self.updates if u.get('cached_sha256')} | {sha for u in self.updates for sha in published_checksums(self.data, u.get('key', ''))}
+
+    def discard_archive(self, archive: Path):
+        """Deletes an installed archive unless the ArchiveStore keeps it for reuse."""
+        if not self.store.holds(archive): archive.unlink(missing_ok=True)
+
+    def run(self):
+        logger.log("Update workflow started.", "INFO")
+        # Immediately update UI to show workflow has started
+        self.progress_queue.put({'type': Q_MSG.OVERALL_STATUS, 'message': "Initializing update..."})
+        self.progress_queue.put({'type': Q_MSG.STATUS, 'message': "Starting update process..."})
+        downloaded_files = []
+        
+        # Check if using sequential update system
+        schema_version = self.data.get('metadata', {}).get('schema_version', '1.0')
+        supports_sequential = self.data.get('metadata', {}).get('supports_sequential_updates', False)
+        is_sequential = schema_version == '2.0' or supports_sequential
+        
+        try:
+            if self.cancel_event.is_set(): raise InterruptedError("Cancelled before start")
+            self._check_disk_space()
+            if self.cancel_event.is_set(): raise InterruptedError("Cancelled during disk check")
+            downloaded_files = self._run_download_phase()
+            if self.cancel_event.is_set() or not downloaded_files: raise InterruptedError("Cancelled during download")
+            
+            # Only run install phase if NOT using sequential (sequential installs as it goes)
+            if not is_sequential:
+                self._run_install_phase(downloaded_files)
+                if self.cancel_event.is_set(): raise InterruptedError("Cancelled before completion")
+                self._cleanup_successful_update_files(downloaded_files)
+            
+            self.progress_queue.put({'type': Q_MSG.COMPLETE, 'final_version': self.data.get('latest_version', 'N/A')})
+        except InterruptedError as e:
+            logger.log(f"Update workflow cancelled: {e}", "INFO")
+            if not is_sequential:
+                self._cleanup_failed_update_files(downloaded_files)
+        except Exception as e:
+            if not self.cancel_event.is_set():
+                logger.log(f"Update workflow stopped due to a runtime error: {e}", "CRITICAL")
+                self.progress_queue.put({'type': Q_MSG.DOWNLOAD_FAILED, 'reason': str(e)})
+        finally:
+            self.scheduler.close()
+            if self.cancel_event.is_set(): self.progress_queue.put({'type': Q_MSG.CANCELLED})
+            logger.log("Update workflow finished.", "INFO")
+
+    def fetch_archive(self, update_info: Dict) -> Path:
+        """
+        Downloads one patch into the cache (or reuses the cached archive) and checks its checksum, without installing it.
+        FleetUpdater installs the result into several games. Raises RuntimeError if every source fails or the
+        checksum mismatch is refused, InterruptedError if cancelled.
+        """
+        patch_name = f"v{update_info.get('from', '?')} → v{update_info.get('to', '?')}"; host_id = None
+        started = time.monotonic(); archive = self._cached_archive(update_info); from_cache = archive is not None
+        if not archive and update_info.get('links'):
+            archive_name = UpdatePlanner.cached_archive_path(self.cache_dir, update_info['from'], update_info['to']).name
+            result = self.downloader.download_file(update_info['links'], self.cache_dir, archive_name)
+            if result: archive, host_id = result; self.host_stats.record(host_id, archive.stat().st_size, time.monotonic() - started)
+        elif not archive: archive = self._download_update_with_fallback(update_info)
+        if self.cancel_event.is_set(): raise InterruptedError(f"Download of patch {patch_name} cancelled.")
+        if not archive: raise RuntimeError(f"All sources failed for patch {patch_name}.")
+        if self.verify_checksums:
+            built = self.data.get('update_archives', {}).get(update_info.get('key'))
+            expected = self._cached_checksums(update_info) if from_cache else self._get_checksum_for_host(host_id, update_info['key']) if host_id else \
+                update_info.get('downloads', {}).get('primary', {}).get('checksum') or (built.get('sha256') if isinstance(built, dict) else None)
+            if not expected: logger.log(f"No checksum available for patch {patch_name}. Skipping verification.", "WARNING")
+            elif not self._verify_checksum(archive, expected, update_info):
+                if self.cancel_event.is_set(): raise InterruptedError(f"Checksum check of patch {patch_name} cancelled.")
+                self.progress_queue.put({'type': Q_MSG.CHECKSUM_CONFIRM, 'update_info': update_info})
+                if not self.decision_queue.get():
+                    archive.unlink(missing_ok=True)
+                    raise RuntimeError(f"Update aborted due to checksum mismatch for patch {patch_name}.")
+                logger.log(f"User continued despite checksum mismatch for patch {patch_name}.", "WARNING")
+        return self._store_archive(archive, update_info)
+
+    def _check_disk_space(self):
+        self.progress_queue.put({'type': Q_MSG.OVERALL_STATUS, 'message': "Checking disk space..."})
+        total_download_size = sum(u.get('size_bytes', 0) for u in self.updates)
+        max_install_size = max((u.get('size_bytes', 0) for u in self.updates), default=0) * 2.5
+        cache_drive = Path(self.cache_dir.anchor); game_drive = Path(self.game_dir.anchor)
+        cache_free = shutil.disk_usage(cache_drive).free
+        if cache_free < total_download_size: raise RuntimeError(f"Not enough space on {cache_drive} for downloads. Required: {format_bytes(total_download_size)}, Available: {format_bytes(cache_free)}")
+        if game_drive == cache_drive:
+             if cache_free < (total_download_size + max_install_size): raise RuntimeError(f"Not enough space on {game_drive} for download & install. Required: ~{format_bytes(total_download_size + max_install_size)}, Available: {format_bytes(cache_free)}")
+        else:
+            game_free = shutil.disk_usage(game_drive).free
+            if game_free < max_install_size: raise RuntimeError(f"Not enough space on game drive {game_drive} for installation. Required: ~{format_bytes(max_install_size)}, Available: {format_bytes(game_free)}")
+        logger.log("Disk space check passed.", "INFO")
+
+    def _download_update_with_fallback(self, update_info: Dict) -> Optional[Path]:
+        """
+        Download update with fallback support for Cricket 26 v2.0 schema.
+        Tries primary source first, then fallbacks in order.
+        """
+        cached_archive = self._cached_archive(update_info)
+        if cached_archive: return cached_archive
+        downloads = update_info.get('downloads', {})
+        
+        # Try primary first
+        primary = downloads.get('primary')
+        if primary:
+            self.progress_queue.put({
+                'type': Q_MSG.STATUS,
+                'message': f'📥 Trying primary: {primary.get("name", primary.get("type", "Unknown"))}'
+            })
+            
+            result = self._download_from_source(primary, update_info)
+            if result:
+                return result
+        
+        # Primary failed - try fallbacks
+        fallbacks = downloads.get('fallback', [])
+        
+        for i, fallback in enumerate(fallbacks, 1):
+            self.progress_queue.put({
+                'type': Q_MSG.STATUS,
+                'message': f'🔄 Trying fallback {i}/{len(fallbacks)}: {fallback.get("name", fallback.get("type", "Unknown"))}'
+            })
+            
+            result = self._download_from_source(fallback, update_info)
+            if result:
+                return result
+        
+        # All sources failed
+        return None
+
+    def _download_from_source(self, source: Dict, update_info: Dict) -> Optional[Path]:
+        """
+        Download from a single source (gdrive or direct).
+        """
+        source_type = source.get('type', 'unknown')
+        started = time.monotonic()
+        
+        try:
+            archive_name = f"C26_Update_{update_info.get('from_version', '?')}_to_{update_info.get('to_version', '?')}.zip"
+            output_path = self.cache_dir / archive_name
+            
+            if source_type == 'gdrive':
+                # Google Drive download
+                file_id = source.get('file_id')
+                if not file_id:
+                    # Try to extract from URL
+                    url = source.get('url', '')
+                    import re
+                    match = re.search(r'/d/([a-zA-Z0-9_-]+)', url)
+                    if match:
+                        file_id = match.group(1)
+                    else:
+                        logger.log(f"No file_id found in source: {source}", "ERROR")
+                        return None
+                
+                success = download_from_gdrive(
+                    file_id,
+                    output_path,
+                    self.progress_queue,
+                    self.cancel_event
+                )
+                
+                if success and output_path.exists():
+                    self.host_stats.record(source.get('name', source_type), output_path.stat().st_size, time.monotonic() - started)
+                    return output_path
+                
+            elif source_type == 'direct':
+                # Direct HTTP download (use existing download system)
+                url = source.get('url')
+                if not url:
+                    logger.log(f"No URL found in source: {source}", "ERROR")
+                    return None
+                
+                # Create link format for existing downloader
+                links = [{'link': url, 'host_id': source.get('name', 'direct')}]
+                result = self.downloader.download_file(
+                    links,
+                    self.cache_dir,
+                    archive_name
+                )
+                
+                if result:
+                    self.host_stats.record(source.get('name', source_type), result[0].stat().st_size, time.monotonic() - started)
+                    return result[0]  # Return the path
+            
+            else:
+                logger.log(f"Unknown source type: {source_type}", "ERROR")
+                
+        except Exception as e:
+            logger.log(f"Download from {source.get('name', 'unknown')} failed: {e}", "ERROR")
+        
+        return None
+
+    def _run_download_phase_sequential(self) -> List[Dict[str, Any]]:
+        """
+        Download and INSTALL updates SEQUENTIALLY for Cricket 26 (install-as-you-go).
+        Each update is installed immediately after download so partial progress is preserved.
+        If update 7/12 fails, updates 1-6 remain installed.
+        """
+        num_updates = len(self.updates)
+        completed_updates = []
+        
+        logger.log(f"Starting sequential download-and-install for {num_updates} updates", "INFO")
+        
+        with tempfile.TemporaryDirectory(prefix="c26-extract-") as temp_extract_dir_str:
+            extract_dir = Path(temp_extract_dir_str)
+            
+            for i, update_info in enumerate(self.updates, 1):
+                if self.cancel_event.is_set():
+                    raise InterruptedError("Sequential update cancelled by user")
+                
+                # Show which update we're on
+                from_ver = update_info.get('from_version', '?')
+                to_ver = update_info.get('to_version', '?')
+                
+                self.progress_queue.put({
+                    'type': Q_MSG.OVERALL_STATUS,
+                    'message': f'📦 Sequential Update {i}/{num_updates}: v{from_ver} → v{to_ver}'
+                })
+                
+                # Download with fallback support
+                try:
+                    self.progress_queue.put({
+                        'type': Q_MSG.STATUS,
+                        'message': f'⬇️ Downloading update {i}/{num_updates}...'
+                    })
+                    
+                    downloaded_file = self._download_update_with_fallback(update_info)
+                    
+                    if not downloaded_file:
+                        # Download failed even with fallbacks
+                        raise RuntimeError(
+                            f"Failed to download update {i}/{num_updates}. "
+                            f"All sources failed for v{from_ver} → v{to_ver}. "
+                            f"Game is at v{self.updates[i-2].get('to_version', 'unknown') if i > 1 else 'base'} "
+                            f"(Installed: {len(completed_updates)}/{num_updates} updates)."
+                        )
+                    
+                    # Download successful - verify if needed
+                    if self.verify_checksums:
+                        expected_checksum = self._cached_checksums(update_info) if str(downloaded_file) == update_info.get('cached_path') \
+                            else update_info.get('downloads', {}).get('primary', {}).get('checksum')
+                        if expected_checksum:
+                            self.progress_queue.put({
+                                'type': Q_MSG.STATUS,
+                                'message': f'🔐 Verifying update {i}/{num_updates}...'
+                            })
+                            
+                            if not self._verify_checksum(downloaded_file, expected_checksum, update_info):
+                                logger.log(f"Checksum mismatch for update {i}", "ERROR")
+                                # Clean up and fail
+                                downloaded_file.unlink(missing_ok=True)
+                                raise RuntimeError(f"Security verification failed for update {i}/{num_updates}")
+                            downloaded_file = self._store_archive(downloaded_file, update_info)
+                    
+                    self.progress_queue.put({
+                        'type': Q_MSG.STATUS,
+                        'message': f'✅ Update {i}/{num_updates} downloaded successfully!'
+                    })
+                    
+                    # INSTALL IMMEDIATELY (install-as-you-go)
+                    self.progress_queue.put({
+                        'type': Q_MSG.OVERALL_STATUS,
+                        'message': f'📦 Installing Update {i}/{num_updates}...'
+                    })
+                    
+                    # Extract
+                    self.progress_queue.put({
+                        'type': Q_MSG.STATUS,
+                        'message': f'📂 Extracting update {i}/{num_updates}...'
+                    })
+                    self.extractor.extract_archive(downloaded_file, extract_dir, self.progress_queue, self.cancel_event)
+                    
+                    # Install
+                    self.progress_queue.put({
+                        'type': Q_MSG.STATUS,
+                        'message': f'💾 Installing update {i}/{num_updates} to game directory...'
+                    })
+                    self.progress_queue.put({'type': Q_MSG.PROGRESS, 'value': 0})
+                    self.extractor.install_files(extract_dir, self.game_dir, self.progress_queue, self.cancel_event, self._repair_source(to_ver))
+                    
+                    # Clean up extracted files for next update
+                    for item in extract_dir.iterdir():
+                        if item.is_dir():
+                            import shutil
+                            shutil.rmtree(item, ignore_errors=True)
+                        else:
+                            item.unlink(missing_ok=True)
+                    
+                    # Delete downloaded archive to save space (verified ones stay in the archive store)
+                    self.discard_archive(downloaded_file)
+                    
+                    # Mark as completed and installed
+                    completed_updates.append({
+                        'info': update_info,
+                        'installed': True
+                    })
+                    
+                    self.progress_queue.put({
+                        'type': Q_MSG.STATUS,
+                        'message': f'✅ Update {i}/{num_updates} installed successfully! Game now at v{to_ver}'
+                    })
+                    
+                except Exception as e:
+                    # Update failed - but previous updates are already installed!
+                    logger.log(f"Sequential update {i}/{num_updates} failed: {e}", "ERROR")
+                    
+                    current_version = self.updates[i-2].get('to_version', 'unknown') if i > 1 else 'base'
+                    
+                    self.progress_queue.put({
+                        'type': Q_MSG.DOWNLOAD_FAILED,
+                        'reason': f'Update {i}/{num_updates} failed: {str(e)}\n\n'
+                                  f'✅ Good News: Updates 1-{len(completed_updates)} are already installed!\n'
+                                  f'📌 Current Game Version: v{current_version}\n'
+                                  f'❌ Failed at: v{from_ver} → v{to_ver}\n\n'
+                                  f'Your game is playable at v{current_version}. '
+                                  f'You can retry the update later to complete remaining updates.'
+                    })
+                    
+                    raise
+        
+        # All updates downloaded AND installed successfully!
+        self.progress_queue.put({
+            'type': Q_MSG.OVERALL_STATUS,
+            'message': f'🎉 All {num_updates} updates installed successfully!'
+        })
+        
+        return completed_updates
+
+    def _run_download_phase(self) -> List[Dict[str, Any]]:
+        """
+        Main download phase - detects schema version and uses appropriate method.
+        """
+        # Check if using new v2.0 schema with sequential updates
+        schema_version = self.data.get('metadata', {}).get('schema_version', '1.0')
+        supports_sequential = self.data.get('metadata', {}).get('supports_sequential_updates', False)
+        
+        if schema_version == '2.0' or supports_sequential:
+            logger.log("Using sequential update system (v2.0 schema)", "INFO")
+            return self._run_download_phase_sequential()
+        else:
+            logger.log("Using legacy parallel download system", "INFO")
+            return self._run_download_phase_legacy()
+    
+    def _run_download_phase_legacy(self) -> List[Dict[str, Any]]:
+        """Legacy download phase for old schema (original Cricket 24 method)."""
+        downloaded_files_map = []
+        num_updates = len(self.updates)
+        
+        # INTELLIGENT MODE DETECTION for contextual messaging
+        is_single_host_mode = all(len(update.get('links', [])) == 1 for update in self.updates)
+        total_unique_hosts = len(set(link['host_id'] for update in self.updates for link in update.get('links', [])))
+        
+        if is_single_host_mode and total_unique_hosts == 1:
+            # Pure single host mode - simplified messaging
+            single_host_name = self.updates[0].get('links', [{}])[0].get('host_id', 'selected host')
+            self.progress_queue.put({'type': Q_MSG.OVERALL_STATUS, 'message': f"📱 DOWNLOAD: Starting {num_updates} patch(es) from {single_host_name}"})
+            self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"📡 Connecting to {single_host_name} for {num_updates} update file(s)..."})
+        else:
+            # Multi-host smart mode - advanced messaging
+            self.progress_queue.put({'type': Q_MSG.OVERALL_STATUS, 'message': f"🚀 SMART DOWNLOAD: Starting {num_updates} patch(es) with intelligent host selection..."})
+            self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"🧠 Initializing multi-host download system for {num_updates} update file(s)..."})
+        
+        for i, update_info in enumerate(self.updates):
+            if self.cancel_event.is_set(): raise InterruptedError("Download phase cancelled.")
+            
+            # Enhanced patch info with contextual messaging
+            patch_name = f"v{update_info.get('from', '?')} → v{update_info.get('to', '?')}"
+            available_hosts = len(update_info.get('links', []))
+            patch_is_single_host = available_hosts == 1
+            
+            if patch_is_single_host:
+                # Single host for this patch
+                host_name = update_info.get('links', [{}])[0].get('host_id', 'host')
+                self.progress_queue.put({'type': Q_MSG.OVERALL_STATUS, 'message': f"📥 PATCH {i+1}/{num_updates}: {patch_name} from {host_name}"})
+                self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"📡 Downloading patch {patch_name} from {host_name}..."})
+            else:
+                # Multi-host for this patch
+                self.progress_queue.put({'type': Q_MSG.OVERALL_STATUS, 'message': f"📥 SMART PATCH {i+1}/{num_updates}: {patch_name} | {available_hosts} hosts available"})
+                self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"🧠 Smart system: Testing {available_hosts} hosts for patch {patch_name}..."})
+            
+            archive_name = f"C26_Update_{update_info['from']}_to_{update_info['to']}.zip"
+            
+            try:
+                started = time.monotonic(); cached_archive = self._cached_archive(update_info)
+                download_result = (cached_archive, 'cache') if cached_archive else self.downloader.download_file(update_info.get('links', []), self.cache_dir, archive_name)
+                if download_result and not cached_archive: self.host_stats.record(download_result[1], download_result[0].stat().st_size, time.monotonic() - started)
+                if not download_result:
+                    if self.cancel_event.is_set(): 
+                        raise InterruptedError("Download cancelled during file transfer.")
+                    else: 
+                        # Create contextual error message based on available hosts
+                        if available_hosts == 1:
+                            # Single host failure
+                            single_host_name = update_info.get('links', [{}])[0].get('host_id', 'selected host')
+                            raise RuntimeError(f"DOWNLOAD FAILED: {single_host_name} was unable to provide the update file for v{update_info.get('to', 'N/A')}. This could be due to network issues or server problems.")
+                        else:
+                            # Multi-host failure  
+                            raise RuntimeError(f"SMART DOWNLOAD FAILED: All {available_hosts} hosts failed for update v{update_info.get('to', 'N/A')}.")
+                
+                dl_file_path, host_id = download_result
+                
+                # Show success with host info
+                self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"✅ Patch {i+1}/{num_updates} downloaded successfully from {host_id}"})
+                
+            except Exception as e:
+                # Enhanced error reporting with contextual host information
+                error_msg = str(e)
+                if "SMART DOWNLOAD FAILED" in error_msg or "hosts failed" in error_msg:
+                    raise RuntimeError(f"Smart multi-host download system failed for patch {patch_name}: {error_msg}")
+                elif "DOWNLOAD FAILED" in error_msg:
+                    raise RuntimeError(f"Single host download failed for patch {patch_name}: {error_msg}")
+                else:
+                    raise RuntimeError(f"Download error for patch {patch_name}: {error_msg}")
+            
+            if self.verify_checksums:
+                self.progress_queue.put({'type': Q_MSG.OVERALL_STATUS, 'message': f"🔍 SECURITY CHECK: Verifying Patch {i+1}/{num_updates}..."})
+                self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"🔐 Checking file integrity for {patch_name} from {host_id}..."})
+                
+                expected_checksum = self._cached_checksums(update_info) if host_id == 'cache' else self._get_checksum_for_host(host_id, update_info['key'])
+                
+                if expected_checksum:
+                    if not self._verify_checksum(dl_file_path, expected_checksum, update_info):
+                        self.progress_queue.put({'type': Q_MSG.CHECKSUM_CONFIRM, 'update_info': update_info})
+                        if not self.decision_queue.get():
+                            if dl_file_path.exists(): dl_file_path.unlink(missing_ok=True)
+                            raise RuntimeError(f"Update aborted by user due to checksum mismatch for v{update_info.get('to', 'N/A')}.")
+                        logger.log(f"User continued despite checksum mismatch for v{update_info.get('to', 'N/A')}.", "WARNING")
+                    else:
+                        self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"🔐 Security check passed for {patch_name}"})
+                        dl_file_path = self._store_archive(dl_file_path, update_info)
+                else:
+                    logger.log(f"No checksum found for host '{host_id}' for patch to v{update_info['to']}. Skipping verification.", "WARNING")
+                    self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"⚠️ No checksum available for {patch_name} from {host_id}"})
+
+            downloaded_files_map.append({'info': update_info, 'path': dl_file_path})
+            
+        # Final success status with contextual messaging
+        if num_updates == 1 and available_hosts == 1:
+            single_host_name = downloaded_files_map[0]['info']['links'][0]['host_id']
+            self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"✅ Update downloaded successfully from {single_host_name}"})
+        else:
+            self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"✅ All {num_updates} patch(es) downloaded successfully with smart system"})
+        return downloaded_files_map
+
+    def _run_install_phase(self, files_to_install: List[Dict[str, Any]]):
+        with tempfile.TemporaryDirectory(prefix="c26-extract-") as temp_extract_dir_str:
+            extract_dir = Path(temp_extract_dir_str)
+            for i, downloaded_file in enumerate(files_to_install):
+                if self.cancel_event.is_set(): raise InterruptedError("Installation phase cancelled.")
+                
+                self.progress_queue.put({'type': Q_MSG.OVERALL_STATUS, 'message': f"Extracting Patch {i+1}/{len(files_to_install)}..."})
+                self.extractor.extract_archive(downloaded_file['path'], extract_dir, self.progress_queue, self.cancel_event)
+
+                self.progress_queue.put({'type': Q_MSG.OVERALL_STATUS, 'message': f"Installing Patch {i+1}/{len(files_to_install)}..."})
+                self.progress_queue.put({'type': Q_MSG.PROGRESS, 'value': 0})
+                self.extractor.install_files(extract_dir, self.game_dir, self.progress_queue, self.cancel_event, self._repair_source(downloaded_file['info'].get('to')))
+
+                for item in extract_dir.iterdir():
+                    if item.is_dir(): shutil.rmtree(item)
+                    else: item.unlink()
+
+    def _cleanup_successful_update_files(self, downloaded_files: List[Dict[str, Any]]):
+        logger.log("Update successful. Cleaning up used patch files.", "INFO")
+        self.progress_queue.put({'type': Q_MSG.OVERALL_STATUS, 'message': "Cleaning up temporary files..."})
+        for file_data in downloaded_files:
+            archive_path = file_data['path']
+            try:
+                self.discard_archive(archive_path)
+            except OSError as e:
+                logger.log(f"Could not delete file {archive_path.name} during cleanup: {e}", "WARNING")
+
+    def _cleanup_failed_update_files(self, downloaded_files: List[Dict[str, Any]]):
+        logger.log("Cleaning up files from failed/cancelled update.", "INFO")
+        for file_data in downloaded_files:
+            archive_path = file_data['path']
+            if self.store.holds(archive_path): continue  # Verified and complete; keep it for the retry
+            try:
+                archive_path.with_suffix(archive_path.suffix + '.progress').unlink(missing_ok=True)
+                archive_path.unlink(missing_ok=True)
+                logger.log(f"Deleted incomplete download: {archive_path.name}", "INFO")
+            except OSError as e:
+                logger.log(f"Could not delete file {archive_path.name} during cleanup: {e}", "WARNING")
+
+    def _repair_source(self, version: Optional[str]) -> Optional[str]:
+        """Base URL of the full game files for a version, used when a delta patch cannot be applied."""
+        return self.data.get('repair_sources', {}).get(version) if version else None
+
+    def _get_checksum_for_host(self, host_id: str, update_key: str) -> Optional[str]:
+        for host in self.data.get('hosts', []):
+            if host.get('id') == host_id:
+                host_checksums = host.get('checksums')
+                if isinstance(host_checksums, dict):
+                    checksum = host_checksums.get(update_key)
+                    if checksum:
+                        logger.log(f"Found specific checksum for host '{host_id}' and patch '{update_key}'.", "INFO")
+                        return checksum
+                    else:
+                        logger.log(f"Host '{host_id}' has a checksums object, but no entry for '{update_key}'.", "WARNING")
+                        break
+        
+        # Every host serves the same archive, so a built archive's SHA256 covers hosts without their own entry
+        archive = self.data.get('update_archives', {}).get(update_key)
+        if isinstance(archive, dict) and archive.get('sha256'):
+            logger.log(f"Using archive checksum for patch '{update_key}' on host '{host_id}'.", "INFO")
+            return archive['sha256']
+        logger.log(f"No checksum available for host '{host_id}' and patch '{update_key}'. Verification for this file will be skipped.", "WARNING")
+        return None
+
+    def _cached_checksums(self, update_info: Dict) -> set:
+        """What a reused archive must hash to: any checksum published for its patch, else the digest it is stored under."""
+        return published_checksums(self.data, update_info['key']) or ({update_info['cached_sha256']} if update_info.get('cached_sha256') else set())
+
+    def _verify_checksum(self, file_path: Path, expected_hash: Union[str, Iterable[str]], update_info: Optional[Dict] = None) -> bool:
+        """True if the file hashes to expected_hash (or to any of several accepted checksums)."""
+        expected = {expected_hash.lower()} if isinstance(expected_hash, str) else {e.lower() for e in expected_hash}
+        if update_info and update_info.get('cached_verified') and update_info.get('cached_sha256') in expected and str(file_path) == update_info.get('cached_path'):
+            logger.log(f"{file_path.name} matched this checksum when it entered the archive store; not hashing it again.", "INFO"); return True
+        self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"Verifying integrity of {file_path.name}..."})
+        logger.log(f"Verifying checksum for {file_path.name}", "INFO"); sha256 = hashlib.sha256()
+        try:
+            total, done, last_update = file_path.stat().st_size, 0, time.time()
+            with open(file_path, "rb") as f:
+                for chunk in iter(lambda: f.read(4 * 1024 * 1024), b""):
+                    if self.cancel_event.is_set(): return False
+                    self.pause_event.wait()
+                    sha256.update(chunk); done += len(chunk); self.scheduler.consume(len(chunk))
+                    if time.time() - last_update > 0.5:
+                        rate = self.scheduler.rate(); last_update = time.time()
+                        throttle_note = " (background)" if self.scheduler.throttled else ""
+                        self.progress_queue.put({'type': Q_MSG.STATUS, 'message': f"Verifying integrity of {file_path.name}... {done * 100 // max(total, 1)}% | {format_bytes(rate)}/s | ETA: {format_eta((total - done) / rate if rate else -1)}{throttle_note}"})
+            digest = sha256.hexdigest().lower(); is_valid = digest in expected
+            if is_valid: self._verified_digests[str(file_path)] = digest
+            logger.log(f"Checksum for {file_path.name} {'OK' if is_valid else 'MISMATCH'}.", "INFO" if is_valid else "ERROR")
+            return is_valid
+        except IOError as e:
+            logger.log(f"Could not read file for checksum: {e}", "ERROR")
+            return False
+
+# ==============================================================================
+# --- FLEET UPDATES ---
+# ==============================================================================
+def volume_id(path: Path) -> Any:
+    """The disk a path lives on; fleet installs that share one take turns."""
+    try: return os.stat(path).st_dev
+    except OSError: return Path(path).resolve().anchor
+
+
+class TargetQueue:
+    """Progress queue for one fleet target: tags each message with the target before it reaches the shared bus."""
+    def __init__(self, bus: queue.Queue, target: str): self.bus, self.target = bus, target
+    def put(self, msg: dict, block: bool = True, timeout: Optional[float] = None): self.bus.put({**msg, 'target': self.target})
+    put_nowait = put
+
+
+class FleetUpdater:
+    """
+    Updates many game folders from one set of downloads.
+
+    Targets are grouped by installed version and each group is routed once by UpdatePlanner. Every patch
+    a route needs is downloaded once into the shared cache and extracted once; each target installs its
+    route hop by hop as soon as the archives arrive. Extraction and installs on the same disk take turns
+    (installs_per_volume at a time) so parallel copies don't thrash it, while targets on different disks
+    run side by side. A failing target stops at the last patch it installed without affecting the others.
+    Progress messages carry a 'target' field; each finished target posts FLEET_TARGET_DONE and run()
+    ends with FLEET_COMPLETE holding the summary.
+    """
+    DOWNLOADS = "downloads"  # 'target' of the shared download messages
+
+    def __init__(self, game_dirs: List[str], data: Dict, cache_dir: Path, queue: queue.Queue, cancel: threading.Event, pause: threading.Event, verify: bool,
+                 decision_queue: queue.Queue, links_for: Callable[[str], List[Dict[str, str]]], by_time: bool = False,
+                 installs_per_volume: int = Constants.FLEET_INSTALLS_PER_VOLUME, scheduler: Optional[BackgroundScheduler] = None):
+        self.game_dirs = list(dict.fromkeys(str(Path(d)) for d in game_dirs))
+        self.data, self.cache_dir, self.latest = data, Path(cache_dir), data.get('latest_version')
+        self.queue, self.cancel_event, self.pause_event = queue, cancel, pause
+        self.links_for, self.by_time, self.installs_per_volume = links_for, by_time, max(1, installs_per_volume)
+        self.scheduler = scheduler or BackgroundScheduler()
+        self.fetcher = UpdateWorkflow(self.game_dirs[0] if self.game_dirs else str(self.cache_dir), self.cache_dir, [], data,
+                                      TargetQueue(queue, self.DOWNLOADS), cancel, pause, verify, decision_queue, self.scheduler)
+        self.extractor = Extractor()
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.archives: Dict[str, Future] = {}; self.fetched_bytes = 0
+        self._extracted: Dict[str, Future] = {}; self._users: Counter = Counter()
+        self._volume_slots: Dict[Any, threading.Semaphore] = {}; self._lock = threading.Lock()
+        self._extract_root: Optional[Path] = None
+
+    def run(self):
+        logger.log(f"Fleet update started for {len(self.game_dirs)} game folder(s).", "INFO"); started = time.monotonic()
+        self.queue.put({'type': Q_MSG.OVERALL_STATUS, 'message': f"Checking {len(self.game_dirs)} game folder(s)..."})
+        try:
+            routes = self._check_disk_space(self._plan_routes(self._group_targets()))
+            if routes:
+                downloads = self.fetcher.updates = self._download_order(routes)  # The fetcher's plan: eviction keeps these archives
+                self.queue.put({'type': Q_MSG.OVERALL_STATUS, 'message': f"🚀 Updating {len(routes)} game(s) with {len(downloads)} patch(es), each downloaded once..."})
+                with tempfile.TemporaryDirectory(prefix="c26-fleet-") as extract_root, \
+                        ThreadPoolExecutor(max_workers=1, thread_name_prefix='FleetDownload') as download_pool, \
+                        ThreadPoolExecutor(max_workers=min(len(routes), Constants.FLEET_MAX_TARGETS), thread_name_prefix='FleetTarget') as target_pool:
+                    self._extract_root = Path(extract_root)
+                    for entry in downloads: self.archives[entry['key']] = download_pool.submit(self._fetch, entry)
+                    for future in as_completed([target_pool.submit(self._update_target, game_dir, route) for game_dir, route in routes.items()]): future.result()
+                self._cleanup_archives(routes)
+        except Exception as e:
+            logger.log(f"Fleet update stopped due to a runtime error: {e}", "CRITICAL")
+            self.queue.put({'type': Q_MSG.ERROR, 'message': f"Fleet update stopped: {e}"})
+        finally:
+            self.scheduler.close()
+            for game_dir in self.game_dirs:
+                if game_dir not in self.results: self._finish(game_dir, 'cancelled' if self.cancel_event.is_set() else 'failed', error="Not started.")
+            summary = self.summary(time.monotonic() - started)
+            logger.log(f"Fleet update finished: {summary['counts']}, {summary['patches_downloaded']} patch(es) downloaded.", "INFO", phase='fleet', **summary['counts'])
+            self.queue.put({'type': Q_MSG.FLEET_COMPLETE, 'summary': summary})
+            if self.cancel_event.is_set(): self.queue.put({'type': Q_MSG.CANCELLED})
+
+    def summary(self, seconds: float) -> Dict[str, Any]:
+        return {'targets': [self.results[game_dir] for game_dir in self.game_dirs if game_dir in self.results],
+                'counts': dict(Counter(result['status'] for result in self.results.values())), 'latest_version': self.latest,
+                'patches_downloaded': sum(1 for f in self.archives.values() if f.done() and not f.cancelled() and not f.exception()),
+                'bytes_downloaded': self.fetched_bytes, 'seconds': round(seconds, 1)}
+
+    def _finish(self, game_dir: str, status: str, **fields):
+        result = {'game_dir': game_dir, 'status': status, **fields}; self.results[game_dir] = result
+        logger.log(f"Fleet target {game_dir}: {status}{': ' + fields['error'] if fields.get('error') else ''}", "INFO" if status in ('updated', 'up_to_date') else "WARNING")
+        self.queue.put({'type': Q_MSG.FLEET_TARGET_DONE, 'target': game_dir, 'result': result})
+
+    def _group_targets(self) -> Dict[str, List[str]]:
+        """{installed version: [game dirs]} for the targets that need updating; the rest finish here."""
+        groups: Dict[str, List[str]] = {}
+        for game_dir in self.game_dirs:
+            version = GameManager(game_dir).check_version() if Path(game_dir).is_dir() else "NOT_FOUND"
+            if not version or version in GameManager.VERSION_ERRORS: self._finish(game_dir, 'failed', error=f"Could not detect the installed version ({version}).")
+            elif version == self.latest: self._finish(game_dir, 'up_to_date', version=version, final_version=version)
+            else: groups.setdefault(version, []).append(game_dir)
+        return groups
+
+    def _plan_routes(self, groups: Dict[str, List[str]]) -> Dict[str, List[Dict[str, Any]]]:
+        """{game dir: install entries}, one UpdatePlanner route per version group."""
+        planner = UpdatePlanner(self.data, self.cache_dir, self.links_for, HostStats(self.cache_dir), self.fetcher.store); routes = {}
+        for version, game_dirs in groups.items():
+            plan = planner.plan(version, self.latest, by_time=self.by_time)
+            if plan is None:
+                for game_dir in game_dirs: self._finish(game_dir, 'failed', version=version, error=f"No patch route from v{version} to v{self.latest}.")
+                continue
+            updates = [UpdatePlanner.to_install_entry(edge) for edge in plan['route']]
+            logger.log(f"Fleet: {len(game_dirs)} game(s) at v{version} → v{self.latest} via {' + '.join(u['key'] for u in updates)}.", "INFO")
+            for game_dir in game_dirs: routes[game_dir] = updates
+        for route in routes.values(): self._users.update(entry['key'] for entry in route)
+        return routes
+
+    def _check_disk_space(self, routes: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Fails the whole fleet if the cache can't hold the downloads, or single targets whose disk is too full."""
+        patches = {entry['key']: entry for route in routes.values() for entry in route}
+        download_size = sum(e.get('size_bytes', 0) for e in patches.values() if not e.get('cached_path'))
+        extract_size = max((e.get('size_bytes', 0) for e in patches.values()), default=0) * 2.5
+        cache_drive = Path(self.cache_dir.anchor); cache_free = shutil.disk_usage(cache_drive).free
+        if cache_free < download_size + extract_size:
+            raise RuntimeError(f"Not enough space on {cache_drive} for downloads. Required: ~{format_bytes(download_size + extract_size)}, Available: {format_bytes(cache_free)}")
+        for game_dir, route in list(routes.items()):
+            install_size = max(e.get('size_bytes', 0) for e in route) * 2.5; game_free = shutil.disk_usage(game_dir).free
+            if game_free < install_size:
+                self._finish(game_dir, 'failed', version=route[0]['from'], error=f"Not enough space for installation. Required: ~{format_bytes(install_size)}, Available: {format_bytes(game_free)}")
+                self._users.subtract(entry['key'] for entry in route); del routes[game_dir]
+        return routes
+
+    @staticmethod
+    def _download_order(routes: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Each patch once, every route's first hop before any second hop, so all targets can start early."""
+        order: Dict[str, Dict[str, Any]] = {}
+        for depth in range(max(len(route) for route in routes.values())):
+            for route in routes.values():
+                if depth < len(route): order.setdefault(route[depth]['key'], route[depth])
+        return list(order.values())
+
+    def _volume_slot(self, path: Path) -> threading.Semaphore:
+        key = volume_id(path)
+        with self._lock: return self._volume_slots.setdefault(key, threading.Semaphore(self.installs_per_volume))
+
+    def _fetch(self, entry: Dict[str, Any]) -> Path:
+        if self.cancel_event.is_set(): raise InterruptedError("Fleet update cancelled.")
+        self.fetcher.progress_queue.put({'type': Q_MSG.OVERALL_STATUS, 'message': f"⬇️ Patch v{entry['from']} → v{entry['to']} for {self._users[entry['key']]} game(s)"})
+        archive = self.fetcher.fetch_archive(entry)
+        if not entry.get('cached_path'): self.fetched_bytes += archive.stat().st_size
+        return archive
+
+    def _extract(self, entry: Dict[str, Any], archive: Path, target_queue: TargetQueue) -> Path:
+        """Extracts a patch once for every target; later callers wait for the first one's result."""
+        key = entry['key']
+        with self._lock:
+            future = self._extracted.get(key); owner = future is None
+            if owner: future = self._extracted[key] = Future()
+        if not owner: return future.result()
+        dest = self._extract_root / key
+        try:
+            with self._volume_slot(self._extract_root):
+                target_queue.put({'type': Q_MSG.STATUS, 'message': f"📂 Extracting patch v{entry['from']} → v{entry['to']}..."})
+                self.extractor.extract_archive(archive, dest, target_queue, self.cancel_event)
+        except BaseException as e:
+            future.set_exception(e); raise
+        future.set_result(dest)
+        return dest
+
+    def _release(self, key: str):
+        """A target is done with a patch; the extracted copy goes once no target still needs it."""
+        with self._lock:
+            self._users[key] -= 1
+            future = self._extracted.get(key) if self._users[key] <= 0 else None
+        if future and future.done() and not future.exception(): shutil.rmtree(future.result(), ignore_errors=True)
+
+    def _update_target(self, game_dir: str, route: List[Dict[str, Any]]):
+        target_queue = TargetQueue(self.queue, game_dir); pending = [entry['key'] for entry in route]
+        version, installed, started = route[0]['from'], [], time.monotonic()
+        try:
+            for i, entry in enumerate(route, 1):
+                if self.cancel_event.is_set(): raise InterruptedError("Fleet update cancelled.")
+                patch_name = f"v{entry['from']} → v{entry['to']}"
+                target_queue.put({'type': Q_MSG.OVERALL_STATUS, 'message': f"📦 Patch {i}/{len(route)}: {patch_name}"})
+                target_queue.put({'type': Q_MSG.STATUS, 'message': "Waiting for the download..."})
+                source_dir = self._extract(entry, self.archives[entry['key']].result(), target_queue)
+                self.pause_event.wait()
+                target_queue.put({'type': Q_MSG.STATUS, 'message': "Waiting for the disk..."})
+                with self._volume_slot(Path(game_dir)):
+                    target_queue.put({'type': Q_MSG.PROGRESS, 'value': 0})
+                    self.extractor.install_files(source_dir, Path(game_dir), target_queue, self.cancel_event, self.data.get('repair_sources', {}).get(entry['to']))
+                version = entry['to']; installed.append(entry['key']); self._release(pending.pop(0))
+                target_queue.put({'type': Q_MSG.STATUS, 'message': f"✅ Patch {i}/{len(route)} installed. Game now at v{version}"})
+            self._finish(game_dir, 'updated', version=route[0]['from'], final_version=version, patches=installed, seconds=round(time.monotonic() - started, 1))
+        except InterruptedError:
+            self._finish(game_dir, 'cancelled', version=route[0]['from'], final_version=version, patches=installed, error="Cancelled.")
+        except Exception as e:
+            logger.log(f"Fleet target {game_dir} failed at v{version}: {e}", "ERROR")
+            self._finish(game_dir, 'failed', version=route[0]['from'], final_version=version, patches=installed, error=str(e))
+        finally:
+            for key in pending: self._release(key)
+
+    def _cleanup_archives(self, routes: Dict[str, List[Dict[str, Any]]]):
+        """Deletes archives every target installed, unless the archive store keeps them; keeps the rest so a retry doesn't download them again."""
+        for key, future in self.archives.items():
+            if not future.done() or future.cancelled() or future.exception(): continue
+            if all(self.results.get(game_dir, {}).get('status') == 'updated' for game_dir, route in routes.items() if any(e['key'] == key for e in route)):
+                try: self.fetcher.discard_archive(future.result())
+                except OSError as e: logger.log(f"Could not delete file {future.result().name} during cleanup: {e}", "WARNING")
+
+# ==============================================================================
+# --- LAN MIRROR ---
+# ==============================================================================
+def configured_mirror() -> Optional[str]:
+    """Base URL of the LAN mirror: the CRICKET26_MIRROR variable, else the first line of c26_mirror.txt beside the app."""
+    url = os.environ.get(Constants.MIRROR_ENV_VAR, '').strip()
+    if not url:
+        app_dir = Path(sys.executable).parent if getattr(sys, 'frozen', False) else Path(__file__).resolve().parent.parent
+        try: url = (app_dir / Constants.MIRROR_CONFIG_FILENAME).read_text(encoding='utf-8').strip().splitlines()[0].strip()
+        except (OSError, IndexError): url = ''
+    if url and '://' not in url: url = f"http://{url}"
+    return url.rstrip('/') or None
+
+
+def patch_keys(data: Dict[str, Any]) -> List[str]:
+    """Every "<from>_<to>" patch the update data offers, over hosts and v2.0 updates."""
+    keys = {key for host in data.get('hosts', []) for key in host.get('links', {})}
+    keys |= {f"{u['from_version']}_{u['to_version']}" for u in data.get('updates', []) if u.get('from_version') and u.get('to_version')}
+    return sorted(keys)
+
+
+def with_mirror_host(data: Optional[Dict[str, Any]], base_url: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Adds a LAN mirror as the first host for every patch: a hosts entry at the head of host_preference_order,
+    and the primary download of each v2.0 update (the previous primary becomes the first fallback).
+    Checksums are copied from the upstream hosts, since the mirror serves their archives byte for byte.
+    Version data that already lists the mirror host is returned unchanged.
+    """
+    if not data or not base_url or any(host.get('id') == Constants.MIRROR_HOST_ID for host in data.get('hosts', [])): return data
+    links = {key: f"{base_url}/patches/{quote(key)}" for key in patch_keys(data)}
+    checksums = {}
+    for host_id in data.get('host_preference_order', []):
+        for host in data.get('hosts', []):
+            if host.get('id') == host_id and isinstance(host.get('checksums'), dict):
+                for key, checksum in host['checksums'].items(): checksums.setdefault(key, checksum)
+    data['hosts'] = [{'id': Constants.MIRROR_HOST_ID, 'name': "LAN Mirror", 'links': links, 'checksums': checksums}, *data.get('hosts', [])]
+    data['host_preference_order'] = [Constants.MIRROR_HOST_ID, *data.get('host_preference_order', [])]
+    for update in data.get('updates', []):
+        downloads = update.get('downloads')
+        key = f"{update.get('from_version')}_{update.get('to_version')}"
+        if not isinstance(downloads, dict) or not downloads.get('primary') or key not in links: continue
+        mirror = {'type': 'direct', 'name': "LAN Mirror", 'url': links[key], 'checksum': downloads['primary'].get('checksum')}
+        update['downloads'] = {**downloads, 'primary': mirror, 'fallback': [downloads['primary'], *downloads.get('fallback', [])]}
+    logger.log(f"LAN mirror {base_url} added as the preferred host for {len(links)} patch(es).", "SETTING")
+    return data
+
+
+class MirrorBusy(Exception):
+    """The archive is being fetched whole (Google Drive) and can't be served by range yet"""
+
+
+class MirrorArchive:
+    """
+    One patch archive on the mirror, filled from upstream as clients ask for it.
+
+    Direct (HTTP) sources are fetched by range: the archive is split into MIRROR_BLOCK_SIZE blocks, a
+    client's request fetches the blocks it covers into a sparse part file, and concurrent requests for
+    a block wait on the one fetch already running. Google Drive cannot serve ranges, so gdrive-only
+    patches are downloaded whole in the background while clients fall back to their other hosts.
+    The finished archive is checked against the published checksum and moved into the ArchiveStore (or,
+    with no checksum published, renamed to the cache name UpdatePlanner looks for).
+    """
+    def __init__(self, key: str, path: Path, sources: List[Dict[str, str]], expected_sha256: Optional[str], store: ArchiveStore,
+                 block_size: int = Constants.MIRROR_BLOCK_SIZE):
+        self.key, self.path, self.sources, self.expected_sha256, self.store, self.block_size = key, path, sources, expected_sha256, store, block_size
+        self.part_path = path.with_name(path.name + '.mirror-part'); self.blocks_path = path.with_name(path.name + '.mirror-blocks')
+        stored = store.lookup(key, [expected_sha256] if expected_sha256 else [])
+        if stored: self.path = store.path_for(stored[0])
+        self._lock = threading.Lock(); self._readers_done = threading.Condition(self._lock)
+        self._size: Optional[int] = None; self._source: Optional[Dict[str, str]] = None
+        self._done: set = set(); self._inflight: Dict[int, threading.Event] = {}; self._readers = 0; self._finishing = False
+        self._whole_fetch: Optional[threading.Thread] = None; self._started = time.monotonic()
+
+    @property
+    def complete(self) -> bool: return self.path.is_file()
+
+    def size(self) -> int:
+        """Total archive size, probing the upstream hosts on the first call; raises MirrorBusy or ConnectionError."""
+        if self.complete: return self.path.stat().st_size
+        with self._lock:
+            if self._size is None: self._probe()
+            return self._size
+
+    def _probe(self):
+        for source in (s for s in self.sources if s['type'] == 'direct'):
+            try:
+                response = requests.head(source['url'], timeout=Constants.DOWNLOAD_TIMEOUT_SECONDS, allow_redirects=True)
+                response.raise_for_status(); size = int(response.headers.get('content-length', 0))
+                if size <= 0 or response.headers.get('accept-ranges', 'bytes').lower() == 'none': continue
+            except (requests.RequestException, ValueError) as e:
+                logger.log(f"Mirror: upstream {source['name']} unavailable for {self.key}: {type(e).__name__}", "WARNING"); continue
+            self._source, self._size, self._started = source, size, time.monotonic()
+            if not (self.part_path.is_file() and self.part_path.stat().st_size == size): self.blocks_path.unlink(missing_ok=True)
+            with open(self.part_path, 'r+b' if self.part_path.is_file() else 'wb') as f: f.truncate(size)
+            try: self._done = {int(line) for line in self.blocks_path.read_text(encoding='utf-8').split()}
+            except (OSError, ValueError): self._done = set()
+            logger.log(f"Mirror: {self.key} ({format_bytes(size)}) will be fetched from {source['name']}; {len(self._done)} block(s) already cached.", "INFO")
+            return
+        gdrive = next((s for s in self.sources if s['type'] == 'gdrive'), None)
+        if gdrive:
+            if not (self._whole_fetch and self._whole_fetch.is_alive()):
+                self._whole_fetch = threading.Thread(target=self._fetch_whole, args=(gdrive,), name=f"MirrorFetch-{self.key}", daemon=True); self._whole_fetch.start()
+            raise MirrorBusy(f"{self.key} is being downloaded from {gdrive['name']}")
+        raise ConnectionError(f"No upstream host can serve {self.key}")
+
+    def read(self, start: int, end: int) -> Iterable[bytes]:
+        """Bytes start..end inclusive, fetching missing blocks from upstream first."""
+        if self.complete: yield from self._read_file(self.path, start, end); return
+        with self._lock:
+            published = self.complete  # _finish may have published the archive (and reset _size/_done) while this waited
+            if not published:
+                if self._size is None: self._probe()  # The finished part file failed its checksum and was discarded
+                self._readers += 1
+        if published: yield from self._read_file(self.path, start, end); return
+        try:
+            for index in range(start // self.block_size, end // self.block_size + 1):
+                self._ensure_block(index)
+                yield from self._read_file(self.part_path, max(start, index * self.block_size), min(end, (index + 1) * self.block_size - 1))
+        finally:
+            with self._lock: self._readers -= 1; self._readers_done.notify_all()
+            self._maybe_finish()
+
+    @staticmethod
+    def _read_file(path: Path, start: int, end: int) -> Iterable[bytes]:
+        with open(path, 'rb') as f:
+            f.seek(start); remaining = end - start + 1
+            while remaining > 0 and (chunk := f.read(min(remaining, Constants.DOWNLOAD_BUFFER_SIZE))):
+                remaining -= len(chunk); yield chunk
+
+    def _ensure_block(self, index: int):
+        while True:
+            with self._lock:
+                if index in self._done: return
+                event = self._inflight.get(index); owner = event is None
+                if owner: event = self._inflight[index] = threading.Event()
+            if not owner:
+                event.wait(); continue  # The fetch may have failed; re-check and try it ourselves
+            try:
+                self._fetch_block(index)
+                with self._lock:
+                    self._done.add(index)
+                    with self.blocks_path.open('a', encoding='utf-8') as f: f.write(f"{index}\n")
+            finally:
+                with self._lock: del self._inflight[index]
+                event.set()
+            return
+
+    def _fetch_block(self, index: int):
+        start = index * self.block_size; end = min(self._size, start + self.block_size) - 1
+        for attempt in range(3):
+            try:
+                with requests.get(self._source['url'], headers={'Range': f"bytes={start}-{end}"}, stream=True, timeout=Constants.DOWNLOAD_TIMEOUT_SECONDS) as response:
+                    response.raise_for_status()
+                    if response.status_code != 206 and not (start == 0 and end == self._size - 1): raise ConnectionError("Upstream ignored the Range header")
+                    data = b''.join(response.iter_content(chunk_size=Constants.DOWNLOAD_BUFFER_SIZE))
+                if len(data) != end - start + 1: raise ConnectionError(f"Short read ({len(data)} of {end - start + 1} bytes)")
+                with open(self.part_path, 'r+b') as f: f.seek(start); f.write(data)
+                return
+            except (requests.RequestException, ConnectionError) as e:
+                logger.log(f"Mirror: block {index} of {self.key} failed on attempt {attempt + 1}/3: {e}", "WARNING")
+                time.sleep(0.5 * (attempt + 1))
+        raise ConnectionError(f"Upstream {self._source['name']} failed for block {index} of {self.key}")
+
+    def _maybe_finish(self):
+        """Publishes the part file on a helper thread once every block is in."""
+        with self._lock:
+            if self._finishing or self._size is None or self.complete or len(self._done) < -(-self._size // self.block_size): return
+            self._finishing = True
+        threading.Thread(target=self._finish, name=f"MirrorFinish-{self.key}", daemon=True).start()
+
+    def _finish(self):
+        verified = self._verify(self.part_path, self._source['name'])
+        with self._readers_done:
+            while self._readers: self._readers_done.wait()  # Windows can't rename a file other requests still read
+            if verified: self._publish(self.part_path)
+            else: self.part_path.unlink(missing_ok=True)
+            self.blocks_path.unlink(missing_ok=True); self._size, self._done, self._finishing = None, set(), False
+        if verified: self._log_cached(self._source['name'])
+
+    def _fetch_whole(self, source: Dict[str, str]):
+        temp_path = self.path.with_name(self.path.name + '.mirror-gdrive'); self._started = time.monotonic()
+        if download_from_gdrive(source['url'], temp_path, ProgressBus(), threading.Event()) and temp_path.is_file() and self._verify(temp_path, source['name']):
+            self._publish(temp_path); self._log_cached(source['name'])
+        else:
+            logger.log(f"Mirror: {source['name']} download of {self.key} failed.", "ERROR"); temp_path.unlink(missing_ok=True)
+
+    def _publish(self, file_path: Path):
+        if self.expected_sha256:
+            self.path = self.store.add(file_path, self.expected_sha256, [self.key]); self.store.evict(protect=[self.expected_sha256])
+        else: os.replace(file_path, self.path)
+
+    def _verify(self, file_path: Path, source_name: str) -> bool:
+        if not self.expected_sha256: return True
+        sha256 = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            while chunk := f.read(4 * 1024 * 1024): sha256.update(chunk)
+        if sha256.hexdigest().lower() == self.expected_sha256.lower(): return True
+        logger.log(f"Mirror: {self.key} from {source_name} failed its checksum; discarded.", "ERROR")
+        return False
+
+    def _log_cached(self, source_name: str):
+        logger.log(f"Mirror: {self.key} cached from {source_name}.", "INFO", phase='mirror_fetch', key=self.key, bytes=self.path.stat().st_size,
+                   duration=round(time.monotonic() - self._started, 3), verified=bool(self.expected_sha256))
+
+
+class PatchMirror:
+    """
+    Caching HTTP mirror state: which patches exist, where their upstream copies live and what they hash to.
+    Keeps archives in cache_dir's ArchiveStore, where UpdatePlanner looks, so the mirror machine's own
+    updates reuse them too. Unknown patch keys trigger a version.json revalidation at most every
+    MIRROR_REFRESH_S seconds, so patches published after start-up are picked up.
+    """
+    def __init__(self, data: Dict[str, Any], cache_dir: Path, block_size: int = Constants.MIRROR_BLOCK_SIZE):
+        self.data, self.cache_dir, self.block_size = data, Path(cache_dir), block_size
+        self._archives: Dict[str, MirrorArchive] = {}; self._lock = threading.Lock(); self._refreshed = time.monotonic(); self.store = ArchiveStore.for_cache(cache_dir)
+
+    def archive(self, key: str) -> MirrorArchive:
+        """The archive for a patch key (one shared object per key); raises KeyError for unknown patches."""
+        with self._lock:
+            if key in self._archives: return self._archives[key]
+            if key not in patch_keys(self.data) and time.monotonic() - self._refreshed > Constants.MIRROR_REFRESH_S: self._refresh()
+            if key not in patch_keys(self.data): raise KeyError(key)
+            from_ver, _, to_ver = key.partition('_'); update = next((u for u in self.data.get('updates', []) if f"{u.get('from_version')}_{u.get('to_version')}" == key), None)
+            if update: from_ver, to_ver = update['from_version'], update['to_version']
+            archive = self._archives[key] = MirrorArchive(key, UpdatePlanner.cached_archive_path(self.cache_dir, from_ver, to_ver), self._sources(key, update), self._checksum(key, update), self.store, self.block_size)
+            return archive
+
+    def _refresh(self):
+        self._refreshed = time.monotonic()
+        try:
+            data, source = APIHandler.revalidate_update_data()
+            if data is not None: self.data = data; logger.log("Mirror: version.json changed; patch list reloaded.", "INFO")
+        except (requests.RequestException, ValueError) as e: logger.log(f"Mirror: could not revalidate version.json: {e}", "WARNING")
+
+    def _sources(self, key: str, update: Optional[Dict[str, Any]]) -> List[Dict[str, str]]:
+        """Upstream copies in preference order, never the mirror itself: {'type': 'direct'|'gdrive', 'url', 'name'}."""
+        sources = []
+        for link in ordered_links(self.data, key):
+            if link['host_id'] == Constants.MIRROR_HOST_ID: continue
+            sources.append(link_source(link))
+        if update:
+            for source in [update['downloads'].get('primary'), *update['downloads'].get('fallback', [])]:
+                if not source or source.get('name') == "LAN Mirror": continue
+                url = source.get('url') if source.get('type') == 'direct' else (source.get('file_id') or source.get('url'))
+                if url: sources.append({'type': 'direct' if source.get('type') == 'direct' else 'gdrive', 'url': url, 'name': source.get('name', source.get('type', 'direct'))})
+        return sources
+
+    def _checksum(self, key: str, update: Optional[Dict[str, Any]]) -> Optional[str]:
+        archive = self.data.get('update_archives', {}).get(key)
+        if isinstance(archive, dict) and archive.get('sha256'): return archive['sha256']
+        for link in ordered_links(self.data, key):
+            host = next((h for h in self.data.get('hosts', []) if h.get('id') == link['host_id'] and link['host_id'] != Constants.MIRROR_HOST_ID), None)
+            if host and isinstance(host.get('checksums'), dict) and host['checksums'].get(key): return host['checksums'][key]
+        return ((update or {}).get('downloads', {}).get('primary') or {}).get('checksum')
+
+    def describe(self, base_url: str) -> Dict[str, Any]:
+        """The hosts entry that publishes this mirror in version.json, plus what it has cached."""
+        keys = patch_keys(self.data)
+        return {'host': {'id': Constants.MIRROR_HOST_ID, 'name': "LAN Mirror", 'links': {key: f"{base_url}/patches/{quote(key)}" for key in keys}},
+                'cached': [key for key in keys if self.store.lookup(key, published_checksums(self.data, key)) or UpdatePlanner.cached_archive_path(self.cache_dir, *key.split('_', 1)).is_file()]}
+
+
+class MirrorRequestHandler(BaseHTTPRequestHandler):
+    """GET/HEAD /patches/<key> with single-range support; / describes the mirror as a version.json host entry."""
+    server_version = "C26Mirror/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def do_HEAD(self): self._serve(head=True)
+    def do_GET(self): self._serve(head=False)
+
+    def log_request(self, code='-', size='-'):
+        logger.metric('mirror_request', client=self.client_address[0], path=self.path, status=str(code), range=self.headers.get('Range'))
+
+    def log_message(self, format, *args): logger.log(f"Mirror: {self.client_address[0]} {format % args}", "WARNING")
+
+    def _send_empty(self, status: int, **headers):
+        self.send_response(status)
+        for name, value in {'Content-Length': '0', **headers}.items(): self.send_header(name.replace('_', '-'), str(value))
+        self.end_headers()
+
+    def _serve(self, head: bool):
+        mirror: PatchMirror = self.server.mirror; path = urlsplit(self.path).path
+        if path in ('/', '/mirror.json'):
+            body = json.dumps(mirror.describe(f"http://{self.headers.get('Host', '%s:%s' % self.server.server_address[:2])}"), indent=2).encode('utf-8')
+            self.send_response(200); self.send_header('Content-Type', 'application/json'); self.send_header('Content-Length', str(len(body))); self.end_headers()
+            if not head: self.wfile.write(body)
+            return
+        match = re.fullmatch(r'/patches/([^/]+)', path)
+        if not match: self._send_empty(404); return
+        try:
+            archive = mirror.archive(unquote(match.group(1))); size = archive.size()
+        except KeyError: self._send_empty(404); return
+        except MirrorBusy: self._send_empty(503, Retry_After=Constants.MIRROR_RETRY_AFTER_S); return
+        except ConnectionError as e: logger.log(f"Mirror: {e}", "ERROR"); self._send_empty(502); return
+        start, end, status = 0, size - 1, 200
+        ranges = re.fullmatch(r'bytes=(\d*)-(\d*)', self.headers.get('Range', '').strip())
+        if ranges and (ranges.group(1) or ranges.group(2)):
+            if ranges.group(1): start = int(ranges.group(1)); end = min(int(ranges.group(2)), size - 1) if ranges.group(2) else size - 1
+            else: start = max(0, size - int(ranges.group(2)))
+            if start > end or start >= size: self._send_empty(416, Content_Range=f"bytes */{size}"); return
+            status = 206
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/zip'); self.send_header('Accept-Ranges', 'bytes'); self.send_header('Content-Length', str(end - start + 1))
+        if status == 206: self.send_header('Content-Range', f"bytes {start}-{end}/{size}")
+        self.end_headers()
+        if head: return
+        chunks = archive.read(start, end)
+        try:
+            for chunk in chunks: self.wfile.write(chunk)
+        except (ConnectionError, OSError) as e:
+            logger.log(f"Mirror: stopped serving {archive.key} bytes {start}-{end} to {self.client_address[0]}: {e}", "WARNING"); self.close_connection = True
+        finally:
+            chunks.close()
+
+
+def serve_mirror(data: Dict[str, Any], bind: str = "0.0.0.0", port: int = Constants.MIRROR_PORT, cache_dir: Path = Constants.CACHE_DIR) -> ThreadingHTTPServer:
+    """Starts the LAN mirror's HTTP server (call serve_forever() on the result)."""
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    server = ThreadingHTTPServer((bind, port), MirrorRequestHandler); server.daemon_threads = True
+    server.mirror = PatchMirror(data, cache_dir)
+    logger.log(f"LAN mirror listening on {bind}:{server.server_address[1]}, caching in {cache_dir}.", "SETTING")
+    return server
+
+# ==============================================================================
+# --- MANIFEST STORE ---
+# ==============================================================================
+class ManifestStore(manifest_store.ManifestStore):
+    """Local, integrity-checked store of downloaded manifests keyed by version and URL.
+
+    The layout, integrity check and get/find/put live in cricket26/manifest_store.py, which the admin
+    panel uses to seed entries; this adds the conditional download and decoding the verifier needs.
+    """
+    def _discarded(self, body_path: Path):
+        logger.log(f"Cached manifest {body_path.name} failed its integrity check; discarding it.", "WARNING")
+
+    def put(self, version: str, url: str, body: bytes, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        try: return super().put(version, url, body, etag, last_modified)
+        except OSError as e: logger.log(f"Could not store manifest for v{version} locally: {e}", "WARNING")
+
+    def fetch(self, version: str, url: str, decode: Callable[[Iterable[bytes]], Dict], cancel_event: threading.Event) -> Dict:
+        """Conditionally fetches a manifest, reusing the stored copy on 304 or when the server is unreachable."""
+        cached, meta = self.get(version, url)
+        headers = {'Accept': 'application/vnd.github.v3.raw'}
+        if cached is not None:
+            if meta.get('etag'): headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'): headers['If-Modified-Since'] = meta['last_modified']
+        try:
+            with requests.get(url, headers=headers, timeout=15, stream=True) as response:
+                if response.status_code == 304 and cached is not None:
+                    logger.log(f"Manifest for v{version} is unchanged on the server; using the local copy.", "INFO")
+                    return decode((cached,))
+                response.raise_for_status()
+                body: List[bytes] = []
+                def _chunks():
+                    for chunk in response.iter_content(chunk_size=64 * 1024):
+                        if cancel_event.is_set(): raise InterruptedError("Verification cancelled while downloading manifest.")
+                        body.append(chunk); yield chunk
+                manifest = decode(_chunks())
+                self.put(version, url, b''.join(body), response.headers.get('ETag'), response.headers.get('Last-Modified'))
+                return manifest
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if cached is None: raise
+            logger.log(f"Manifest server unreachable ({e}); verifying offline with the cached v{version} manifest.", "WARNING")
+            return decode((cached,))
+
+    def load(self, data: Optional[Dict[str, Any]], version: str, cancel_event: threading.Event) -> Dict:
+        """The verification manifest for a version: binary if published, else JSON, else any stored copy."""
+        if cancel_event.is_set(): raise InterruptedError("Verification cancelled during initialization.")
+        manifest_api_url = (data or {}).get('manifest_links', {}).get(version)
+        if not manifest_api_url:
+            # No update data (offline start): fall back to any stored manifest for this version
+            cached, meta = self.find(version)
+            if cached is None: raise ValueError(f"A verification manifest for v{version} is not available.")
+            logger.log(f"Using stored manifest for v{version} from {meta.get('stored_at')}.", "WARNING")
+            return self.decode_body(meta.get('url', ''), (cached,))
+        if cancel_event.is_set(): raise InterruptedError("Verification cancelled before downloading manifest.")
+
+        # Prefer the compact binary manifest; any failure falls back to the JSON manifest below
+        binary_url = (data or {}).get('manifest_binary_links', {}).get(version) or self.binary_manifest_url(manifest_api_url)
+        if binary_url:
+            try:
+                manifest = self.fetch(version, binary_url, self.decode_binary, cancel_event)
+                logger.log(f"Binary manifest loaded ({len(manifest)} entries).", "INFO"); return manifest
+            except (requests.RequestException, ValueError, zlib.error, UnicodeDecodeError) as e: logger.log(f"Binary manifest unavailable ({e}), falling back to JSON.", "INFO")
+
+        try:
+            manifest = self.fetch(version, manifest_api_url, self.decode_json, cancel_event)
+            logger.log("Manifest downloaded successfully.", "INFO"); return manifest
+        except json.JSONDecodeError as e: logger.log(f"Failed to parse manifest JSON: {e}", "CRITICAL"); raise ValueError("Downloaded manifest file is corrupted or not valid JSON.")
+        except requests.RequestException as e: logger.log(f"Failed to download manifest: {e}", "ERROR"); raise ConnectionError("Could not download the verification manifest.")
+
+    @staticmethod
+    def binary_manifest_url(json_url: str) -> Optional[str]:
+        """Derives the .c26m URL published next to a JSON manifest URL."""
+        parts = urlsplit(json_url)
+        if not parts.path.lower().endswith('.json'): return None
+        return urlunsplit(parts._replace(path=parts.path[:-len('.json')] + Constants.BINARY_MANIFEST_SUFFIX))
+
+    @staticmethod
+    def decode_binary(chunks: Iterable[bytes]) -> Dict:
+        """Feeds chunks to the decoder as they arrive, so parsing overlaps the transfer."""
+        decoder = BinaryManifestDecoder()  # cricket26/manifest_format.py, shared with the admin tools
+        for chunk in chunks: decoder.feed(chunk)
+        return decoder.finish()
+
+    @staticmethod
+    def decode_json(chunks: Iterable[bytes]) -> Dict:
+        return json.loads(b''.join(chunks))
+
+    @classmethod
+    def decode_body(cls, url: str, chunks: Iterable[bytes]) -> Dict:
+        is_binary = urlsplit(url).path.endswith(Constants.BINARY_MANIFEST_SUFFIX)
+        return cls.decode_binary(chunks) if is_binary else cls.decode_json(chunks)
+
+# ==============================================================================
+# --- LOCAL HASH CACHE ---
+# ==============================================================================
+class LocalHashCache:
+    """Remembers SHA256 digests of an install's files keyed by (size, mtime), so unchanged files need no re-read."""
+    def __init__(self, game_dir: Path, cache_dir: Path = Constants.HASH_CACHE_DIR):
+        key = hashlib.sha256(str(game_dir.resolve()).lower().encode('utf-8')).hexdigest()[:16]
+        self.path = cache_dir / f"{key}.json"
+        self.entries: Dict[str, List] = {}; self._dirty = False
+
+    def load(self) -> 'LocalHashCache':
+        try: self.entries = json.loads(self.path.read_text(encoding='utf-8')).get('files', {})
+        except (OSError, ValueError, AttributeError): self.entries = {}
+        return self
+
+    def lookup(self, rel_path: str, st: os.stat_result) -> Optional[str]:
+        entry = self.entries.get(rel_path)
+        return entry[2] if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns else None
+
+    def store(self, rel_path: str, st: os.stat_result, digest: str):
+        self.entries[rel_path] = [st.st_size, st.st_mtime_ns, digest.lower()]; self._dirty = True
+
+    def forget(self, rel_paths: Iterable[str]):
+        for rel_path in rel_paths:
+            if self.entries.pop(rel_path, None) is not None: self._dirty = True
+
+    def save(self):
+        if not self._dirty: return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp'); tmp_path.write_text(json.dumps({'files': self.entries}, separators=(',', ':')), encoding='utf-8')
+            os.replace(tmp_path, self.path); self._dirty = False
+        except OSError as e: logger.log(f"Could not save local hash cache: {e}", "WARNING")
+
+class VerificationJournal:
+    """Append-only checkpoint of per-file verdicts, so an interrupted verification can resume.
+
+    Lives in VERIFICATION_LOGS_DIR as one JSON line per verified file (path, size, mtime, verdict)
+    after a header naming the game directory and a digest of the manifest's file entries. A
+    checkpoint for a different manifest is discarded, and entries whose file changed are re-checked.
+    """
+    FLUSH_INTERVAL_S = 2.0
+
+    def __init__(self, game_dir: Path, manifest: Dict[str, Any]):
+        self.game_dir = str(game_dir.resolve())
+        self.path = Constants.VERIFICATION_LOGS_DIR / f"checkpoint_{hashlib.sha256(self.game_dir.lower().encode('utf-8')).hexdigest()[:16]}.jsonl"
+        entries = sorted((key.replace('\\', '/'), str(value).lower()) for key, value in manifest.items() if not key.startswith('_'))
+        self.manifest_id = hashlib.sha256('\n'.join(f"{k}\0{v}" for k, v in entries).encode('utf-8')).hexdigest()
+        self._file = None; self._last_flush = 0.0
+
+    def read_checkpoint(self) -> Optional[Dict[str, Tuple[int, int, str, Optional[List[int]]]]]:
+        """Returns {path: (size, mtime_ns, verdict, bad blocks)} from a matching checkpoint, discarding stale ones."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                header = json.loads(f.readline() or '{}')
+                if header.get('manifest') != self.manifest_id or header.get('game_dir') != self.game_dir:
+                    logger.log("Discarding verification checkpoint for a different manifest or folder.", "INFO"); f.close(); self.discard(); return None
+                entries = {}
+                for line in f:
+                    try: e = json.loads(line); entries[e['p']] = (e['s'], e['m'], e['v'], e.get('b'))
+                    except (ValueError, KeyError): break  # Torn final line from an abrupt exit
+                return entries or None
+        except (OSError, ValueError): return None
+
+    def open(self, resume: bool):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+            if not resume: self._file.write(json.dumps({'game_dir': self.game_dir, 'manifest': self.manifest_id, 'created': datetime.now().isoformat(timespec='seconds')}) + '\n')
+        except OSError as e: logger.log(f"Could not open verification checkpoint: {e}", "WARNING"); self._file = None
+
+    def record(self, rel_path: str, st: Optional[os.stat_result], verdict: str, bad_blocks: Optional[List[int]] = None):
+        if self._file is None or st is None: return
+        entry = {'p': rel_path, 's': st.st_size, 'm': st.st_mtime_ns, 'v': verdict}
+        if bad_blocks is not None: entry['b'] = bad_blocks
+        self._file.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        if time.time() - self._last_flush > self.FLUSH_INTERVAL_S: self._file.flush(); self._last_flush = time.time()
+
+    def close(self):
+        if self._file is not None: self._file.close(); self._file = None
+
+    def discard(self):
+        self.close(); self.path.unlink(missing_ok=True)
+
+class GameVerifier:
+    """Handles the logic for verifying game files against a manifest."""
+    def __init__(self, game_dir: Path, manifest: Dict, queue: queue.Queue, cancel: threading.Event, pause: threading.Event, hash_cache: Optional[LocalHashCache] = None,
+                 journal: Optional[VerificationJournal] = None, checkpoint: Optional[Dict[str, Tuple[int, int, str, Optional[List[int]]]]] = None,
+                 scheduler: Optional[BackgroundScheduler] = None):
+        self.game_dir, self.manifest_data = game_dir, manifest
+        self.progress_queue, self.cancel_event, self.pause_event = queue, cancel, pause
+        self.hash_cache = hash_cache
+        self.scheduler = scheduler or BackgroundScheduler()
+        self.journal, self.checkpoint = journal, checkpoint or {}
+        self.issue_buffer: List[Tuple[str, str]] = []
+        self.BUFFER_FLUSH_SIZE = 100
+        self.BUFFER_FLUSH_INTERVAL_S = 0.5
+        self.last_flush_time = 0
+
+    def _flush_issue_buffer(self, force: bool = False):
+        if self.issue_buffer and (force or len(self.issue_buffer) >= self.BUFFER_FLUSH_SIZE or time.time() - self.last_flush_time > self.BUFFER_FLUSH_INTERVAL_S):
+            self.progress_queue.put({'type': Q_MSG.VERIFY_ISSUES_BATCH, 'batch': list(self.issue_buffer)})
+            self.issue_buffer.clear()
+            self.last_flush_time = time.time()
+
+    def _calculate_sha256(self, file_path: Path) -> Optional[str]:
+        hashed = self._hash_file(file_path)
+        return hashed[0] if hashed else None
+
+    def _hash_file(self, file_path: Path, block_size: int = 0) -> Optional[Tuple[str, List[bytes], int]]:
+        """Returns (sha256 hex, per-block digests, size); block digests come from the same read when block_size is set."""
+        sha256 = hashlib.sha256(); block_digests: List[bytes] = []; size = 0
+        try:
+            with open(file_path, "rb") as f:
+                while chunk := f.read(block_size or 4 * 1024 * 1024):
+                    if self.cancel_event.is_set(): return None
+                    self.pause_event.wait(); sha256.update(chunk); size += len(chunk)
+                    if block_size: block_digests.append(hashlib.sha256(chunk).digest())
+                    self.scheduler.consume(len(chunk))
+            return sha256.hexdigest(), block_digests, size
+        except (IOError, PermissionError):
+            logger.log(f"Permission denied or IO error reading {file_path} for hashing.", "ERROR")
+            return None
+
+    @staticmethod
+    def _find_bad_blocks(expected: Dict[str, Any], block_digests: List[bytes]) -> List[int]:
+        """Indices of blocks whose digest differs from the manifest (including blocks the file is too short to contain)."""
+        return [i for i, block_hash in enumerate(expected.get('hashes', [])) if i >= len(block_digests) or block_digests[i].hex() != block_hash.lower()]
+
+    def _file_size(self, rel_path: str, stats: Dict[str, os.stat_result]) -> int:
+        st = stats.get(rel_path)
+        if st is None:
+            try: stats[rel_path] = st = (self.game_dir / rel_path).stat()
+            except OSError: return 0
+        return st.st_size
+
+    def _confirm_from_hash_cache(self, manifest: Dict[str, str], present: set) -> Tuple[Dict[str, os.stat_result], List[str]]:
+        """Returns (stats of present files, files confirmed good without reading them).
+
+        Files whose size/mtime match the local hash cache are known by their cached digest. A directory
+        whose every manifest file is known is confirmed as a whole when its local Merkle hash equals the
+        manifest's (published '_merkle' tree or one built here); other directories only compare their own
+        known files and descend, so an uncached file costs its ancestors the shortcut but nothing else.
+        """
+        stats: Dict[str, os.stat_result] = {}
+        if self.hash_cache is None: return stats, []
+        known: Dict[str, str] = {}
+        for rel_path in present:
+            try: stats[rel_path] = st = (self.game_dir / rel_path).stat()
+            except OSError: continue
+            cached = self.hash_cache.lookup(rel_path, st)
+            if cached: known[rel_path] = cached
+        if not known: return stats, []
+        uncached = Counter()  # Manifest files without a cached digest, per directory and all its ancestors
+        for rel_path in manifest.keys() - known.keys():
+            parts = rel_path.split('/')
+            for depth in range(len(parts)): uncached['/'.join(parts[:depth])] += 1
+        carried_tree = self.manifest_data.get('_merkle')  # Optional tree published with the manifest
+        manifest_tree = carried_tree if isinstance(carried_tree, dict) and carried_tree else build_merkle_tree(manifest)
+        local_tree, children = build_merkle_tree(known), merkle_children(manifest)
+        confirmed: List[str] = []; stack = ['']
+        while stack:
+            directory = stack.pop(); prefix = f"{directory}/" if directory else ''
+            dir_files, subdirs = children[directory]
+            if not uncached[directory] and local_tree.get(directory) == manifest_tree.get(directory):
+                subtree = [directory]
+                while subtree:
+                    directory = subtree.pop(); prefix = f"{directory}/" if directory else ''; dir_files, subdirs = children[directory]
+                    confirmed.extend(prefix + name for name in dir_files); subtree.extend(prefix + name for name in subdirs)
+                continue
+            confirmed.extend(prefix + name for name, digest in dir_files.items() if known.get(prefix + name) == digest)
+            stack.extend(prefix + name for name in subdirs)
+        confirmed.sort()
+        logger.log(f"Hash cache confirmed {len(confirmed)} of {len(present)} files without re-reading them.", "INFO")
+        return stats, confirmed
+
+    def run(self):
+        logger.log("Starting game file verification (in-memory)...", "INFO"); started = time.monotonic()
+        self.progress_queue.put({'type': Q_MSG.OVERALL_STATUS, 'message': 'Verifying Game Files'})
+        # "_" keys are manifest metadata (comment, counts, Merkle tree), not files
+        normalized_manifest = {key.replace('\\', '/'): value.lower() for key, value in self.manifest_data.items() if not key.startswith('_')}
+        try:
+            local_files = {p.relative_to(self.game_dir).as_posix() for p in self.game_dir.rglob('*') if p.is_file()}
+        except PermissionError:
+            self.progress_queue.put({'type': Q_MSG.ERROR, 'message': "Permission denied when scanning game files. Please check folder permissions."})
+            return
+        manifest_files = set(normalized_manifest.keys())
+        missing_files, corrupted_files, good_files, extra_files, unreadable_files = [], [], [], sorted(list(local_files - manifest_files)), []
+        stats, confirmed = self._confirm_from_hash_cache(normalized_manifest, manifest_files & local_files)
+        good_files.extend(confirmed)
+        block_info = self.manifest_data.get('_blocks') or {}
+        block_size, block_files = block_info.get('block_size', 0), block_info.get('files', {})
+        bad_blocks: Dict[str, List[int]] = {}
+        if self.journal is not None: self.journal.open(resume=bool(self.checkpoint))
+        resumed = 0
+        self.last_flush_time = time.time()
+        for rel_path in sorted(list(manifest_files - local_files)):
+            if self.cancel_event.is_set(): break
+            missing_files.append(rel_path)
+            self.issue_buffer.append(('missing', rel_path))
+            self._flush_issue_buffer()
+        files_to_check = []
+        if not self.cancel_event.is_set():
+            files_to_check = sorted(list(manifest_files.intersection(local_files) - set(confirmed)))
+            total_to_check, last_update_time = len(confirmed) + len(files_to_check), time.time()
+            remaining_bytes = sum(self._file_size(rel_path, stats) for rel_path in files_to_check)
+            for i, rel_path in enumerate(files_to_check, len(confirmed)):
+                if self.cancel_event.is_set(): break
+                self.pause_event.wait()
+                current_time = time.time()
+                if current_time - last_update_time > 0.1:
+                    rate = self.scheduler.rate()
+                    self.progress_queue.put({'type': Q_MSG.VERIFY_STATS, 'data': {'processed': i, 'total': total_to_check, 'missing': len(missing_files), 'corrupted': len(corrupted_files), 'current_file': Path(rel_path).name,
+                                                                                  'rate': rate, 'eta': remaining_bytes / rate if rate else -1, 'throttled': self.scheduler.throttled}})
+                    last_update_time = current_time
+                remaining_bytes -= self._file_size(rel_path, stats)
+                full_path = self.game_dir / rel_path.replace('/', os.sep); expected_hash = normalized_manifest.get(rel_path)
+                if not expected_hash: continue
+                st = stats.get(rel_path)
+                if st is None and (self.journal is not None or rel_path in self.checkpoint):
+                    try: st = full_path.stat()
+                    except OSError: st = None
+                previous = self.checkpoint.get(rel_path)
+                if previous and st is not None and previous[0] == st.st_size and previous[1] == st.st_mtime_ns:
+                    # Unchanged since the interrupted run: reuse its verdict
+                    verdict = previous[2]; resumed += 1
+                    {'good': good_files, 'corrupted': corrupted_files}.get(verdict, unreadable_files).append(rel_path)
+                    if verdict == 'corrupted':
+                        self.issue_buffer.append(('corrupted', rel_path))
+                        if previous[3] is not None: bad_blocks[rel_path] = list(previous[3])
+                    self._flush_issue_buffer(); continue
+                file_blocks = block_files.get(rel_path) if block_size else None
+                hashed = self._hash_file(full_path, block_size if file_blocks else 0)
+                if hashed is None:
+                    if self.cancel_event.is_set(): break
+                    unreadable_files.append(rel_path)
+                    if self.journal is not None: self.journal.record(rel_path, st, 'unreadable')
+                    continue
+                calculated_hash, block_digests, actual_size = hashed
+                if self.hash_cache is not None and rel_path in stats: self.hash_cache.store(rel_path, stats[rel_path], calculated_hash)
+                if calculated_hash.lower() == expected_hash:
+                    good_files.append(rel_path)
+                    if self.journal is not None: self.journal.record(rel_path, st, 'good')
+                else:
+                    corrupted_files.append(rel_path)
+                    self.issue_buffer.append(('corrupted', rel_path))
+                    logger.log(f"Verification failed for {rel_path}. Hash mismatch.", "WARNING")
+                    if file_blocks:
+                        bad = self._find_bad_blocks(file_blocks, block_digests)
+                        if bad or actual_size != file_blocks.get('size'):
+                            bad_blocks[rel_path] = bad
+                            logger.log(f"{rel_path}: {len(bad)} of {len(file_blocks.get('hashes', []))} blocks bad (size {actual_size} vs {file_blocks.get('size')}).", "WARNING")
+                    if self.journal is not None: self.journal.record(rel_path, st, 'corrupted', bad_blocks.get(rel_path))
+                self._flush_issue_buffer()
+        self._flush_issue_buffer(force=True)
+        self.scheduler.close()
+        if self.hash_cache is not None: self.hash_cache.save()
+        if resumed: logger.log(f"Resumed {resumed} verdicts from the previous checkpoint.", "INFO")
+        if self.cancel_event.is_set():
+            if self.journal is not None: self.journal.close(); logger.log(f"Verification checkpoint kept at {self.journal.path}.", "INFO")
+            self.progress_queue.put({'type': Q_MSG.VERIFY_CANCELLED})
+            return
+        if self.journal is not None: self.journal.discard()
+        checked_total = len(confirmed) + len(files_to_check); good_files.sort()
+        final_data = {'processed': checked_total, 'total': checked_total, 'missing': len(missing_files), 'corrupted': len(corrupted_files), 'current_file': "Finalizing report..."}
+        self.progress_queue.put({'type': Q_MSG.VERIFY_STATS, 'data': final_data})
+        results = {"missing": missing_files, "corrupted": corrupted_files, "extra": extra_files, "good": good_files, "unreadable": unreadable_files, "bad_blocks": bad_blocks}
+        self.progress_queue.put({'type': Q_MSG.VERIFY_COMPLETE, 'results': results})
+        logger.log("Game file verification finished.", "INFO", phase='verify', files=checked_total, duration=round(time.monotonic() - started, 3))
+
+class BlockRepairer:
+    """Repairs corrupted files by rewriting only their bad blocks.
+
+    Blocks come either from a block-addressable remote copy of the game tree (HTTP Range requests
+    against <base URL>/<relative path>) or from a local patch archive (.zip) or folder. Every block
+    is checked against its manifest digest before it is written, and the whole file afterwards.
+    """
+    def __init__(self, game_dir: Path, manifest: Dict[str, Any]):
+        self.game_dir = game_dir
+        self.expected = {key.replace('\\', '/'): value.lower() for key, value in manifest.items() if not key.startswith('_')}
+        block_info = manifest.get('_blocks') or {}
+        self.block_size, self.block_files = block_info.get('block_size', 0), block_info.get('files', {})
+        self._archive: Optional[zipfile.ZipFile] = None; self._archive_names: Dict[str, str] = {}
+
+    def repair(self, bad_blocks: Dict[str, List[int]], remote_base_url: Optional[str] = None, local_source: Optional[Path] = None) -> Dict[str, List[str]]:
+        if not self.block_size: raise ValueError("The manifest for this version has no block hashes.")
+        if local_source and local_source.is_file():
+            self._archive = zipfile.ZipFile(local_source)
+            self._archive_names = {name.replace('\\', '/'): name for name in self._archive.namelist() if not name.endswith('/')}
+        results: Dict[str, List[str]] = {'repaired': [], 'failed': []}; rewritten = 0
+        try:
+            for rel_path, block_indices in bad_blocks.items():
+                try:
+                    rewritten += self._repair_file(rel_path, block_indices, remote_base_url, local_source)
+                    results['repaired'].append(rel_path)
+                except (requests.RequestException, OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+                    logger.log(f"Block repair failed for {rel_path}: {e}", "ERROR"); results['failed'].append(rel_path)
+        finally:
+            if self._archive: self._archive.close(); self._archive = None
+        logger.log(f"Block repair finished: {len(results['repaired'])} file(s) repaired ({rewritten} blocks rewritten), {len(results['failed'])} failed.", "INFO")
+        return results
+
+    def _repair_file(self, rel_path: str, block_indices: List[int], remote_base_url: Optional[str], local_source: Optional[Path]) -> int:
+        file_blocks = self.block_files[rel_path]; size = file_blocks['size']
+        full_path = self.game_dir / rel_path.replace('/', os.sep)
+        with open(full_path, 'r+b') as f:
+            for index in block_indices:
+                offset = index * self.block_size; length = min(self.block_size, size - offset)
+                data = self._read_remote(remote_base_url, rel_path, offset, length) if remote_base_url else self._read_local(local_source, rel_path, offset, length)
+                if hashlib.sha256(data).hexdigest() != file_blocks['hashes'][index].lower(): raise ValueError(f"Source block {index} does not match the manifest.")
+                f.seek(offset); f.write(data)
+            f.truncate(size)
+        sha256 = hashlib.sha256()
+        with open(full_path, 'rb') as f:
+            while chunk := f.read(4 * 1024 * 1024): sha256.update(chunk)
+        if sha256.hexdigest() != self.expected.get(rel_path): raise ValueError("File is still corrupted after rewriting its bad blocks; a full replacement is needed.")
+        logger.log(f"Repaired {rel_path} by rewriting {len(block_indices)} block(s).", "INFO")
+        return len(block_indices)
+
+    def _read_remote(self, base_url: str, rel_path: str, offset: int, length: int) -> bytes:
+        url = f"{base_url.rstrip('/')}/{quote(rel_path)}"
+        response = requests.get(url, headers={'Range': f"bytes={offset}-{offset + length - 1}"}, timeout=Constants.DOWNLOAD_TIMEOUT_SECONDS)
+        response.raise_for_status()
+        if response.status_code != 206 or len(response.content) != length: raise ValueError(f"Server did not honour the byte range for {rel_path}.")
+        return response.content
+
+    def _read_local(self, local_source: Path, rel_path: str, offset: int, length: int) -> bytes:
+        if self._archive:
+            # Archives may wrap the game tree in a top-level folder; match on the path suffix
+            candidates = [name for key, name in self._archive_names.items() if key == rel_path or key.endswith('/' + rel_path)]
+            if not candidates: raise KeyError(f"{rel_path} is not in the patch archive.")
+            with self._archive.open(min(candidates, key=len)) as member: member.seek(offset); data = member.read(length)
+        else:
+            with open(local_source / rel_path.replace('/', os.sep), 'rb') as f: f.seek(offset); data = f.read(length)
+        if len(data) != length: raise ValueError(f"Local source copy of {rel_path} is too short.")
+        return data
+
+
+# ==============================================================================
+# --- PROGRESS BUS ---
+# ==============================================================================
+class ProgressBus:
+    """Worker -> UI channel that coalesces high-frequency updates.
+
+    Status, progress, speed and verify-stats messages land in last-value-wins slots, so a
+    worker reporting every chunk costs the UI one update per frame however fast it posts.
+    Everything else (complete, failed, checksum confirm, ...) stays in an ordered queue and is
+    never dropped. Each message is stamped with a sequence number, and `drain()` hands slot
+    values and events back in that order, so a final status posted after COMPLETE still lands
+    after it. Offers the `put`/`get_nowait`/`empty` subset of queue.Queue the workers use.
+    """
+    COALESCED = frozenset({Q_MSG.STATUS, Q_MSG.OVERALL_STATUS, Q_MSG.PROGRESS, Q_MSG.PROGRESS_MODE, Q_MSG.DOWNLOAD_SPEED, Q_MSG.VERIFY_STATS})
+
+    def __init__(self):
+        self._lock = threading.Lock(); self._seq = 0
+        self._slots: Dict[Any, Tuple[int, float, dict]] = {}
+        self._events: deque = deque()
+        self.reset_stats()
+
+    @staticmethod
+    def slot_key(msg: dict) -> Optional[Any]:
+        """Slot a message coalesces into, or None for discrete events."""
+        msg_type = msg.get('type')
+        if msg_type not in ProgressBus.COALESCED: return None
+        # Verify-stats carries either counts or a phase message; keep the last of each
+        key = (msg_type, 'status') if msg_type == Q_MSG.VERIFY_STATS and 'status' in (msg.get('data') or {}) else msg_type
+        # Fleet targets report side by side; each keeps its own slots
+        return (key, msg['target']) if 'target' in msg else key
+
+    def put(self, msg: dict, block: bool = True, timeout: Optional[float] = None):
+        key, now = self.slot_key(msg), time.monotonic()
+        with self._lock:
+            self._seq += 1; self.posted += 1
+            if key is None:
+                self._events.append((self._seq, now, msg)); self.peak_depth = max(self.peak_depth, len(self._events))
+            else:
+                if key in self._slots: self.coalesced += 1
+                self._slots[key] = (self._seq, now, msg)
+
+    put_nowait = put
+
+    def empty(self) -> bool:
+        with self._lock: return not self._slots and not self._events
+
+    def get_nowait(self) -> dict:
+        """Oldest pending message, for callers that still want one at a time."""
+        batch = self.drain(1)
+        if not batch: raise queue.Empty
+        return batch[0]
+
+    def clear(self):
+        """Discards everything pending (counted as dropped)."""
+        with self._lock:
+            self.dropped += len(self._slots) + len(self._events)
+            self._slots.clear(); self._events.clear()
+
+    def drain(self, max_events: Optional[int] = None) -> List[dict]:
+        """Everything due this frame in posting order: up to max_events events plus the slots.
+
+        Slot values posted after the first event left for the next frame stay pending too, so
+        ordering between the two kinds is preserved across frames.
+        """
+        now = time.monotonic()
+        with self._lock:
+            take = len(self._events) if max_events is None else min(max_events, len(self._events))
+            batch = [self._events.popleft() for _ in range(take)]
+            cutoff = self._events[0][0] if self._events else None
+            for key, item in list(self._slots.items()):
+                if cutoff is None or item[0] < cutoff: batch.append(item); del self._slots[key]
+            for _, posted_at, _ in batch:
+                latency = (now - posted_at) * 1000
+                self.delivered += 1; self._latency_total += latency; self.max_latency_ms = max(self.max_latency_ms, latency)
+        batch.sort(key=lambda item: item[0])
+        return [msg for _, _, msg in batch]
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters since the last reset: posted/delivered/coalesced/dropped, queue depth and put-to-UI latency."""
+        with self._lock:
+            return {'posted': self.posted, 'delivered': self.delivered, 'coalesced': self.coalesced, 'dropped': self.dropped,
+                    'pending_events': len(self._events), 'peak_event_depth': self.peak_depth,
+                    'avg_latency_ms': self._latency_total / self.delivered if self.delivered else 0.0, 'max_latency_ms': self.max_latency_ms}
+
+    def reset_stats(self):
+        self.posted = self.delivered = self.coalesced = self.dropped = self.peak_depth = 0
+        self._latency_total = self.max_latency_ms = 0.0
+
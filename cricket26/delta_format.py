@@ -0,0 +1,140 @@
+"""
+CRICKET 26 DELTA PATCH FORMAT (.c26d)
+Record layout, header reader and applier, shared by the utility's installer and the admin tools (stdlib only)
+"""
+
+import hashlib
+import struct
+from pathlib import Path
+
+
+# ==============================================================================
+# DELTA FORMAT (.c26d)
+# ==============================================================================
+# header   <4sBBHQ32sQ32s  magic, format version, flags, reserved,
+#                          source size, source SHA256, target size, target SHA256
+# ops      <B opcode, then
+#            COPY  <QQ  offset and length of a run of the source file
+#            DATA  <I   length, followed by that many literal bytes
+#            END        no payload
+# The target is rebuilt front to back, so a delta can be applied while it streams
+# out of an archive. Appliers check the source hash before touching anything and
+# the target hash before the result is used.
+#
+# Patch archives ship deltas as DELTA_DIR/<path>.c26d; the installer rebuilds <path>.
+# The builder lives in manifests/delta_patch.py.
+
+DELTA_MAGIC = b'C26D'
+DELTA_VERSION = 1
+DELTA_SUFFIX = '.c26d'
+DELTA_DIR = '__c26_delta__'
+
+OP_END = 0
+OP_COPY = 1
+OP_DATA = 2
+
+HEADER = struct.Struct('<4sBBHQ32sQ32s')
+OP = struct.Struct('<B')
+COPY = struct.Struct('<QQ')
+DATA = struct.Struct('<I')
+
+COPY_BUFFER_SIZE = 4 * 1024 * 1024
+
+
+class DeltaError(ValueError):
+    """A delta that does not fit the file it is applied to, or is malformed"""
+
+
+def read_delta_header(fileobj):
+    """Parse a .c26d header into {"source_size", "source_sha256", "target_size", "target_sha256"}"""
+    raw = fileobj.read(HEADER.size)
+    if len(raw) != HEADER.size:
+        raise DeltaError("Delta is truncated")
+    magic, version, _, _, source_size, source_digest, target_size, target_digest = HEADER.unpack(raw)
+    if magic != DELTA_MAGIC:
+        raise DeltaError("Not a delta patch")
+    if version != DELTA_VERSION:
+        raise DeltaError(f"Unsupported delta version {version}")
+    return {
+        "source_size": source_size,
+        "source_sha256": source_digest.hex(),
+        "target_size": target_size,
+        "target_sha256": target_digest.hex(),
+    }
+
+
+def file_sha256(file_path, checkpoint=None):
+    """SHA256 hex of a file, read in COPY_BUFFER_SIZE chunks; checkpoint() runs before each chunk"""
+    sha256 = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        while True:
+            if checkpoint:
+                checkpoint()
+            chunk = f.read(COPY_BUFFER_SIZE)
+            if not chunk:
+                break
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def source_matches(header, source_path, checkpoint=None):
+    """True if source_path is the file a delta with this header was built from"""
+    source_path = Path(source_path)
+    if not source_path.is_file() or source_path.stat().st_size != header["source_size"]:
+        return False
+    return file_sha256(source_path, checkpoint) == header["source_sha256"]
+
+
+def _read_exact(fileobj, length):
+    data = fileobj.read(length)
+    if len(data) != length:
+        raise DeltaError("Delta is truncated")
+    return data
+
+
+def apply_delta(source_path, delta, output_path, checkpoint=None):
+    """Rebuild the target from source_path and a delta (a path or an open binary stream)
+
+    The source is checked against the delta's source hash before anything is written, and
+    the rebuilt file against its target hash; both raise DeltaError. output_path must not
+    be the source itself: write beside it and replace once this returns. checkpoint(), if
+    given, runs before every chunk so callers can abort (by raising) on cancellation.
+    """
+    if not hasattr(delta, 'read'):
+        with open(delta, 'rb') as f:
+            return apply_delta(source_path, f, output_path, checkpoint)
+    header = read_delta_header(delta)
+    if not source_matches(header, source_path, checkpoint):
+        raise DeltaError(f"{Path(source_path).name} is not the version this delta was built from")
+    sha256 = hashlib.sha256()
+    written = 0
+    with open(source_path, 'rb') as source, open(output_path, 'wb') as out:
+        def emit(read, length):
+            nonlocal written
+            while length:
+                if checkpoint:
+                    checkpoint()
+                chunk = _read_exact(read, min(length, COPY_BUFFER_SIZE))
+                sha256.update(chunk)
+                out.write(chunk)
+                written += len(chunk)
+                length -= len(chunk)
+
+        while True:
+            opcode = _read_exact(delta, OP.size)[0]
+            if opcode == OP_END:
+                break
+            if opcode == OP_COPY:
+                offset, length = COPY.unpack(_read_exact(delta, COPY.size))
+                if offset + length > header["source_size"]:
+                    raise DeltaError("Delta copies past the end of the source")
+                source.seek(offset)
+                emit(source, length)
+            elif opcode == OP_DATA:
+                length, = DATA.unpack(_read_exact(delta, DATA.size))
+                emit(delta, length)
+            else:
+                raise DeltaError(f"Unknown delta op {opcode}")
+    if written != header["target_size"] or sha256.hexdigest() != header["target_sha256"]:
+        raise DeltaError(f"Rebuilt {Path(output_path).name} does not match the delta's target hash")
+    return header
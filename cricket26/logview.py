@@ -0,0 +1,81 @@
+"""
+CRICKET 26 UPDATER LOG VIEW
+Parsing and formatting behind the GUI's Logs tab: application log lines, their level index and
+the Windows event logs (wevtutil text output). Pure functions, so they run and test without Tk.
+"""
+
+import re
+from array import array
+from typing import Optional, Dict, List, Tuple, Iterable
+
+from .core import Constants
+
+LOG_LEVELS = ("INFO", "SETTING", "DIAG", "WARNING", "ERROR", "CRITICAL")  # Level code = position
+LOG_LEVEL_TAGS = {"CRITICAL": "error", "ERROR": "error", "WARNING": "warning", "SETTING": "info", "DIAG": "info", "INFO": "success"}
+LOG_LEVEL_PATTERN = re.compile(r'\[(CRITICAL|ERROR|WARNING|SETTING|DIAG|INFO)\]')
+LOG_LINE_LEVEL_PATTERN = re.compile(rb'\[[^\]\n]*\] \[(CRITICAL|ERROR|WARNING|SETTING|DIAG|INFO)\]')
+WEVTUTIL_FIELD_PATTERN = re.compile(r'^\s*(Date|Source|Event ID|Level):[ \t]*(.*?)\s*$', re.MULTILINE)
+
+def render_log_lines(lines: Iterable[str], levels: Optional[Iterable[int]] = None) -> Tuple[str, List[Tuple[str, int, int]]]:
+    """Formats raw log lines for the Logs tab: (text, [(tag, first line, end line)]).
+
+    Line numbers are 0-based and relative to the returned text; consecutive lines with the
+    same tag share one range, so the view applies a handful of tags per batch. With `levels`
+    (LOG_LEVELS codes, as LogIndex.read returns them) each line takes its indexed level and
+    blank lines are kept, so rows stay aligned with line numbers.
+    """
+    out: List[str] = []; ranges: List[Tuple[str, int, int]] = []
+    rows = ((line.strip(), None) for line in lines) if levels is None else zip((line.rstrip() for line in lines), levels)
+    for line, code in rows:
+        if code is None:
+            if not line: continue
+            match = LOG_LEVEL_PATTERN.search(line); code = LOG_LEVELS.index(match.group(1)) if match else 0
+        level = LOG_LEVELS[code]; tag, row = LOG_LEVEL_TAGS[level], len(out)
+        out.append(f"{Constants.LOG_SYMBOLS.get(level, 'ℹ️')} {line}\n")
+        if ranges and ranges[-1][0] == tag and ranges[-1][2] == row: ranges[-1] = (tag, ranges[-1][1], row + 1)
+        else: ranges.append((tag, row, row + 1))
+    return "".join(out), ranges
+
+def index_log_lines(data: bytes, base: int = 0, level: int = 0) -> Tuple[array, bytearray, int]:
+    """Indexes the complete lines of data: (line start offsets + base, level codes, bytes consumed).
+
+    A line without its own [LEVEL] marker (the header, continuation lines of a multi-line
+    message) inherits the level of the line before it, starting from `level`.
+    """
+    offsets, levels, pos = array('Q'), bytearray(), 0
+    codes = {name.encode(): code for code, name in enumerate(LOG_LEVELS)}
+    while (end := data.find(b'\n', pos)) >= 0:
+        match = LOG_LINE_LEVEL_PATTERN.match(data, pos, end)
+        if match: level = codes[match.group(1)]
+        offsets.append(base + pos); levels.append(level); pos = end + 1
+    return offsets, levels, pos
+
+def parse_wevtutil_events(output: str, limit: int) -> List[Dict[str, str]]:
+    """Parses `wevtutil qe <log> /f:text` output into the newest `limit` events."""
+    events = []
+    for block in output.split('Event[')[1:]:
+        fields = dict(WEVTUTIL_FIELD_PATTERN.findall(block))
+        if not fields.get('Date'): continue
+        level = fields.get('Level', '').lower()
+        events.append({'time': fields['Date'][:19].replace('T', ' '), 'source': fields.get('Source') or "Unknown", 'event_id': fields.get('Event ID') or "Unknown",
+                       'level': "Error" if level in ('error', 'critical') else "Warning" if level == 'warning' else "Info"})
+        if len(events) >= limit: break
+    return events
+
+def render_event_logs(sections: List[Tuple[str, List[Dict[str, str]]]]) -> Tuple[str, List[Tuple[str, int, int]]]:
+    """Formats parsed events per log (Application, System) plus the application-log banner, like render_log_lines."""
+    out: List[str] = []; ranges: List[Tuple[str, int, int]] = []
+    for log_name, events in sections:
+        for event in events:
+            if log_name == "System": entry = f"⚙️ {event['time']} | {event['level']} | {event['source']} (System)"
+            else: entry = f"🖥️ {event['time']} | {event['level']} | {event['source']} | Event ID: {event['event_id']}"
+            ranges.append(({"Error": "error", "Warning": "warning"}.get(event['level'], "info"), len(out), len(out) + 1)); out.append(entry + "\n")
+    banner = ["\n", "=" * 60 + "\n", "📄 APPLICATION LOGS:\n", "=" * 60 + "\n", "\n"]
+    ranges.append(("info", len(out), len(out) + len(banner))); out.extend(banner)
+    return "".join(out), ranges
+
+def slice_log_block(block: Tuple[str, List[Tuple[str, int, int]]], first: int, last: int) -> Tuple[str, List[Tuple[str, int, int]]]:
+    """Rows first..last of a rendered (text, tag ranges) block, renumbered from 0."""
+    text, ranges = block
+    return ("".join(text.splitlines(keepends=True)[first:last]),
+            [(tag, max(a, first) - first, min(b, last) - first) for tag, a, b in ranges if a < last and b > first])
@@ -0,0 +1,187 @@
+"""
+CRICKET 26 BINARY MANIFEST FORMAT (.c26m)
+Record layout, the streaming decoder and the Merkle tree encoding, shared by the utility and the admin tools (stdlib only)
+"""
+
+import hashlib
+import json
+import struct
+import zlib
+
+
+# ==============================================================================
+# BINARY MANIFEST FORMAT (.c26m)
+# ==============================================================================
+# Gzip-framed stream of:
+#   header   <4sBBHIII  magic, format version, flags, reserved, entry count,
+#                       block size, metadata length
+#   metadata UTF-8 JSON of the "_" keys from the JSON manifest
+#   entries  sorted by path; each is <HH (shared prefix length, suffix length),
+#            the UTF-8 path suffix, the raw 32-byte SHA256, then <Q file size
+#            if FLAG_SIZES, then if FLAG_BLOCKS an <I block count followed (when
+#            non-zero) by <Q file size and one raw SHA256 per block
+#   trailer  raw SHA256 of everything above (uncompressed)
+# Block hashes live in the JSON manifest as
+#   "_blocks": {"block_size": N, "files": {path: {"size": n, "hashes": [hex, ...]}}}
+#
+# Version 2 added the FLAG_BLOCKS records. Version 1 files never set it, so both
+# decode here; decoders reject versions and flags they don't know rather than
+# misparse the entry table.
+
+BINARY_MANIFEST_MAGIC = b'C26M'
+BINARY_MANIFEST_VERSION = 2
+SUPPORTED_VERSIONS = (1, 2)
+BINARY_MANIFEST_SUFFIX = '.c26m'
+FLAG_SIZES = 0x01
+FLAG_BLOCKS = 0x02
+KNOWN_FLAGS = FLAG_SIZES | FLAG_BLOCKS
+
+HEADER = struct.Struct('<4sBBHIII')
+ENTRY = struct.Struct('<HH')
+SIZE = struct.Struct('<Q')
+COUNT = struct.Struct('<I')
+DIGEST_LEN = 32
+
+
+class BinaryManifestDecoder:
+    """Incremental .c26m decoder; feed() compressed chunks as they arrive, then finish()"""
+
+    def __init__(self):
+        self._inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        self._buffer = bytearray()
+        self._body_hash = hashlib.sha256()
+        self._flags = None
+        self._remaining = 0
+        self._previous = b''
+        self.version = None
+        self.metadata = {}
+        self.manifest = {}
+        self.sizes = {}
+        self.blocks = {}
+        self.block_size = 0
+
+    def feed(self, chunk):
+        """Decompress a chunk and parse every complete record in it"""
+        self._buffer += self._inflater.decompress(chunk)
+        self._parse()
+
+    def finish(self):
+        """Validate the trailer and return the manifest in its JSON shape"""
+        self._buffer += self._inflater.flush()
+        self._parse()
+        if self._flags is None or self._remaining or len(self._buffer) != DIGEST_LEN:
+            raise ValueError("Binary manifest is truncated")
+        if bytes(self._buffer) != self._body_hash.digest():
+            raise ValueError("Binary manifest integrity check failed")
+        result = {**self.metadata, **self.manifest}
+        if self.blocks:
+            result['_blocks'] = {
+                "block_size": self.block_size,
+                "files": {path: {"size": size, "hashes": [d.hex() for d in digests]}
+                          for path, (size, digests) in self.blocks.items()},
+            }
+        return result
+
+    def _take(self, length):
+        data = bytes(self._buffer[:length])
+        del self._buffer[:length]
+        self._body_hash.update(data)
+        return data
+
+    def _parse(self):
+        if self._flags is None:
+            if len(self._buffer) < HEADER.size:
+                return
+            magic, version, flags, _, count, block_size, meta_len = HEADER.unpack_from(self._buffer)
+            if magic != BINARY_MANIFEST_MAGIC:
+                raise ValueError("Not a binary manifest")
+            if version not in SUPPORTED_VERSIONS:
+                raise ValueError(f"Unsupported binary manifest version {version}")
+            if flags & ~KNOWN_FLAGS:
+                raise ValueError(f"Unsupported binary manifest flags {flags:#04x}")
+            if len(self._buffer) < HEADER.size + meta_len:
+                return
+            self._take(HEADER.size)
+            self.metadata = json.loads(self._take(meta_len).decode('utf-8'))
+            self.version, self._flags, self._remaining, self.block_size = version, flags, count, block_size
+
+        flags = self._flags
+        while self._remaining:
+            if len(self._buffer) < ENTRY.size:
+                return
+            shared, suffix_len = ENTRY.unpack_from(self._buffer)
+            needed = ENTRY.size + suffix_len + DIGEST_LEN
+            if flags & FLAG_SIZES:
+                needed += SIZE.size
+            block_count = 0
+            if flags & FLAG_BLOCKS:
+                if len(self._buffer) < needed + COUNT.size:
+                    return
+                block_count = COUNT.unpack_from(self._buffer, needed)[0]
+                needed += COUNT.size + (SIZE.size + block_count * DIGEST_LEN if block_count else 0)
+            if len(self._buffer) < needed:
+                return
+
+            self._take(ENTRY.size)
+            path_bytes = self._previous[:shared] + self._take(suffix_len)
+            rel_path = path_bytes.decode('utf-8')
+            self.manifest[rel_path] = self._take(DIGEST_LEN).hex()
+            if flags & FLAG_SIZES:
+                self.sizes[rel_path] = SIZE.unpack(self._take(SIZE.size))[0]
+            if flags & FLAG_BLOCKS:
+                self._take(COUNT.size)
+                if block_count:
+                    size = SIZE.unpack(self._take(SIZE.size))[0]
+                    raw = self._take(block_count * DIGEST_LEN)
+                    self.blocks[rel_path] = (size, [raw[i:i + DIGEST_LEN] for i in range(0, len(raw), DIGEST_LEN)])
+            self._previous = path_bytes
+            self._remaining -= 1
+
+
+def decode_binary_manifest(data):
+    """Decode complete .c26m bytes to a {path: sha256} manifest"""
+    decoder = BinaryManifestDecoder()
+    decoder.feed(data)
+    return decoder.finish()
+
+
+# ==============================================================================
+# MERKLE TREE
+# ==============================================================================
+# Optional "_merkle": {directory: hex digest} in a JSON manifest, '' being the root.
+# Every directory node is the SHA256 of its children in name order, each encoded as
+# b'F' or b'D', the UTF-8 name, a NUL byte and the raw child digest.
+
+def manifest_files(manifest):
+    """Return only the file entries of a manifest, with forward-slash paths and lowercase digests"""
+    return {k.replace('\\', '/'): v.lower() for k, v in manifest.items() if not k.startswith('_')}
+
+
+def merkle_children(files):
+    """Index {path: sha256} as directory -> ({file name: digest}, {subdirectory names})"""
+    children = {'': ({}, set())}
+    for rel_path, digest in files.items():
+        parts = rel_path.split('/')
+        for depth in range(1, len(parts)):
+            parent = '/'.join(parts[:depth - 1])
+            children.setdefault(parent, ({}, set()))[1].add(parts[depth - 1])
+            children.setdefault('/'.join(parts[:depth]), ({}, set()))
+        children['/'.join(parts[:-1])][0][parts[-1]] = digest
+    return children
+
+
+def build_merkle_tree(manifest):
+    """Return {directory: hex digest} for every directory of a manifest (or a {path: sha256} map)"""
+    children = merkle_children(manifest_files(manifest))
+    tree = {}
+    for directory in sorted(children, key=lambda d: d.count('/') + (1 if d else 0), reverse=True):
+        dir_files, subdirs = children[directory]
+        node = hashlib.sha256()
+        for name in sorted(set(dir_files) | subdirs):
+            child = f"{directory}/{name}" if directory else name
+            if name in subdirs:
+                node.update(b'D' + name.encode('utf-8') + b'\0' + bytes.fromhex(tree[child]))
+            if name in dir_files:
+                node.update(b'F' + name.encode('utf-8') + b'\0' + bytes.fromhex(dir_files[name]))
+        tree[directory] = node.hexdigest()
+    return tree
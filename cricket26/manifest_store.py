@@ -0,0 +1,104 @@
+"""
+CRICKET 26 LOCAL MANIFEST STORE
+Integrity-checked cache of downloaded manifests, shared by the utility and the admin tools (stdlib only)
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+
+
+# ==============================================================================
+# STORE LAYOUT
+# ==============================================================================
+# <version>_<url hash>.manifest holds the body exactly as served and <...>.meta.json its
+# version, URL, ETag/Last-Modified validators, SHA256 and size. Entries whose body no
+# longer matches its SHA256 are discarded on read. The utility adds the conditional
+# download on top (cricket26.core.ManifestStore); the admin panel seeds entries after
+# publishing a manifest so that machine can verify without downloading it again.
+
+MANIFEST_STORE_DIR = Path(tempfile.gettempdir()) / "cricket26_updater_cache" / "manifests"
+_VERSION_KEY_RE = re.compile(r'[^\w.-]')
+
+
+class ManifestStore:
+    """Local store of manifest bodies keyed by version and URL; safe to share between threads"""
+
+    def __init__(self, store_dir=MANIFEST_STORE_DIR):
+        self.store_dir = Path(store_dir)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _version_key(version):
+        return _VERSION_KEY_RE.sub('_', version)
+
+    def _paths(self, version, url):
+        key = f"{self._version_key(version)}_{hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]}"
+        return self.store_dir / f"{key}.manifest", self.store_dir / f"{key}.meta.json"
+
+    def _discarded(self, body_path):
+        """Called when a corrupted entry is removed; the utility logs it"""
+
+    def _read(self, body_path, meta_path):
+        try:
+            meta = json.loads(meta_path.read_text(encoding='utf-8'))
+            body = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None, {}
+        if hashlib.sha256(body).hexdigest() != meta.get('sha256'):
+            for path in (body_path, meta_path):
+                path.unlink(missing_ok=True)
+            self._discarded(body_path)
+            return None, {}
+        return body, meta
+
+    def get(self, version, url):
+        """Return (body, meta) for a verified stored entry, or (None, {})"""
+        with self._lock:
+            return self._read(*self._paths(version, url))
+
+    def find(self, version):
+        """Return the most recently stored verified entry for a version regardless of URL"""
+        with self._lock:
+            if not self.store_dir.exists():
+                return None, {}
+            metas = sorted(self.store_dir.glob(f"{self._version_key(version)}_*.meta.json"),
+                           key=lambda p: p.stat().st_mtime, reverse=True)
+            for meta_path in metas:
+                body, meta = self._read(meta_path.with_name(meta_path.name[:-len('.meta.json')] + '.manifest'), meta_path)
+                if body is not None and meta.get('version') == version:
+                    return body, meta
+        return None, {}
+
+    def put(self, version, url, body, etag=None, last_modified=None):
+        """Store a manifest body and return its path; raises OSError if it cannot be written"""
+        body_path, meta_path = self._paths(version, url)
+        meta = {
+            'version': version, 'url': url, 'etag': etag, 'last_modified': last_modified,
+            'sha256': hashlib.sha256(body).hexdigest(), 'size': len(body),
+            'stored_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        with self._lock:
+            self.store_dir.mkdir(parents=True, exist_ok=True)
+            for path, data in ((body_path, body), (meta_path, json.dumps(meta, indent=2).encode('utf-8'))):
+                tmp_path = path.with_name(path.name + '.tmp')
+                tmp_path.write_bytes(data)
+                os.replace(tmp_path, path)
+        return body_path
+
+    def entries(self):
+        """List the metadata of every stored manifest"""
+        if not self.store_dir.exists():
+            return []
+        metas = []
+        for meta_path in sorted(self.store_dir.glob('*.meta.json')):
+            try:
+                metas.append(json.loads(meta_path.read_text(encoding='utf-8')))
+            except (OSError, ValueError):
+                continue
+        return metas
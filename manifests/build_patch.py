@@ -0,0 +1,351 @@
+"""
+CRICKET 26 PATCH ARCHIVE BUILDER
+Builds a minimal update zip holding only the files that changed between two versions
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import tempfile
+import zipfile
+from datetime import datetime
+from pathlib import Path
+
+try:
+    from .delta_patch import DELTA_DIR, DELTA_SUFFIX, create_delta
+    from .generate_manifest import (DEFAULT_BLOCK_SIZE, DEFAULT_WORKERS, HASH_BUFFER_SIZE, ThroughputReporter,
+                                    build_packing_list, compare_manifests, compile_exclusion_matcher, format_diff_summary,
+                                    hash_file_blocks, hash_files, read_manifest, scan_game_files)
+except ImportError:
+    from delta_patch import DELTA_DIR, DELTA_SUFFIX, create_delta
+    from generate_manifest import (DEFAULT_BLOCK_SIZE, DEFAULT_WORKERS, HASH_BUFFER_SIZE, ThroughputReporter,
+                                   build_packing_list, compare_manifests, compile_exclusion_matcher, format_diff_summary,
+                                   hash_file_blocks, hash_files, read_manifest, scan_game_files)
+
+
+# ==============================================================================
+# PATCH ARCHIVE FORMAT
+# ==============================================================================
+# A plain zip whose members are paths relative to the game folder, so the utility's
+# installer copies them straight in. Members are sorted and carry their file's mtime,
+# so rebuilding from the same trees gives the same bytes and the same SHA256.
+# <archive>.patch.json records what clients need to plan, verify and resume a download:
+# exact size, SHA256, per-block SHA256s and where the central directory sits.
+#
+# Large modified files may instead ship as a binary delta against the old version, stored
+# as __c26_delta__/<path>.c26d (see cricket26/delta_format.py); the installer rebuilds the file and
+# falls back to a full copy when the installed one is not the delta's source.
+
+PATCH_INFO_SUFFIX = '.patch.json'
+PATCH_BLOCK_SIZE = DEFAULT_BLOCK_SIZE
+DELTA_MIN_SIZE = 16 * 1024 * 1024
+DELTA_MAX_RATIO = 0.5   # a delta bigger than this share of the file ships the file instead
+
+# Already-compressed formats are stored; deflating them costs time and saves nothing
+STORED_EXTENSIONS = ('.pak', '.ucas', '.utoc', '.bik', '.bk2', '.mp4', '.webm', '.wem', '.bnk', '.ogg',
+                     '.zip', '.7z', '.png', '.jpg', '.jpeg')
+# The utility's installer refuses these (except cricket26.exe), see Extractor.install_files
+BLOCKED_EXTENSIONS = ('.exe', '.bat', '.cmd', '.scr', '.com', '.pif')
+GAME_EXECUTABLE = 'cricket26.exe'
+
+# Keys of the .patch.json copied into version.json's update_archives[<from>_<to>]
+VERSION_ENTRY_KEYS = ('size_bytes', 'sha256', 'block_size', 'block_hashes', 'files', 'uncompressed_bytes',
+                      'central_directory')
+
+_EOCD = struct.Struct('<4s4H2LH')
+_EOCD_SIGNATURE = b'PK\x05\x06'
+_ZIP64_LOCATOR = struct.Struct('<4sLQL')
+_ZIP64_LOCATOR_SIGNATURE = b'PK\x06\x07'
+_ZIP64_EOCD = struct.Struct('<4sQ2H2L4Q')
+_ZIP_EPOCH = datetime(1980, 1, 1).timestamp()
+
+
+def read_central_directory(archive_path):
+    """Locate a zip's central directory: {"offset", "size", "entries", "sha256"}
+
+    Reads the end-of-central-directory record (and its zip64 counterpart for large
+    archives), so a client can Range-fetch exactly these bytes and check them.
+    """
+    with open(archive_path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        file_size = f.tell()
+        tail_start = max(0, file_size - _EOCD.size - 0xFFFF)
+        f.seek(tail_start)
+        tail = f.read()
+        pos = tail.rfind(_EOCD_SIGNATURE)
+        if pos < 0 or pos + _EOCD.size > len(tail):
+            raise ValueError(f"{archive_path} is not a zip archive (no end of central directory record)")
+        _, _, _, _, entries, cd_size, cd_offset, _ = _EOCD.unpack_from(tail, pos)
+        locator = pos - _ZIP64_LOCATOR.size
+        if locator >= 0 and tail[locator:locator + 4] == _ZIP64_LOCATOR_SIGNATURE:
+            _, _, zip64_offset, _ = _ZIP64_LOCATOR.unpack_from(tail, locator)
+            f.seek(zip64_offset)
+            fields = _ZIP64_EOCD.unpack(f.read(_ZIP64_EOCD.size))
+            entries, cd_size, cd_offset = fields[7], fields[8], fields[9]
+        f.seek(cd_offset)
+        cd_hash = hashlib.sha256(f.read(cd_size)).hexdigest()
+    return {"offset": cd_offset, "size": cd_size, "entries": entries, "sha256": cd_hash}
+
+
+def describe_archive(archive_path, block_size=PATCH_BLOCK_SIZE):
+    """Size, SHA256, per-block SHA256s, central directory and members of a finished archive"""
+    archive_path = Path(archive_path)
+    archive_hash, size, blocks = hash_file_blocks(archive_path, block_size)
+    if archive_hash is None:
+        raise OSError(f"Could not read {archive_path}")
+    with zipfile.ZipFile(archive_path) as archive:
+        members = [{
+            "path": info.filename,
+            "size": info.file_size,
+            "compressed_size": info.compress_size,
+            "crc32": f"{info.CRC:08x}",
+            "method": "deflate" if info.compress_type == zipfile.ZIP_DEFLATED else "store",
+            "header_offset": info.header_offset,
+        } for info in archive.infolist()]
+    return {
+        "file": archive_path.name,
+        "size_bytes": size,
+        "sha256": archive_hash,
+        "block_size": block_size,
+        "block_hashes": [digest.hex() for digest in blocks],
+        "files": len(members),
+        "uncompressed_bytes": sum(member["size"] for member in members),
+        "central_directory": read_central_directory(archive_path),
+        "members": members,
+    }
+
+
+def version_entry(info):
+    """The part of a .patch.json that belongs in version.json's update_archives"""
+    return {key: info[key] for key in VERSION_ENTRY_KEYS}
+
+
+# ==============================================================================
+# BUILDING
+# ==============================================================================
+
+def _hash_tree(game_dir, workers, only=None, label="", is_excluded=None):
+    """Hash every file under game_dir (or those `only` accepts); returns (manifest, sizes)
+
+    Files `only` rejects get a size-tagged placeholder digest, which never equals a real one.
+    Excluded files (user settings, saves, logs, as in manifests) are skipped entirely.
+    """
+    files, _ = scan_game_files(game_dir, is_excluded=is_excluded or compile_exclusion_matcher())
+    sizes = {rel_path: size for rel_path, size, _ in files}
+    manifest = {rel_path: f"size:{size}" for rel_path, size, _ in files if only and not only(rel_path, size)}
+    to_hash = [entry for entry in files if entry[0] not in manifest]
+    print(f"🔐 Hashing {len(to_hash)} of {len(files)} files in {label or game_dir}...")
+    reporter = ThroughputReporter(len(to_hash), sum(size for _, size, _ in to_hash))
+    for rel_path, size, file_hash, _ in hash_files(game_dir, to_hash, workers):
+        reporter.update(size)
+        if file_hash is None:
+            raise OSError(f"Could not read {Path(game_dir) / rel_path}")
+        manifest[rel_path] = file_hash
+    print(f"⚡ Hashed {reporter.summary()}")
+    return manifest, sizes
+
+
+def plan_patch(new_dir, old_dir=None, old_manifest=None, new_manifest=None, workers=DEFAULT_WORKERS):
+    """Work out what a patch must carry; returns (diff, packing list)
+
+    The old side is a game directory or a manifest; the new side is always the directory
+    the files are packed from, optionally with its manifest to skip rehashing it. Comparing
+    two directories covers every file the manifests would; manifests only cover what they
+    list. Both sides drop the files manifests exclude, so a patch never overwrites a
+    player's settings, saves or logs.
+    """
+    if bool(old_dir) == bool(old_manifest):
+        raise ValueError("Give either the old game directory or the old manifest")
+    is_excluded = compile_exclusion_matcher()
+    if new_manifest:
+        new_digests, new_sizes = read_manifest(new_manifest)
+        new_digests = {k: v for k, v in new_digests.items() if not k.startswith('_') and not is_excluded(k.replace('\\', '/'))}
+    else:
+        new_digests, new_sizes = _hash_tree(new_dir, workers, label="new version", is_excluded=is_excluded)
+
+    if old_manifest:
+        old_digests, old_sizes = read_manifest(old_manifest)
+        old_digests = {k: v for k, v in old_digests.items() if not k.startswith('_') and not is_excluded(k.replace('\\', '/'))}
+    else:
+        # Same path, different size is already "modified": only same-size and vanished files need the old digest
+        old_digests, old_sizes = _hash_tree(old_dir, workers, label="old version", is_excluded=is_excluded,
+                                            only=lambda rel_path, size: new_sizes.get(rel_path, size) == size)
+
+    diff = compare_manifests(old_digests, new_digests, old_sizes, new_sizes)
+    packing = build_packing_list(diff, new_digests, new_sizes)
+    for entry in packing["files"]:
+        if entry["size"] is None:
+            entry["size"] = (Path(new_dir) / entry["path"]).stat().st_size
+    packing["total_bytes"] = sum(entry["size"] for entry in packing["files"])
+    packing["unknown_sizes"] = 0
+    return diff, packing
+
+
+def make_deltas(old_dir, new_dir, packing, work_dir, min_size=DELTA_MIN_SIZE):
+    """Build deltas for modified files of at least min_size; returns the ones worth shipping
+
+    Each kept delta is attached to its packing entry as entry["delta"] and listed as
+    {"path", "size", "delta_size", "source_sha256", "target_sha256"}.
+    """
+    deltas = []
+    for entry in packing["files"]:
+        if entry["reason"] != "modified" or entry["size"] < min_size:
+            continue
+        delta_file = Path(work_dir) / f"{len(deltas)}{DELTA_SUFFIX}"
+        print(f"🧬 Delta for {entry['path']}...")
+        result = create_delta(Path(old_dir) / entry["path"], Path(new_dir) / entry["path"], delta_file)
+        if result["target_sha256"] != entry["sha256"]:
+            raise ValueError(f"{entry['path']} changed since it was hashed; rebuild the patch")
+        if result["delta_size"] > entry["size"] * DELTA_MAX_RATIO:
+            print(f"   Shipping the full file: the delta would be {result['delta_size'] / 1024**2:.1f} MB")
+            delta_file.unlink()
+            continue
+        print(f"   {result['delta_size'] / 1024**2:.1f} MB instead of {entry['size'] / 1024**2:.1f} MB")
+        entry["delta"] = str(delta_file)
+        deltas.append({"path": entry["path"], "size": entry["size"], "delta_size": result["delta_size"],
+                       "source_sha256": result["source_sha256"], "target_sha256": result["target_sha256"]})
+    return deltas
+
+
+def _archive_members(new_dir, packing):
+    """(member name, file to read, SHA256 to check or None, size, mtime) per packing entry, sorted"""
+    members = []
+    for entry in packing["files"]:
+        source = new_dir / entry["path"]
+        if entry.get("delta"):
+            delta_file = Path(entry["delta"])
+            members.append((f"{DELTA_DIR}/{entry['path']}{DELTA_SUFFIX}", delta_file, None, delta_file.stat().st_size, source.stat().st_mtime))
+        else:
+            members.append((entry["path"], source, entry["sha256"], entry["size"], source.stat().st_mtime))
+    members.sort()
+    return members
+
+
+def write_patch_archive(new_dir, packing, output_file, progress_callback=None):
+    """Write the packing list's files (or their deltas) from new_dir into a deterministic zip
+
+    Each file is re-hashed as it is copied in; one that no longer matches the packing
+    list's SHA256 aborts the build instead of shipping content nobody verified.
+    """
+    new_dir, output_file = Path(new_dir), Path(output_file)
+    members = _archive_members(new_dir, packing)
+    total_bytes, done_bytes = sum(member[3] for member in members), 0
+    partial_file = output_file.with_name(output_file.name + '.part')
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with zipfile.ZipFile(partial_file, 'w', allowZip64=True) as archive:
+            for name, source, expected_sha256, size, mtime in members:
+                info = zipfile.ZipInfo(name, date_time=datetime.fromtimestamp(max(mtime, _ZIP_EPOCH)).timetuple()[:6])
+                stored = Path(name[:-len(DELTA_SUFFIX)] if expected_sha256 is None else name).suffix.lower() in STORED_EXTENSIONS
+                info.compress_type = zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED
+                info.external_attr = 0o644 << 16
+                info.file_size = size
+                sha256 = hashlib.sha256()
+                with open(source, 'rb') as src, archive.open(info, 'w') as dest:
+                    while chunk := src.read(HASH_BUFFER_SIZE):
+                        sha256.update(chunk)
+                        dest.write(chunk)
+                        done_bytes += len(chunk)
+                        if progress_callback:
+                            progress_callback(done_bytes, total_bytes, name)
+                if expected_sha256 and sha256.hexdigest() != expected_sha256:
+                    raise ValueError(f"{name} changed since it was hashed; rebuild the patch")
+        os.replace(partial_file, output_file)
+    finally:
+        if partial_file.exists():
+            partial_file.unlink()
+    return output_file
+
+
+def build_patch(new_dir, output_file, old_dir=None, old_manifest=None, new_manifest=None,
+                workers=DEFAULT_WORKERS, block_size=PATCH_BLOCK_SIZE, progress_callback=None,
+                delta_min_size=DELTA_MIN_SIZE):
+    """Build a patch archive and its .patch.json; returns the patch info
+
+    `progress_callback(done_bytes, total_bytes, member name)` is called while packing.
+    Deltas need the old files, so they are only built when old_dir is given (and
+    delta_min_size is not 0).
+    """
+    output_file = Path(output_file)
+    diff, packing = plan_patch(new_dir, old_dir, old_manifest, new_manifest, workers)
+    print(f"🔀 {format_diff_summary(diff)}, {diff['unchanged']} unchanged")
+    if not packing["files"]:
+        raise ValueError("Nothing to pack: no files were added, modified or renamed")
+
+    blocked = [entry["path"] for entry in packing["files"]
+               if Path(entry["path"]).suffix.lower() in BLOCKED_EXTENSIONS and Path(entry["path"]).name.lower() != GAME_EXECUTABLE]
+    for path in blocked:
+        print(f"⚠️ Warning: the utility will not install {path} (executable type)")
+
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix='c26-delta-', dir=output_file.parent) as work_dir:
+        deltas = make_deltas(old_dir, new_dir, packing, work_dir, delta_min_size) if old_dir and delta_min_size else []
+        print(f"📦 Packing {len(packing['files'])} files ({packing['total_bytes'] / 1024**2:.1f} MB, {len(deltas)} as deltas) into {output_file.name}...")
+        write_patch_archive(new_dir, packing, output_file, progress_callback)
+
+    info = describe_archive(output_file, block_size)
+    info["deltas"] = deltas
+    info["obsolete"] = packing["obsolete"]
+    info["renamed"] = diff["renamed"]
+    info_file = output_file.with_name(output_file.name[:-len(output_file.suffix)] + PATCH_INFO_SUFFIX)
+    with open(info_file, 'w', encoding='utf-8') as f:
+        json.dump(info, f, indent=2, ensure_ascii=False)
+
+    print(f"✅ Patch archive: {output_file} ({info['size_bytes']:,} bytes)")
+    print(f"🔐 SHA256: {info['sha256']}")
+    print(f"🧱 {len(info['block_hashes'])} block hashes of {block_size // (1024 * 1024)} MB")
+    print(f"📇 Central directory: {info['central_directory']['entries']} entries at offset {info['central_directory']['offset']:,}")
+    print(f"📄 Patch info: {info_file.name}")
+    if packing["obsolete"]:
+        print(f"🗑️ {len(packing['obsolete'])} files exist only in the old version (listed under \"obsolete\")")
+    return info
+
+
+def update_version_json(version_json, update_key, info):
+    """Record a built archive under update_key in a local version.json"""
+    version_json = Path(version_json)
+    with open(version_json, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    entry = version_entry(info)
+    data.setdefault('update_archives', {})[update_key] = entry
+    data.setdefault('checksums', {})[update_key] = entry['sha256']
+    data.setdefault('update_sizes', {})[update_key] = f"{entry['size_bytes'] / 1024**2:.1f} MB"
+    for host in data.get('hosts', []):
+        if update_key in host.get('links', {}):
+            host.setdefault('checksums', {})[update_key] = entry['sha256']
+    with open(version_json, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    print(f"📝 Updated {version_json.name}: update_archives[\"{update_key}\"]")
+
+
+def cli_mode(argv):
+    """python build_patch.py NEW_DIR OUTPUT.zip (--old-dir DIR | --old-manifest FILE) [options]"""
+    parser = argparse.ArgumentParser(prog="build_patch.py", description="Build a minimal Cricket 26 patch archive.")
+    parser.add_argument("new_dir", help="Game directory of the new version (files are packed from here)")
+    parser.add_argument("output", help="Patch archive to write, e.g. 1.0.3_1.0.4.zip")
+    old = parser.add_mutually_exclusive_group(required=True)
+    old.add_argument("--old-dir", help="Game directory of the old version")
+    old.add_argument("--old-manifest", help="Manifest (.json or .c26m) of the old version")
+    parser.add_argument("--new-manifest", help="Manifest of the new version, to skip rehashing NEW_DIR")
+    parser.add_argument("-j", "--workers", type=int, default=DEFAULT_WORKERS, help=f"Hashing threads (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--delta-min-mb", type=int, default=DELTA_MIN_SIZE // (1024 * 1024),
+                        help="Ship modified files at least this big as binary deltas (needs --old-dir; 0 disables)")
+    parser.add_argument("--version-json", help="version.json to record the archive in (needs --key)")
+    parser.add_argument("--key", help="Update key, e.g. 1.0.3_1.0.4 (default: the output file name)")
+    args = parser.parse_args(argv)
+    try:
+        info = build_patch(args.new_dir, args.output, args.old_dir, args.old_manifest, args.new_manifest, args.workers,
+                           delta_min_size=args.delta_min_mb * 1024 * 1024)
+        if args.version_json:
+            update_version_json(args.version_json, args.key or Path(args.output).stem, info)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        return False
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if cli_mode(sys.argv[1:]) else 1)
@@ -0,0 +1,231 @@
+"""
+CRICKET 26 DELTA PATCHES
+Pure-Python binary deltas (.c26d) for large files that change only in places
+"""
+
+import hashlib
+import os
+import sys
+from pathlib import Path
+
+try:
+    from cricket26.delta_format import (COPY, COPY_BUFFER_SIZE, DATA, DELTA_DIR, DELTA_MAGIC, DELTA_SUFFIX, DELTA_VERSION,
+                                        HEADER, OP, OP_COPY, OP_DATA, OP_END, DeltaError, apply_delta, file_sha256,
+                                        read_delta_header)
+except ImportError:  # Run as a script from manifests/: the utility's package sits one folder up
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from cricket26.delta_format import (COPY, COPY_BUFFER_SIZE, DATA, DELTA_DIR, DELTA_MAGIC, DELTA_SUFFIX, DELTA_VERSION,
+                                        HEADER, OP, OP_COPY, OP_DATA, OP_END, DeltaError, apply_delta, file_sha256,
+                                        read_delta_header)
+
+
+# ==============================================================================
+# DELTA BUILDER
+# ==============================================================================
+# The .c26d layout, its reader and the applier live in cricket26/delta_format.py, shared
+# with the utility's installer; create_delta below is the only encoder.
+#
+# Deltas are found against an index of the source's aligned blocks. Runs that keep
+# matching are extended block by block; after a changed region the builder searches
+# for where upcoming source blocks reappear, so inserted or removed bytes (an asset
+# growing inside a .pak) only cost the bytes that really differ.
+
+__all__ = ['DELTA_BLOCK_SIZE', 'DELTA_DIR', 'DELTA_SUFFIX', 'DeltaError', 'apply_delta', 'create_delta', 'file_sha256',
+           'index_source', 'read_delta_header']
+
+DELTA_BLOCK_SIZE = 64 * 1024
+
+MAX_DATA_RUN = 4 * 1024 * 1024
+RESYNC_PROBE = 64
+RESYNC_CANDIDATES = 16
+RESYNC_WINDOW = 8 * 1024 * 1024
+READ_AHEAD = 32 * 1024 * 1024
+
+
+def _block_key(block):
+    return hashlib.blake2b(block, digest_size=16).digest()
+
+
+def index_source(source_path, block_size=DELTA_BLOCK_SIZE):
+    """One pass over the source: (size, sha256 digest, {block key: first offset})"""
+    sha256 = hashlib.sha256()
+    index = {}
+    offset = 0
+    read_size = max(1, COPY_BUFFER_SIZE // block_size) * block_size   # keeps blocks aligned across reads
+    with open(source_path, 'rb') as f:
+        while True:
+            chunk = f.read(read_size)
+            if not chunk:
+                break
+            sha256.update(chunk)
+            for start in range(0, len(chunk) - block_size + 1, block_size):
+                index.setdefault(_block_key(chunk[start:start + block_size]), offset + start)
+            offset += len(chunk)
+    return offset, sha256.digest(), index
+
+
+class _DeltaWriter:
+    """Emits ops, merging adjacent copies and batching literal bytes"""
+
+    def __init__(self, fileobj):
+        self._file = fileobj
+        self._copy = None
+        self._data = bytearray()
+        self.copied = 0
+        self.literal = 0
+
+    def copy(self, offset, length):
+        self._flush_data()
+        if self._copy and self._copy[0] + self._copy[1] == offset:
+            self._copy[1] += length
+        else:
+            self._flush_copy()
+            self._copy = [offset, length]
+        self.copied += length
+
+    def data(self, data):
+        self._flush_copy()
+        self._data += data
+        self.literal += len(data)
+        if len(self._data) >= MAX_DATA_RUN:
+            self._flush_data()
+
+    def close(self):
+        self._flush_copy()
+        self._flush_data()
+        self._file.write(OP.pack(OP_END))
+
+    def _flush_copy(self):
+        if self._copy:
+            self._file.write(OP.pack(OP_COPY) + COPY.pack(*self._copy))
+            self._copy = None
+
+    def _flush_data(self):
+        if self._data:
+            self._file.write(OP.pack(OP_DATA) + DATA.pack(len(self._data)))
+            self._file.write(self._data)
+            self._data = bytearray()
+
+
+def _resync(data, pos, expect, block_size, source_size, read_source):
+    """Earliest (target position, source offset) after pos where one of the next source blocks starts
+
+    Searches the read-ahead for a short probe from each candidate block and confirms the
+    whole block before accepting it. Returns (match or None, whether any probe was seen):
+    a probe seen without a confirmed block means repetitive data, not a long new region.
+    """
+    base = 0 if expect is None else -(-expect // block_size) * block_size
+    limit = min(len(data), pos + RESYNC_WINDOW)
+    best = None
+    seen = False
+    for k in range(RESYNC_CANDIDATES):
+        offset = base + k * block_size
+        if offset + RESYNC_PROBE > source_size:
+            break
+        probe = read_source(offset, RESYNC_PROBE)
+        found = data.find(probe, pos + 1, limit)
+        seen = seen or found >= 0
+        for _ in range(4):  # repetitive data can hold the probe many times; give up early
+            if found < 0 or (best and found >= best[0]):
+                break
+            length = min(block_size, source_size - offset, len(data) - found)
+            if read_source(offset, length) == data[found:found + length]:
+                best = (found, offset)
+                break
+            found = data.find(probe, found + 1, limit)
+    return best, seen
+
+
+def create_delta(source_path, target_path, output_path, block_size=DELTA_BLOCK_SIZE):
+    """Write a delta that turns source_path into target_path
+
+    Returns {"source_size", "source_sha256", "target_size", "target_sha256", "delta_size",
+    "copied", "literal"}. Memory use is the block index plus the read-ahead buffer.
+    """
+    source_size, source_digest, index = index_source(source_path, block_size)
+    target_size = os.path.getsize(target_path)
+    target_sha256 = hashlib.sha256()
+    output_path = Path(output_path)
+    with open(source_path, 'rb') as source, open(target_path, 'rb') as target, open(output_path, 'w+b') as out:
+        out.write(HEADER.pack(DELTA_MAGIC, DELTA_VERSION, 0, 0, source_size, source_digest, target_size, bytes(32)))
+        writer = _DeltaWriter(out)
+
+        def read_source(offset, length):
+            source.seek(offset)
+            return source.read(length)
+
+        data = b''
+        pos = 0
+        eof = False
+        expect = None   # source offset the next target bytes most likely continue from
+        while True:
+            if not eof and len(data) - pos < RESYNC_WINDOW + block_size:
+                chunk = target.read(READ_AHEAD)
+                target_sha256.update(chunk)
+                data = data[pos:] + chunk
+                pos = 0
+                eof = not chunk
+            if pos >= len(data):
+                break
+            block = data[pos:pos + block_size]
+
+            # 1. The run continues where the last copy ended
+            if expect is not None and read_source(expect, len(block)) == block:
+                writer.copy(expect, len(block))
+                expect += len(block)
+                pos += len(block)
+                continue
+
+            # 2. The block exists somewhere in the source at an aligned offset
+            offset = index.get(_block_key(block)) if len(block) == block_size else None
+            if offset is not None:
+                writer.copy(offset, block_size)
+                expect = offset + block_size
+                pos += block_size
+                continue
+
+            # 3. Changed bytes: look for where the upcoming source blocks reappear
+            resume, seen = _resync(data, pos, expect, block_size, source_size, read_source)
+            if resume:
+                found, expect = resume
+                writer.data(data[pos:found])
+                pos = found
+            else:
+                # Nothing reappears in the window: it is all new, unless probes matched ambiguously
+                step = block_size if seen else max(block_size, RESYNC_WINDOW - RESYNC_PROBE)
+                step = min(len(data) - pos, step)
+                writer.data(data[pos:pos + step])
+                pos += step
+        writer.close()
+        delta_size = out.tell()
+        out.seek(HEADER.size - 32)
+        out.write(target_sha256.digest())
+    return {
+        "source_size": source_size,
+        "source_sha256": source_digest.hex(),
+        "target_size": target_size,
+        "target_sha256": target_sha256.hexdigest(),
+        "delta_size": delta_size,
+        "copied": writer.copied,
+        "literal": writer.literal,
+    }
+
+
+if __name__ == "__main__":
+    # python delta_patch.py create OLD_FILE NEW_FILE OUT.c26d
+    # python delta_patch.py apply OLD_FILE IN.c26d NEW_FILE
+    if len(sys.argv) == 5 and sys.argv[1] == 'create':
+        result = create_delta(sys.argv[2], sys.argv[3], sys.argv[4])
+        print(f"✅ Delta: {result['delta_size']:,} bytes for a {result['target_size']:,} byte target "
+              f"({result['copied']:,} copied, {result['literal']:,} literal)")
+    elif len(sys.argv) == 5 and sys.argv[1] == 'apply':
+        try:
+            apply_delta(sys.argv[2], sys.argv[3], sys.argv[4])
+        except (OSError, DeltaError) as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+        print(f"✅ Rebuilt {sys.argv[4]}")
+    else:
+        print(__doc__.strip())
+        print("Usage: delta_patch.py create OLD NEW OUT.c26d | apply OLD IN.c26d NEW")
+        sys.exit(2)
@@ -3,19 +3,61 @@ CRICKET 26 MANIFEST GENERATOR
 Generates SHA256 manifest files for game directory verification
 """
 
+import argparse
+import gzip
 import hashlib
+import io
 import json
 import os
+import re
+import sys
+import tempfile
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+try:
+    from cricket26.manifest_format import (BINARY_MANIFEST_MAGIC, BINARY_MANIFEST_SUFFIX, BINARY_MANIFEST_VERSION, COUNT, DIGEST_LEN,
+                                           ENTRY, FLAG_BLOCKS, FLAG_SIZES, HEADER, SIZE, BinaryManifestDecoder, build_merkle_tree,
+                                           decode_binary_manifest)
+except ImportError:  # Run as a script from manifests/: the utility's package sits one folder up
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from cricket26.manifest_format import (BINARY_MANIFEST_MAGIC, BINARY_MANIFEST_SUFFIX, BINARY_MANIFEST_VERSION, COUNT, DIGEST_LEN,
+                                           ENTRY, FLAG_BLOCKS, FLAG_SIZES, HEADER, SIZE, BinaryManifestDecoder, build_merkle_tree,
+                                           decode_binary_manifest)
+
+
+# The .c26m layout, its decoder and the "_merkle" tree encoding live in
+# cricket26/manifest_format.py, shared with the utility; BinaryManifestWriter below is the only encoder.
+DEFAULT_BLOCK_SIZE = 4 * 1024 * 1024
+DEFAULT_BLOCK_THRESHOLD = 64 * 1024 * 1024   # Block hashes only cover files at least this big
+
+HASH_BUFFER_SIZE = 4 * 1024 * 1024
+DEFAULT_WORKERS = min(8, os.cpu_count() or 2)
+STAT_SIDECAR_SUFFIX = '.stat.json'
+DIFF_SUFFIX = '.diff.json'
+PACKING_LIST_SUFFIX = '.packing.json'
+
+EXCLUDE_EXTENSIONS = (
+    '.log', '.tmp', '.cache', '.bak',
+    '.sav', '.dat', '.ini', '.cfg'
+)
+
+EXCLUDE_FOLDERS = (
+    'Logs/', 'Temp/', 'Cache/', 'Saves/',
+    'Screenshots/', 'Replays/'
+)
+
 
 def calculate_sha256(file_path):
     """Calculate SHA256 hash of a file"""
     sha256 = hashlib.sha256()
     try:
         with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b''):
+            while chunk := f.read(HASH_BUFFER_SIZE):
                 sha256.update(chunk)
         return sha256.hexdigest()
     except Exception as e:
@@ -23,34 +65,261 @@ def calculate_sha256(file_path):
         return None
 
 
+def compile_exclusion_matcher(extensions=EXCLUDE_EXTENSIONS, folders=EXCLUDE_FOLDERS):
+    """Compile exclusion rules into a single case-insensitive matcher
+
+    Extensions match at the end of the path, folders anywhere in it.
+    """
+    alternatives = [re.escape(folder) for folder in folders]
+    if extensions:
+        alternatives.append(f"(?:{'|'.join(re.escape(ext) for ext in extensions)})\\Z")
+    if not alternatives:
+        return lambda rel_path: False
+    search = re.compile('|'.join(alternatives), re.IGNORECASE).search
+    return lambda rel_path: search(rel_path) is not None
+
+
+_is_excluded = compile_exclusion_matcher()
+
+
 def should_exclude_file(rel_path):
     """Check if file should be excluded from manifest"""
-    exclude_extensions = [
-        '.log', '.tmp', '.cache', '.bak',
-        '.sav', '.dat', '.ini', '.cfg'
-    ]
-    
-    exclude_folders = [
-        'Logs/', 'Temp/', 'Cache/', 'Saves/',
-        'Screenshots/', 'Replays/'
-    ]
-    
-    # Check extension
-    if any(rel_path.lower().endswith(ext) for ext in exclude_extensions):
-        return True
-    
-    # Check folder
-    if any(folder.lower() in rel_path.lower() for folder in exclude_folders):
-        return True
-    
-    return False
+    return _is_excluded(rel_path)
+
+
+def scan_game_files(game_dir, is_excluded=_is_excluded):
+    """Walk the install once, returning (sorted [(rel_path, size, mtime_ns)], excluded count)"""
+    files = []
+    excluded_count = 0
+    pending = [(str(game_dir), '')]
+    while pending:
+        directory, prefix = pending.pop()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    rel_path = prefix + entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append((entry.path, rel_path + '/'))
+                    elif entry.is_file():
+                        if is_excluded(rel_path):
+                            excluded_count += 1
+                        else:
+                            st = entry.stat()
+                            files.append((rel_path, st.st_size, st.st_mtime_ns))
+        except OSError as e:
+            print(f"❌ Error scanning {directory}: {e}")
+    files.sort()
+    return files, excluded_count
+
+
+def _hash_entry(file_path, with_blocks):
+    """Worker body: (sha256 hex, (size, [block digests]) or None)"""
+    if with_blocks:
+        file_hash, size, digests = hash_file_blocks(file_path)
+        return file_hash, (size, digests)
+    return calculate_sha256(file_path), None
+
+
+def hash_files(game_dir, files, workers=DEFAULT_WORKERS, block_hashes=False, block_threshold=DEFAULT_BLOCK_THRESHOLD,
+                reuse=None):
+    """Hash (rel_path, size, mtime_ns) entries on a thread pool
+
+    Yields (rel_path, size, sha256 hex or None, blocks or None) in input order; only a few
+    files per worker are in flight, so memory stays flat however large the install is.
+    `reuse(rel_path, size, mtime_ns, with_blocks)` may return a known (sha256, blocks) to skip a read.
+    """
+    game_path = Path(game_dir)
+    workers = max(1, workers)
+    entries = iter(files)
+    in_flight = deque()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ManifestHasher') as pool:
+        def submit_next():
+            # Queues reused results until one file actually needs hashing
+            for rel_path, size, mtime_ns in entries:
+                with_blocks = block_hashes and size >= block_threshold
+                known = reuse(rel_path, size, mtime_ns, with_blocks) if reuse else None
+                if known:
+                    in_flight.append((rel_path, size, None, known))
+                    continue
+                in_flight.append((rel_path, size, pool.submit(_hash_entry, game_path / rel_path, with_blocks), None))
+                return
+
+        for _ in range(workers * 4):
+            submit_next()
+        while in_flight:
+            rel_path, size, future, known = in_flight.popleft()
+            if future is None:
+                file_hash, blocks = known
+            else:
+                submit_next()
+                file_hash, blocks = future.result()
+            yield rel_path, size, file_hash, blocks
+
+
+class ThroughputReporter:
+    """Prints files/bytes progress with MB/s and ETA at most every `interval` seconds"""
+
+    def __init__(self, total_files, total_bytes, interval=2.0):
+        self.total_files = total_files
+        self.total_bytes = total_bytes
+        self.interval = interval
+        self.files = 0
+        self.bytes = 0
+        self.started = self._last = time.monotonic()
+
+    def update(self, size):
+        self.files += 1
+        self.bytes += size
+        now = time.monotonic()
+        if now - self._last >= self.interval:
+            self._last = now
+            rate = self.rate()
+            eta = (self.total_bytes - self.bytes) / rate if rate else 0
+            print(f"📊 {self.files}/{self.total_files} files | {self.bytes / 1024**3:.2f}/{self.total_bytes / 1024**3:.2f} GB"
+                  f" | {rate / 1024**2:.1f} MB/s | ETA {int(eta // 60)}m {int(eta % 60)}s")
+
+    def rate(self):
+        return self.bytes / max(time.monotonic() - self.started, 1e-6)
+
+    def summary(self):
+        elapsed = time.monotonic() - self.started
+        return f"{self.files} files, {self.bytes / 1024**3:.2f} GB in {elapsed:.1f}s ({self.rate() / 1024**2:.1f} MB/s)"
 
 
-def generate_manifest(game_dir, version, output_dir="."):
-    """Generate manifest file for game directory"""
+class JsonManifestWriter:
+    """Writes a JSON object key by key, byte-identical to json.dump(indent=2) of the same dict"""
+
+    def __init__(self, fileobj):
+        self._file = fileobj
+        self._empty = True
+        fileobj.write('{')
+
+    def add(self, key, value):
+        text = json.dumps(value, indent=2, ensure_ascii=False).replace('\n', '\n  ')
+        self._file.write('\n' if self._empty else ',\n')
+        self._file.write(f"  {json.dumps(key, ensure_ascii=False)}: {text}")
+        self._empty = False
+
+    def close(self):
+        self._file.write('}' if self._empty else '\n}')
+
+
+# ==============================================================================
+# INCREMENTAL REGENERATION
+# ==============================================================================
+# Every generation writes <version>_manifest.stat.json next to the manifest:
+#   {"game_directory": ..., "files": {path: [size, mtime_ns]}}
+# The next version's run reuses a previous hash when the file's size and mtime are
+# unchanged and the applied patch does not list it (extraction can preserve mtimes).
+
+def load_manifest(manifest_path):
+    """Load a JSON or .c26m manifest in its JSON shape"""
+    return read_manifest(manifest_path)[0]
+
+
+def read_manifest(manifest_path):
+    """Load a manifest plus whatever file sizes are known, as (manifest, {path: size})
+
+    Sizes come from a .c26m's size table, else the stat sidecar next to the manifest;
+    block-hashed files always carry their size in "_blocks".
+    """
+    manifest_path = Path(manifest_path)
+    sizes = {}
+    if manifest_path.suffix == BINARY_MANIFEST_SUFFIX:
+        decoder = BinaryManifestDecoder()
+        decoder.feed(manifest_path.read_bytes())
+        manifest = decoder.finish()
+        sizes.update(decoder.sizes)
+    else:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    sidecar_path = manifest_path.with_suffix(STAT_SIDECAR_SUFFIX)
+    if not sizes and sidecar_path.exists():
+        with open(sidecar_path, 'r', encoding='utf-8') as f:
+            sizes.update((rel_path, stat[0]) for rel_path, stat in json.load(f).get('files', {}).items())
+    for rel_path, file_blocks in ((manifest.get('_blocks') or {}).get('files') or {}).items():
+        sizes.setdefault(rel_path, file_blocks['size'])
+    return manifest, sizes
+
+
+def write_stat_sidecar(output_file, game_dir, files):
+    """Write the size/mtime sidecar for [(rel_path, size, mtime_ns)] and return its path"""
+    output_file = Path(output_file)
+    sidecar = {"game_directory": str(game_dir), "files": {rel_path: [size, mtime_ns] for rel_path, size, mtime_ns in files}}
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(sidecar, f, separators=(',', ':'), ensure_ascii=False)
+    return output_file
+
+
+def load_patch_file_list(list_path):
+    """Paths a patch installs: the members of a patch .zip, or one path per line of a text file
+
+    Zip members are made relative to the folder holding cricket26.exe, as the utility installs them.
+    """
+    list_path = Path(list_path)
+    if zipfile.is_zipfile(list_path):
+        with zipfile.ZipFile(list_path) as archive:
+            names = [info.filename.replace('\\', '/') for info in archive.infolist() if not info.is_dir()]
+        root = next((name[:-len('cricket26.exe')] for name in names
+                     if name.lower() == 'cricket26.exe' or name.lower().endswith('/cricket26.exe')), '')
+        return {name[len(root):] for name in names if name.startswith(root)}
+    with open(list_path, 'r', encoding='utf-8') as f:
+        return {line.strip().replace('\\', '/').lstrip('/') for line in f if line.strip()}
+
+
+class PreviousManifest:
+    """Hashes from an earlier manifest, reusable for files whose size and mtime are unchanged"""
+
+    def __init__(self, manifest, stats=None, patch_files=(), name=''):
+        self.manifest = {k.replace('\\', '/'): v.lower() for k, v in manifest.items() if not k.startswith('_')}
+        block_info = manifest.get('_blocks') or {}
+        self.blocks = block_info.get('files', {}) if block_info.get('block_size') == DEFAULT_BLOCK_SIZE else {}
+        self.stats = stats or {}
+        self.patch_files = set(patch_files)
+        self.name = name
+        self.reused = 0
+
+    @classmethod
+    def load(cls, manifest_path, stats_path=None, patch_list_path=None):
+        """Load a previous manifest, its stat sidecar (next to it by default) and an optional patch file list"""
+        manifest_path = Path(manifest_path)
+        stats_path = Path(stats_path) if stats_path else manifest_path.with_suffix(STAT_SIDECAR_SUFFIX)
+        stats = None
+        if stats_path.exists():
+            with open(stats_path, 'r', encoding='utf-8') as f:
+                stats = json.load(f).get('files')
+        else:
+            print(f"⚠️ Warning: no stat sidecar at {stats_path}, every file will be rehashed")
+        patch_files = load_patch_file_list(patch_list_path) if patch_list_path else ()
+        return cls(load_manifest(manifest_path), stats, patch_files, manifest_path.name)
+
+    def lookup(self, rel_path, size, mtime_ns, with_blocks):
+        """(sha256, blocks) from the previous manifest if the file cannot have changed, else None"""
+        file_hash = self.manifest.get(rel_path)
+        if not file_hash or rel_path in self.patch_files or self.stats.get(rel_path) != [size, mtime_ns]:
+            return None
+        blocks = None
+        if with_blocks:
+            file_blocks = self.blocks.get(rel_path)
+            if not file_blocks or file_blocks.get('size') != size:
+                return None
+            blocks = (size, [bytes.fromhex(h) for h in file_blocks['hashes']])
+        self.reused += 1
+        return file_hash, blocks
+
+
+def generate_manifest(game_dir, version, output_dir=".", binary=True, block_hashes=False, merkle=False,
+                      block_threshold=DEFAULT_BLOCK_THRESHOLD, workers=DEFAULT_WORKERS, json_output=True,
+                      interactive=True, previous=None):
+    """Generate manifest file (and its binary companion) for game directory
+
+    Files are hashed on `workers` threads and both outputs are written as results arrive,
+    in sorted path order, so the result is the same whatever the worker count. With a
+    PreviousManifest only changed files are read, and a <version>_manifest.diff.json is written.
+    """
     print(f"\n🔍 Scanning Cricket 26 directory: {game_dir}")
     print(f"📦 Version: {version}")
-    print(f"⏳ This may take a few minutes...\n")
+    print("⏳ This may take a few minutes...\n")
     
     game_path = Path(game_dir)
     
@@ -62,61 +331,388 @@ def generate_manifest(game_dir, version, output_dir="."):
     exe_path = game_path / "cricket26.exe"
     if not exe_path.exists():
         print(f"⚠️ Warning: cricket26.exe not found in {game_dir}")
-        response = input("Continue anyway? (y/n): ")
-        if response.lower() != 'y':
-            return False
+        if interactive:
+            response = input("Continue anyway? (y/n): ")
+            if response.lower() != 'y':
+                return False
     
-    manifest = {}
-    file_count = 0
-    excluded_count = 0
+    files, excluded_count = scan_game_files(game_path)
+    total_bytes = sum(size for _, size, _ in files)
+    print(f"📁 Found {len(files)} files ({total_bytes / 1024**3:.2f} GB), hashing with {workers} workers...")
+    with_blocks = block_hashes and any(size >= block_threshold for _, size, _ in files)
     
-    # Scan all files
-    for file_path in game_path.rglob('*'):
-        if file_path.is_file():
-            # Calculate relative path
-            rel_path = str(file_path.relative_to(game_path)).replace('\\', '/')
-            
-            # Check if should exclude
-            if should_exclude_file(rel_path):
-                excluded_count += 1
-                continue
-            
-            # Calculate SHA256
-            file_hash = calculate_sha256(file_path)
-            
-            if file_hash:
-                manifest[rel_path] = file_hash
-                file_count += 1
-                
-                # Progress indicator
-                if file_count % 100 == 0:
-                    print(f"📊 Processed {file_count} files...")
-    
-    # Add metadata
-    manifest_with_metadata = {
+    output_file = Path(output_dir) / f"{version}_manifest.json"
+    binary_file = output_file.with_suffix(BINARY_MANIFEST_SUFFIX)
+    head = {
         "_comment": f"Cricket 26 v{version} - File Manifest",
         "_description": f"SHA256 checksums for all game files in version {version}",
         "_generated": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
-        "_file_count": file_count,
-        "_excluded_count": excluded_count,
         "_game_directory": str(game_dir),
-        **manifest
     }
     
-    # Save manifest
-    output_file = Path(output_dir) / f"{version}_manifest.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(manifest_with_metadata, f, indent=2, ensure_ascii=False)
+    json_file = open(output_file, 'w', encoding='utf-8') if json_output else None
+    json_writer = JsonManifestWriter(json_file) if json_file else None
+    binary_writer = BinaryManifestWriter(sizes=True, block_size=DEFAULT_BLOCK_SIZE if with_blocks else 0) if binary else None
+    reporter = ThroughputReporter(len(files), total_bytes)
+    digests = {} if merkle or previous else None
+    blocks = {}
+    file_count = 0
+    try:
+        if json_writer:
+            for key, value in head.items():
+                json_writer.add(key, value)
+    
+        # Per-block hashes of large files come from the same read as the file hash
+        for rel_path, size, file_hash, file_blocks in hash_files(game_path, files, workers, block_hashes, block_threshold,
+                                                                 previous.lookup if previous else None):
+            reporter.update(size)
+            if not file_hash:
+                continue
+            if file_blocks:
+                size = file_blocks[0]
+                blocks[rel_path] = {"size": size, "hashes": [b.hex() for b in file_blocks[1]]}
+            if json_writer:
+                json_writer.add(rel_path, file_hash)
+            if binary_writer:
+                binary_writer.add(rel_path, file_hash, size, file_blocks)
+            if digests is not None:
+                digests[rel_path] = file_hash
+            file_count += 1
     
-    print(f"\n✅ Manifest generated successfully!")
-    print(f"📄 File: {output_file}")
+        # Counts and trees are only known once every file is hashed, so they follow the entries
+        tail = {"_file_count": file_count, "_excluded_count": excluded_count}
+        if merkle:
+            tail["_merkle"] = build_merkle_tree(digests)
+        if blocks:
+            tail["_blocks"] = {"block_size": DEFAULT_BLOCK_SIZE, "files": blocks}
+        if json_writer:
+            for key, value in tail.items():
+                json_writer.add(key, value)
+            json_writer.close()
+        if binary_writer:
+            metadata = {k: v for k, v in {**head, **tail}.items() if k != '_blocks'}
+            with open(binary_file, 'wb') as f:
+                binary_writer.finish(metadata, f)
+    finally:
+        if json_file:
+            json_file.close()
+        if binary_writer:
+            binary_writer.close()
+
+    stat_file = write_stat_sidecar(output_file.with_suffix(STAT_SIDECAR_SUFFIX), game_dir, files)
+    if previous:
+        new_sizes = {rel_path: size for rel_path, size, _ in files}
+        old_sizes = {rel_path: stat[0] for rel_path, stat in previous.stats.items()}
+        diff, diff_file, _ = write_diff(previous.manifest, digests, output_file, previous.name, old_sizes, new_sizes)
+    
+    print("\n✅ Manifest generated successfully!")
+    if json_output:
+        print(f"📄 File: {output_file}")
     print(f"📊 Files included: {file_count}")
     print(f"⏭️ Files excluded: {excluded_count}")
-    print(f"💾 File size: {output_file.stat().st_size / 1024:.2f} KB")
+    print(f"⚡ Processed {reporter.summary()}")
+    if previous:
+        print(f"♻️ Reused {previous.reused} unchanged hashes from {previous.name}")
+        print(f"🔀 Diff: {format_diff_summary(diff)} → {diff_file.name}")
+    if json_output:
+        print(f"💾 File size: {output_file.stat().st_size / 1024:.2f} KB")
+    
+    if binary:
+        print(f"📦 Binary manifest: {binary_file} ({binary_file.stat().st_size / 1024:.2f} KB)")
+    print(f"🗂️ Stat sidecar: {stat_file.name}")
     
     return True
 
 
+def hash_file_blocks(file_path, block_size=DEFAULT_BLOCK_SIZE):
+    """Hash a file in one pass, returning (sha256 hex, size, [block digests])"""
+    whole = hashlib.sha256()
+    blocks = []
+    size = 0
+    try:
+        with open(file_path, 'rb') as f:
+            while chunk := f.read(block_size):
+                whole.update(chunk)
+                blocks.append(hashlib.sha256(chunk).digest())
+                size += len(chunk)
+        return whole.hexdigest(), size, blocks
+    except Exception as e:
+        print(f"❌ Error reading {file_path}: {e}")
+        return None, 0, []
+
+
+def _block_count(size, block_size):
+    """Number of blocks a file of the given size is split into"""
+    return (size + block_size - 1) // block_size if block_size else 0
+
+
+class BinaryManifestWriter:
+    """Incremental .c26m encoder; add() entries in sorted path order, then finish()
+
+    Entries are spooled to a temporary file since the header (entry count, metadata) precedes them.
+    """
+
+    def __init__(self, sizes=False, block_size=0):
+        self.flags = (FLAG_SIZES if sizes else 0) | (FLAG_BLOCKS if block_size else 0)
+        self.block_size = block_size
+        self.count = 0
+        self._previous = None
+        self._body = tempfile.SpooledTemporaryFile(max_size=16 * 1024 * 1024)
+
+    def add(self, rel_path, hex_digest, size=None, blocks=None):
+        """Append one entry; blocks is (file size, [raw block digests]) or None"""
+        path_bytes = rel_path.replace('\\', '/').encode('utf-8')
+        if self._previous is not None and path_bytes <= self._previous:
+            raise ValueError(f"Binary manifest entries must be added in sorted order: {rel_path}")
+        previous = self._previous or b''
+        shared = 0
+        limit = min(len(previous), len(path_bytes), 0xFFFF)
+        while shared < limit and previous[shared] == path_bytes[shared]:
+            shared += 1
+        suffix = path_bytes[shared:]
+        if len(suffix) > 0xFFFF:
+            raise ValueError(f"Path too long for binary manifest: {rel_path}")
+        digest = bytes.fromhex(hex_digest)
+        if len(digest) != DIGEST_LEN:
+            raise ValueError(f"Not a SHA256 digest for {rel_path}: {hex_digest}")
+        parts = [ENTRY.pack(shared, len(suffix)), suffix, digest]
+        if self.flags & FLAG_SIZES:
+            parts.append(SIZE.pack(size))
+        if self.flags & FLAG_BLOCKS:
+            if not blocks:
+                parts.append(COUNT.pack(0))
+            else:
+                file_size, digests = blocks
+                if len(digests) != _block_count(file_size, self.block_size):
+                    raise ValueError(f"Block hash count does not match size for {rel_path}")
+                parts.extend((COUNT.pack(len(digests)), SIZE.pack(file_size)))
+                parts.extend(digests)
+        self._body.write(b''.join(parts))
+        self._previous = path_bytes
+        self.count += 1
+
+    def finish(self, metadata, fileobj):
+        """Write the gzip stream (header, metadata, entries, trailer) to fileobj"""
+        meta_bytes = json.dumps(metadata, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        header = HEADER.pack(BINARY_MANIFEST_MAGIC, BINARY_MANIFEST_VERSION, self.flags, 0, self.count, self.block_size, len(meta_bytes))
+        body_hash = hashlib.sha256(header + meta_bytes)
+        # No file name and mtime=0 keep the output byte-identical for identical input
+        with gzip.GzipFile(filename='', mode='wb', fileobj=fileobj, compresslevel=9, mtime=0) as gz:
+            gz.write(header + meta_bytes)
+            self._body.seek(0)
+            while chunk := self._body.read(1024 * 1024):
+                body_hash.update(chunk)
+                gz.write(chunk)
+            gz.write(body_hash.digest())
+        self.close()
+
+    def close(self):
+        self._body.close()
+
+
+def encode_binary_manifest(manifest, sizes=None):
+    """Encode a {path: sha256} manifest (plus optional sizes and "_blocks") to .c26m bytes"""
+    block_info = manifest.get('_blocks') or {}
+    block_files = block_info.get('files', {})
+    block_size = block_info.get('block_size', 0) if block_files else 0
+    metadata = {k: v for k, v in manifest.items() if k.startswith('_') and k != '_blocks'}
+    entries = sorted((k.replace('\\', '/'), v) for k, v in manifest.items() if not k.startswith('_'))
+
+    writer = BinaryManifestWriter(sizes=sizes is not None, block_size=block_size)
+    for rel_path, hex_digest in entries:
+        file_blocks = block_files.get(rel_path) if block_size else None
+        writer.add(rel_path, hex_digest, sizes[rel_path] if sizes is not None else None,
+                   (file_blocks['size'], [bytes.fromhex(h) for h in file_blocks['hashes']]) if file_blocks else None)
+    output = io.BytesIO()
+    writer.finish(metadata, output)
+    return output.getvalue()
+
+
+def write_binary_manifest(manifest, output_file, sizes=None):
+    """Write the binary companion of a manifest and return its path"""
+    output_file = Path(output_file)
+    output_file.write_bytes(encode_binary_manifest(manifest, sizes))
+    return output_file
+
+
+def convert_manifest(json_path, output_path=None):
+    """Convert an existing JSON manifest to the binary format"""
+    json_path = Path(json_path)
+    output_path = Path(output_path) if output_path else json_path.with_suffix(BINARY_MANIFEST_SUFFIX)
+    with open(json_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    write_binary_manifest(manifest, output_path)
+    expected = {k if k.startswith('_') else k.replace('\\', '/'): v if k.startswith('_') else v.lower()
+                for k, v in manifest.items()}
+    if decode_binary_manifest(output_path.read_bytes()) != expected:
+        raise ValueError(f"Round-trip check failed for {output_path}")
+
+    print(f"✅ Converted {json_path.name} → {output_path.name}")
+    print(f"💾 {json_path.stat().st_size / 1024:.2f} KB → {output_path.stat().st_size / 1024:.2f} KB")
+    return output_path
+
+
+# ==============================================================================
+# MANIFEST DIFF ENGINE
+# ==============================================================================
+# Both manifests are reduced to (path, digest, size) tuples sorted by path and merged
+# in a single pass; only the added/removed remainder is indexed by digest to find renames.
+
+def _sorted_entries(manifest, sizes=None):
+    """Manifest files as a path-sorted list of (path, lowercase sha256, size or None)"""
+    sizes = sizes or {}
+    return sorted((k.replace('\\', '/'), v.lower(), sizes.get(k.replace('\\', '/')))
+                  for k, v in manifest.items() if k[:1] != '_')
+
+
+def compare_manifests(old_manifest, new_manifest, old_sizes=None, new_sizes=None):
+    """Diff two manifests with byte totals
+
+    Returns added/removed/modified paths, renamed [{"from", "to"}] pairs (a removed path whose
+    exact content reappears under an added path), the unchanged count and byte totals. Added,
+    modified and renamed bytes are new sizes, removed bytes old sizes; paths without a known
+    size are counted in "unknown_sizes".
+    """
+    old_entries = _sorted_entries(old_manifest, old_sizes)
+    new_entries = _sorted_entries(new_manifest, new_sizes)
+    added, removed, modified = [], [], []
+    unchanged = 0
+    i = j = 0
+    old_count, new_count = len(old_entries), len(new_entries)
+    while i < old_count and j < new_count:
+        old_entry, new_entry = old_entries[i], new_entries[j]
+        if old_entry[0] == new_entry[0]:
+            if old_entry[1] != new_entry[1]:
+                modified.append(new_entry)
+            else:
+                unchanged += 1
+            i += 1
+            j += 1
+        elif old_entry[0] < new_entry[0]:
+            removed.append(old_entry)
+            i += 1
+        else:
+            added.append(new_entry)
+            j += 1
+    removed.extend(old_entries[i:])
+    added.extend(new_entries[j:])
+
+    # A removed file whose digest reappears under an added path was renamed or moved
+    removed_by_digest = {}
+    for entry in removed:
+        removed_by_digest.setdefault(entry[1], []).append(entry)
+    renamed, renamed_to, renamed_from = [], [], set()
+    for entry in added:
+        sources = removed_by_digest.get(entry[1])
+        if sources:
+            source = sources.pop(0)
+            renamed.append({"from": source[0], "to": entry[0]})
+            renamed_to.append(entry)
+            renamed_from.add(source[0])
+    renamed_paths = {pair["to"] for pair in renamed}
+    added = [entry for entry in added if entry[0] not in renamed_paths]
+    removed = [entry for entry in removed if entry[0] not in renamed_from]
+
+    unknown = 0
+
+    def total(entries):
+        nonlocal unknown
+        byte_count = 0
+        for _, _, size in entries:
+            if size is None:
+                unknown += 1
+            else:
+                byte_count += size
+        return byte_count
+
+    return {
+        "added": [entry[0] for entry in added],
+        "removed": [entry[0] for entry in removed],
+        "modified": [entry[0] for entry in modified],
+        "renamed": renamed,
+        "unchanged": unchanged,
+        "bytes": {
+            "added": total(added),
+            "removed": total(removed),
+            "modified": total(modified),
+            "renamed": total(renamed_to),
+        },
+        "unknown_sizes": unknown,
+    }
+
+
+def diff_manifests(old_manifest, new_manifest):
+    """Added/removed/modified paths between two manifests, with renames counted as remove + add"""
+    diff = compare_manifests(old_manifest, new_manifest)
+    return {
+        'added': sorted(diff['added'] + [pair['to'] for pair in diff['renamed']]),
+        'removed': sorted(diff['removed'] + [pair['from'] for pair in diff['renamed']]),
+        'modified': diff['modified'],
+    }
+
+
+def build_packing_list(diff, new_manifest, new_sizes=None):
+    """Files a patch from the diff must ship, with size, SHA256 and why each is included
+
+    The updater only copies files in, so renamed files are packed too ("from" names their
+    old path); "obsolete" lists paths the new version no longer has.
+    """
+    new_sizes = new_sizes or {}
+    digests = {k.replace('\\', '/'): v.lower() for k, v in new_manifest.items() if k[:1] != '_'}
+    reasons = [(path, "added", None) for path in diff["added"]] + [(path, "modified", None) for path in diff["modified"]]
+    reasons += [(pair["to"], "renamed", pair["from"]) for pair in diff["renamed"]]
+    files = []
+    for path, reason, source in sorted(reasons):
+        entry = {"path": path, "size": new_sizes.get(path), "sha256": digests[path], "reason": reason}
+        if source:
+            entry["from"] = source
+        files.append(entry)
+    return {
+        "files": files,
+        "obsolete": diff["removed"],
+        "total_bytes": sum(entry["size"] or 0 for entry in files),
+        "unknown_sizes": sum(1 for entry in files if entry["size"] is None),
+    }
+
+
+def format_diff_summary(diff):
+    """One-line summary of a compare_manifests() result"""
+    mb = {key: value / 1024**2 for key, value in diff["bytes"].items()}
+    return (f"{len(diff['added'])} added ({mb['added']:.1f} MB), {len(diff['removed'])} removed, "
+            f"{len(diff['modified'])} modified ({mb['modified']:.1f} MB), {len(diff['renamed'])} renamed")
+
+
+def write_diff(old_manifest, new_manifest, new_manifest_path, old_name, old_sizes=None, new_sizes=None):
+    """Write <new>.diff.json and <new>.packing.json; returns (diff, diff path, packing list path)"""
+    new_manifest_path = Path(new_manifest_path)
+    diff = compare_manifests(old_manifest, new_manifest, old_sizes, new_sizes)
+    header = {"from": old_name, "to": new_manifest_path.name}
+    diff_file = new_manifest_path.with_suffix(DIFF_SUFFIX)
+    with open(diff_file, 'w', encoding='utf-8') as f:
+        json.dump({**header, **diff}, f, indent=2, ensure_ascii=False)
+    packing_file = new_manifest_path.with_suffix(PACKING_LIST_SUFFIX)
+    with open(packing_file, 'w', encoding='utf-8') as f:
+        json.dump({**header, **build_packing_list(diff, new_manifest, new_sizes)}, f, indent=2, ensure_ascii=False)
+    return diff, diff_file, packing_file
+
+
+def diff_manifest_files(old_path, new_path):
+    """Compare two manifest files and write the diff and packing list next to the new one"""
+    started = time.perf_counter()
+    old_manifest, old_sizes = read_manifest(old_path)
+    new_manifest, new_sizes = read_manifest(new_path)
+    loaded = time.perf_counter()
+    diff, diff_file, packing_file = write_diff(old_manifest, new_manifest, new_path, Path(old_path).name, old_sizes, new_sizes)
+    print(f"🔀 {Path(old_path).name} → {Path(new_path).name}: {format_diff_summary(diff)}, {diff['unchanged']} unchanged")
+    if diff["unknown_sizes"]:
+        print(f"⚠️ {diff['unknown_sizes']} files have no known size (no stat sidecar or binary size table); byte totals exclude them")
+    print(f"📄 Diff: {diff_file}")
+    print(f"📦 Packing list: {packing_file}")
+    print(f"⚡ Loaded in {(loaded - started) * 1000:.0f} ms, compared in {(time.perf_counter() - loaded) * 1000:.0f} ms")
+    return diff
+
+
 def interactive_mode():
     """Interactive manifest generation"""
     print("\n" + "="*60)
@@ -142,7 +738,7 @@ def interactive_mode():
         return
     
     # Confirm
-    print(f"\n📋 Summary:")
+    print("\n📋 Summary:")
     print(f"   Directory: {game_dir}")
     print(f"   Version: {version}")
     print(f"   Output: {version}_manifest.json")
@@ -160,7 +756,47 @@ def quick_generate(game_dir, version):
     return generate_manifest(game_dir, version)
 
 
+def cli_mode(argv):
+    """Non-interactive generation: python generate_manifest.py GAME_DIR VERSION [options]"""
+    parser = argparse.ArgumentParser(prog="generate_manifest.py", description="Generate a Cricket 26 file manifest without prompts.")
+    parser.add_argument("game_dir", help="Cricket 26 installation directory")
+    parser.add_argument("version", help="Version number, e.g. 1.0.4")
+    parser.add_argument("-o", "--output-dir", default=".", help="Directory for the manifest files (default: current directory)")
+    parser.add_argument("-j", "--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Hashing threads (default: {DEFAULT_WORKERS}; use 1 for spinning disks)")
+    parser.add_argument("--format", choices=("both", "json", "binary"), default="both", help="Manifest output format (default: both)")
+    parser.add_argument("--blocks", action="store_true", help="Add per-block hashes for large files")
+    parser.add_argument("--block-threshold-mb", type=int, default=DEFAULT_BLOCK_THRESHOLD // (1024 * 1024),
+                        help="Minimum file size for block hashes, in MB")
+    parser.add_argument("--merkle", action="store_true", help="Add a Merkle tree of directory hashes")
+    parser.add_argument("--previous", help="Previous version's manifest; only files changed since it are rehashed")
+    parser.add_argument("--previous-stats", help=f"Stat sidecar of --previous (default: next to it, *{STAT_SIDECAR_SUFFIX})")
+    parser.add_argument("--patch-files", help="Patch .zip (or text list of paths) applied since --previous; its files are always rehashed")
+    args = parser.parse_args(argv)
+    if args.patch_files and not args.previous:
+        parser.error("--patch-files requires --previous")
+    previous = PreviousManifest.load(args.previous, args.previous_stats, args.patch_files) if args.previous else None
+    return generate_manifest(args.game_dir, args.version, args.output_dir, binary=args.format != "json",
+                             block_hashes=args.blocks, merkle=args.merkle, block_threshold=args.block_threshold_mb * 1024 * 1024,
+                             workers=args.workers, json_output=args.format != "binary", interactive=False, previous=previous)
+
+
 if __name__ == "__main__":
+    # Convert existing JSON manifests: python generate_manifest.py --convert a.json [b.json ...]
+    if len(sys.argv) > 2 and sys.argv[1] == '--convert':
+        for json_file in sys.argv[2:]:
+            convert_manifest(json_file)
+        sys.exit(0)
+
+    # Compare two manifests: python generate_manifest.py --diff 1.0.2_manifest.json 1.0.3_manifest.json
+    if len(sys.argv) == 4 and sys.argv[1] == '--diff':
+        diff_manifest_files(sys.argv[2], sys.argv[3])
+        sys.exit(0)
+
+    # Generate without prompts: python generate_manifest.py "C:/Games/Cricket 26" 1.0.4 --workers 8
+    if len(sys.argv) > 1:
+        sys.exit(0 if cli_mode(sys.argv[1:]) else 1)
+
     # Run interactive mode
     interactive_mode()
     
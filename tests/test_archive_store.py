@@ -0,0 +1,61 @@
+import hashlib
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from cricket26.core import ArchiveStore
+
+
+class ArchiveStoreTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def stage(self, data):
+        path = self.cache_dir / "download.part"
+        path.write_bytes(data)
+        return path, hashlib.sha256(data).hexdigest()
+
+    def test_for_cache_shares_one_instance_per_directory(self):
+        store = ArchiveStore.for_cache(self.cache_dir)
+        self.assertIs(ArchiveStore.for_cache(self.cache_dir / "."), store)
+        with tempfile.TemporaryDirectory() as other:
+            self.assertIsNot(ArchiveStore.for_cache(Path(other)), store)
+
+    def test_missing_index_over_empty_store_is_not_rescanned(self):
+        store = ArchiveStore(self.cache_dir)
+        self.assertEqual(store.total_bytes, 0)
+        with mock.patch.object(ArchiveStore, "_scan", side_effect=AssertionError("rescanned")):
+            self.assertEqual(store.total_bytes, 0)
+            self.assertIsNone(store.lookup("1.0_1.1"))
+
+    def test_unindexed_archives_are_adopted_on_first_load(self):
+        writer = ArchiveStore(self.cache_dir)
+        path, digest = self.stage(b"indexed")
+        writer.add(path, digest, ["1.0_1.1"])
+        orphan = writer.path_for(hashlib.sha256(b"orphan").hexdigest())
+        orphan.write_bytes(b"orphan")
+        store = ArchiveStore(self.cache_dir)
+        self.assertEqual(store.total_bytes, len(b"indexed") + len(b"orphan"))
+        index = json.loads(store.index_path.read_text(encoding="utf-8"))
+        self.assertIsNone(index["archives"][orphan.stem]["verified_at"])
+
+    def test_evict_skips_protected_digests(self):
+        store = ArchiveStore(self.cache_dir)
+        digests = []
+        for data in (b"old archive", b"new archive"):
+            path, digest = self.stage(data)
+            store.add(path, digest, [data.decode()])
+            digests.append(digest)
+        self.assertEqual(store.evict(protect=[digests[0]], max_bytes=0), [digests[1]])
+        self.assertTrue(store.path_for(digests[0]).is_file())
+        self.assertEqual(store.total_bytes, len(b"old archive"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import hashlib
+import json
+import tempfile
+import unittest
+import zipfile
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from manifests.build_patch import build_patch
+
+
+def write_tree(root, files):
+    for rel_path, data in files.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+
+class ExcludedFilesTests(unittest.TestCase):
+    USER_FILES = {"settings.ini": b"[video]\nfullscreen=1\n", "Logs/run.log": b"started\n"}
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.old_dir, self.new_dir = self.root / "old", self.root / "new"
+        write_tree(self.old_dir, {"a.pak": b"old", "b.pak": b"same", **self.USER_FILES})
+        write_tree(self.new_dir, {"a.pak": b"new", "b.pak": b"same", **self.USER_FILES})
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def packed(self, **kwargs):
+        with redirect_stdout(StringIO()):
+            build_patch(self.new_dir, self.root / "patch.zip", delta_min_size=0, **kwargs)
+        with zipfile.ZipFile(self.root / "patch.zip") as archive:
+            return archive.namelist()
+
+    def test_patch_against_a_manifest_packs_only_game_files(self):
+        manifest = {"_comment": "v1.0", **{rel_path: hashlib.sha256((self.old_dir / rel_path).read_bytes()).hexdigest()
+                                          for rel_path in ("a.pak", "b.pak")}}
+        manifest_file = self.root / "old.json"
+        manifest_file.write_text(json.dumps(manifest), encoding="utf-8")
+        self.assertEqual(self.packed(old_manifest=manifest_file), ["a.pak"])
+
+    def test_folder_patch_skips_changed_user_files(self):
+        write_tree(self.new_dir, {"settings.ini": b"[video]\nfullscreen=0\n", "Logs/run.log": b"maintainer run\n"})
+        self.assertEqual(self.packed(old_dir=self.old_dir), ["a.pak"])
+
+
+if __name__ == "__main__":
+    unittest.main()
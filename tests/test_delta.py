@@ -0,0 +1,91 @@
+import random
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from cricket26.core import DeltaPatcher
+from cricket26.delta_format import DeltaError, apply_delta
+from manifests.delta_patch import create_delta
+
+BLOCK_SIZE = 64
+
+
+def sample(size, seed):
+    return random.Random(seed).randbytes(size)
+
+
+class DeltaRoundTripTests(unittest.TestCase):
+    SOURCE = sample(64 * 1024, 1)
+    EDITS = {
+        "insert": SOURCE[:20000] + sample(3000, 2) + SOURCE[20000:],
+        "delete": SOURCE[:10000] + SOURCE[30000:],
+        "overwrite": SOURCE[:40000] + sample(5000, 3) + SOURCE[45000:],
+    }
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def make_delta(self, source, target):
+        source_path, target_path, delta_path = self.root / "source.pak", self.root / "target.pak", self.root / "source.pak.c26d"
+        source_path.write_bytes(source)
+        target_path.write_bytes(target)
+        stats = create_delta(source_path, target_path, delta_path, block_size=BLOCK_SIZE)
+        return source_path, delta_path, stats
+
+    def test_apply_delta_rebuilds_the_target(self):
+        for name, target in self.EDITS.items():
+            with self.subTest(name):
+                source_path, delta_path, stats = self.make_delta(self.SOURCE, target)
+                self.assertGreater(stats["copied"], 0)
+                self.assertLess(stats["delta_size"], len(target))
+                output_path = self.root / "rebuilt.pak"
+                apply_delta(source_path, delta_path, output_path)
+                self.assertEqual(output_path.read_bytes(), target)
+
+    def test_utility_patcher_rebuilds_the_target_in_place(self):
+        for name, target in self.EDITS.items():
+            with self.subTest(name):
+                source_path, delta_path, _ = self.make_delta(self.SOURCE, target)
+                DeltaPatcher().apply(delta_path, source_path, threading.Event())
+                self.assertEqual(source_path.read_bytes(), target)
+                self.assertFalse((self.root / "source.pak.c26new").exists())
+
+    def test_source_hash_mismatch_raises_and_leaves_the_file(self):
+        source_path, delta_path, _ = self.make_delta(self.SOURCE, self.EDITS["overwrite"])
+        modified = bytearray(self.SOURCE)
+        modified[100] ^= 0xFF
+        source_path.write_bytes(modified)
+        with self.assertRaises(DeltaError):
+            apply_delta(source_path, delta_path, self.root / "rebuilt.pak")
+        with self.assertRaises(ValueError):
+            DeltaPatcher().apply(delta_path, source_path, threading.Event())
+        self.assertEqual(source_path.read_bytes(), bytes(modified))
+
+    def test_truncated_delta_raises_and_leaves_the_file(self):
+        source_path, delta_path, _ = self.make_delta(self.SOURCE, self.EDITS["insert"])
+        data = delta_path.read_bytes()
+        for cut in (10, len(data) // 2, len(data) - 1):
+            with self.subTest(cut=cut):
+                delta_path.write_bytes(data[:cut])
+                with self.assertRaises(DeltaError):
+                    apply_delta(source_path, delta_path, self.root / "rebuilt.pak")
+                with self.assertRaises(ValueError):
+                    DeltaPatcher().apply(delta_path, source_path, threading.Event())
+                self.assertEqual(source_path.read_bytes(), self.SOURCE)
+
+    def test_cancel_interrupts_the_utility_patcher(self):
+        source_path, delta_path, _ = self.make_delta(self.SOURCE, self.EDITS["delete"])
+        cancel_event = threading.Event()
+        cancel_event.set()
+        with self.assertRaises(InterruptedError):
+            DeltaPatcher().apply(delta_path, source_path, cancel_event)
+        self.assertEqual(source_path.read_bytes(), self.SOURCE)
+
+
+if __name__ == "__main__":
+    unittest.main()
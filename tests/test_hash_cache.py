@@ -0,0 +1,77 @@
+import hashlib
+import queue
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from cricket26.core import GameVerifier, LocalHashCache
+from cricket26.manifest_format import build_merkle_tree
+
+
+def digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+FILES = {
+    "cricket26.exe": b"exe",
+    "data/a.pak": b"a",
+    "data/b.pak": b"b",
+    "data/stadiums/lords.pak": b"lords",
+    "data/stadiums/mcg.pak": b"mcg",
+    "movies/intro.bk2": b"intro",
+}
+
+
+class MerkleTreeTests(unittest.TestCase):
+    def test_node_encoding(self):
+        tree = build_merkle_tree({"x/f.pak": digest(b"f"), "g.pak": digest(b"g")})
+        x = hashlib.sha256(b"Ff.pak\0" + bytes.fromhex(digest(b"f"))).hexdigest()
+        root = hashlib.sha256(b"Fg.pak\0" + bytes.fromhex(digest(b"g")) + b"Dx\0" + bytes.fromhex(x)).hexdigest()
+        self.assertEqual(tree, {"x": x, "": root})
+
+    def test_ignores_metadata_and_normalizes_paths(self):
+        manifest = {"_comment": "v1", "data\\a.pak": digest(b"a").upper()}
+        self.assertEqual(build_merkle_tree(manifest), build_merkle_tree({"data/a.pak": digest(b"a")}))
+
+
+class HashCacheConfirmTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        root = Path(self._tmp.name)
+        self.game_dir, self.cache_dir = root / "game", root / "cache"
+        for rel_path, data in FILES.items():
+            path = self.game_dir / rel_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+        self.manifest = {rel_path: digest(data) for rel_path, data in FILES.items()}
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def confirm(self, cached, manifest_data=None):
+        hash_cache = LocalHashCache(self.game_dir, self.cache_dir)
+        for rel_path, value in cached.items():
+            hash_cache.store(rel_path, (self.game_dir / rel_path).stat(), value)
+        verifier = GameVerifier(self.game_dir, manifest_data or dict(self.manifest), queue.Queue(), threading.Event(), threading.Event(), hash_cache=hash_cache)
+        _, confirmed = verifier._confirm_from_hash_cache(self.manifest, set(self.manifest))
+        return confirmed
+
+    def test_fully_cached_install_is_confirmed(self):
+        self.assertEqual(self.confirm(self.manifest), sorted(self.manifest))
+
+    def test_published_tree_is_used(self):
+        manifest_data = {**self.manifest, "_merkle": build_merkle_tree(self.manifest)}
+        self.assertEqual(self.confirm(self.manifest, manifest_data), sorted(self.manifest))
+
+    def test_uncached_file_only_excludes_itself(self):
+        cached = {k: v for k, v in self.manifest.items() if k != "data/stadiums/mcg.pak"}
+        self.assertEqual(self.confirm(cached), sorted(cached))
+
+    def test_stale_digest_is_not_confirmed(self):
+        cached = {**self.manifest, "data/a.pak": digest(b"old")}
+        self.assertEqual(self.confirm(cached), sorted(k for k in self.manifest if k != "data/a.pak"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+from pathlib import Path
+
+from cricket26.logview import (
+    LOG_LEVELS, index_log_lines, parse_wevtutil_events, render_event_logs, render_log_lines, slice_log_block,
+)
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+class WevtutilTests(unittest.TestCase):
+    def setUp(self):
+        self.output = (FIXTURES / "wevtutil_application.txt").read_text(encoding="utf-8")
+
+    def test_parses_captured_text_output(self):
+        events = parse_wevtutil_events(self.output, 10)
+        self.assertEqual(events[0], {"time": "2025-10-02 21:14:07", "source": "Application Error", "event_id": "1000", "level": "Error"})
+        self.assertEqual([event["level"] for event in events], ["Error", "Info", "Warning", "Error", "Info"])
+        self.assertEqual([event["event_id"] for event in events], ["1000", "1001", "10010", "Unknown", "916"])
+
+    def test_empty_fields_fall_back_to_unknown(self):
+        event = parse_wevtutil_events(self.output, 10)[3]
+        self.assertEqual((event["source"], event["event_id"]), ("Unknown", "Unknown"))
+
+    def test_limit_keeps_the_newest_events(self):
+        events = parse_wevtutil_events(self.output, 2)
+        self.assertEqual([event["event_id"] for event in events], ["1000", "1001"])
+
+    def test_no_events(self):
+        self.assertEqual(parse_wevtutil_events("", 5), [])
+        self.assertEqual(parse_wevtutil_events("No events were found that match the specified selection criteria.\n", 5), [])
+
+    def test_render_event_logs_tags_each_row(self):
+        sections = [("Application", parse_wevtutil_events(self.output, 3)), ("System", [])]
+        text, ranges = render_event_logs(sections)
+        lines = text.splitlines()
+        self.assertEqual(lines[0], "🖥️ 2025-10-02 21:14:07 | Error | Application Error | Event ID: 1000")
+        self.assertEqual(ranges[:3], [("error", 0, 1), ("info", 1, 2), ("warning", 2, 3)])
+        self.assertEqual(ranges[-1], ("info", 3, len(lines)))
+        self.assertIn("📄 APPLICATION LOGS:", lines)
+
+
+class LogLineTests(unittest.TestCase):
+    LOG = (b"=== CRICKET 26 UPDATER LOG ===\n"
+           b"[2025-10-02 21:14:07] [INFO] Started\n"
+           b"[2025-10-02 21:14:08] [WARNING] Mirror slow\n"
+           b"  continued warning detail\n"
+           b"[2025-10-02 21:14:09] [ERROR] Download failed\n"
+           b"[2025-10-02 21:14:10] [ERROR] partial")
+
+    def test_index_inherits_levels_and_stops_at_the_last_newline(self):
+        offsets, levels, consumed = index_log_lines(self.LOG, base=100)
+        lines = self.LOG.split(b"\n")
+        self.assertEqual(len(offsets), 5)
+        self.assertEqual(offsets[1] - 100, len(lines[0]) + 1)
+        self.assertEqual([LOG_LEVELS[code] for code in levels], ["INFO", "INFO", "WARNING", "WARNING", "ERROR"])
+        self.assertEqual(consumed, self.LOG.rfind(b"\n") + 1)
+
+    def test_render_groups_consecutive_tags(self):
+        text, ranges = render_log_lines(self.LOG.decode().split("\n"))
+        self.assertEqual(len(text.splitlines()), 6)
+        self.assertEqual(ranges, [("success", 0, 2), ("warning", 2, 3), ("success", 3, 4), ("error", 4, 6)])
+
+    def test_render_with_indexed_levels_keeps_blank_rows(self):
+        lines = ["[t] [INFO] a", "", "detail"]
+        text, ranges = render_log_lines(lines, [0, 3, 3])
+        self.assertEqual(len(text.splitlines()), 3)
+        self.assertEqual(ranges, [("success", 0, 1), ("warning", 1, 3)])
+
+    def test_slice_renumbers_ranges(self):
+        block = render_log_lines(self.LOG.decode().split("\n"))
+        text, ranges = slice_log_block(block, 2, 5)
+        self.assertEqual(len(text.splitlines()), 3)
+        self.assertEqual(ranges, [("warning", 0, 1), ("success", 1, 2), ("error", 2, 3)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+
+from manifests.generate_manifest import build_packing_list, compare_manifests, diff_manifests
+
+OLD = {"_comment": "v1.0", "a.pak": "AA", "data\\b.pak": "bb", "c.pak": "cc", "gone.pak": "dd"}
+NEW = {"_comment": "v1.1", "a.pak": "aa", "data/b.pak": "b2", "moved/c.pak": "cc", "new.pak": "ee"}
+OLD_SIZES = {"a.pak": 1, "data/b.pak": 2, "c.pak": 3, "gone.pak": 4}
+NEW_SIZES = {"a.pak": 1, "data/b.pak": 20, "moved/c.pak": 3}
+
+
+class CompareManifestsTests(unittest.TestCase):
+    def test_merge_walk_with_renames_and_byte_totals(self):
+        diff = compare_manifests(OLD, NEW, OLD_SIZES, NEW_SIZES)
+        self.assertEqual(diff["added"], ["new.pak"])
+        self.assertEqual(diff["removed"], ["gone.pak"])
+        self.assertEqual(diff["modified"], ["data/b.pak"])
+        self.assertEqual(diff["renamed"], [{"from": "c.pak", "to": "moved/c.pak"}])
+        self.assertEqual(diff["unchanged"], 1)
+        self.assertEqual(diff["bytes"], {"added": 0, "removed": 4, "modified": 20, "renamed": 3})
+        self.assertEqual(diff["unknown_sizes"], 1)
+
+    def test_diff_manifests_folds_renames_into_added_and_removed(self):
+        self.assertEqual(diff_manifests(OLD, NEW), {"added": ["moved/c.pak", "new.pak"], "removed": ["c.pak", "gone.pak"], "modified": ["data/b.pak"]})
+
+    def test_packing_list(self):
+        packing = build_packing_list(compare_manifests(OLD, NEW, OLD_SIZES, NEW_SIZES), NEW, NEW_SIZES)
+        self.assertEqual([(f["path"], f["reason"]) for f in packing["files"]], [("data/b.pak", "modified"), ("moved/c.pak", "renamed"), ("new.pak", "added")])
+        self.assertEqual(packing["obsolete"], ["gone.pak"])
+        self.assertEqual((packing["total_bytes"], packing["unknown_sizes"]), (23, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
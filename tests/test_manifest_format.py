@@ -0,0 +1,67 @@
+import gzip
+import hashlib
+import unittest
+
+from cricket26.manifest_format import HEADER, BinaryManifestDecoder, decode_binary_manifest
+from manifests.generate_manifest import encode_binary_manifest
+
+
+def digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+MANIFEST = {
+    "_comment": "Cricket 26 v1.0.4 - File Manifest",
+    "data/a.pak": digest(b"a"),
+    "data/b.pak": digest(b"b"),
+    "cricket26.exe": digest(b"exe"),
+    "_blocks": {"block_size": 4, "files": {"data/a.pak": {"size": 6, "hashes": [digest(b"blk1"), digest(b"blk2")]}}},
+}
+SIZES = {"data/a.pak": 6, "data/b.pak": 1, "cricket26.exe": 3}
+
+
+def rewrite_header(data, **fields):
+    """Re-frame an encoded manifest with some header fields changed (the trailer is left as is)"""
+    raw = bytearray(gzip.decompress(data))
+    names = ("magic", "version", "flags", "reserved", "count", "block_size", "meta_len")
+    values = {**dict(zip(names, HEADER.unpack_from(raw))), **fields}
+    HEADER.pack_into(raw, 0, *(values[name] for name in names))
+    return gzip.compress(bytes(raw))
+
+
+class BinaryManifestTests(unittest.TestCase):
+    def test_round_trip_in_small_chunks(self):
+        data = encode_binary_manifest(MANIFEST, SIZES)
+        decoder = BinaryManifestDecoder()
+        for start in range(0, len(data), 5):
+            decoder.feed(data[start:start + 5])
+        self.assertEqual(decoder.finish(), MANIFEST)
+        self.assertEqual(decoder.sizes, SIZES)
+        self.assertEqual(decoder.version, 2)
+
+    def test_without_sizes_or_blocks(self):
+        manifest = {k: v for k, v in MANIFEST.items() if k != "_blocks"}
+        self.assertEqual(decode_binary_manifest(encode_binary_manifest(manifest)), manifest)
+
+    def test_rejects_unknown_version(self):
+        with self.assertRaisesRegex(ValueError, "version 3"):
+            decode_binary_manifest(rewrite_header(encode_binary_manifest(MANIFEST, SIZES), version=3))
+
+    def test_rejects_unknown_flags(self):
+        with self.assertRaisesRegex(ValueError, "flags"):
+            decode_binary_manifest(rewrite_header(encode_binary_manifest(MANIFEST, SIZES), flags=0x07))
+
+    def test_rejects_truncated_stream(self):
+        raw = gzip.decompress(encode_binary_manifest(MANIFEST, SIZES))
+        with self.assertRaisesRegex(ValueError, "truncated"):
+            decode_binary_manifest(gzip.compress(raw[:-40]))
+
+    def test_rejects_tampered_body(self):
+        raw = bytearray(gzip.decompress(encode_binary_manifest(MANIFEST, SIZES)))
+        raw[-40] ^= 0xFF
+        with self.assertRaisesRegex(ValueError, "integrity"):
+            decode_binary_manifest(gzip.compress(bytes(raw)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from cricket26 import core
+from cricket26.manifest_store import ManifestStore
+
+URL = "https://raw.githubusercontent.com/example/repo/main/manifests/1.0.4_manifest.json"
+
+
+class ManifestStoreTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.store_dir = Path(self._tmp.name)
+        self.body = json.dumps({"_comment": "v1.0.4", "data/a.pak": "ab" * 32}).encode("utf-8")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_round_trip(self):
+        store = ManifestStore(self.store_dir)
+        store.put("1.0.4", URL, self.body, etag='"abc"')
+        body, meta = store.get("1.0.4", URL)
+        self.assertEqual(body, self.body)
+        self.assertEqual((meta["etag"], meta["url"]), ('"abc"', URL))
+        self.assertEqual(store.find("1.0.4")[0], self.body)
+        self.assertEqual([meta["version"] for meta in store.entries()], ["1.0.4"])
+
+    def test_corrupted_entry_is_discarded(self):
+        store = ManifestStore(self.store_dir)
+        body_path = store.put("1.0.4", URL, self.body)
+        body_path.write_bytes(self.body[:-1])
+        self.assertEqual(store.get("1.0.4", URL), (None, {}))
+        self.assertEqual(list(self.store_dir.iterdir()), [])
+
+    def test_utility_loads_an_entry_seeded_by_the_admin_tools(self):
+        ManifestStore(self.store_dir).put("1.0.4", URL, self.body)
+        manifest = core.ManifestStore(self.store_dir).load(None, "1.0.4", threading.Event())
+        self.assertEqual(manifest, json.loads(self.body))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from cricket26.core import ArchiveStore, MirrorArchive
+
+
+class FinishBeforeLock:
+    """Stands in for MirrorArchive._lock and runs `finish` the first time a reader acquires it"""
+
+    def __init__(self, lock, finish):
+        self.lock, self.finish = lock, finish
+
+    def __enter__(self):
+        if self.finish:
+            finish, self.finish = self.finish, None
+            finish()
+        return self.lock.__enter__()
+
+    def __exit__(self, *exc):
+        return self.lock.__exit__(*exc)
+
+
+class MirrorArchiveReadTests(unittest.TestCase):
+    DATA = bytes(range(256)) * 4
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        cache_dir = Path(self._tmp.name)
+        self.archive = MirrorArchive("1.0_1.1", cache_dir / "1.0_1.1.zip", [], None, ArchiveStore(cache_dir), block_size=256)
+        self.archive.part_path.write_bytes(self.DATA)
+        self.archive._size, self.archive._done = len(self.DATA), {0, 1, 2}  # Block 3 still missing, so nothing finishes
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_reads_the_part_file_while_filling(self):
+        self.assertEqual(b"".join(self.archive.read(100, 700)), self.DATA[100:701])
+        self.assertEqual(self.archive._readers, 0)
+
+    def test_reader_racing_the_finish_reads_the_published_archive(self):
+        archive = self.archive
+
+        def finish():  # What _finish does once the last block is in, between the reader's check and its lock
+            archive._publish(archive.part_path)
+            archive._size, archive._done = None, set()
+
+        archive._lock = FinishBeforeLock(threading.Lock(), finish)
+        self.assertEqual(b"".join(archive.read(100, 700)), self.DATA[100:701])
+        self.assertTrue(archive.complete)
+        self.assertEqual(archive._readers, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+import hashlib
+import tempfile
+import unittest
+from pathlib import Path
+
+from cricket26.core import ArchiveStore, UpdatePlanner, ordered_links
+
+
+def make_data(sizes, links=None, **extra):
+    """version.json with one host serving every patch in sizes ({"<from>_<to>": "<n> MB"})"""
+    links = links or {key: f"https://cdn.example.com/{key}.zip" for key in sizes}
+    return {"latest_version": "1.3", "versions": ["1.0", "1.1", "1.2", "1.3"],
+            "hosts": [{"id": "cdn", "name": "CDN", "links": links}], "host_preference_order": ["cdn"],
+            "update_sizes": sizes, **extra}
+
+
+class PlannerTestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def planner(self, data, store=None):
+        return UpdatePlanner(data, self.cache_dir, lambda key: ordered_links(data, key), store=store)
+
+
+class RoutingTests(PlannerTestCase):
+    CHAIN = {"1.0_1.1": "100 MB", "1.1_1.2": "100 MB", "1.2_1.3": "100 MB"}
+
+    def test_cumulative_patch_wins_when_smaller_than_chain(self):
+        plan = self.planner(make_data({**self.CHAIN, "1.0_1.3": "250 MB"})).plan("1.0", "1.3")
+        self.assertEqual([e["key"] for e in plan["route"]], ["1.0_1.3"])
+        self.assertEqual(plan["bytes"], 250 * 1024 * 1024)
+
+    def test_chain_wins_when_cumulative_is_larger(self):
+        plan = self.planner(make_data({**self.CHAIN, "1.0_1.3": "400 MB"})).plan("1.0", "1.3")
+        self.assertEqual([e["key"] for e in plan["route"]], ["1.0_1.1", "1.1_1.2", "1.2_1.3"])
+        self.assertIn(["1.0_1.3"], [[e["key"] for e in a["route"]] for a in plan["alternatives"]])
+
+    def test_mixed_route_over_partial_cumulative(self):
+        plan = self.planner(make_data({**self.CHAIN, "1.0_1.2": "120 MB"})).plan("1.0", "1.3")
+        self.assertEqual([e["key"] for e in plan["route"]], ["1.0_1.2", "1.2_1.3"])
+        self.assertIn("Step-by-step chain", [a["label"] for a in plan["alternatives"]])
+
+    def test_equal_cost_prefers_fewer_installs(self):
+        plan = self.planner(make_data({**self.CHAIN, "1.0_1.3": "300 MB"})).plan("1.0", "1.3")
+        self.assertEqual([e["key"] for e in plan["route"]], ["1.0_1.3"])
+
+    def test_unreachable_target(self):
+        self.assertIsNone(self.planner(make_data({"1.0_1.1": "100 MB"})).plan("1.0", "1.3"))
+
+    def test_stored_archives_make_the_chain_free(self):
+        data = make_data({**self.CHAIN, "1.0_1.3": "250 MB"})
+        store = ArchiveStore(self.cache_dir)
+        digests = {}
+        for key in self.CHAIN:
+            path = self.cache_dir / f"{key}.part"
+            path.write_bytes(key.encode())
+            digests[key] = hashlib.sha256(key.encode()).hexdigest()
+            store.add(path, digests[key], [key])
+        data["hosts"][0]["checksums"] = digests
+        plan = self.planner(data, store).plan("1.0", "1.3")
+        self.assertEqual([e["key"] for e in plan["route"]], ["1.0_1.1", "1.1_1.2", "1.2_1.3"])
+        self.assertEqual(plan["bytes"], 0)
+        self.assertTrue(all(e["cached_verified"] for e in plan["route"]))
+
+
+class CachedArchiveTests(PlannerTestCase):
+    def write_cached(self, data, key="1.0_1.1"):
+        from_ver, _, to_ver = key.partition("_")
+        path = UpdatePlanner.cached_archive_path(self.cache_dir, from_ver, to_ver)
+        path.write_bytes(data)
+        return path
+
+    def edge(self, planner, key="1.0_1.1"):
+        return next(e for edges in planner.edges.values() for e in edges if e["key"] == key)
+
+    def test_approximate_size_does_not_make_a_file_cached(self):
+        self.write_cached(b"x" * 1024)
+        self.assertFalse(self.edge(self.planner(make_data({"1.0_1.1": "1 KB"})))["cached"])
+
+    def test_unknown_size_without_checksum_is_not_cached(self):
+        self.write_cached(b"partial")
+        self.assertFalse(self.edge(self.planner(make_data({"1.0_1.1": "0 B"})))["cached"])
+
+    def test_exact_archive_size_is_trusted(self):
+        path = self.write_cached(b"archive")
+        data = make_data({"1.0_1.1": "1 MB"}, update_archives={"1.0_1.1": {"size_bytes": 7}})
+        edge = self.edge(self.planner(data))
+        self.assertTrue(edge["cached"])
+        self.assertEqual(edge["cached_path"], path)
+        self.assertFalse(edge["cached_verified"])
+
+    def test_truncated_archive_with_exact_size_is_not_cached(self):
+        self.write_cached(b"arch")
+        data = make_data({"1.0_1.1": "1 MB"}, update_archives={"1.0_1.1": {"size_bytes": 7}})
+        self.assertFalse(self.edge(self.planner(data))["cached"])
+
+    def test_checksum_match_moves_the_archive_into_the_store(self):
+        self.write_cached(b"archive")
+        digest = hashlib.sha256(b"archive").hexdigest()
+        data = make_data({"1.0_1.1": "1 MB"})
+        data["hosts"][0]["checksums"] = {"1.0_1.1": digest}
+        store = ArchiveStore(self.cache_dir)
+        edge = self.edge(self.planner(data, store))
+        self.assertTrue(edge["cached"])
+        self.assertEqual(edge["cached_path"], store.path_for(digest))
+        self.assertEqual(edge["cached_sha256"], digest)
+        self.assertEqual(store.total_bytes, 7)
+
+    def test_checksum_mismatch_is_not_cached(self):
+        self.write_cached(b"corrupt")
+        data = make_data({"1.0_1.1": "1 MB"})
+        data["hosts"][0]["checksums"] = {"1.0_1.1": hashlib.sha256(b"archive").hexdigest()}
+        self.assertFalse(self.edge(self.planner(data))["cached"])
+
+
+class InstallEntryTests(PlannerTestCase):
+    def test_bare_drive_ids_become_gdrive_sources(self):
+        data = make_data({"1.0_1.1": "100 MB"}, links={"1.0_1.1": "1ABC123XYZ456DEF789"})
+        data["hosts"].append({"id": "cdn2", "name": "CDN 2", "links": {"1.0_1.1": "https://cdn2.example.com/1.0_1.1.zip"}})
+        data["host_preference_order"].append("cdn2")
+        planner = self.planner(data)
+        entry = UpdatePlanner.to_install_entry(planner.plan("1.0", "1.1")["route"][0])
+        self.assertEqual(entry["downloads"]["primary"], {"type": "gdrive", "url": "1ABC123XYZ456DEF789", "file_id": "1ABC123XYZ456DEF789", "name": "cdn"})
+        self.assertEqual(entry["downloads"]["fallback"], [{"type": "direct", "url": "https://cdn2.example.com/1.0_1.1.zip", "name": "cdn2"}])
+        self.assertEqual((entry["from"], entry["to"], entry["key"]), ("1.0", "1.1", "1.0_1.1"))
+        self.assertIsNone(entry["cached_path"])
+
+    def test_drive_urls_keep_their_file_id(self):
+        data = make_data({"1.0_1.1": "100 MB"}, links={"1.0_1.1": "https://drive.google.com/file/d/1XYZ789/view?usp=sharing"})
+        entry = UpdatePlanner.to_install_entry(self.planner(data).plan("1.0", "1.1")["route"][0])
+        self.assertEqual(entry["downloads"]["primary"]["type"], "gdrive")
+        self.assertEqual(entry["downloads"]["primary"]["file_id"], "1XYZ789")
+
+    def test_v2_update_fields_are_kept(self):
+        update = {"update_id": 1, "from_version": "1.0", "to_version": "1.1", "size_mb": 50, "mandatory": True,
+                  "downloads": {"primary": {"type": "direct", "url": "https://cdn.example.com/a.zip", "checksum": "ab"}, "fallback": []}}
+        data = {"versions": ["1.0", "1.1"], "hosts": [], "host_preference_order": [], "updates": [update]}
+        entry = UpdatePlanner.to_install_entry(self.planner(data).plan("1.0", "1.1")["route"][0])
+        self.assertEqual(entry["downloads"], update["downloads"])
+        self.assertEqual((entry["from_version"], entry["to_version"], entry["size_bytes"]), ("1.0", "1.1", 50 * 1024 * 1024))
+        self.assertTrue(entry["mandatory"])
+
+
+if __name__ == "__main__":
+    unittest.main()